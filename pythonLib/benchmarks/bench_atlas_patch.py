@@ -0,0 +1,141 @@
+"""Benchmark: streaming atlas patcher vs the read-all/rewrite-all apply.
+
+    python benchmarks/bench_atlas_patch.py [--rows 17500] [--repeat 3]
+
+Enriches a synthetic statewide atlas with 3, 300 and 3000 hmdb targets,
+once with the old ``_write_atlas_enrichment`` (every row loaded into a
+dict, ``shutil.copy2`` backup, every row rewritten) and once with the
+streaming patcher and its reverse-patch backup. Prints best-of-N time and
+backup size for each, and checks that both leave identical atlas bytes
+and that restoring the reverse patch gives back the original file.
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from thc_toolkit import hmdb_sync
+
+try:
+    from .synthetic import ATLAS_ROWS, make_atlas
+except ImportError:  # run as a script
+    from synthetic import ATLAS_ROWS, make_atlas  # type: ignore
+
+
+def write_atlas_enrichment_rewrite(atlas_path, targets, make_backup):
+    """The pre-streaming implementation, kept here as the baseline."""
+    with atlas_path.open(newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        fieldnames = reader.fieldnames
+        rows = list(reader)
+    rows_by_thc = hmdb_sync._group_atlas_by_thc(rows)
+    claimed: set[int] = set()
+    updated = []
+    for thc, hmdb_row in targets:
+        group = rows_by_thc.get(thc)
+        if not group:
+            continue
+        target, _ = hmdb_sync._resolve_atlas_row(
+            group, (hmdb_row.get("MarkerID") or "").strip(), claimed
+        )
+        claimed.add(id(target))
+        target.update(hmdb_sync._hmdb_to_enrichment(hmdb_row))
+        updated.append(thc)
+    backup_path = None
+    if updated and make_backup:
+        backup_path = atlas_path.with_suffix(atlas_path.suffix + ".bak.old")
+        shutil.copy2(atlas_path, backup_path)
+    if updated:
+        with atlas_path.open("w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames, lineterminator="\n")
+            writer.writeheader()
+            writer.writerows(rows)
+    return {"backup_path": backup_path}
+
+
+def targets_for(atlas, n):
+    free = atlas[atlas["ref:hmdb"].isna()]["ref:US-TX:thc"].astype(str).tolist()
+    return [
+        (
+            thc,
+            {
+                "MarkerID": str(900_000 + i),
+                "Link": f"https://www.hmdb.org/m.asp?m={900_000 + i}",
+                "Street Address": f"{i} Oak St",
+                "City or Town": "Austin",
+                "Latitude (minus=S)": "30.2",
+                "Longitude (minus=W)": "-97.7",
+                "Missing": "",
+            },
+        )
+        for i, thc in enumerate(free[:n])
+    ]
+
+
+def best_of(fn, source, work, targets, repeat):
+    times, result = [], None
+    for _ in range(repeat):
+        shutil.copy(source, work)
+        for old in work.parent.glob(work.name + ".bak.*"):
+            old.unlink()
+        start = time.perf_counter()
+        result = fn(work, targets, make_backup=True)
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--rows", type=int, default=ATLAS_ROWS)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args(argv)
+
+    ok = True
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        atlas = make_atlas(args.rows)
+        source = tmp / "source.csv"
+        atlas.to_csv(source, index=False)
+        # Normalize once through the csv module, as any earlier apply would.
+        normalized = tmp / "normalized.csv"
+        with source.open(newline="", encoding="utf-8") as src, normalized.open(
+            "w", newline="", encoding="utf-8"
+        ) as dst:
+            csv.writer(dst, lineterminator="\n").writerows(csv.reader(src))
+        print(f"atlas            : {args.rows:,} rows, {normalized.stat().st_size / 1e6:.1f} MB")
+        print(f"{'targets':>7} {'rewrite ms':>11} {'stream ms':>10} {'old backup':>11} {'new backup':>11}")
+        for n in (3, 300, 3000):
+            targets = targets_for(atlas, n)
+            old_dir, new_dir = tmp / f"old{n}", tmp / f"new{n}"
+            old_dir.mkdir()
+            new_dir.mkdir()
+            old_s, old = best_of(
+                write_atlas_enrichment_rewrite, normalized, old_dir / "atlas_db.csv",
+                targets, args.repeat,
+            )
+            new_s, new = best_of(
+                hmdb_sync._write_atlas_enrichment, normalized, new_dir / "atlas_db.csv",
+                targets, args.repeat,
+            )
+            same = (old_dir / "atlas_db.csv").read_bytes() == (
+                new_dir / "atlas_db.csv"
+            ).read_bytes()
+            hmdb_sync.restore_backup(new_dir / "atlas_db.csv", new["backup_path"])
+            restored = (new_dir / "atlas_db.csv").read_bytes() == normalized.read_bytes()
+            ok = ok and same and restored
+            print(
+                f"{n:>7} {old_s * 1000:>11.1f} {new_s * 1000:>10.1f} "
+                f"{old['backup_path'].stat().st_size / 1e3:>9.0f}kB "
+                f"{new['backup_path'].stat().st_size / 1e3:>9.1f}kB"
+                f"{'' if same and restored else '  MISMATCH'}"
+            )
+    print(f"identical + restorable: {ok}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
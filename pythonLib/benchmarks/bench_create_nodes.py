@@ -0,0 +1,119 @@
+"""Benchmark: columnar ``create_nodes`` vs the old ``iterrows`` build.
+
+    python benchmarks/bench_create_nodes.py [--rows 17500] [--repeat 3]
+
+Builds nodes for every verified marker of a synthetic statewide atlas with
+both implementations, checks the ``nodes.json`` text they produce is
+identical, and prints the best-of-N wall time for each.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from thc_toolkit.utils import (
+    assert_no_duplicate_ids,
+    coerce_nullable_int_series,
+    create_nodes,
+    read_atlas,
+    require_columns,
+)
+
+try:
+    from .synthetic import ATLAS_ROWS, write_atlas
+except ImportError:  # run as a script
+    from synthetic import ATLAS_ROWS, write_atlas  # type: ignore
+
+
+def _normalize_scalar(value):
+    if pd.isna(value):
+        return None
+    return value
+
+
+def create_nodes_rowwise(df):
+    """The pre-vectorization implementation, kept here as the baseline."""
+    require_columns(
+        df,
+        ["name", "ref:US-TX:thc", "ref:hmdb", "website",
+         "verified:Latitude", "verified:Longitude"],
+        context="create_nodes input",
+    )
+    assert_no_duplicate_ids(
+        df, ["ref:US-TX:thc", "ref:hmdb"], context="create_nodes input"
+    )
+    thc_ref = coerce_nullable_int_series(
+        df["ref:US-TX:thc"], "ref:US-TX:thc", context="create_nodes input"
+    )
+    hmdb_ref = coerce_nullable_int_series(
+        df["ref:hmdb"], "ref:hmdb", context="create_nodes input"
+    )
+    nodes = []
+    for index, row in df.iterrows():
+        lat = pd.to_numeric(pd.Series([row["verified:Latitude"]]), errors="coerce").iloc[0]
+        lon = pd.to_numeric(pd.Series([row["verified:Longitude"]]), errors="coerce").iloc[0]
+        row_thc = thc_ref.iloc[index]
+        row_hmdb = hmdb_ref.iloc[index]
+        tags = {
+            "name": _normalize_scalar(row["name"]),
+            "historic": "memorial",
+            "memorial": "plaque",
+            "material": "aluminium",
+            "operator": "Texas Historical Commission",
+            "operator:wikidata": "Q2397965",
+            "ref:US-TX:thc": int(row_thc) if pd.notna(row_thc) else None,
+            "ref:hmdb": int(row_hmdb) if pd.notna(row_hmdb) else None,
+            "website": _normalize_scalar(row["website"]),
+        }
+        if pd.notna(row_hmdb):
+            tags["memorial:website"] = f"https://www.hmdb.org/m.asp?m={int(row_hmdb)}"
+        for col in (
+            "thc:designation", "start_date", "addr:full", "addr:city",
+            "addr:county", "wikimedia_commons", "subject:wikimedia_commons",
+            "subject:wikipedia", "subject:wikidata",
+        ):
+            if col in df.columns and pd.notna(row.get(col)):
+                tags[col] = _normalize_scalar(row[col])
+        nodes.append({"lat": float(lat), "lon": float(lon), "tags": tags})
+    return nodes
+
+
+def best_of(fn, arg, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = fn(arg)
+        times.append(time.perf_counter() - start)
+    return min(times), out
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--rows", type=int, default=ATLAS_ROWS)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = write_atlas(Path(tmp) / "atlas_db.csv", rows=args.rows)
+        atlas = read_atlas(csv_path, cache=False)
+    df = atlas[atlas["verified:Latitude"].notna()].reset_index(drop=True)
+
+    old_s, old_nodes = best_of(create_nodes_rowwise, df, args.repeat)
+    new_s, new_nodes = best_of(create_nodes, df, args.repeat)
+    identical = json.dumps(old_nodes, indent=2) == json.dumps(new_nodes, indent=2)
+
+    print(f"nodes built      : {len(new_nodes):,} (of {len(atlas):,} atlas rows)")
+    print(f"iterrows         : {old_s * 1000:9.1f} ms")
+    print(f"columnar         : {new_s * 1000:9.1f} ms")
+    print(f"speedup          : {old_s / new_s:9.1f}x")
+    print(f"nodes.json equal : {identical}")
+    return 0 if identical else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,181 @@
+"""Benchmark: streamed, delta-aware ``hmdb fetch`` vs the buffered download.
+
+    python benchmarks/bench_hmdb_fetch.py [--rows 22000] [--churn 300]
+
+Serves a synthetic hmdb export from a local HTTP server standing in for
+Results.asp and ListsDownload.asp, then:
+
+* downloads it once the old way (``r.content`` written in one piece) and
+  once streamed, under ``tracemalloc``; prints time and peak Python memory;
+* fetches again with the same marker IDs, which skips the download;
+* fetches next week's export (``--churn`` titles edited, ``churn / 3`` rows
+  dropped and added) and times the download plus the MarkerID diff.
+
+Checks that both downloads are byte-identical and that the delta holds
+exactly the rows that were edited or added.
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import tempfile
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest import mock
+
+import requests
+
+from thc_toolkit import hmdb_fetch
+
+try:
+    from .bench_reconcile_incremental import next_week
+    from .synthetic import HMDB_ROWS, make_atlas, make_hmdb
+except ImportError:  # run as a script
+    from bench_reconcile_incremental import next_week  # type: ignore
+    from synthetic import HMDB_ROWS, make_atlas, make_hmdb  # type: ignore
+
+
+def download_csv_buffered(session, markers, markercount, title, out_dir, filename):
+    """The pre-streaming download, kept here as the baseline."""
+    r = session.post(
+        f"{hmdb_fetch.BASE}/ListsDownload.asp",
+        data={"markers": markers, "markercount": markercount, "title": title},
+        timeout=120,
+    )
+    r.raise_for_status()
+    path = Path(out_dir) / filename
+    path.write_bytes(r.content)
+    return path
+
+
+class Listing:
+    """What the fake hmdb serves: an export and its marker IDs."""
+
+    def __init__(self, frame):
+        self.set(frame)
+
+    def set(self, frame):
+        self.body = frame.to_csv(index=False).encode("utf-8")
+        self.ids = ",".join(frame["MarkerID"].astype(str))
+
+
+def serve(listing):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def _send(self, body, content_type, extra=()):
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            for name, value in extra:
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            count = listing.ids.count(",") + 1
+            html = (
+                f"<input type='hidden' name='markers' value='{listing.ids}'>"
+                f"<input type='hidden' name='markercount' value='{count}'>"
+            )
+            self._send(html.encode("utf-8"), "text/html")
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            self._send(
+                listing.body,
+                "text/csv",
+                [("Content-Disposition", 'attachment; filename="HMdb-Entries.csv"')],
+            )
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def timed(fn):
+    start = time.perf_counter()
+    out = fn()
+    return time.perf_counter() - start, out
+
+
+def measured(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    out = fn()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak, out
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--rows", type=int, default=HMDB_ROWS)
+    ap.add_argument("--churn", type=int, default=300)
+    args = ap.parse_args(argv)
+
+    atlas = make_atlas()
+    week0 = make_hmdb(atlas, rows=args.rows)
+    week1 = next_week(week0, atlas, args.churn)
+    listing = Listing(week0)
+    server = serve(listing)
+    session = requests.Session()
+    base = f"http://127.0.0.1:{server.server_port}"
+    try:
+        with tempfile.TemporaryDirectory() as tmp, mock.patch.object(
+            hmdb_fetch, "BASE", base
+        ):
+            tmp = Path(tmp)
+            markers, count, title = hmdb_fetch.fetch_state_listing(session)
+            old_s, old_peak, old_path = measured(
+                lambda: download_csv_buffered(
+                    session, markers, count, title, tmp, "buffered.csv"
+                )
+            )
+            new_s, new_peak, new_path = measured(
+                lambda: hmdb_fetch.download_csv(
+                    session, markers, count, title, tmp, "streamed.csv"
+                )
+            )
+            same = old_path.read_bytes() == new_path.read_bytes()
+
+            out = tmp / "data_files"
+            fetch = lambda: hmdb_fetch.fetch_listing(session, out_dir=out)  # noqa: E731
+            fetch()
+            skip_s, skipped = timed(fetch)
+            listing.set(week1)
+            delta_s, delta = timed(fetch)
+            with delta["delta_csv"].open(newline="", encoding="utf-8") as f:
+                got = sorted(row["MarkerID"] for row in csv.DictReader(f))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    old_titles = dict(zip(week0["MarkerID"].astype(str), week0["Title"]))
+    want = sorted(
+        marker_id
+        for marker_id, title in zip(week1["MarkerID"].astype(str), week1["Title"])
+        if old_titles.get(marker_id) != title
+    )
+    ok = same and skipped["skipped"] and got == want
+    diff = delta["diff"]
+    print(f"export           : {args.rows:,} rows, {len(listing.body) / 1e6:.1f} MB")
+    print(f"buffered download: {old_s * 1000:8.1f} ms, peak {old_peak / 1e6:6.1f} MB")
+    print(f"streamed download: {new_s * 1000:8.1f} ms, peak {new_peak / 1e6:6.1f} MB")
+    print(f"unchanged IDs    : {skip_s * 1000:8.1f} ms (download skipped: {skipped['skipped']})")
+    print(
+        f"churned listing  : {delta_s * 1000:8.1f} ms "
+        f"({len(diff['added'])} added, {len(diff['removed'])} removed, "
+        f"{len(diff['changed'])} changed)"
+    )
+    print(f"identical bytes, exact delta: {ok}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,80 @@
+"""Benchmark: batched ``NameScorer`` vs one ``name_similarity`` call per pair.
+
+    python benchmarks/bench_name_scoring.py [--pairs 200000] [--workers N]
+
+Builds (hmdb title, atlas name) pairs from the synthetic atlas and hmdb
+export, repeated the way a reconcile run and a statewide dedup see them,
+and scores them three ways: the old per-pair function (normalize both
+names, build a ``SequenceMatcher``), a batched scorer in this process, and
+a batched scorer fanned out over ``--workers`` processes. Scores must be
+bit-identical; the process pool only pays off with more than one CPU.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import time
+from difflib import SequenceMatcher
+
+from thc_toolkit import hmdb_sync
+
+try:
+    from .synthetic import make_atlas, make_hmdb
+except ImportError:  # run as a script
+    from synthetic import make_atlas, make_hmdb  # type: ignore
+
+
+def name_similarity_per_pair(a: str, b: str) -> float:
+    """The pre-batching ``hmdb_sync.name_similarity``, kept as the baseline."""
+    na, nb = hmdb_sync.normalize_name(a), hmdb_sync.normalize_name(b)
+    if not na or not nb:
+        return 0.0
+    if na == nb:
+        return 1.0
+    return SequenceMatcher(None, na, nb).ratio()
+
+
+def make_pairs(n: int) -> list[tuple[str, str]]:
+    atlas = make_atlas()
+    hmdb = make_hmdb(atlas, rows=n)
+    names = dict(zip(atlas["ref:US-TX:thc"].astype(str), atlas["name"]))
+    # Every title against its own atlas row and, as dedup does, a neighbour.
+    pairs = []
+    for marker_no, title in zip(hmdb["Marker No."], hmdb["Title"]):
+        own = names.get(marker_no, "")
+        pairs.append((title, own))
+        pairs.append((title, names.get(str(int(marker_no or 1000) + 3), "")))
+    return pairs[:n]
+
+
+def timed(fn):
+    start = time.perf_counter()
+    out = fn()
+    return time.perf_counter() - start, out
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--pairs", type=int, default=200_000)
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = ap.parse_args(argv)
+
+    pairs = make_pairs(args.pairs)
+    old_s, old = timed(lambda: [name_similarity_per_pair(a, b) for a, b in pairs])
+    serial_s, serial = timed(lambda: hmdb_sync.name_scorer(workers=1).score_pairs(pairs))
+    pool_s, pooled = timed(
+        lambda: hmdb_sync.name_scorer(workers=max(2, args.workers)).score_pairs(pairs)
+    )
+
+    identical = old == serial == pooled
+    print(f"pairs            : {len(pairs):,} ({len(set(pairs)):,} distinct)")
+    print(f"per pair         : {old_s * 1000:9.1f} ms")
+    print(f"batched, 1 proc  : {serial_s * 1000:9.1f} ms")
+    print(f"batched, {max(2, args.workers)} procs : {pool_s * 1000:9.1f} ms")
+    print(f"speedup (1 proc) : {old_s / serial_s:9.1f}x")
+    print(f"bit-identical    : {identical}")
+    return 0 if identical else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
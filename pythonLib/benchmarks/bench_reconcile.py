@@ -0,0 +1,149 @@
+"""Benchmark: ``hmdb reconcile`` with the compiled ``Erected By`` matcher.
+
+    python benchmarks/bench_reconcile.py [--rows 22000] [--top 8]
+
+Writes a synthetic atlas and an overlapping hmdb export, then runs
+``reconcile`` under cProfile twice: once with the old per-row phrase and
+window scan patched in as ``is_thc_erected_by``, once with the compiled,
+memoized matcher. Prints the top functions of each profile by cumulative
+time, times the filter alone over every row, and checks that both runs
+classify every row the same way. The old and new verdicts are also
+compared on the export's distinct strings with random typos added, to
+exercise the fuzzy path.
+"""
+from __future__ import annotations
+
+import argparse
+import cProfile
+import io
+import pstats
+import random
+import shutil
+import tempfile
+import time
+from difflib import SequenceMatcher
+from pathlib import Path
+from unittest import mock
+
+from thc_toolkit import hmdb_sync
+
+try:
+    from .synthetic import HMDB_ROWS, make_atlas, write_hmdb
+except ImportError:  # run as a script
+    from synthetic import HMDB_ROWS, make_atlas, write_hmdb  # type: ignore
+
+
+def is_thc_erected_by_scan(erected_by: str) -> bool:
+    """The pre-compilation filter, kept here as the baseline."""
+    norm = hmdb_sync.normalize_phrase(erected_by)
+    if not norm:
+        return False
+    if any(excl in norm for excl in hmdb_sync.THC_EXCLUSIONS):
+        return False
+    for canon in hmdb_sync.THC_CANONICAL_PHRASES:
+        if canon in norm:
+            return True
+    norm_words = norm.split()
+    for canon in hmdb_sync.THC_CANONICAL_PHRASES:
+        canon_words = canon.split()
+        if SequenceMatcher(None, canon, norm).ratio() >= hmdb_sync.THC_FUZZ_THRESHOLD:
+            return True
+        window_len = len(canon_words)
+        if len(norm_words) >= window_len:
+            for i in range(len(norm_words) - window_len + 1):
+                window = " ".join(norm_words[i : i + window_len])
+                if (
+                    SequenceMatcher(None, canon, window).ratio()
+                    >= hmdb_sync.THC_FUZZ_THRESHOLD
+                ):
+                    return True
+    return False
+
+
+def typo(text: str, rng: random.Random) -> str:
+    if len(text) < 2:
+        return text
+    i = rng.randrange(len(text) - 1)
+    edit = rng.randrange(3)
+    if edit == 0:
+        return text[:i] + text[i + 1 :]
+    if edit == 1:
+        return text[:i] + text[i + 1] + text[i] + text[i + 2 :]
+    return text[:i] + rng.choice("aeiourst") + text[i:]
+
+
+def profile_reconcile(filter_fn, hmdb_path, atlas_src, tmp, top):
+    atlas_path = tmp / "atlas_db.csv"
+    shutil.copy(atlas_src, atlas_path)
+    out_dir = tmp / "review"
+    profiler = cProfile.Profile()
+    with mock.patch.object(hmdb_sync, "is_thc_erected_by", filter_fn):
+        profiler.enable()
+        stats = hmdb_sync.reconcile(
+            hmdb_path, atlas_path, out_dir, make_backup=False, full=True
+        )
+        profiler.disable()
+    buf = io.StringIO()
+    ps = pstats.Stats(profiler, stream=buf).sort_stats("cumulative")
+    ps.print_stats(top)
+    reviews = {p.name: p.read_text() for p in sorted(out_dir.glob("*.csv"))}
+    # Both runs share one out_dir, so the second one's delta is empty.
+    for key in ("backup_path", "delta"):
+        stats.pop(key, None)
+    return ps.total_tt, buf.getvalue(), stats, reviews
+
+
+def time_filter(filter_fn, values):
+    start = time.perf_counter()
+    for value in values:
+        filter_fn(value)
+    return time.perf_counter() - start
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--rows", type=int, default=HMDB_ROWS)
+    ap.add_argument("--top", type=int, default=8)
+    args = ap.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        atlas = make_atlas()
+        atlas_src = tmp / "atlas_src.csv"
+        atlas.to_csv(atlas_src, index=False)
+        hmdb_path = write_hmdb(tmp / "hmdb.csv", atlas, rows=args.rows)
+
+        old_s, old_profile, old_stats, old_reviews = profile_reconcile(
+            is_thc_erected_by_scan, hmdb_path, atlas_src, tmp, args.top
+        )
+        new_s, new_profile, new_stats, new_reviews = profile_reconcile(
+            hmdb_sync.ErectedByMatcher(), hmdb_path, atlas_src, tmp, args.top
+        )
+
+        erected = [row["Erected By"] for row in hmdb_sync._load_hmdb_rows(hmdb_path)]
+        distinct = set(erected)
+    filter_old = time_filter(is_thc_erected_by_scan, erected)
+    filter_new = time_filter(hmdb_sync.ErectedByMatcher(), erected)
+    rng = random.Random(0)
+    probes = sorted(distinct) + [typo(typo(s, rng), rng) for s in sorted(distinct)]
+    matcher = hmdb_sync.ErectedByMatcher()
+    mismatched = [s for s in probes if matcher(s) != is_thc_erected_by_scan(s)]
+
+    print("---- before: per-row phrase/window scan ----")
+    print(old_profile)
+    print("---- after: compiled, memoized matcher ----")
+    print(new_profile)
+    same = old_stats == new_stats and old_reviews == new_reviews and not mismatched
+    print(f"hmdb rows         : {args.rows:,} ({len(distinct)} distinct Erected By)")
+    print(f"filter before     : {filter_old * 1000:9.1f} ms")
+    print(f"filter after      : {filter_new * 1000:9.1f} ms")
+    print(f"reconcile before  : {old_s:9.2f} s (profiled)")
+    print(f"reconcile after   : {new_s:9.2f} s (profiled)")
+    print(f"speedup           : {old_s / new_s:9.1f}x")
+    print(f"verdict probes    : {len(probes):,}, mismatches {len(mismatched)}")
+    print(f"identical output  : {same}")
+    return 0 if same else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
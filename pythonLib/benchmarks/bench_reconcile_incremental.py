@@ -0,0 +1,106 @@
+"""Benchmark: incremental ``hmdb reconcile`` against a stored state.
+
+    python benchmarks/bench_reconcile_incremental.py [--churn 0 300 3000] [--repeat 3]
+
+Reconciles a synthetic hmdb export into a synthetic atlas twice, so the
+auto-applied rows settle as documented and the state file describes the
+atlas on disk. It then derives next week's export by editing the title of
+``churn`` rows, dropping ``churn / 3`` and adding ``churn / 3`` new ones,
+and reconciles that export two ways from the same starting atlas: a full
+run (``full=True``) and an incremental run against the stored state.
+Prints best-of-N wall time and how many rows each run classified. Checks
+that both runs write identical review CSVs and stats.
+"""
+from __future__ import annotations
+
+import argparse
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from thc_toolkit import hmdb_sync
+
+try:
+    from .synthetic import HMDB_ROWS, make_atlas, make_hmdb
+except ImportError:  # run as a script
+    from synthetic import HMDB_ROWS, make_atlas, make_hmdb  # type: ignore
+
+# Stats that describe the work done rather than the outcome.
+WORK_STATS = ("reclassified", "delta", "removed", "backup_path", "state_path")
+
+
+def next_week(hmdb: pd.DataFrame, atlas: pd.DataFrame, churn: int) -> pd.DataFrame:
+    week = hmdb.copy()
+    if not churn:
+        return week
+    step = max(1, len(week) // churn)
+    edited = week.index[::step][:churn]
+    week.loc[edited, "Title"] = week.loc[edited, "Title"] + " Site"
+    dropped = week.index[step // 2 :: step][: churn // 3]
+    added = make_hmdb(atlas, rows=churn // 3, seed=1)
+    added["MarkerID"] += 1_000_000
+    return pd.concat([week.drop(dropped), added], ignore_index=True)
+
+
+def run(source_dir: Path, work: Path, hmdb_path: Path, full: bool, repeat: int):
+    times, stats = [], None
+    for _ in range(repeat):
+        if work.exists():
+            shutil.rmtree(work)
+        shutil.copytree(source_dir, work)
+        start = time.perf_counter()
+        stats = hmdb_sync.reconcile(
+            hmdb_path, work / "atlas_db.csv", work / "review", make_backup=False, full=full
+        )
+        times.append(time.perf_counter() - start)
+    reviews = {p.name: p.read_text() for p in sorted((work / "review").glob("*.csv"))}
+    return min(times), stats, reviews
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--rows", type=int, default=HMDB_ROWS)
+    ap.add_argument("--churn", type=int, nargs="+", default=[0, 300, 3000])
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args(argv)
+
+    ok = True
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        atlas = make_atlas()
+        hmdb = make_hmdb(atlas, rows=args.rows)
+        settled = tmp / "settled"
+        (settled / "review").mkdir(parents=True)
+        atlas.to_csv(settled / "atlas_db.csv", index=False)
+        hmdb.to_csv(tmp / "week0.csv", index=False)
+        for _ in range(2):
+            hmdb_sync.reconcile(
+                tmp / "week0.csv", settled / "atlas_db.csv", settled / "review",
+                make_backup=False,
+            )
+
+        print(f"hmdb rows        : {args.rows:,}")
+        print(f"{'churn':>6} {'full ms':>9} {'incr ms':>9} {'full rows':>10} {'incr rows':>10} {'delta':>6}")
+        for churn in args.churn:
+            hmdb_path = tmp / f"week_{churn}.csv"
+            next_week(hmdb, atlas, churn).to_csv(hmdb_path, index=False)
+            full_s, full, full_reviews = run(settled, tmp / "full", hmdb_path, True, args.repeat)
+            incr_s, incr, incr_reviews = run(settled, tmp / "incr", hmdb_path, False, args.repeat)
+            same = full_reviews == incr_reviews and {
+                k: v for k, v in full.items() if k not in WORK_STATS
+            } == {k: v for k, v in incr.items() if k not in WORK_STATS}
+            ok = ok and same
+            print(
+                f"{churn:>6} {full_s * 1000:>9.1f} {incr_s * 1000:>9.1f} "
+                f"{full['reclassified']:>10,} {incr['reclassified']:>10,} {incr['delta']:>6,}"
+                f"{'' if same else '  MISMATCH'}"
+            )
+    print(f"identical output : {ok}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
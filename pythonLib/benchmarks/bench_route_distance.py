@@ -0,0 +1,131 @@
+"""Benchmark: route distance modes (mercator / utm / geodesic).
+
+    python benchmarks/bench_route_distance.py [--radius 5] [--miles 1000]
+
+Measures every marker of a synthetic statewide atlas against a synthetic
+GPS-style track (a vertex every ~300 m) with each ``--distance-mode``, and
+checks a sample of the markers found against a brute-force ellipsoidal
+reference (minimum ``Geod.inv`` to the track densified to 25 m). With
+``--legacy`` it also times the original one-marker-at-a-time loop.
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pyproj
+import shapely
+from shapely.geometry import LineString, Point
+
+from thc_toolkit import route_cli
+from thc_toolkit.utils import read_atlas, resolve_coords
+
+try:
+    from .synthetic import ATLAS_ROWS, write_atlas
+except ImportError:  # run as a script
+    from synthetic import ATLAS_ROWS, write_atlas  # type: ignore
+
+GEOD = pyproj.Geod(ellps="WGS84")
+
+
+def synthetic_track(miles, step_m=300.0, seed=7):
+    """Meandering track starting in west Texas, heading roughly east."""
+    rng = np.random.default_rng(seed)
+    n = int(miles * route_cli.METERS_PER_MILE / step_m)
+    heading = 100.0 + np.cumsum(rng.normal(0, 2.0, n)).clip(-60, 60)
+    lon, lat = [-104.5], [31.0]
+    for az in heading:
+        x, y, _ = GEOD.fwd(lon[-1], lat[-1], az, step_m)
+        lon.append(x)
+        lat.append(y)
+    return LineString(zip(lon, lat))
+
+
+def geodesic_reference(lon, lat, route, step_m=25.0):
+    xs, ys = np.array(route.coords).T
+    rx, ry = [xs[0]], [ys[0]]
+    for x0, y0, x1, y1 in zip(xs[:-1], ys[:-1], xs[1:], ys[1:]):
+        n = int(GEOD.inv(x0, y0, x1, y1)[2] // step_m)
+        for x, y in GEOD.npts(x0, y0, x1, y1, n):
+            rx.append(x)
+            ry.append(y)
+        rx.append(x1)
+        ry.append(y1)
+    rx, ry = np.array(rx), np.array(ry)
+    out = np.empty(len(lon))
+    for i, (x, y) in enumerate(zip(lon, lat)):
+        out[i] = GEOD.inv(np.full_like(rx, x), np.full_like(ry, y), rx, ry)[2].min()
+    return out / route_cli.METERS_PER_MILE
+
+
+def legacy_mercator(lon, lat, route, radius):
+    proj = pyproj.Transformer.from_crs("EPSG:4326", "EPSG:3857", always_xy=True).transform
+    rp = shapely.transform(route, proj, interleaved=False)
+    return np.array(
+        [rp.distance(Point(*proj(x, y))) / route_cli.METERS_PER_MILE <= radius
+         for x, y in zip(lon, lat)]
+    )
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--rows", type=int, default=ATLAS_ROWS)
+    ap.add_argument("--miles", type=float, default=1000)
+    ap.add_argument("--radius", type=float, default=5)
+    ap.add_argument("--sample", type=int, default=150)
+    ap.add_argument("--legacy", action="store_true", help="also time the old loop")
+    args = ap.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = write_atlas(Path(tmp) / "atlas_db.csv", rows=args.rows)
+        atlas = read_atlas(csv_path, cache=False)
+    lat, lon = resolve_coords(atlas)
+    lon, lat = lon.to_numpy(float), lat.to_numpy(float)
+    zones = atlas["UTM Zone"]
+    route = synthetic_track(args.miles)
+    print(f"{len(lon):,} markers, {len(route.coords):,}-vertex track "
+          f"({args.miles:g} mi), radius {args.radius:g} mi\n")
+
+    results = {}
+    for mode in route_cli.DISTANCE_MODES:
+        start = time.perf_counter()
+        dist = route_cli.route_distance_miles(
+            lon, lat, route, args.radius, mode=mode, zones=zones
+        )
+        results[mode] = (time.perf_counter() - start, dist)
+
+    found = np.flatnonzero(
+        np.logical_or.reduce([np.isfinite(d) for _, d in results.values()])
+    )
+    rng = np.random.default_rng(0)
+    sample = rng.choice(found, size=min(args.sample, len(found)), replace=False)
+    ref = geodesic_reference(lon[sample], lat[sample], route)
+
+    print(f"{'mode':<10}{'time':>10}{'within':>9}{'mean err':>11}{'max err':>10}{'wrong':>7}")
+    for mode, (secs, dist) in results.items():
+        d = dist[sample]
+        finite = np.isfinite(d)
+        err = np.abs(d[finite] - ref[finite]) * route_cli.METERS_PER_MILE
+        wrong = int(((d <= args.radius) != (ref <= args.radius)).sum())
+        print(
+            f"{mode:<10}{secs * 1000:>8.0f}ms{int((dist <= args.radius).sum()):>9}"
+            f"{err.mean() if len(err) else 0:>9.1f} m{err.max() if len(err) else 0:>8.1f} m"
+            f"{wrong:>7}"
+        )
+    print(f"\nerrors vs ellipsoidal reference on {len(sample)} sampled markers; "
+          "'wrong' = inside/outside the radius disagrees with the reference")
+
+    if args.legacy:
+        start = time.perf_counter()
+        old = legacy_mercator(lon, lat, route, args.radius)
+        secs = time.perf_counter() - start
+        same = np.array_equal(old, results["mercator"][1] <= args.radius)
+        print(f"\nlegacy per-marker mercator loop: {secs * 1000:.0f} ms (same result: {same})")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,139 @@
+"""Load test: the SQLite browser's threaded and asyncio backends.
+
+    python benchmarks/bench_viewer_load.py [--rows 17500] [--seconds 3]
+        [--clients 1 10 50] [--backend threaded async] [--url http://...]
+
+Builds a synthetic statewide atlas into SQLite, serves it with each backend
+and, for every client count, runs that many client threads for
+``--seconds``. Each client keeps one ``http.client`` connection (reopened
+by the client whenever the threaded server closes it) and cycles through a
+county search, the options list, a full-text search and a bounding box.
+Clients send no ``If-None-Match``, so every request runs its query.
+
+Prints requests per second and p50/p99 latency per backend and client
+count. Clients and server share one process, so on a small machine the
+numbers are a floor. ``--url`` points the clients at a server that is
+already running instead.
+"""
+from __future__ import annotations
+
+import argparse
+import http.client
+import tempfile
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urlparse
+
+from thc_toolkit import sqlite_sync, sqlite_viewer
+from thc_toolkit.sqlite_viewer_async import serve_async_browser
+
+try:
+    from .synthetic import ATLAS_ROWS, COUNTIES, write_atlas
+except ImportError:  # run as a script
+    from synthetic import ATLAS_ROWS, COUNTIES, write_atlas  # type: ignore
+
+REQUESTS = [f"/api/search?county={county.replace(' ', '+')}" for county, _ in COUNTIES] + [
+    "/api/options",
+    "/api/fts?q=courthouse",
+    "/api/bbox?south=29&west=-99&north=31&east=-97&limit=500",
+]
+SERVERS = {
+    "threaded": sqlite_viewer.serve_sqlite_browser,
+    "async": serve_async_browser,
+}
+
+
+def run_clients(host, port, clients, seconds):
+    """``(requests, errors, latencies)`` from ``clients`` threads."""
+    deadline = time.perf_counter() + seconds
+    lock = threading.Lock()
+    latencies: list[float] = []
+    errors = [0]
+
+    def client(offset):
+        conn = http.client.HTTPConnection(host, port, timeout=30)
+        mine, failed, i = [], 0, offset
+        while time.perf_counter() < deadline:
+            path = REQUESTS[i % len(REQUESTS)]
+            i += 1
+            started = time.perf_counter()
+            try:
+                conn.request("GET", path)
+                response = conn.getresponse()
+                response.read()
+                if response.status != 200:
+                    failed += 1
+            except (OSError, http.client.HTTPException):
+                failed += 1
+                conn.close()
+                continue
+            mine.append(time.perf_counter() - started)
+        conn.close()
+        with lock:
+            latencies.extend(mine)
+            errors[0] += failed
+
+    threads = [threading.Thread(target=client, args=(n,)) for n in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return len(latencies), errors[0], sorted(latencies)
+
+
+def report(label, clients, seconds, done, errors, latencies):
+    def pct(q):
+        if not latencies:
+            return float("nan")
+        return latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000
+
+    print(
+        f"{label:<9} {clients:>7} {done / seconds:>10.1f} "
+        f"{pct(0.50):>9.1f} {pct(0.99):>9.1f} {errors:>7}"
+    )
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--rows", type=int, default=ATLAS_ROWS)
+    ap.add_argument("--seconds", type=float, default=3.0)
+    ap.add_argument("--clients", type=int, nargs="+", default=[1, 10, 50])
+    ap.add_argument("--backend", nargs="+", choices=sorted(SERVERS), default=list(SERVERS))
+    ap.add_argument("--workers", type=int, default=sqlite_viewer.POOL_MAX_IDLE)
+    ap.add_argument("--url", default=None, help="Load an already running server")
+    args = ap.parse_args(argv)
+
+    print(f"{'backend':<9} {'clients':>7} {'req/s':>10} {'p50 ms':>9} {'p99 ms':>9} {'errors':>7}")
+    if args.url:
+        target = urlparse(args.url)
+        for clients in args.clients:
+            done, errors, lat = run_clients(target.hostname, target.port, clients, args.seconds)
+            report("external", clients, args.seconds, done, errors, lat)
+        return 0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        csv_path = write_atlas(tmp / "atlas_db.csv", rows=args.rows)
+        sqlite_path = tmp / "atlas.sqlite"
+        sqlite_sync.build_sqlite_from_csv(csv_path, sqlite_path)
+
+        for backend in args.backend:
+            options = {"workers": args.workers} if backend == "async" else {}
+            server = SERVERS[backend](sqlite_path, port=0, open_browser=False, **options)
+            thread = threading.Thread(target=server.serve_forever, daemon=True)
+            thread.start()
+            try:
+                for clients in args.clients:
+                    done, errors, lat = run_clients(
+                        "127.0.0.1", server.server_port, clients, args.seconds
+                    )
+                    report(backend, clients, args.seconds, done, errors, lat)
+            finally:
+                server.shutdown()
+                server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,201 @@
+"""Seeded synthetic atlas_db.csv for the benchmarks.
+
+The real atlas is not shipped with the toolkit, so the benchmarks build a
+stand-in with the same header, roughly the same size (17.5k rows) and the
+same mix of blanks: about a third of markers have an hmdb page, some have
+only estimated coordinates, and ``Marker Text`` carries a long inscription.
+"""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+ATLAS_ROWS = 17_500
+
+COUNTIES = [
+    ("Travis", "Austin"),
+    ("Harris", "Houston"),
+    ("Bexar", "San Antonio"),
+    ("Dallas", "Dallas"),
+    ("El Paso", "El Paso"),
+    ("Williamson", "Round Rock"),
+    ("Brazos", "College Station"),
+    ("Lubbock", "Lubbock"),
+    ("Nueces", "Corpus Christi"),
+    ("Tarrant", "Fort Worth"),
+]
+
+ATLAS_HEADER = [
+    "ref:US-TX:thc", "ref:hmdb", "name", "OsmNodeID", "website",
+    "memorial:website", "start_date", "isActive", "isHMDB", "isMissing",
+    "isPending", "isOSM", "isPrivate", "addr:full", "addr:city", "addr:county",
+    "UTM Zone", "UTM Easting", "UTM Northing", "estimated:Latitude",
+    "estimated:Longitude", "verified:Latitude", "verified:Longitude",
+    "Recorded Texas Historic Landmark", "thc:designation", "Marker Notes",
+    "wikimedia_commons", "subject:wikimedia_commons", "subject:wikipedia",
+    "subject:wikidata", "Marker Text", "inscription_size", "DATA_NOTE",
+]
+
+
+def make_atlas(rows: int = ATLAS_ROWS, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    thc = np.arange(1, rows + 1) * 3 + 1000
+    has_hmdb = rng.random(rows) < 0.35
+    hmdb = pd.array(
+        np.where(has_hmdb, np.arange(rows) + 100_000, 0), dtype="Int32"
+    )
+    hmdb[~has_hmdb] = pd.NA
+    place = rng.integers(0, len(COUNTIES), rows)
+    counties = [COUNTIES[i][0] for i in place]
+    cities = [COUNTIES[i][1] for i in place]
+
+    lat = rng.uniform(26.0, 36.5, rows).round(6)
+    lon = rng.uniform(-106.5, -93.5, rows).round(6)
+    verified = rng.random(rows) < 0.6
+    est_lat = (lat + rng.normal(0, 0.002, rows)).round(6)
+    est_lon = (lon + rng.normal(0, 0.002, rows)).round(6)
+
+    def sometimes(p, values):
+        keep = rng.random(rows) < p
+        return [v if k else None for v, k in zip(values, keep)]
+
+    words = np.array("old first county church school road cemetery fort mill "
+                     "bridge house ranch town site home".split())
+    names = [
+        " ".join(words[rng.integers(0, len(words), 3)]).title() for _ in range(rows)
+    ]
+    text = [
+        " ".join(words[rng.integers(0, len(words), 120)]) for _ in range(rows)
+    ]
+
+    df = pd.DataFrame(
+        {
+            "ref:US-TX:thc": thc,
+            "ref:hmdb": hmdb,
+            "name": names,
+            "OsmNodeID": None,
+            "website": [f"https://atlas.thc.texas.gov/Details/5{t:09d}" for t in thc],
+            "memorial:website": None,
+            "start_date": pd.array(
+                sometimes(0.8, rng.integers(1936, 2024, rows).tolist()), dtype="Int32"
+            ),
+            "isActive": True,
+            "isHMDB": has_hmdb,
+            "isMissing": rng.random(rows) < 0.05,
+            "isPending": False,
+            "isOSM": rng.random(rows) < 0.5,
+            "isPrivate": rng.random(rows) < 0.1,
+            "addr:full": sometimes(0.7, [f"{n} Main St" for n in range(rows)]),
+            "addr:city": cities,
+            "addr:county": counties,
+            "UTM Zone": (np.floor((lon + 180.0) / 6.0) + 1).astype(int),
+            "UTM Easting": rng.integers(200_000, 800_000, rows),
+            "UTM Northing": rng.integers(2_900_000, 4_000_000, rows),
+            "estimated:Latitude": est_lat,
+            "estimated:Longitude": est_lon,
+            "verified:Latitude": np.where(verified, lat, np.nan),
+            "verified:Longitude": np.where(verified, lon, np.nan),
+            "Recorded Texas Historic Landmark": rng.random(rows) < 0.2,
+            "thc:designation": sometimes(0.2, ["RTHL"] * rows),
+            "Marker Notes": sometimes(0.1, ["see file"] * rows),
+            "wikimedia_commons": sometimes(0.05, ["Category:Marker"] * rows),
+            "subject:wikimedia_commons": None,
+            "subject:wikipedia": sometimes(0.03, ["en:Texas"] * rows),
+            "subject:wikidata": sometimes(0.03, ["Q1439"] * rows),
+            "Marker Text": text,
+            "inscription_size": None,
+            "DATA_NOTE": None,
+        },
+        columns=ATLAS_HEADER,
+    )
+    return df
+
+
+def write_atlas(path, rows: int = ATLAS_ROWS, seed: int = 0):
+    make_atlas(rows, seed).to_csv(path, index=False)
+    return path
+
+
+HMDB_ROWS = 22_000
+
+HMDB_HEADER = [
+    "MarkerID", "Marker No.", "Title", "Erected By", "Latitude (minus=S)",
+    "Longitude (minus=W)", "Street Address", "City or Town", "County or Parish",
+    "Missing", "Link",
+]
+
+# Sponsors as hmdb spells them: the THC under its several names (with the
+# odd typo), co-sponsors, and the groups the reconcile filter must reject.
+ERECTED_BY = [
+    "Texas Historical Commission",
+    "Texas Historical Commision",
+    "Texas Historical Comission",
+    "Texas State Historical Survey Committee",
+    "Texas State Historical Survey Commitee",
+    "State Historical Survey Committee",
+    "State of Texas",
+    "The State of Texas",
+    "Texas Historical Commission and {county} County Historical Commission",
+    "{county} County Historical Commission",
+    "{county} County Historical Society",
+    "State of Texas Highway Department",
+    "Daughters of the American Revolution",
+    "{city} Chapter, Daughters of the Republic of Texas",
+    "Sons of Confederate Veterans",
+    "Texas Centennial Commission",
+    "City of {city}",
+]
+
+
+def make_hmdb(atlas: pd.DataFrame, rows: int = HMDB_ROWS, seed: int = 0) -> pd.DataFrame:
+    """An hmdb.org Texas export that overlaps ``atlas``.
+
+    Most rows carry an atlas THC number and a title close to the atlas
+    name; ``Erected By`` repeats a few hundred distinct strings, as the
+    real export does.
+    """
+    rng = np.random.default_rng(seed)
+    pick = rng.integers(0, len(atlas), rows)
+    in_atlas = rng.random(rows) < 0.8
+    thc = atlas["ref:US-TX:thc"].to_numpy()[pick]
+    marker_no = [str(t) if k else "" for t, k in zip(thc, in_atlas)]
+
+    names = atlas["name"].to_numpy()[pick]
+    style = rng.random(rows)
+    titles = [
+        n if s < 0.6 else f"The {n}" if s < 0.8 else n[:-1]
+        for n, s in zip(names, style)
+    ]
+
+    place = rng.integers(0, len(COUNTIES), rows)
+    years = rng.choice([1936, 1965, 1968, 1976, 1983, 1985, 1994, 2004], rows)
+    template = rng.integers(0, len(ERECTED_BY), rows)
+    dated = rng.random(rows) < 0.3
+    erected = []
+    for t, p, y, d in zip(template, place, years, dated):
+        county, city = COUNTIES[p]
+        text = ERECTED_BY[t].format(county=county, city=city)
+        erected.append(f"{text}, {y}" if d else text)
+
+    ids = np.arange(rows) + 200_000
+    return pd.DataFrame(
+        {
+            "MarkerID": ids,
+            "Marker No.": marker_no,
+            "Title": titles,
+            "Erected By": erected,
+            "Latitude (minus=S)": rng.uniform(26.0, 36.5, rows).round(6),
+            "Longitude (minus=W)": rng.uniform(-106.5, -93.5, rows).round(6),
+            "Street Address": [f"{n} Main St" for n in range(rows)],
+            "City or Town": [COUNTIES[p][1] for p in place],
+            "County or Parish": [f"{COUNTIES[p][0]} County" for p in place],
+            "Missing": "",
+            "Link": [f"https://www.hmdb.org/m.asp?m={i}" for i in ids],
+        },
+        columns=HMDB_HEADER,
+    )
+
+
+def write_hmdb(path, atlas: pd.DataFrame, rows: int = HMDB_ROWS, seed: int = 0):
+    make_hmdb(atlas, rows, seed).to_csv(path, index=False)
+    return path
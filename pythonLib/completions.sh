@@ -17,7 +17,7 @@ _thc_complete() {
             return
             ;;
         route)
-            opts="--track --data --radius --unmapped --csv --simple --geojson --kml --openmap"
+            opts="--track --data --radius --distance-mode --unmapped --csv --simple --geojson --kml --openmap"
             COMPREPLY=( $(compgen -W "${opts}" -- "$cur") )
             return
             ;;
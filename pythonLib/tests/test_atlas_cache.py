@@ -0,0 +1,86 @@
+import os
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from thc_toolkit import atlas_cache, atlas_frame
+from thc_toolkit.atlas_frame import AtlasFrame
+from thc_toolkit.utils import read_atlas
+
+KEY = AtlasFrame().cache_key()
+
+
+@pytest.fixture
+def atlas_csv(sample_atlas_df, tmp_path):
+    path = tmp_path / "atlas_db.csv"
+    sample_atlas_df.assign(**{"Marker Text": ["a", "b", "c"]}).to_csv(
+        path, index=False
+    )
+    return path
+
+
+def test_first_read_writes_sidecar_and_second_read_uses_it(atlas_csv, monkeypatch):
+    parsed = read_atlas(atlas_csv)
+    assert atlas_cache.sidecar_path(atlas_csv, KEY).exists()
+
+    real_read_csv = pd.read_csv
+
+    def header_only(*args, **kwargs):
+        # The header probe (nrows=0) is allowed; parsing rows is not.
+        assert kwargs.get("nrows") == 0, "cache hit should not parse the CSV"
+        return real_read_csv(*args, **kwargs)
+
+    monkeypatch.setattr(atlas_frame.pd, "read_csv", header_only)
+    cached = read_atlas(atlas_csv)
+    pd.testing.assert_frame_equal(parsed, cached)
+    assert cached["ref:US-TX:thc"].dtype.name == "Int32"
+    assert cached["isOSM"].dtype.name == "boolean"
+
+
+def test_column_projection_on_miss_and_hit(atlas_csv):
+    cols = ["ref:US-TX:thc", "name", "not-a-column"]
+    miss = read_atlas(atlas_csv, columns=cols)
+    hit = read_atlas(atlas_csv, columns=cols)
+    assert list(miss.columns) == ["ref:US-TX:thc", "name"]
+    pd.testing.assert_frame_equal(miss, hit)
+
+
+def test_edited_csv_invalidates_sidecar(atlas_csv):
+    read_atlas(atlas_csv)
+    text = atlas_csv.read_text().replace("Marker A", "Marker Z")
+    atlas_csv.write_text(text)
+    assert not atlas_cache.is_fresh(atlas_csv, KEY)
+    assert read_atlas(atlas_csv)["name"].iloc[0] == "Marker Z"
+
+
+def test_touched_but_identical_csv_keeps_sidecar(atlas_csv):
+    read_atlas(atlas_csv)
+    st = os.stat(atlas_csv)
+    os.utime(atlas_csv, ns=(st.st_atime_ns, st.st_mtime_ns + 5_000_000_000))
+    assert atlas_cache.is_fresh(atlas_csv, KEY)
+
+
+def test_same_size_edit_is_caught_by_hash(atlas_csv):
+    read_atlas(atlas_csv)
+    text = atlas_csv.read_text()
+    atlas_csv.write_text(text.replace("Marker B", "Marker Q"))
+    st = os.stat(atlas_csv)
+    os.utime(atlas_csv, ns=(st.st_atime_ns, st.st_mtime_ns + 5_000_000_000))
+    assert not atlas_cache.is_fresh(atlas_csv, KEY)
+
+
+def test_cache_disabled_leaves_no_sidecar(atlas_csv):
+    read_atlas(atlas_csv, cache=False)
+    assert not atlas_cache.sidecar_path(atlas_csv, KEY).exists()
+
+
+def test_unwritable_sidecar_falls_back_to_parsing(atlas_csv, monkeypatch):
+    def fail(*args, **kwargs):
+        raise OSError("read-only")
+
+    monkeypatch.setattr(atlas_cache.pq, "write_table", fail)
+    df = read_atlas(atlas_csv)
+    assert len(df) == 3
+    assert not atlas_cache.sidecar_path(atlas_csv, KEY).exists()
@@ -0,0 +1,86 @@
+import pandas as pd
+import pytest
+
+from thc_toolkit import atlas_frame
+from thc_toolkit.atlas_frame import Where, read_atlas_frame, read_atlas_raw
+
+IN_TRAVIS = Where(("addr:county",), lambda df: df["addr:county"].eq("Travis"))
+
+
+@pytest.fixture
+def atlas_csv(sample_atlas_df, tmp_path):
+    path = tmp_path / "atlas_db.csv"
+    sample_atlas_df.assign(**{"Marker Text": ["a", "b", "c"]}).to_csv(
+        path, index=False
+    )
+    return path
+
+
+@pytest.fixture(params=[False, True], ids=["parse", "cache"])
+def cache(request):
+    if request.param:
+        pytest.importorskip("pyarrow")
+    return request.param
+
+
+def test_schema_columns_are_typed(atlas_csv, cache):
+    df = read_atlas_frame(atlas_csv, cache=cache)
+    assert df["ref:US-TX:thc"].dtype.name == "Int32"
+    assert df["OsmNodeID"].dtype.name == "Int64"
+    assert df["isOSM"].dtype.name == "boolean"
+    assert df["verified:Latitude"].dtype.kind == "f"
+
+
+def test_projection_keeps_requested_order(atlas_csv, cache):
+    df = read_atlas_frame(atlas_csv, columns=["name", "ref:hmdb"], cache=cache)
+    assert list(df.columns) == ["name", "ref:hmdb"]
+
+
+def test_where_filters_rows_and_resets_index(atlas_csv, cache):
+    df = read_atlas_frame(
+        atlas_csv, columns=["ref:US-TX:thc", "name"], where=IN_TRAVIS, cache=cache
+    )
+    assert df["ref:US-TX:thc"].tolist() == [1001, 1002]
+    assert df.index.tolist() == [0, 1]
+
+
+def test_where_skips_other_rows_during_parse(atlas_csv, monkeypatch):
+    calls = []
+    real_read_csv = pd.read_csv
+
+    def spy(*args, **kwargs):
+        df = real_read_csv(*args, **kwargs)
+        calls.append((kwargs.get("usecols"), len(df)))
+        return df
+
+    monkeypatch.setattr(atlas_frame.pd, "read_csv", spy)
+    read_atlas_frame(atlas_csv, where=IN_TRAVIS, cache=False)
+    # header probe, predicate columns over every row, full parse of two rows
+    assert calls[-2] == (["addr:county"], 3)
+    assert calls[-1] == (None, 2)
+
+
+def test_raw_mode_keeps_literal_strings(atlas_csv, cache):
+    df = read_atlas_raw(atlas_csv, columns=["ref:hmdb", "isOSM"], cache=cache)
+    assert df["ref:hmdb"].tolist() == ["5001", "5002", ""]
+    assert df["isOSM"].tolist() == ["True", "False", "False"]
+
+
+def test_yes_no_flags_are_coerced(tmp_path, cache):
+    path = tmp_path / "atlas.csv"
+    path.write_text("ref:US-TX:thc,isMissing\n1.0,yes\n2,no\n3,\n", encoding="utf-8")
+    df = read_atlas_frame(path, cache=cache)
+    assert df["ref:US-TX:thc"].tolist() == [1, 2, 3]
+    assert df["isMissing"].tolist() == [True, False, pd.NA]
+
+
+def test_missing_required_column_raises_before_parsing(atlas_csv):
+    with pytest.raises(ValueError, match=r"route input missing required column\(s\): UTM Zone"):
+        read_atlas_frame(atlas_csv, require=["UTM Zone"], context="route input")
+
+
+def test_bad_value_names_context(tmp_path):
+    path = tmp_path / "atlas.csv"
+    path.write_text("ref:US-TX:thc,isPrivate\n1,maybe\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="my input has invalid boolean values in isPrivate"):
+        read_atlas_frame(path, context="my input", cache=False)
@@ -1,6 +1,8 @@
 import argparse
 import sys
 
+import pytest
+
 from thc_toolkit import cli
 from thc_toolkit import sqlite_sync
 
@@ -48,12 +50,14 @@ def test_main_dispatches_sqlite_build_subcommand(monkeypatch):
         sqlite_path,
         table_name=sqlite_sync.DEFAULT_TABLE_NAME,
         strict_ids=False,
+        incremental=False,
     ):
         called["build"] = True
         assert csv_path == "source.csv"
         assert sqlite_path == "target.sqlite"
         assert table_name == sqlite_sync.DEFAULT_TABLE_NAME
         assert strict_ids is False
+        assert incremental is False
 
     monkeypatch.setattr(sqlite_sync, "build_sqlite_from_csv", fake_build)
     monkeypatch.setattr(
@@ -95,3 +99,89 @@ def test_main_dispatches_sqlite_browse_subcommand(monkeypatch):
     cli.main()
 
     assert called["browse"] is True
+
+
+def test_main_dispatches_sqlite_browse_async(monkeypatch):
+    from thc_toolkit import sqlite_viewer_async
+
+    called = {}
+
+    class FakeServer:
+        def serve_forever(self):
+            called["served"] = True
+
+        def server_close(self):
+            return None
+
+    def fake_serve(sqlite_path, workers, table_name, host, port, open_browser):
+        called.update(sqlite_path=sqlite_path, workers=workers)
+        return FakeServer()
+
+    monkeypatch.setattr(sqlite_viewer_async, "serve_async_browser", fake_serve)
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        [
+            "thc", "sqlite", "browse", "--sqlite", "b.sqlite",
+            "--no-open", "--async", "--workers", "3",
+        ],
+    )
+
+    cli.main()
+
+    assert called == {"sqlite_path": "b.sqlite", "workers": 3, "served": True}
+
+
+def test_main_dispatches_search_subcommand(monkeypatch, capsys, tmp_path):
+    sqlite_path = tmp_path / "atlas.sqlite"
+    sqlite_path.touch()
+    seen = {}
+
+    def fake_search(path, query, table_name, limit, offset, raw, highlight):
+        seen.update(path=path, query=query, limit=limit, offset=offset, raw=raw)
+        return {
+            "query": query,
+            "match": query,
+            "total": 7,
+            "rows": [
+                {
+                    "ref:US-TX:thc": 1001,
+                    "name": "Old Stone Fort",
+                    "addr:city": "Nacogdoches",
+                    "addr:county": "Nacogdoches",
+                    "snippet": f"built of {highlight[0]}stone{highlight[1]}",
+                }
+            ],
+        }
+
+    monkeypatch.setattr(cli.sqlite_sync, "search_text", fake_search)
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        ["thc", "search", "stone", "--sqlite", str(sqlite_path), "--limit", "5", "--page", "2"],
+    )
+
+    cli.main()
+
+    assert seen == {
+        "path": str(sqlite_path.resolve()),
+        "query": "stone",
+        "limit": 5,
+        "offset": 5,
+        "raw": False,
+    }
+    out = capsys.readouterr().out
+    assert "Old Stone Fort" in out and "built of stone" in out
+    assert "6-6 of 7 match(es)" in out
+
+
+@pytest.mark.parametrize("page", ["0", "-2"])
+def test_search_rejects_pages_below_one(monkeypatch, capsys, page):
+    monkeypatch.setattr(cli.sqlite_sync, "search_text", lambda *a, **k: pytest.fail("searched"))
+    monkeypatch.setattr(sys, "argv", ["thc", "search", "stone", "--page", page])
+
+    with pytest.raises(SystemExit) as exc:
+        cli.main()
+
+    assert exc.value.code == 2
+    assert "must be 1 or more" in capsys.readouterr().err
@@ -0,0 +1,205 @@
+import csv
+import json
+
+import pytest
+
+from thc_toolkit import hmdb_fetch
+
+HEADER = ["MarkerID", "Marker No.", "Title", "Erected By"]
+
+
+def _export(rows):
+    lines = [",".join(HEADER)] + [",".join(row) for row in rows]
+    return ("\ufeff" + "\r\n".join(lines) + "\r\n").encode("utf-8")
+
+
+class FakeResponse:
+    """Enough of ``requests.Response`` for the fetcher; no ``.content``."""
+
+    def __init__(self, text="", body=b"", headers=None):
+        self.text = text
+        self._body = body
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size):
+        for i in range(0, len(self._body), 7):  # small chunks on purpose
+            yield self._body[i : i + 7]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class FakeSession:
+    def __init__(self):
+        self.ids, self.body, self.posts = [], b"", 0
+
+    def get(self, url, timeout=None):
+        return FakeResponse(
+            text=(
+                f"<input type='hidden' name='markers' value='{','.join(self.ids)}'>"
+                f"<input type='hidden' name='markercount' value='{len(self.ids)}'>"
+            )
+        )
+
+    def post(self, url, data=None, timeout=None, stream=False):
+        assert stream
+        self.posts += 1
+        return FakeResponse(
+            body=self.body,
+            headers={"Content-Disposition": 'attachment; filename="HMdb-Entries.csv"'},
+        )
+
+
+def test_fetch_streams_skips_unchanged_ids_and_writes_a_delta(tmp_path):
+    session = FakeSession()
+    session.ids = ["101", "102", "103"]
+    session.body = _export(
+        [("101", "1001", "Old Mill", "THC"), ("102", "1002", "Fort", "THC"),
+         ("103", "1003", "Bridge", "THC")]
+    )
+
+    first = hmdb_fetch.fetch_listing(session, out_dir=tmp_path)
+    assert first["path"].read_bytes() == session.body
+    assert first["diff"] is None
+    assert not list(tmp_path.glob(".*.part"))
+
+    again = hmdb_fetch.fetch_listing(session, out_dir=tmp_path)
+    assert again["skipped"] and again["path"] == first["path"]
+    assert session.posts == 1
+
+    session.ids = ["101", "103", "104"]
+    session.body = _export(
+        [("101", "1001", "Old Mill", "THC"), ("103", "1003", "Bridge Site", "THC"),
+         ("104", "1004", "Depot", "THC")]
+    )
+    result = hmdb_fetch.fetch_listing(session, out_dir=tmp_path)
+    assert session.posts == 2
+    assert result["diff"] == {"added": ["104"], "removed": ["102"], "changed": ["103"]}
+
+    with result["delta_csv"].open(newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert [(r["MarkerID"], r["Title"]) for r in rows] == [
+        ("103", "Bridge Site"), ("104", "Depot")
+    ]
+    summary = json.loads(result["delta_json"].read_text())
+    assert summary["counts"] == {"added": 1, "removed": 1, "changed": 1}
+    assert summary["previous"] == summary["current"] == "HMdb-Entries.csv"
+    assert summary["previous_sha256"] != summary["current_sha256"]
+
+
+def test_fetch_force_downloads_and_finds_edits_behind_the_same_ids(tmp_path):
+    session = FakeSession()
+    session.ids = ["101"]
+    session.body = _export([("101", "1001", "Old Mill", "THC")])
+    hmdb_fetch.fetch_listing(session, out_dir=tmp_path)
+
+    session.body = _export([("101", "1001", "The Old Mill", "THC")])
+    assert hmdb_fetch.fetch_listing(session, out_dir=tmp_path)["skipped"]
+    result = hmdb_fetch.fetch_listing(session, out_dir=tmp_path, force=True)
+    assert result["diff"]["changed"] == ["101"]
+
+
+def test_fetch_downloads_when_the_previous_csv_is_gone(tmp_path):
+    session = FakeSession()
+    session.ids = ["101"]
+    session.body = _export([("101", "1001", "Old Mill", "THC")])
+    first = hmdb_fetch.fetch_listing(session, out_dir=tmp_path)
+    first["path"].unlink()
+
+    result = hmdb_fetch.fetch_listing(session, out_dir=tmp_path)
+    assert not result["skipped"] and result["path"].exists()
+    assert result["diff"] is None
+
+
+THC = "Texas Historical Commission"
+
+
+def _atlas(tmp_path):
+    atlas = tmp_path / "atlas_db.csv"
+    atlas.write_text(
+        "ref:US-TX:thc,ref:hmdb,name,addr:city,addr:county\n"
+        "1001,,Old Mill,,\n1002,,Fort,,\n1003,,Bridge,,\n",
+        encoding="utf-8",
+    )
+    return atlas
+
+
+def test_fetch_delta_reconciles_into_the_stored_state(tmp_path):
+    from thc_toolkit import hmdb_sync
+
+    atlas = _atlas(tmp_path)
+    thc = THC
+    session = FakeSession()
+    session.ids = ["101", "102", "103"]
+    session.body = _export(
+        [("101", "1001", "Old Mil", thc), ("102", "1002", "Fortt", thc),
+         ("103", "1003", "Bridgee", thc)]
+    )
+    out = tmp_path / "review"
+    first = hmdb_fetch.fetch_listing(session, out_dir=tmp_path / "data")
+    assert hmdb_sync.reconcile(first["path"], atlas, out)["candidates"] == 3
+
+    session.ids = ["101", "103", "104"]
+    session.body = _export(
+        [("101", "1001", "Old Mil", thc), ("103", "1003", "Bridge Site", thc),
+         ("104", "1004", "Depot", thc)]
+    )
+    fetched = hmdb_fetch.fetch_listing(session, out_dir=tmp_path / "data")
+    stats = hmdb_sync.reconcile(fetched["delta_csv"], atlas, out, delta=True)
+
+    assert (stats["hmdb_total"], stats["removed"], stats["reclassified"]) == (3, 1, 1)
+    assert (stats["candidates"], stats["name_mismatches"]) == (1, 1)
+    state = json.loads((out / "reconcile_state.json").read_text())
+    assert sorted(state["rows"]) == ["101", "103", "104"]
+
+    # Same review files as reconciling the full export from scratch.
+    full_out = tmp_path / "full"
+    hmdb_sync.reconcile(fetched["path"], atlas, full_out)
+    for name in hmdb_sync.REVIEW_FILES.values():
+        assert (out / name).read_text() == (full_out / name).read_text()
+
+    with pytest.raises(SystemExit, match="reconcile the full export first"):
+        hmdb_sync.reconcile(fetched["delta_csv"], atlas, tmp_path / "fresh", delta=True)
+
+
+def test_delta_reconcile_refuses_a_delta_it_cannot_place(tmp_path):
+    from thc_toolkit import hmdb_sync
+
+    atlas = _atlas(tmp_path)
+    out = tmp_path / "review"
+    session = FakeSession()
+
+    def fetch(*rows):
+        session.ids = [row[0] for row in rows]
+        session.body = _export([(*row, THC) for row in rows])
+        return hmdb_fetch.fetch_listing(session, out_dir=tmp_path / "data")
+
+    first = fetch(("101", "1001", "Old Mil"), ("102", "1002", "Fortt"))
+    hmdb_sync.reconcile(first["path"], atlas, out)
+
+    # Two fetches with no reconcile between them: the second delta is taken
+    # against an export the state never saw, so 103's arrival would be lost.
+    fetch(("101", "1001", "Old Mil"), ("102", "1002", "Fortt"), ("103", "1003", "Bridgee"))
+    third = fetch(("101", "1001", "Old Mil"), ("103", "1003", "Bridgee"))
+    with pytest.raises(SystemExit, match="was taken against"):
+        hmdb_sync.reconcile(third["delta_csv"], atlas, out, delta=True)
+
+    # Once the state has caught up, the same delta would be replayed.
+    hmdb_sync.reconcile(third["path"], atlas, out)
+    with pytest.raises(SystemExit, match="was taken against"):
+        hmdb_sync.reconcile(third["delta_csv"], atlas, out, delta=True)
+
+    fourth = fetch(
+        ("101", "1001", "Old Mil"), ("103", "1003", "Bridgee"), ("104", "1004", "Depot")
+    )
+    fourth["delta_json"].unlink()
+    with pytest.raises(SystemExit, match="needs the summary"):
+        hmdb_sync.reconcile(fourth["delta_csv"], atlas, out, delta=True)
+    state = json.loads((out / "reconcile_state.json").read_text())
+    assert sorted(state["rows"]) == ["101", "103"]
@@ -0,0 +1,253 @@
+import csv
+import json
+
+import pytest
+
+from thc_toolkit import hmdb_sync
+
+
+@pytest.mark.parametrize(
+    "erected_by, expected",
+    [
+        ("Texas Historical Commission", True),
+        ("Texas Historical Commission, 1983", True),
+        ("Texas Historical Commision", True),
+        ("Erected by the Texs Historcal Commission and friends", True),
+        ("Texas State Historical Survey Commitee", True),
+        ("<i>State of Texas</i>", True),
+        ("State of Texas Highway Department", False),
+        ("Daughters of the American Revolution, State of Texas", False),
+        ("Travis County Historical Society", False),
+        ("Texas Centennial Commission", False),
+        ("", False),
+    ],
+)
+def test_erected_by_matcher_verdicts(erected_by, expected):
+    assert hmdb_sync.ErectedByMatcher()(erected_by) is expected
+    assert hmdb_sync.is_thc_erected_by(erected_by) is expected
+
+
+def test_erected_by_matcher_memoizes_and_prefilters(monkeypatch):
+    calls = []
+    real = hmdb_sync.SequenceMatcher
+
+    def counting(*args):
+        calls.append(args[1:])
+        return real(*args)
+
+    monkeypatch.setattr(hmdb_sync, "SequenceMatcher", counting)
+    matcher = hmdb_sync.ErectedByMatcher()
+
+    assert matcher("Texas Historical Commision") is True
+    first = len(calls)
+    assert matcher("Texas Historical Commision") is True
+    assert matcher("TEXAS  historical commision.") is True
+    assert len(calls) == first
+
+    # Exact phrases and strings nowhere near any phrase never reach difflib.
+    calls.clear()
+    assert matcher("Texas Historical Commission") is True
+    assert matcher("City of Austin") is False
+    assert calls == []
+
+
+ATLAS_HEADER = [
+    "ref:US-TX:thc", "ref:hmdb", "name", "memorial:website", "isHMDB",
+    "isMissing", "isPending", "addr:full", "addr:city", "verified:Latitude",
+    "verified:Longitude", "Marker Notes", "Marker Text",
+]
+
+
+def _atlas(tmp_path, rows):
+    path = tmp_path / "atlas_db.csv"
+    with path.open("w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(ATLAS_HEADER)
+        for thc, ref_hmdb, name in rows:
+            cells = dict.fromkeys(ATLAS_HEADER, "")
+            cells.update({"ref:US-TX:thc": thc, "ref:hmdb": ref_hmdb, "name": name})
+            cells["Marker Text"] = f'"{name}",\nerected 1936'
+            writer.writerow(cells.values())
+    return path
+
+
+def _hmdb_row(marker_id, city="Austin"):
+    return {
+        "MarkerID": marker_id,
+        "Link": f"https://www.hmdb.org/m.asp?m={marker_id}",
+        "Street Address": "1 Main St",
+        "City or Town": city,
+        "Latitude (minus=S)": "30.1",
+        "Longitude (minus=W)": "-97.1",
+        "Missing": "",
+    }
+
+
+def test_write_atlas_enrichment_streams_and_backs_up_only_changed_rows(tmp_path):
+    atlas = _atlas(
+        tmp_path,
+        [("1001", "", "Old Mill"), ("1002", "", "Twin A"), ("1002", "", "Twin B"),
+         ("1003", "", "Fort")],
+    )
+    original = atlas.read_bytes()
+
+    result = hmdb_sync._write_atlas_enrichment(
+        atlas,
+        [("1002", _hmdb_row("501")), ("1002", _hmdb_row("502")), ("9999", _hmdb_row("7"))],
+        make_backup=True,
+    )
+
+    with atlas.open(newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert [r["ref:hmdb"] for r in rows] == ["", "501", "502", ""]
+    assert rows[1]["Marker Text"] == '"Twin A",\nerected 1936'
+    assert result["updated_ids"] == ["1002", "1002"]
+    assert result["not_in_atlas"] == ["9999"]
+    assert not list(tmp_path.glob(".*.tmp"))
+
+    backup = json.loads(result["backup_path"].read_text())
+    assert result["backup_path"].name.startswith("atlas_db.csv.bak.")
+    assert [(e["row"], e["ref:US-TX:thc"]) for e in backup["rows"]] == [
+        (1, "1002"), (2, "1002")
+    ]
+    assert backup["rows"][0]["values"]["ref:hmdb"] == ""
+    assert "Marker Text" not in backup["rows"][0]["values"]
+
+    restored = hmdb_sync.restore_backup(atlas, result["backup_path"])
+    assert restored["restored"] == 2
+    assert atlas.read_bytes() == original
+
+
+def test_write_atlas_enrichment_leaves_other_rows_bytes_alone(tmp_path):
+    atlas = tmp_path / "atlas_db.csv"
+    header = ",".join(ATLAS_HEADER) + "\r\n"
+    untouched = '"1001",,"Old Mill",,,,,,,,,,"line one\r\nline two"\r\n'
+    atlas.write_bytes((header + untouched + "1002,,Fort,,,,,,,,,,\r\n").encode())
+
+    hmdb_sync._write_atlas_enrichment(atlas, [("1002", _hmdb_row("501"))], make_backup=False)
+
+    text = atlas.read_bytes().decode()
+    assert text.startswith(header + untouched)
+    assert text.endswith("\r\n") and "501" in text.splitlines()[-1]
+
+
+def test_write_atlas_enrichment_skips_a_write_that_changes_nothing(tmp_path):
+    atlas = _atlas(tmp_path, [("1001", "", "Old Mill")])
+    first = hmdb_sync._write_atlas_enrichment(
+        atlas, [("1001", _hmdb_row("501"))], make_backup=True
+    )
+    stamp = atlas.stat().st_mtime_ns
+
+    again = hmdb_sync._write_atlas_enrichment(
+        atlas, [("1001", _hmdb_row("501"))], make_backup=True
+    )
+
+    assert first["backup_path"] is not None
+    assert again["backup_path"] is None
+    assert again["updated_ids"] == ["1001"]
+    assert atlas.stat().st_mtime_ns == stamp
+
+
+def test_restore_backup_refuses_a_changed_atlas(tmp_path):
+    atlas = _atlas(tmp_path, [("1001", "", "Old Mill"), ("1002", "", "Fort")])
+    result = hmdb_sync._write_atlas_enrichment(
+        atlas, [("1002", _hmdb_row("501"))], make_backup=True
+    )
+    with atlas.open("a", encoding="utf-8") as f:
+        f.write("1003,,New,,,,,,,,,,\n")
+
+    with pytest.raises(SystemExit, match="has changed"):
+        hmdb_sync.restore_backup(atlas, result["backup_path"])
+
+    hmdb_sync.restore_backup(atlas, result["backup_path"], force=True)
+    assert "501" not in atlas.read_text()
+
+    reordered = _atlas(tmp_path, [("1002", "501", "Fort"), ("1001", "", "Old Mill")])
+    with pytest.raises(SystemExit, match="not restoring"):
+        hmdb_sync.restore_backup(reordered, result["backup_path"], force=True)
+
+
+def _hmdb_csv(tmp_path, rows, name="hmdb.csv"):
+    path = tmp_path / name
+    with path.open("w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(
+            f, fieldnames=["Marker No.", "Title", "Erected By", *_hmdb_row("0")],
+            lineterminator="\n",
+        )
+        writer.writeheader()
+        for marker_id, thc, title in rows:
+            writer.writerow(
+                {"Marker No.": thc, "Title": title,
+                 "Erected By": "Texas Historical Commission", **_hmdb_row(marker_id)}
+            )
+    return path
+
+
+def _reviews(out_dir):
+    return {p.name: p.read_text() for p in sorted(out_dir.glob("*.csv"))}
+
+
+def test_reconcile_reclassifies_only_changed_rows(tmp_path, monkeypatch):
+    atlas = _atlas(
+        tmp_path,
+        [("1001", "", "Old Mill"), ("1002", "5002", "Fort"), ("1003", "", "Bridge")],
+    )
+    week1 = [("5001", "1001", "Old Mil"), ("5002", "1002", "Fort"),
+             ("5003", "1003", "Ferry Landing")]
+    out = tmp_path / "out"
+
+    first = hmdb_sync.reconcile(_hmdb_csv(tmp_path, week1), atlas, out, make_backup=False)
+    assert (first["reclassified"], first["delta"]) == (3, 2)
+    assert (out / "reconcile_state.json").exists()
+
+    calls = []
+    real = hmdb_sync.is_thc_erected_by
+    monkeypatch.setattr(
+        hmdb_sync, "is_thc_erected_by", lambda s: calls.append(s) or real(s)
+    )
+    again = hmdb_sync.reconcile(_hmdb_csv(tmp_path, week1), atlas, out, make_backup=False)
+    assert (again["reclassified"], again["delta"], calls) == (0, 0, [])
+    assert again["candidates"] == first["candidates"] == 1
+
+    week2 = week1[:2] + [("5003", "1003", "Bridgee"), ("5004", "1004", "Gone")]
+    hmdb = _hmdb_csv(tmp_path, week2)
+    stats = hmdb_sync.reconcile(hmdb, atlas, out, make_backup=False)
+    assert (stats["reclassified"], stats["delta"], stats["name_mismatches"]) == (1, 1, 0)
+    assert len(calls) == 2  # only the edited and the new row
+
+    with (out / "delta" / "review_candidates.csv").open(newline="") as f:
+        assert [r["hmdb_MarkerID"] for r in csv.DictReader(f)] == ["5003"]
+    with (out / "review_candidates.csv").open(newline="") as f:
+        assert [r["hmdb_MarkerID"] for r in csv.DictReader(f)] == ["5001", "5003"]
+
+    full_out = tmp_path / "full"
+    full = hmdb_sync.reconcile(hmdb, atlas, full_out, make_backup=False, full=True)
+    assert full["reclassified"] == 3
+    assert _reviews(full_out) == _reviews(out)
+
+    # A full rerun over the same state reclassifies everything, yet only
+    # reports what actually differs from the last run.
+    rerun = hmdb_sync.reconcile(hmdb, atlas, out, make_backup=False, full=True)
+    assert (rerun["reclassified"], rerun["delta"]) == (3, 0)
+    assert _reviews(out) == _reviews(full_out)
+
+
+def test_reconcile_state_follows_atlas_and_rule_changes(tmp_path, monkeypatch):
+    atlas = _atlas(tmp_path, [("1001", "", "Old Mill"), ("1003", "", "Bridge")])
+    hmdb = _hmdb_csv(tmp_path, [("5001", "1001", "Old Mil"), ("5003", "1003", "Bridgee")])
+    out = tmp_path / "out"
+    hmdb_sync.reconcile(hmdb, atlas, out, make_backup=False)
+
+    # An atlas edit under one THC# reopens just that group.
+    text = atlas.read_text(encoding="utf-8")
+    atlas.write_text(text.replace("1003,,Bridge,", "1003,,Bridge Site,", 1), encoding="utf-8")
+    stats = hmdb_sync.reconcile(hmdb, atlas, out, make_backup=False)
+    assert (stats["reclassified"], stats["name_mismatches"]) == (1, 1)
+
+    # A state written under other thresholds is not trusted at all.
+    monkeypatch.setattr(hmdb_sync, "NAME_FUZZ_THRESHOLD", 0.5)
+    stats = hmdb_sync.reconcile(hmdb, atlas, out, make_backup=False)
+    assert (stats["reclassified"], stats["candidates"]) == (2, 2)
+
+    (out / "reconcile_state.json").write_text("{not json", encoding="utf-8")
+    assert hmdb_sync.reconcile(hmdb, atlas, out, make_backup=False)["reclassified"] == 2
@@ -0,0 +1,68 @@
+from difflib import SequenceMatcher
+
+from thc_toolkit import hmdb_sync, osm_dedup
+from thc_toolkit.name_scoring import NameScorer
+
+LONG = "old county courthouse square " * 9  # over difflib's autojunk length
+
+PAIRS = [
+    ("Old Fort Mill", "Old Fort Mil"),
+    ("The Old Fort Mill", "Old Fort Mill"),
+    ("Bexár County Courthouse", "Bexar County Court House"),
+    ("First Church", "First Baptist Church"),
+    ("First Baptist Church", "First Church"),
+    ("Cemetery Road Bridge", "Old Fort Mill"),
+    (LONG, LONG.replace("square", "squares")),
+    (LONG, LONG),
+    ("", "Old Fort Mill"),
+    (None, "Old Fort Mill"),
+    ("Old Fort Mill", "Old Fort Mil"),
+]
+
+
+def _reference(normalize, a, b, equal_is_one):
+    na, nb = normalize(a), normalize(b)
+    if not na or not nb:
+        return 0.0
+    if equal_is_one and na == nb:
+        return 1.0
+    return SequenceMatcher(None, na, nb).ratio()
+
+
+def test_batched_scores_are_bit_identical_to_sequence_matcher():
+    osm_scorer = NameScorer(osm_dedup.normalize_name, workers=1)
+    assert osm_scorer.score_pairs(PAIRS) == [
+        _reference(osm_dedup.normalize_name, a, b, False) for a, b in PAIRS
+    ]
+
+    hmdb_pairs = [(a or "", b) for a, b in PAIRS]
+    hmdb_scorer = NameScorer(hmdb_sync.normalize_name, equal_is_one=True, workers=1)
+    assert hmdb_scorer.score_pairs(hmdb_pairs) == [
+        _reference(hmdb_sync.normalize_name, a, b, True) for a, b in hmdb_pairs
+    ]
+    assert hmdb_scorer.score("The Old Fort Mill", "old fort mill") == 1.0
+
+
+def test_process_pool_scores_match_serial_scores():
+    pairs = PAIRS * 3 + [(f"Marker {i} Road", f"Marker {i} Rd") for i in range(40)]
+    serial = NameScorer(osm_dedup.normalize_name, workers=1).score_pairs(pairs)
+    pooled = NameScorer(
+        osm_dedup.normalize_name, workers=2, parallel_min=1
+    ).score_pairs(pairs)
+
+    assert pooled == serial
+
+
+def test_names_are_normalized_once_and_pairs_scored_once():
+    seen = []
+
+    def normalize(value):
+        seen.append(value)
+        return osm_dedup.normalize_name(value)
+
+    scorer = NameScorer(normalize, workers=1)
+    first = scorer.score_pairs([("Old Mill", "Old Mil"), ("Old Mill", "Old Mil")])
+    again = scorer.score("Old Mill", "Old Mil")
+
+    assert sorted(seen) == ["Old Mil", "Old Mill"]
+    assert first == [again, again]
@@ -238,7 +238,11 @@ class TestApplyDedupCheckIntegration:
                 }
             return None
 
-        with patch.object(osm_dedup, "find_duplicate", side_effect=fake_find_duplicate):
+        with patch.object(
+            osm_dedup,
+            "fetch_memorial_index",
+            return_value=(osm_dedup.MemorialIndex(), set()),
+        ), patch.object(osm_dedup, "find_duplicate", side_effect=fake_find_duplicate):
             kept, skipped = osm_cli._apply_dedup_check(
                 nodes,
                 radius_ft=100.0,
@@ -269,6 +273,10 @@ class TestApplyDedupCheckIntegration:
         ]
 
         with patch.object(
+            osm_dedup,
+            "fetch_memorial_index",
+            return_value=(osm_dedup.MemorialIndex(), set()),
+        ), patch.object(
             osm_dedup, "find_duplicate", side_effect=RuntimeError("overpass down")
         ):
             kept, skipped = osm_cli._apply_dedup_check(
@@ -281,3 +289,163 @@ class TestApplyDedupCheckIntegration:
 
         assert len(kept) == 1
         assert skipped == []
+
+
+class TestBatchedDedup:
+    def _element(self, osm_id, lat, lon, name):
+        return {
+            "type": "node",
+            "id": osm_id,
+            "lat": lat,
+            "lon": lon,
+            "tags": {"memorial": "plaque", "name": name},
+        }
+
+    def _candidates(self):
+        # Two clusters in different 2-degree tiles, plus a lone candidate.
+        return [
+            {"lat": 30.0, "lon": -97.0, "tags": {"name": "Fort Worth Marker", "ref:US-TX:thc": 1}},
+            {"lat": 30.001, "lon": -97.001, "tags": {"name": "Old Mill", "ref:US-TX:thc": 2}},
+            {"lat": 32.5, "lon": -101.2, "tags": {"name": "Cemetery", "ref:US-TX:thc": 3}},
+            {"lat": 32.6, "lon": -101.3, "tags": {"name": "Nothing Here", "ref:US-TX:thc": 4}},
+        ]
+
+    def _osm(self):
+        return [
+            self._element(10, 30.0, -97.0, "Fort Worth Marker"),
+            self._element(11, 30.00102, -97.001, "Unrelated"),  # ~2 m from #2
+            self._element(12, 30.0009, -97.0, "Far Enough"),  # ~100 m from #1
+            self._element(13, 32.50001, -101.2, ""),
+        ]
+
+    def _session(self, elements):
+        session = MagicMock()
+
+        def post(endpoint, data, timeout, headers):
+            q = data["data"]
+            box = q[q.index('"plaque"](') + 10 : q.index(");out;")]
+            s, w, n, e = map(float, box.split(","))
+            response = MagicMock()
+            response.json.return_value = {
+                "elements": [
+                    el for el in elements
+                    if s <= el["lat"] <= n and w <= el["lon"] <= e
+                ]
+            }
+            return response
+
+        session.post.side_effect = post
+        return session
+
+    def test_one_query_per_tile_and_same_matches_as_per_node(self):
+        session = self._session(self._osm())
+        kept, skipped = osm_cli._apply_dedup_check(
+            self._candidates(),
+            radius_ft=100.0,
+            name_threshold=0.80,
+            rate_limit_sec=0,
+            endpoint=osm_dedup.DEFAULT_OVERPASS_ENDPOINT,
+            session=session,
+        )
+        assert session.post.call_count == 2
+
+        # Reference: the old one-around-query-per-candidate path.
+        nodes = osm_dedup._parse_memorial_nodes({"elements": self._osm()})
+        expected = {}
+        for c in self._candidates():
+            near = [
+                n for n in nodes
+                if osm_dedup.haversine_m(c["lat"], c["lon"], n.lat, n.lon) <= 100 / 3.28084
+            ]
+            expected[c["tags"]["ref:US-TX:thc"]] = osm_dedup.find_duplicate(
+                c["lat"], c["lon"], c["tags"]["name"], nearby_nodes=near
+            )
+        got = {r["candidate"]["ref:US-TX:thc"]: r["match"] for r in skipped}
+        assert got == {k: v for k, v in expected.items() if v is not None}
+        assert sorted(got) == [1, 2, 3]
+        assert [n["tags"]["ref:US-TX:thc"] for n in kept] == [4]
+
+    def test_failed_tile_keeps_its_candidates_unchecked(self):
+        session = self._session(self._osm())
+        ok = session.post.side_effect
+
+        def flaky(endpoint, data, timeout, headers):
+            if "-101" in data["data"]:
+                raise RuntimeError("overpass down")
+            return ok(endpoint, data, timeout, headers)
+
+        session.post.side_effect = flaky
+        kept, skipped = osm_cli._apply_dedup_check(
+            self._candidates(),
+            radius_ft=100.0,
+            name_threshold=0.80,
+            rate_limit_sec=0,
+            endpoint=osm_dedup.DEFAULT_OVERPASS_ENDPOINT,
+            session=session,
+        )
+        assert sorted(r["candidate"]["ref:US-TX:thc"] for r in skipped) == [1, 2]
+        assert sorted(n["tags"]["ref:US-TX:thc"] for n in kept) == [3, 4]
+
+    def test_index_nearby_orders_by_id_and_respects_radius(self):
+        index = osm_dedup.MemorialIndex(
+            osm_dedup._parse_memorial_nodes({"elements": self._osm()})
+        )
+        near = index.nearby(30.0, -97.0, 150.0)
+        assert [n.osm_id for n in near] == [10, 11, 12]
+        assert [n.osm_id for n in index.nearby(30.0, -97.0, 50.0)] == [10]
+
+
+class TestSnapshotDedup:
+    def _snapshot(self, tmp_path):
+        payload = {
+            "osm3s": {"timestamp_osm_base": "2026-08-15T19:41:51Z"},
+            "elements": [
+                {"type": "node", "id": 7, "lat": 30.0, "lon": -97.0,
+                 "tags": {"memorial": "plaque", "name": "Fort Worth Marker"}},
+                # Halff House: the marker was mapped on the building footprint.
+                {"type": "way", "id": 7, "center": {"lat": 29.4200, "lon": -98.4800},
+                 "tags": {"memorial": "plaque", "name": "Halff House"}},
+                {"type": "way", "id": 8, "tags": {"memorial": "plaque"}},
+            ],
+        }
+        path = tmp_path / "osm_extract.json"
+        path.write_text(json.dumps(payload))
+        return path
+
+    def test_indexes_nodes_and_way_centres(self, tmp_path):
+        index, info = osm_dedup.load_snapshot_index(self._snapshot(tmp_path))
+        assert len(index) == 2  # node 7 and way 7 are distinct features
+        assert info["unlocated"] == 1
+        assert info["timestamp"] == "2026-08-15T19:41:51Z"
+        near = index.nearby(29.42001, -98.48, 30.0)
+        assert [(n.osm_type, n.osm_id) for n in near] == [("way", 7)]
+
+    def test_dedup_snapshot_runs_offline(self, tmp_path, capsys):
+        nodes = [
+            {"lat": 29.42001, "lon": -98.48,
+             "tags": {"name": "Halff House", "ref:US-TX:thc": 2333}},
+            {"lat": 31.0, "lon": -98.0,
+             "tags": {"name": "Brand New Marker", "ref:US-TX:thc": 1002}},
+        ]
+        index = osm_cli._load_dedup_snapshot(self._snapshot(tmp_path))
+        assert "timestamp_osm_base 2026-08-15T19:41:51Z" in capsys.readouterr().out
+
+        with patch.object(osm_dedup.requests, "post") as post:
+            kept, skipped = osm_cli._apply_dedup_check(
+                nodes,
+                radius_ft=100.0,
+                name_threshold=0.80,
+                rate_limit_sec=1.0,
+                endpoint=osm_dedup.DEFAULT_OVERPASS_ENDPOINT,
+                index=index,
+            )
+        post.assert_not_called()
+        assert [n["tags"]["ref:US-TX:thc"] for n in kept] == [1002]
+        assert skipped[0]["match"]["osm_type"] == "way"
+        assert skipped[0]["match"]["osm_id"] == 7
+
+    def test_snapshot_age_days(self):
+        now = osm_dedup.datetime(2026, 8, 20, tzinfo=osm_dedup.timezone.utc)
+        assert osm_dedup.snapshot_age_days("2026-08-15T19:41:51Z", now=now) == 4
+        assert osm_dedup.snapshot_age_days(None) is None
+        assert osm_dedup.snapshot_age_days("garbage") is None
@@ -1,8 +1,13 @@
+import threading
+import time
+
 import pandas as pd
 import pytest
+import requests
 from unittest.mock import MagicMock
 
 from thc_toolkit import osm_cli, osm_sync
+from thc_toolkit.overpass_cache import OverpassCache
 
 
 class TestNormalizeRefs:
@@ -123,6 +128,246 @@ class TestQueryOsmNodesByThcRefs:
         session.post.assert_not_called()
 
 
+class FakeOverpass:
+    """Answers ref-regex queries from a fixed node list, like Overpass would."""
+
+    def __init__(self, nodes, fail=None, delay=None):
+        self.nodes = sorted(nodes)  # (osm_id, ref); Overpass sorts by id
+        self.fail = fail or (lambda refs, n: None)
+        self.delay = delay or (lambda refs, n: 0)
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def post(self, endpoint, data, timeout, headers):
+        q = data["data"]
+        refs = q[q.index("^(") + 2 : q.index(")$")].split("|")
+        with self._lock:
+            self.calls.append(refs)
+            n = len(self.calls)
+        time.sleep(self.delay(refs, n))
+        response = MagicMock()
+        error = self.fail(refs, n)
+        if error is not None:
+            response.status_code = error.get("status", 200)
+            response.headers = error.get("headers", {})
+            if "remark" in error:
+                response.json.return_value = {"elements": [], "remark": error["remark"]}
+                return response
+            response.raise_for_status.side_effect = requests.HTTPError(response=response)
+            return response
+        response.json.return_value = {
+            "elements": [
+                {"type": "node", "id": i, "tags": {"ref:US-TX:thc": r}}
+                for i, r in self.nodes
+                if r in refs
+            ]
+        }
+        return response
+
+
+class TestConcurrentSync:
+    REFS = [str(r) for r in range(100, 160)]
+    NODES = [(1000 + int(r), r) for r in REFS[::3]] + [(5, "103"), (7, "130"), (9, "130")]
+
+    def _run(self, fake, logs=None, **kwargs):
+        kwargs.setdefault("batch_size", 8)
+        kwargs.setdefault("rate_limit_sec", 0)
+        return osm_sync.query_osm_nodes_by_thc_refs(
+            self.REFS, session=fake, log=(logs.append if logs is not None else None),
+            **kwargs,
+        )
+
+    def test_concurrent_run_matches_sequential_including_warnings(self):
+        seq_logs, par_logs = [], []
+        seq = self._run(FakeOverpass(self.NODES), seq_logs)
+        par = self._run(FakeOverpass(self.NODES), par_logs, concurrency=4)
+        assert par == seq
+        assert seq["130"] == 7
+        warn = [m for m in seq_logs if m.startswith("[WARN]")]
+        assert warn == [m for m in par_logs if m.startswith("[WARN]")]
+        assert len(warn) == 2  # 103 and 130 both have extra nodes
+
+    def test_429_waits_for_retry_after_then_retries(self, monkeypatch):
+        sleeps = []
+        monkeypatch.setattr(osm_sync.time, "sleep", sleeps.append)
+        fake = FakeOverpass(
+            self.NODES,
+            fail=lambda refs, n: {"status": 429, "headers": {"Retry-After": "7"}}
+            if n == 1 else None,
+        )
+        out = self._run(fake)
+        assert out == self._run(FakeOverpass(self.NODES))
+        assert 7.0 in sleeps
+        assert fake.calls[0] == fake.calls[1]  # same batch again, not split
+
+    def test_timed_out_batch_is_split_and_batch_size_adapts(self):
+        logs = []
+        fake = FakeOverpass(
+            self.NODES,
+            fail=lambda refs, n: {"remark": "runtime error: Query timed out"}
+            if len(refs) > 4 else None,
+        )
+        out = self._run(fake, logs)
+        assert out == self._run(FakeOverpass(self.NODES))
+        # After the first split, the size only probes back up every few batches.
+        assert fake.calls[1:3] == [self.REFS[:4], self.REFS[4:8]]
+        oversize = sum(len(c) > 4 for c in fake.calls)
+        assert oversize <= len(fake.calls) // 3
+        assert any("retrying as 4 + 4" in m for m in logs)
+
+    def test_batch_size_follows_response_latency(self):
+        logs = []
+        fake = FakeOverpass(self.NODES, delay=lambda refs, n: 0.2 if n == 1 else 0)
+        out = self._run(fake, logs, target_latency=0.1)
+        assert out == self._run(FakeOverpass(self.NODES))
+        # Slow first answer halves the size; GROW_AFTER fast ones double it back.
+        sizes = [len(c) for c in fake.calls]
+        assert sizes[: osm_sync.GROW_AFTER + 2] == [8] + [4] * osm_sync.GROW_AFTER + [8]
+        assert any("took 0.2s (target 0.1s); batch size now 4" in m for m in logs)
+
+        steady = FakeOverpass(self.NODES, delay=lambda refs, n: 0.06)
+        self._run(steady, target_latency=0.1)
+        assert {len(c) for c in steady.calls[:-1]} == {8}  # between half and target: held
+
+    def test_checkpoint_resumes_after_failure(self, tmp_path):
+        ckpt = tmp_path / "sync.ckpt.json"
+        failing = FakeOverpass(
+            self.NODES,
+            fail=lambda refs, n: {"status": 400} if "140" in refs else None,
+        )
+        with pytest.raises(requests.HTTPError):
+            self._run(failing, checkpoint=ckpt)
+        saved = osm_sync.load_checkpoint(ckpt)
+        assert saved and all("140" not in b["refs"] for b in saved)
+
+        resumed = FakeOverpass(self.NODES)
+        out = self._run(resumed, checkpoint=ckpt)
+        assert out == self._run(FakeOverpass(self.NODES))
+        asked = {r for c in resumed.calls for r in c}
+        assert "140" in asked and not asked & {r for b in saved for r in b["refs"]}
+        assert not ckpt.exists()
+
+    def test_retry_after_http_date(self):
+        response = MagicMock()
+        response.headers = {"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}
+        assert osm_sync._retry_after_seconds(response, 0) == 0.0
+        response.headers = {}
+        assert osm_sync._retry_after_seconds(response, 3) == 16.0
+
+
+class TestBulkSync:
+    REFS = TestConcurrentSync.REFS
+    NODES = TestConcurrentSync.NODES
+
+    def _payload(self):
+        elements = [
+            {"type": "node", "id": i, "tags": {"ref:US-TX:thc": r}}
+            for i, r in sorted(self.NODES)
+        ]
+        elements += [
+            {"type": "way", "id": 77, "tags": {"ref:US-TX:thc": "101"}},
+            {"type": "way", "id": 78, "tags": {"ref:US-TX:thc": "103"}},
+            {"type": "node", "id": 3, "tags": {"ref:US-TX:thc": "999"}},
+            {"type": "node", "id": 4, "tags": {"name": "untagged"}},
+        ]
+        return {"elements": elements}
+
+    def test_query_is_one_bbox_pull_with_ways(self):
+        q = osm_sync.build_bulk_query((1, 2, 3, 4), timeout=90)
+        assert q == (
+            '[out:json][timeout:90];(node["ref:US-TX:thc"](1,2,3,4);'
+            'way["ref:US-TX:thc"](1,2,3,4););out tags;'
+        )
+        assert "way" not in osm_sync.build_bulk_query(include_ways=False)
+
+    def test_join_matches_batched_result_and_warnings(self):
+        batched_logs, bulk_logs = [], []
+        batched = osm_sync.query_osm_nodes_by_thc_refs(
+            self.REFS, batch_size=8, rate_limit_sec=0,
+            session=FakeOverpass(self.NODES), log=batched_logs.append,
+        )
+        nodes, ways = osm_sync.join_thc_refs(self.REFS, self._payload(), log=bulk_logs.append)
+        assert nodes == batched
+        dup = [m for m in bulk_logs if "multiple OSM nodes" in m]
+        assert dup == [m for m in batched_logs if m.startswith("[WARN]")]
+        # 103 has a node too, so only 101 is reported as way-only.
+        assert ways == {"101": 77}
+        assert "999" not in nodes
+
+    def test_fetch_is_a_single_request(self):
+        session = MagicMock()
+        session.post.return_value.json.return_value = self._payload()
+        payload = osm_sync.fetch_thc_tagged(session=session)
+        assert session.post.call_count == 1
+        assert len(payload["elements"]) == len(self._payload()["elements"])
+
+    def test_fetch_raises_on_runtime_error_remark(self):
+        session = MagicMock()
+        session.post.return_value.json.return_value = {
+            "elements": [], "remark": "runtime error: Query timed out"
+        }
+        with pytest.raises(RuntimeError, match="bulk query failed"):
+            osm_sync.fetch_thc_tagged(session=session)
+
+    def test_failed_fetch_is_not_cached(self, tmp_path):
+        cache = OverpassCache(tmp_path)
+        session = MagicMock()
+        session.post.return_value.json.return_value = {
+            "elements": [], "remark": "runtime error: Query timed out"
+        }
+        with pytest.raises(RuntimeError):
+            osm_sync.fetch_thc_tagged(session=session, cache=cache)
+
+        session.post.return_value.json.return_value = self._payload()
+        for _ in range(2):
+            payload = osm_sync.fetch_thc_tagged(session=session, cache=cache)
+        assert len(payload["elements"]) == len(self._payload()["elements"])
+        assert session.post.call_count == 2
+
+    def test_choose_strategy(self):
+        assert osm_sync.choose_strategy("auto", 10) == "batched"
+        assert osm_sync.choose_strategy("auto", osm_sync.BULK_MIN_REFS) == "bulk"
+        assert osm_sync.choose_strategy("auto", 10, snapshot="x.json") == "bulk"
+        assert osm_sync.choose_strategy("batched", 10_000) == "batched"
+        with pytest.raises(ValueError, match="unknown sync strategy"):
+            osm_sync.choose_strategy("regex", 10)
+
+    def test_cli_joins_against_snapshot_without_network(self, tmp_path, monkeypatch, capsys):
+        import json
+        import sys
+
+        snap = tmp_path / "extract.json"
+        payload = self._payload()
+        payload["osm3s"] = {"timestamp_osm_base": "2026-01-01T00:00:00Z"}
+        snap.write_text(json.dumps(payload))
+        atlas = pd.DataFrame({
+            "ref:US-TX:thc": [100, 101, 102],
+            "isOSM": [False, False, False],
+            "OsmNodeID": pd.array([None, None, None], dtype="Int64"),
+        })
+        monkeypatch.setattr(osm_cli, "read_atlas", lambda path: atlas.copy())
+        written = {}
+        monkeypatch.setattr(osm_cli, "write2csv", lambda df, out: written.update(df=df))
+        monkeypatch.setattr(osm_sync, "fetch_thc_tagged", MagicMock(side_effect=AssertionError))
+        nodes = tmp_path / "nodes.json"
+        nodes.write_text(json.dumps(
+            [{"tags": {"ref:US-TX:thc": r}} for r in ("100", "101", "102")]
+        ))
+        report = tmp_path / "report.json"
+        monkeypatch.setattr(sys, "argv", [
+            "osm", "sync-from-osm", "--csv", "a.csv", "--nodes", str(nodes),
+            "--out", "o.csv", "--snapshot", str(snap), "--report", str(report),
+        ])
+        osm_cli.main()
+        out = written["df"]
+        assert out["OsmNodeID"].tolist()[0] == 1100
+        assert out["isOSM"].tolist() == [True, False, False]
+        rep = json.loads(report.read_text())
+        assert rep["tagged_on_way"] == {"101": 77}
+        assert rep["unresolved_refs"] == [102]
+        assert "against snapshot" in capsys.readouterr().out
+
+
 class TestApplySyncResults:
     def _atlas(self):
         return pd.DataFrame(
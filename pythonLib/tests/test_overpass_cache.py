@@ -0,0 +1,149 @@
+from unittest.mock import MagicMock
+
+from thc_toolkit import osm_dedup, osm_extract, osm_sync, overpass_cache
+from thc_toolkit.overpass_cache import OverpassCache
+
+
+class Clock:
+    def __init__(self, t=1_000.0):
+        self.t = t
+
+    def __call__(self):
+        return self.t
+
+
+def _session(payload):
+    session = MagicMock()
+    response = MagicMock()
+    response.json.return_value = payload
+    session.post.return_value = response
+    return session
+
+
+def test_normalized_queries_share_a_key():
+    a = '[out:json][timeout:25];\n node["memorial"="plaque"] ( 1,2,3,4 ) ;out;'
+    b = '[out:json][timeout:300];node["memorial"="plaque"](1,2,3,4);out;'
+    assert overpass_cache.query_key("https://x/api", a) == overpass_cache.query_key(
+        "https://x/api/", b
+    )
+    assert overpass_cache.query_key("https://x/api", a) != overpass_cache.query_key(
+        "https://y/api", a
+    )
+
+
+def test_hit_after_miss_and_counters(tmp_path):
+    cache = OverpassCache(tmp_path)
+    assert cache.get("e", "q") is None
+    cache.put("e", "q", {"elements": [1]})
+    assert cache.get("e", "q") == {"elements": [1]}
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert "1 hit(s), 1 miss(es)" in cache.summary()
+
+
+def test_entries_expire_after_ttl(tmp_path):
+    clock = Clock()
+    cache = OverpassCache(tmp_path, ttl_sec=60, clock=clock)
+    cache.put("e", "q", {"elements": []})
+    clock.t += 59
+    assert cache.get("e", "q") is not None
+    clock.t += 2
+    assert cache.get("e", "q") is None
+
+
+def test_cache_persists_across_instances(tmp_path):
+    OverpassCache(tmp_path).put("e", "q", {"elements": [42]})
+    assert OverpassCache(tmp_path).get("e", "q") == {"elements": [42]}
+
+
+def test_lru_eviction_respects_size_cap(tmp_path):
+    clock = Clock()
+    big = {"elements": [str(i) * 50 for i in range(400)]}
+    probe = OverpassCache(tmp_path / "probe")
+    probe.put("e", "q", big)
+    entry = probe.size_bytes()
+
+    cache = OverpassCache(tmp_path, max_bytes=int(entry * 2.5), clock=clock)
+    for q in ("a", "b"):
+        clock.t += 1
+        cache.put("e", q, big)
+    clock.t += 1
+    cache.get("e", "a")  # "b" is now least recently used
+    clock.t += 1
+    cache.put("e", "c", big)
+
+    assert cache.size_bytes() <= cache.max_bytes
+    assert cache.get("e", "b") is None
+    assert cache.get("e", "a") is not None
+    assert cache.get("e", "c") is not None
+
+
+def test_dedup_query_served_from_cache(tmp_path):
+    cache = OverpassCache(tmp_path)
+    payload = {"elements": [{"type": "node", "id": 1, "lat": 30.0, "lon": -97.0}]}
+    session = _session(payload)
+    for _ in range(2):
+        nodes = osm_dedup.query_overpass_memorials_near(
+            30.0, -97.0, radius_m=30.0, session=session, cache=cache
+        )
+        assert [n.osm_id for n in nodes] == [1]
+    assert session.post.call_count == 1
+
+
+def test_runtime_error_payload_is_not_cached(tmp_path):
+    cache = OverpassCache(tmp_path)
+    timed_out = {"elements": [], "remark": "runtime error: Query timed out"}
+    session = _session(timed_out)
+
+    index, failed = osm_dedup.fetch_memorial_index(
+        [(30.0, -97.0)], radius_m=30.0, session=session, cache=cache,
+        log=lambda msg: None, sleep=lambda s: None,
+    )
+    assert len(failed) == 1 and len(index) == 0
+
+    good = {"elements": [{"type": "node", "id": 1, "lat": 30.0, "lon": -97.0}]}
+    session.post.return_value.json.return_value = good
+    index, failed = osm_dedup.fetch_memorial_index(
+        [(30.0, -97.0)], radius_m=30.0, session=session, cache=cache,
+        log=lambda msg: None, sleep=lambda s: None,
+    )
+    assert not failed and len(index) == 1
+    assert session.post.call_count == 2
+
+
+def test_sync_rerun_skips_network_and_sleep(tmp_path, monkeypatch):
+    cache = OverpassCache(tmp_path)
+    payload = {
+        "elements": [{"type": "node", "id": 9, "tags": {"ref:US-TX:thc": "1"}}]
+    }
+    session = _session(payload)
+    sleeps = []
+    monkeypatch.setattr(osm_sync.time, "sleep", sleeps.append)
+    kwargs = dict(batch_size=1, session=session, log=None, cache=cache)
+
+    first = osm_sync.query_osm_nodes_by_thc_refs([1, 2], **kwargs)
+    second = osm_sync.query_osm_nodes_by_thc_refs([1, 2], **kwargs)
+
+    assert first == second == {"1": 9}
+    assert session.post.call_count == 2
+    assert len(sleeps) == 1  # only the first, uncached run waited
+
+
+def test_extract_fetch_uses_cache(tmp_path):
+    cache = OverpassCache(tmp_path)
+    session = _session({"elements": [], "osm3s": {}})
+    osm_extract.fetch(session=session, cache=cache)
+    osm_extract.fetch(session=session, cache=cache)
+    assert session.post.call_count == 1
+
+
+def test_cache_from_args(tmp_path):
+    class Args:
+        no_cache = False
+        cache_dir = str(tmp_path)
+        cache_ttl = 5.0
+
+    cache = overpass_cache.cache_from_args(Args)
+    assert cache.ttl_sec == 5.0
+    assert cache.path.parent == tmp_path
+    Args.no_cache = True
+    assert overpass_cache.cache_from_args(Args) is None
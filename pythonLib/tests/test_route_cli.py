@@ -0,0 +1,122 @@
+import numpy as np
+import pytest
+import pyproj
+from shapely.geometry import LineString, MultiLineString, Point
+import shapely
+
+from thc_toolkit import route_cli
+
+
+def _brute_force(lon, lat, route, radius):
+    """The original per-point test, kept as the reference."""
+    proj = pyproj.Transformer.from_crs("EPSG:4326", "EPSG:3857", always_xy=True).transform
+    rp = shapely.transform(route, proj, interleaved=False)
+    return np.array(
+        [rp.distance(Point(*proj(x, y))) / 1609.34 <= radius for x, y in zip(lon, lat)],
+        dtype=bool,
+    )
+
+
+def _points_around(route, n=2000, spread=0.4, seed=1):
+    rng = np.random.default_rng(seed)
+    minx, miny, maxx, maxy = route.bounds
+    lon = rng.uniform(minx - spread, maxx + spread, n)
+    lat = rng.uniform(miny - spread, maxy + spread, n)
+    return lon, lat
+
+
+def test_near_route_mask_matches_per_point_distance():
+    route = LineString([(-97.7, 30.2), (-97.4, 30.6), (-97.0, 30.7), (-96.6, 31.2)])
+    lon, lat = _points_around(route)
+    for radius in (1, 5, 12.5):
+        got = route_cli.near_route_mask(lon, lat, route, radius)
+        assert got.tolist() == _brute_force(lon, lat, route, radius).tolist()
+
+
+def test_near_route_mask_keeps_points_on_buffer_arc():
+    # Points just inside the radius, off the end of the route, lie where the
+    # buffer polygon's chords cut inside the true circle.
+    route = LineString([(-97.7, 30.2), (-97.6, 30.2)])
+    proj = pyproj.Transformer.from_crs("EPSG:4326", "EPSG:3857", always_xy=True)
+    back = pyproj.Transformer.from_crs("EPSG:3857", "EPSG:4326", always_xy=True)
+    ex, ey = proj.transform(-97.6, 30.2)
+    r = 5 * 1609.34 * 0.9999
+    angles = np.linspace(-np.pi / 2, np.pi / 2, 181)
+    lon, lat = back.transform(ex + r * np.cos(angles), ey + r * np.sin(angles))
+    assert route_cli.near_route_mask(lon, lat, route, 5).all()
+
+
+def test_near_route_mask_multilinestring_and_empty():
+    route = MultiLineString([[(-97.7, 30.2), (-97.5, 30.3)], [(-96.0, 31.0), (-95.8, 31.1)]])
+    lon, lat = _points_around(route, n=500)
+    got = route_cli.near_route_mask(lon, lat, route, 3)
+    assert got.tolist() == _brute_force(lon, lat, route, 3).tolist()
+    assert route_cli.near_route_mask([], [], route, 3).tolist() == []
+
+
+def _geodesic_reference_miles(lon, lat, route, step_m=100):
+    """Min ellipsoidal distance to a finely densified route."""
+    geod = pyproj.Geod(ellps="WGS84")
+    rx, ry = [], []
+    for (x0, y0), (x1, y1) in zip(route.coords[:-1], route.coords[1:]):
+        n = int(geod.inv(x0, y0, x1, y1)[2] // step_m)
+        rx.append(x0)
+        ry.append(y0)
+        for x, y in geod.npts(x0, y0, x1, y1, n):
+            rx.append(x)
+            ry.append(y)
+    rx.append(route.coords[-1][0])
+    ry.append(route.coords[-1][1])
+    rx, ry = np.array(rx), np.array(ry)
+    out = []
+    for x, y in zip(lon, lat):
+        d = geod.inv(np.full_like(rx, x), np.full_like(ry, y), rx, ry)[2]
+        out.append(d.min() / 1609.34)
+    return np.array(out)
+
+
+def test_geodesic_and_utm_modes_track_ellipsoidal_distance():
+    route = LineString([(-101.9, 33.6), (-99.7, 32.4), (-97.3, 32.7), (-95.4, 29.8)])
+    lon, lat = _points_around(route, n=3000, spread=0.15)
+    radius = 8
+    geo = route_cli.route_distance_miles(lon, lat, route, radius, mode="geodesic")
+    utm = route_cli.route_distance_miles(lon, lat, route, radius, mode="utm")
+    # Skip points hugging the route: there the 100 m reference sampling, not
+    # the mode under test, dominates the difference.
+    near = np.flatnonzero(np.isfinite(geo) & (geo > 0.5))
+    assert len(near) > 50
+    sample = near[:: max(1, len(near) // 60)]
+    ref = _geodesic_reference_miles(lon[sample], lat[sample], route)
+    assert np.abs(geo[sample] - ref).max() < 0.002  # ~3 m
+    # UTM draws each 200+ km test segment as a straight chord, not a geodesic.
+    assert np.abs(utm[sample] - ref).max() < 0.1
+
+
+def test_mercator_mode_understates_radius():
+    route = LineString([(-97.7, 30.2), (-97.0, 31.0)])
+    lon, lat = _points_around(route, n=3000)
+    merc = route_cli.near_route_mask(lon, lat, route, 5, mode="mercator")
+    geo = route_cli.near_route_mask(lon, lat, route, 5, mode="geodesic")
+    # Web Mercator overstates length, so it accepts a strict subset.
+    assert not (merc & ~geo).any()
+    assert geo.sum() > merc.sum()
+
+
+def test_utm_mode_uses_given_zone_column():
+    route = LineString([(-97.7, 30.2), (-97.0, 31.0)])
+    lon, lat = _points_around(route, n=200)
+    derived = route_cli.route_distance_miles(lon, lat, route, 5, mode="utm")
+    given = route_cli.route_distance_miles(
+        lon, lat, route, 5, mode="utm", zones=[14] * len(lon)
+    )
+    assert np.array_equal(derived, given)
+    other = route_cli.route_distance_miles(
+        lon, lat, route, 5, mode="utm", zones=[13] * len(lon)
+    )
+    assert not np.array_equal(derived, other)
+
+
+def test_unknown_distance_mode_raises():
+    route = LineString([(-97.7, 30.2), (-97.0, 31.0)])
+    with pytest.raises(ValueError, match="unknown distance mode"):
+        route_cli.route_distance_miles([-97.5], [30.5], route, 5, mode="haversine")
@@ -2,7 +2,7 @@ import json
 import pandas as pd
 import pytest
 
-from thc_toolkit import map_cli, route_cli, osm_cli
+from thc_toolkit import map_cli, route_cli, osm_cli, utils
 
 
 def test_map_filter_markers_missing_required_column_raises():
@@ -16,7 +16,7 @@ def test_route_require_columns_reports_missing():
     with pytest.raises(
         ValueError, match="missing required column\\(s\\): estimated:Longitude"
     ):
-        route_cli.require_columns(
+        utils.require_columns(
             df, ["ref:hmdb", "estimated:Latitude", "estimated:Longitude"], context="route input"
         )
 
@@ -76,3 +76,357 @@ def test_sqlite_sync_verify_detects_key_mismatch(sample_atlas_df, tmp_path):
 
     with pytest.raises(ValueError, match="row mismatch detected"):
         sqlite_sync.verify_sqlite_sync(csv_path, sqlite_path)
+
+
+def _table_rows(sqlite_path):
+    with sqlite3.connect(sqlite_path) as conn:
+        return conn.execute('SELECT * FROM "atlas" ORDER BY rowid').fetchall()
+
+
+def test_sqlite_sync_incremental_applies_only_changed_rows(sample_atlas_df, tmp_path):
+    csv_path = tmp_path / "atlas.csv"
+    inc_path = tmp_path / "inc.sqlite"
+    full_path = tmp_path / "full.sqlite"
+
+    sample_atlas_df.to_csv(csv_path, index=False)
+    first = sqlite_sync.build_sqlite_from_csv(csv_path, inc_path, incremental=True)
+    assert first["mode"] == "full"
+
+    edited = sample_atlas_df.copy()
+    edited.loc[0, "name"] = "Marker A (rev)"
+    edited = edited.drop(index=1)
+    extra = sample_atlas_df.iloc[[2]].copy()
+    extra["ref:US-TX:thc"] = pd.array([1004], dtype="Int32")
+    edited = pd.concat([edited, extra], ignore_index=True)
+    edited.to_csv(csv_path, index=False)
+
+    report = sqlite_sync.build_sqlite_from_csv(csv_path, inc_path, incremental=True)
+    assert report["mode"] == "incremental"
+    assert (report["inserted"], report["updated"], report["deleted"]) == (1, 1, 1)
+
+    sqlite_sync.build_sqlite_from_csv(csv_path, full_path)
+    assert _table_rows(inc_path) == _table_rows(full_path)
+    assert sqlite_sync.verify_sqlite_sync(csv_path, inc_path)["match"] is True
+
+    again = sqlite_sync.build_sqlite_from_csv(csv_path, inc_path, incremental=True)
+    assert (again["inserted"], again["updated"], again["deleted"]) == (0, 0, 0)
+
+
+def test_sqlite_sync_incremental_rebuilds_when_rows_move(sample_atlas_df, tmp_path):
+    csv_path = tmp_path / "atlas.csv"
+    sqlite_path = tmp_path / "atlas.sqlite"
+
+    sample_atlas_df.to_csv(csv_path, index=False)
+    sqlite_sync.build_sqlite_from_csv(csv_path, sqlite_path)
+    sample_atlas_df.iloc[::-1].to_csv(csv_path, index=False)
+
+    report = sqlite_sync.build_sqlite_from_csv(csv_path, sqlite_path, incremental=True)
+    assert report["mode"] == "full"
+    assert sqlite_sync.verify_sqlite_sync(csv_path, sqlite_path)["match"] is True
+
+
+def _with_new_markers(df, *placed):
+    """``df`` with a copy of its last row, renumbered, at each ``(position, thc)``."""
+    out = df
+    for position, thc in placed:
+        row = df.iloc[[-1]].copy()
+        row["ref:US-TX:thc"] = pd.array([thc], dtype="Int32")
+        row["ref:hmdb"] = pd.array([pd.NA], dtype="Int32")
+        row["name"] = f"Marker {thc}"
+        out = pd.concat([out.iloc[:position], row, out.iloc[position:]], ignore_index=True)
+    return out
+
+
+def test_sqlite_sync_incremental_inserts_mid_file_in_order(sample_atlas_df, tmp_path):
+    csv_path = tmp_path / "atlas.csv"
+    inc_path = tmp_path / "inc.sqlite"
+    full_path = tmp_path / "full.sqlite"
+
+    sample_atlas_df.to_csv(csv_path, index=False)
+    sqlite_sync.build_sqlite_from_csv(csv_path, inc_path)
+    edited = _with_new_markers(sample_atlas_df, (1, 1001), (0, 999), (3, 1002))
+    edited = edited.drop(index=4)  # 1002 itself goes; its replacement stays put
+    edited.to_csv(csv_path, index=False)
+
+    report = sqlite_sync.build_sqlite_from_csv(csv_path, inc_path, incremental=True)
+    assert report["mode"] == "incremental"
+    assert (report["inserted"], report["updated"], report["deleted"]) == (3, 0, 1)
+
+    sqlite_sync.build_sqlite_from_csv(csv_path, full_path)
+    assert _table_rows(inc_path) == _table_rows(full_path)
+    exported = sqlite_sync.export_csv_from_sqlite(inc_path, tmp_path / "out.csv")
+    assert exported["name"].tolist() == edited["name"].tolist()
+    assert sqlite_sync.verify_sqlite_sync(csv_path, inc_path)["match"] is True
+
+
+def test_sqlite_sync_incremental_rebuilds_when_a_gap_is_full(
+    sample_atlas_df, tmp_path, monkeypatch
+):
+    csv_path = tmp_path / "atlas.csv"
+    sqlite_path = tmp_path / "atlas.sqlite"
+    monkeypatch.setattr(sqlite_sync, "ROWID_GAP", 2)
+
+    sample_atlas_df.to_csv(csv_path, index=False)
+    sqlite_sync.build_sqlite_from_csv(csv_path, sqlite_path)
+    one = _with_new_markers(sample_atlas_df, (1, 1101))
+    one.to_csv(csv_path, index=False)
+    assert sqlite_sync.build_sqlite_from_csv(
+        csv_path, sqlite_path, incremental=True
+    )["mode"] == "incremental"
+
+    # Rowids 1 and 2 now sit side by side; nothing fits between them.
+    _with_new_markers(one, (1, 1102)).to_csv(csv_path, index=False)
+    report = sqlite_sync.build_sqlite_from_csv(csv_path, sqlite_path, incremental=True)
+    assert report["mode"] == "full"
+    assert sqlite_sync.verify_sqlite_sync(csv_path, sqlite_path)["match"] is True
+
+
+def test_sqlite_sync_incremental_rebuilds_on_duplicate_row_keys(sample_atlas_df, tmp_path):
+    csv_path = tmp_path / "atlas.csv"
+    sqlite_path = tmp_path / "atlas.sqlite"
+
+    dupe = pd.concat([sample_atlas_df, sample_atlas_df.iloc[[0]]], ignore_index=True)
+    dupe.to_csv(csv_path, index=False)
+    sqlite_sync.build_sqlite_from_csv(csv_path, sqlite_path)
+
+    report = sqlite_sync.build_sqlite_from_csv(csv_path, sqlite_path, incremental=True)
+    assert report["mode"] == "full"
+    assert report["rows"] == 4
+
+
+def test_sqlite_sync_build_declares_typed_columns(sample_atlas_df, tmp_path):
+    csv_path = tmp_path / "atlas.csv"
+    sqlite_path = tmp_path / "atlas.sqlite"
+    sample_atlas_df.to_csv(csv_path, index=False)
+    sqlite_sync.build_sqlite_from_csv(csv_path, sqlite_path)
+
+    with sqlite3.connect(sqlite_path) as conn:
+        decl = {row[1]: row[2] for row in conn.execute('PRAGMA table_info("atlas")')}
+        lat_type, flag, blank_hmdb = conn.execute(
+            'SELECT typeof("verified:Latitude"), "isOSM", "ref:hmdb" '
+            'FROM "atlas" WHERE "ref:US-TX:thc" = 1003'
+        ).fetchone()
+        in_box = conn.execute(
+            'SELECT COUNT(*) FROM "atlas" WHERE "verified:Latitude" BETWEEN 30.15 AND 30.35'
+        ).fetchone()[0]
+        journal = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        analyzed = conn.execute("SELECT COUNT(*) FROM sqlite_stat1").fetchone()[0]
+
+    assert decl["ref:US-TX:thc"] == "INTEGER"
+    assert decl["start_date"] == "INTEGER"
+    assert decl["verified:Latitude"] == "REAL"
+    assert decl["isOSM"] == "BOOLEAN"
+    assert decl["name"] == "TEXT"
+    assert (lat_type, flag, blank_hmdb) == ("real", 0, None)
+    assert in_box == 2
+    assert journal == "delete"
+    assert analyzed > 0
+
+
+def test_sqlite_sync_export_restores_csv_values(sample_atlas_df, tmp_path):
+    csv_path = tmp_path / "atlas.csv"
+    sqlite_path = tmp_path / "atlas.sqlite"
+    exported_csv = tmp_path / "atlas_roundtrip.csv"
+    sample_atlas_df.to_csv(csv_path, index=False)
+
+    sqlite_sync.build_sqlite_from_csv(csv_path, sqlite_path)
+    sqlite_sync.export_csv_from_sqlite(sqlite_path, exported_csv)
+
+    source = pd.read_csv(csv_path, dtype=str, keep_default_na=False)
+    exported = pd.read_csv(exported_csv, dtype=str, keep_default_na=False)
+    pd.testing.assert_frame_equal(source, exported)
+
+
+def _built(sample_atlas_df, tmp_path):
+    csv_path = tmp_path / "atlas.csv"
+    sqlite_path = tmp_path / "atlas.sqlite"
+    sample_atlas_df.to_csv(csv_path, index=False)
+    sqlite_sync.build_sqlite_from_csv(csv_path, sqlite_path)
+    return csv_path, sqlite_path
+
+
+def test_sqlite_sync_verify_reports_every_difference(sample_atlas_df, tmp_path):
+    csv_path, sqlite_path = _built(sample_atlas_df, tmp_path)
+    with sqlite3.connect(sqlite_path) as conn:
+        conn.execute(
+            'UPDATE "atlas" SET "name" = ?, "isOSM" = 0 WHERE "ref:US-TX:thc" = 1001', ("X",)
+        )
+        conn.execute(
+            'UPDATE "atlas" SET "verified:Latitude" = 31.5 WHERE "ref:US-TX:thc" = 1003'
+        )
+        conn.execute('DELETE FROM "atlas" WHERE "ref:US-TX:thc" = 1002')
+        conn.execute(
+            'INSERT INTO "atlas" ("ref:US-TX:thc", "ref:hmdb", "name") VALUES (2000, NULL, ?)',
+            ("Stray",),
+        )
+        conn.commit()
+
+    report = sqlite_sync.verify_sqlite_sync(csv_path, sqlite_path, raise_on_mismatch=False)
+
+    assert report["match"] is False
+    changed = {c["key"]["ref:US-TX:thc"]: c["columns"] for c in report["changed"]}
+    assert changed["1001"] == {
+        "name": {"csv": "Marker A", "sqlite": "X"},
+        "isOSM": {"csv": "True", "sqlite": "False"},
+    }
+    assert changed["1003"] == {"verified:Latitude": {"csv": "30.3", "sqlite": "31.5"}}
+    assert report["missing_in_sqlite"] == [{"ref:US-TX:thc": "1002", "ref:hmdb": "5002"}]
+    assert report["missing_in_csv"] == [{"ref:US-TX:thc": "2000", "ref:hmdb": ""}]
+
+    with pytest.raises(ValueError, match="2 changed row"):
+        sqlite_sync.verify_sqlite_sync(csv_path, sqlite_path)
+
+
+def test_sqlite_sync_verify_sample_and_reports(sample_atlas_df, tmp_path, monkeypatch):
+    csv_path, sqlite_path = _built(sample_atlas_df, tmp_path)
+
+    sampled = sqlite_sync.verify_sqlite_sync(csv_path, sqlite_path, sample=1)
+    assert sampled["match"] is True
+    assert sampled["compared_rows"] < sampled["rows"] == 3
+
+    with sqlite3.connect(sqlite_path) as conn:
+        conn.execute(
+            'UPDATE "atlas" SET "addr:city" = ? WHERE "ref:US-TX:thc" = 1002',
+            ("Pflugerville",),
+        )
+        conn.commit()
+
+    args = sqlite_sync.argparse.Namespace(
+        csv=str(csv_path), sqlite=str(sqlite_path), table="atlas", sample=None,
+        report=str(tmp_path / "diff.csv"),
+    )
+    with pytest.raises(SystemExit) as exc:
+        sqlite_sync.run_verify(args)
+    assert exc.value.code == 1
+    diff = pd.read_csv(tmp_path / "diff.csv", dtype=str, keep_default_na=False)
+    assert diff.to_dict("records") == [{
+        "ref:US-TX:thc": "1002", "ref:hmdb": "5002", "kind": "changed",
+        "column": "addr:city", "csv_value": "Austin", "sqlite_value": "Pflugerville",
+    }]
+
+    args.report = str(tmp_path / "diff.json")
+    with pytest.raises(SystemExit):
+        sqlite_sync.run_verify(args)
+    assert '"Pflugerville"' in (tmp_path / "diff.json").read_text()
+
+
+def _with_estimates(sample_atlas_df):
+    df = sample_atlas_df.copy()
+    df["estimated:Latitude"] = [30.9, 30.9, 31.0]
+    df["estimated:Longitude"] = [-97.9, -97.9, -98.0]
+    df.loc[2, ["verified:Latitude", "verified:Longitude"]] = float("nan")
+    return df
+
+
+def test_sqlite_sync_query_bbox_uses_resolved_coordinates(sample_atlas_df, tmp_path):
+    csv_path, sqlite_path = _built(_with_estimates(sample_atlas_df), tmp_path)
+
+    box = sqlite_sync.query_bbox(sqlite_path, 30.05, -97.25, 30.25, -97.05)
+    assert box["ref:US-TX:thc"].tolist() == [1001, 1002]
+    assert box["isOSM"].tolist() == [True, False]
+
+    # Row 1003 has no verified pair, so it sits at its estimate.
+    est = sqlite_sync.query_bbox(
+        sqlite_path, 30.95, -98.05, 31.05, -97.95, columns=["ref:US-TX:thc", "name"]
+    )
+    assert est.to_dict("records") == [{"ref:US-TX:thc": 1003, "name": "Marker C"}]
+
+    # Edge-inclusive even though the R*Tree rounds to 32-bit floats.
+    edge = sqlite_sync.query_bbox(sqlite_path, 30.1, -97.1, 30.1, -97.1)
+    assert edge["ref:US-TX:thc"].tolist() == [1001]
+
+
+def test_sqlite_sync_query_radius_orders_by_distance(sample_atlas_df, tmp_path):
+    csv_path, sqlite_path = _built(sample_atlas_df, tmp_path)
+
+    near = sqlite_sync.query_radius(sqlite_path, 30.19, -97.19, 10.0)
+    assert near["ref:US-TX:thc"].tolist() == [1002, 1001]
+    assert near["distance_mi"].is_monotonic_increasing
+    assert 0.8 < near["distance_mi"].iloc[0] < 1.0
+
+    far = sqlite_sync.query_radius(sqlite_path, 30.19, -97.19, 30.0)
+    assert far["ref:US-TX:thc"].tolist() == [1002, 1001, 1003]
+
+
+def test_sqlite_sync_incremental_keeps_spatial_index_current(sample_atlas_df, tmp_path):
+    csv_path, sqlite_path = _built(sample_atlas_df, tmp_path)
+
+    moved = sample_atlas_df.copy()
+    moved.loc[0, ["verified:Latitude", "verified:Longitude"]] = [29.5, -95.5]
+    moved = moved.drop(index=2)
+    moved.to_csv(csv_path, index=False)
+    sqlite_sync.build_sqlite_from_csv(csv_path, sqlite_path, incremental=True)
+
+    everything = sqlite_sync.query_bbox(sqlite_path, 25, -107, 37, -93)
+    assert everything["ref:US-TX:thc"].tolist() == [1001, 1002]
+    houston = sqlite_sync.query_radius(sqlite_path, 29.5, -95.5, 1.0)
+    assert houston["ref:US-TX:thc"].tolist() == [1001]
+
+
+def test_sqlite_sync_query_bbox_without_coordinates_raises(sample_atlas_df, tmp_path):
+    no_coords = sample_atlas_df.drop(columns=["verified:Latitude", "verified:Longitude"])
+    csv_path, sqlite_path = _built(no_coords, tmp_path)
+
+    with pytest.raises(ValueError, match="has no spatial index"):
+        sqlite_sync.query_bbox(sqlite_path, 30, -98, 31, -97)
+
+
+def _with_inscriptions(sample_atlas_df):
+    df = sample_atlas_df.copy()
+    df["Marker Text"] = [
+        "Built of native stone in 1779 by Antonio Gil Y'Barbo.",
+        "The first Méthodist church in the county; services held under an oak.",
+        "",
+    ]
+    df["name"] = ["Old Stone Fort", "Stone Chapel", "Ysleta Mission"]
+    return df
+
+
+def test_sqlite_sync_search_text_ranks_and_pages(sample_atlas_df, tmp_path):
+    csv_path, sqlite_path = _built(_with_inscriptions(sample_atlas_df), tmp_path)
+
+    hits = sqlite_sync.search_text(sqlite_path, "ston")
+    assert hits["match"] == '"ston"*'
+    assert hits["total"] == 2
+    # "Stone" in both name and inscription outranks a name-only hit.
+    assert [r["ref:US-TX:thc"] for r in hits["rows"]] == [1001, 1002]
+    assert set(hits["rows"][0]) == set(sqlite_sync.SEARCH_RESULT_COLUMNS) | {
+        "score",
+        "snippet",
+    }
+
+    # Inscriptions are searched too, accents folded, hits highlighted.
+    methodist = sqlite_sync.search_text(sqlite_path, "methodist church")
+    assert [r["name"] for r in methodist["rows"]] == ["Stone Chapel"]
+    assert "[Méthodist] [church]" in methodist["rows"][0]["snippet"]
+
+    page = sqlite_sync.search_text(sqlite_path, "stone", limit=1, offset=1)
+    assert page["total"] == 2 and len(page["rows"]) == 1
+
+    phrase = sqlite_sync.search_text(sqlite_path, '"stone fort"')
+    assert [r["ref:US-TX:thc"] for r in phrase["rows"]] == [1001]
+
+    raw = sqlite_sync.search_text(sqlite_path, "name: mission", raw=True)
+    assert [r["ref:US-TX:thc"] for r in raw["rows"]] == [1003]
+    with pytest.raises(ValueError, match="invalid search query"):
+        sqlite_sync.search_text(sqlite_path, "name: (", raw=True)
+    with pytest.raises(ValueError, match="empty"):
+        sqlite_sync.search_text(sqlite_path, '  ""  ')
+
+
+def test_sqlite_sync_incremental_keeps_text_index_current(sample_atlas_df, tmp_path):
+    df = _with_inscriptions(sample_atlas_df)
+    csv_path, sqlite_path = _built(df, tmp_path)
+
+    df.loc[0, "Marker Text"] = "Rebuilt in 1936 for the Texas Centennial."
+    df = df.drop(index=1)
+    df.to_csv(csv_path, index=False)
+    report = sqlite_sync.build_sqlite_from_csv(csv_path, sqlite_path, incremental=True)
+    assert report["mode"] == "incremental"
+
+    assert sqlite_sync.search_text(sqlite_path, "chapel")["total"] == 0
+    assert sqlite_sync.search_text(sqlite_path, "barbo")["total"] == 0
+    centennial = sqlite_sync.search_text(sqlite_path, "centennial")
+    assert [r["ref:US-TX:thc"] for r in centennial["rows"]] == [1001]
+    with sqlite3.connect(sqlite_path) as conn:
+        conn.execute("INSERT INTO atlas_fts(atlas_fts) VALUES ('integrity-check')")
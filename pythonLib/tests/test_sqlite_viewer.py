@@ -60,7 +60,8 @@ def test_sqlite_viewer_page_includes_column_filters_and_sorting():
     assert "th.className = 'sortable'" in page
     assert "Filter " in page
     assert "Blank only" in page
-    assert 'value="2000"' in page
+    assert "new IntersectionObserver" in page
+    assert "params.set('after', listing.next)" in page
 
 
 def test_sqlite_viewer_resolves_default_repo_root_path(monkeypatch, tmp_path):
@@ -71,3 +72,536 @@ def test_sqlite_viewer_resolves_default_repo_root_path(monkeypatch, tmp_path):
     resolved = sqlite_viewer.resolve_default_sqlite_path()
 
     assert resolved == str(sqlite_path.resolve())
+
+
+def test_sqlite_viewer_bbox_rows_are_json_ready(sample_atlas_df, tmp_path):
+    import json
+
+    csv_path = tmp_path / "atlas.csv"
+    sqlite_path = tmp_path / "atlas.sqlite"
+    sample_atlas_df.to_csv(csv_path, index=False)
+    sqlite_sync.build_sqlite_from_csv(csv_path, sqlite_path)
+
+    payload = sqlite_viewer.query_bbox_rows(sqlite_path, 30.15, -97.35, 30.35, -97.15)
+
+    assert payload["total"] == 2
+    assert [row["name"] for row in payload["rows"]] == ["Marker B", "Marker C"]
+    assert payload["rows"][1]["ref:hmdb"] is None
+    json.dumps(payload)
+
+
+def test_sqlite_viewer_text_rows_escape_snippets(sample_atlas_df, tmp_path):
+    csv_path = tmp_path / "atlas.csv"
+    sqlite_path = tmp_path / "atlas.sqlite"
+    df = sample_atlas_df.copy()
+    df["Marker Text"] = ["<b>Fort</b> & friends", "", ""]
+    df.to_csv(csv_path, index=False)
+    sqlite_sync.build_sqlite_from_csv(csv_path, sqlite_path)
+
+    payload = sqlite_viewer.query_text_rows(sqlite_path, "fort", limit=5)
+
+    assert payload["total"] == 1
+    assert payload["offset"] == 0 and payload["limit"] == 5
+    assert payload["rows"][0]["snippet"] == "&lt;b&gt;<mark>Fort</mark>&lt;/b&gt; &amp; friends"
+
+
+def test_sqlite_viewer_pages_and_totals_in_one_query(sample_atlas_df, tmp_path):
+    csv_path = tmp_path / "atlas.csv"
+    sqlite_path = tmp_path / "atlas.sqlite"
+    sample_atlas_df.to_csv(csv_path, index=False)
+    sqlite_sync.build_sqlite_from_csv(csv_path, sqlite_path)
+
+    page = sqlite_viewer.query_rows(sqlite_path, county=["Travis", "Williamson"], limit=1, offset=1)
+    assert page["total"] == 3
+    assert [row["name"] for row in page["rows"]] == ["Marker B"]
+
+    past_end = sqlite_viewer.query_rows(sqlite_path, county="Travis", offset=10)
+    assert past_end["rows"] == [] and past_end["total"] == 2
+
+
+def test_sqlite_viewer_pool_reuses_read_only_connections(sample_atlas_df, tmp_path):
+    import sqlite3
+
+    import pytest
+
+    csv_path = tmp_path / "atlas.csv"
+    sqlite_path = tmp_path / "atlas.sqlite"
+    sample_atlas_df.to_csv(csv_path, index=False)
+    sqlite_sync.build_sqlite_from_csv(csv_path, sqlite_path)
+
+    pool = sqlite_viewer.connection_pool(sqlite_path)
+    assert sqlite_viewer.connection_pool(str(sqlite_path)) is pool
+    for _ in range(3):
+        sqlite_viewer.query_rows(sqlite_path, county="Travis")
+    assert pool.opened == 1
+    assert pool.immutable is False
+
+    with pool.connection() as conn:
+        with pytest.raises(sqlite3.OperationalError, match="readonly"):
+            conn.execute("DELETE FROM atlas")
+
+    # A rebuild that changes the columns is seen through the cached metadata.
+    columns = sqlite_viewer._available_display_columns(sqlite_path, "atlas")
+    assert "estimated:Latitude" not in columns
+    sample_atlas_df.assign(**{"estimated:Latitude": 30.0}).to_csv(csv_path, index=False)
+    sqlite_sync.build_sqlite_from_csv(csv_path, sqlite_path)
+    columns = sqlite_viewer._available_display_columns(sqlite_path, "atlas")
+    assert "estimated:Latitude" in columns
+
+
+def test_sqlite_viewer_request_stats_percentiles():
+    stats = sqlite_viewer.RequestStats(window=100)
+    for ms in range(1, 101):
+        stats.record("/api/search", ms / 1000)
+    stats.record("/api/options", 0.002)
+
+    summary = stats.summary()
+
+    assert summary["/api/search"] == {
+        "count": 100,
+        "p50_ms": 50.0,
+        "p90_ms": 90.0,
+        "p99_ms": 99.0,
+        "max_ms": 100.0,
+    }
+    assert summary["/api/options"]["count"] == 1
+
+
+def test_sqlite_viewer_serves_stats_endpoint(sample_atlas_df, tmp_path):
+    import json
+    import threading
+    import time
+    from urllib.request import urlopen
+
+    csv_path = tmp_path / "atlas.csv"
+    sqlite_path = tmp_path / "atlas.sqlite"
+    sample_atlas_df.to_csv(csv_path, index=False)
+    sqlite_sync.build_sqlite_from_csv(csv_path, sqlite_path)
+
+    server = sqlite_viewer.serve_sqlite_browser(sqlite_path, port=0, open_browser=False)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+    try:
+        for _ in range(2):
+            urlopen(f"{base}/api/search?county=Travis").read()
+        # A request is recorded just after its response is written, so the
+        # second search may still be finishing on its own thread.
+        for _ in range(50):
+            stats = json.loads(urlopen(f"{base}/api/stats").read())
+            if stats["requests"].get("/api/search", {}).get("count") == 2:
+                break
+            time.sleep(0.01)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert stats["requests"]["/api/search"]["count"] == 2
+    assert stats["requests"]["/api/search"]["p50_ms"] > 0
+    assert stats["connections_opened"] >= 1
+
+
+def _plan(sqlite_path, sql, params):
+    import sqlite3
+
+    with sqlite3.connect(sqlite_path) as conn:
+        return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+
+
+def test_sqlite_viewer_queries_use_key_indexes(sample_atlas_df, tmp_path):
+    import pandas as pd
+
+    # Statewide-like spread: many counties, each with a few cities, so ANALYZE
+    # tells the planner a county or city is selective.
+    df = pd.concat([sample_atlas_df] * 200, ignore_index=True)
+    df["ref:US-TX:thc"] = pd.array(range(1, len(df) + 1), dtype="Int32")
+    df["ref:hmdb"] = pd.NA
+    df["addr:county"] = [f"County {i % 50}" for i in range(len(df))]
+    df["addr:city"] = [f"City {i % 150}" for i in range(len(df))]
+    df.loc[:2, ["addr:county", "addr:city"]] = [["Travis", "Austin"]] * 3
+    csv_path = tmp_path / "atlas.csv"
+    sqlite_path = tmp_path / "atlas.sqlite"
+    df.to_csv(csv_path, index=False)
+    sqlite_sync.build_sqlite_from_csv(csv_path, sqlite_path)
+
+    columns = sqlite_viewer._available_display_columns(sqlite_path, "atlas")
+    filters = [
+        ("County 7", None),
+        (["County 7", "County 8"], None),
+        (None, "City 9"),
+        ("County 7", ["City 7", "City 57"]),
+    ]
+    for county, city in filters:
+        sql, params = sqlite_viewer._rows_sql("atlas", columns, county, city)
+        plan = _plan(sqlite_path, sql, [*params, 50, 0])
+        table_steps = [step for step in plan if " atlas" in step]
+        assert table_steps, plan
+        assert all("USING" in step and "INDEX" in step for step in table_steps), plan
+        assert any("idx_atlas_" in step and "_name_key" in step for step in table_steps), plan
+
+    # A later window of the whole table seeks into the index and reads it in
+    # order: no scan of the table and no sort.
+    sql, params = sqlite_viewer._rows_sql(
+        "atlas", columns, cursor=["county 7", "city 7", "marker a", 8], with_total=False
+    )
+    plan = _plan(sqlite_path, sql, [*params, 50, 0])
+    assert all("USING INDEX idx_atlas_county_city_name_key" in s for s in plan), plan
+
+    page = sqlite_viewer.query_rows(sqlite_path, county="travis", city="AUSTIN", limit=2)
+    assert page["total"] == 3
+    assert [row["ref:US-TX:thc"] for row in page["rows"]] == [1, 2]
+
+    options = _plan(
+        sqlite_path,
+        'SELECT DISTINCT "addr:county" FROM atlas '
+        "WHERE COALESCE(TRIM(\"addr:county\"), '') <> '' "
+        'ORDER BY LOWER("addr:county"), "addr:county"',
+        [],
+    )
+    assert any("COVERING INDEX" in step for step in options), options
+
+
+def _statewide(tmp_path, n=120):
+    import pandas as pd
+
+    df = pd.DataFrame(
+        {
+            "ref:US-TX:thc": pd.array(range(1, n + 1), dtype="Int32"),
+            "ref:hmdb": pd.array([i if i % 3 else pd.NA for i in range(n)], dtype="Int32"),
+            "OsmNodeID": pd.array([pd.NA] * n, dtype="Int64"),
+            "name": [f"Marker {chr(65 + i % 26)}{i}" for i in range(n)],
+            "addr:county": [f"County {i % 7}" for i in range(n)],
+            "addr:city": [f"City {i % 11}" for i in range(n)],
+        }
+    )
+    csv_path = tmp_path / "atlas.csv"
+    sqlite_path = tmp_path / "atlas.sqlite"
+    df.to_csv(csv_path, index=False)
+    sqlite_sync.build_sqlite_from_csv(csv_path, sqlite_path)
+    return sqlite_path
+
+
+def _all_windows(sqlite_path, **kwargs):
+    ids, after, totals = [], None, []
+    while True:
+        page = sqlite_viewer.query_rows(sqlite_path, after=after, **kwargs)
+        totals.append(page["total"])
+        ids += [row["ref:US-TX:thc"] for row in page["rows"]]
+        after = page["next"]
+        if after is None:
+            return ids, totals
+
+
+def test_sqlite_viewer_keyset_windows_cover_every_row_once(tmp_path):
+    sqlite_path = _statewide(tmp_path)
+
+    for sort, descending in [(None, False), ("name", True), ("ref:hmdb", False)]:
+        ids, totals = _all_windows(
+            sqlite_path, all_rows=True, limit=25, sort=sort, descending=descending
+        )
+        whole = sqlite_viewer.query_rows(
+            sqlite_path, all_rows=True, limit=1000, sort=sort, descending=descending
+        )
+        assert ids == [row["ref:US-TX:thc"] for row in whole["rows"]]
+        assert sorted(ids) == list(range(1, 121))
+        # Counted once, on the first window.
+        assert totals[0] == 120 and set(totals[1:]) == {None}
+
+    # Blank hmdb IDs sort after every number.
+    by_hmdb, _ = _all_windows(sqlite_path, all_rows=True, limit=50, sort="ref:hmdb")
+    assert by_hmdb[-40:] == [i + 1 for i in range(0, 120, 3)]
+
+
+def test_sqlite_viewer_filters_and_sorts_server_side(tmp_path):
+    import pytest
+
+    sqlite_path = _statewide(tmp_path)
+
+    page = sqlite_viewer.query_rows(
+        sqlite_path,
+        county="County 2",
+        filters={"name": "1"},
+        blank=["ref:hmdb"],
+        sort="ref:US-TX:thc",
+        descending=True,
+    )
+    assert [row["name"] for row in page["rows"]] == ["Marker K114", "Marker Z51"]
+    assert page["total"] == 2 and page["next"] is None
+
+    # LIKE wildcards in the filter text are matched literally.
+    assert sqlite_viewer.query_rows(sqlite_path, all_rows=True, filters={"name": "%"})["total"] == 0
+
+    with pytest.raises(ValueError, match="cannot sort or filter"):
+        sqlite_viewer.query_rows(sqlite_path, all_rows=True, sort="Marker Text")
+    first = sqlite_viewer.query_rows(sqlite_path, all_rows=True, limit=10)
+    with pytest.raises(ValueError, match="does not match the sort order"):
+        sqlite_viewer.query_rows(sqlite_path, all_rows=True, sort="name", after=first["next"])
+
+
+def test_sqlite_viewer_negotiates_encoding(monkeypatch):
+    monkeypatch.setattr(sqlite_viewer, "brotli", None)
+    assert sqlite_viewer.negotiate_encoding("gzip, deflate, br") == "gzip"
+    assert sqlite_viewer.negotiate_encoding("gzip;q=0, identity") is None
+    assert sqlite_viewer.negotiate_encoding("*") == "gzip"
+    assert sqlite_viewer.negotiate_encoding(None) is None
+
+    small, coding = sqlite_viewer.encode_body(b"{}", "gzip")
+    assert (small, coding) == (b"{}", None)
+
+
+def test_sqlite_viewer_revalidates_with_etags(sample_atlas_df, tmp_path):
+    import gzip
+    import json
+    import threading
+    from urllib.error import HTTPError
+    from urllib.request import Request, urlopen
+
+    csv_path = tmp_path / "atlas.csv"
+    sqlite_path = tmp_path / "atlas.sqlite"
+    sample_atlas_df.to_csv(csv_path, index=False)
+    sqlite_sync.build_sqlite_from_csv(csv_path, sqlite_path)
+
+    def get(path, **headers):
+        try:
+            return urlopen(Request(f"{base}{path}", headers=headers))
+        except HTTPError as exc:
+            return exc
+
+    server = sqlite_viewer.serve_sqlite_browser(sqlite_path, port=0, open_browser=False)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+    try:
+        first = get("/api/options")
+        etag = first.headers["ETag"]
+        body = first.read()
+        repeat = get("/api/options", **{"If-None-Match": etag})
+        other = get("/api/search?county=Travis", **{"If-None-Match": etag})
+
+        search = get("/api/search?county=Travis&all=1", **{"Accept-Encoding": "gzip"})
+        search_tag = search.headers["ETag"]
+        search_coding = search.headers.get("Content-Encoding")
+        search_body = search.read()
+
+        sample_atlas_df.loc[0, "name"] = "Renamed Marker"
+        sample_atlas_df.to_csv(csv_path, index=False)
+        sqlite_sync.build_sqlite_from_csv(csv_path, sqlite_path)
+        after = get("/api/search?county=Travis&all=1", **{"If-None-Match": search_tag})
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert first.status == 200
+    assert b"\n" not in body and b", " not in body
+    assert json.loads(body)["counties"] == ["Travis", "Williamson"]
+    assert first.headers["Cache-Control"] == "no-cache"
+    assert repeat.status == 304
+    assert repeat.headers["ETag"] == etag
+    assert repeat.headers["Content-Length"] is None
+    assert other.status == 200
+
+    if search_coding == "gzip":
+        search_body = gzip.decompress(search_body)
+    assert json.loads(search_body)["total"] == 2
+
+    assert after.status == 200
+    assert after.headers["ETag"] != search_tag
+
+
+def test_sqlite_viewer_answers_a_failed_handler_with_500(sample_atlas_df, tmp_path):
+    import threading
+    from urllib.error import HTTPError
+    from urllib.request import urlopen
+
+    csv_path = tmp_path / "atlas.csv"
+    sqlite_path = tmp_path / "atlas.sqlite"
+    sample_atlas_df.to_csv(csv_path, index=False)
+    sqlite_sync.build_sqlite_from_csv(csv_path, sqlite_path)
+
+    server = sqlite_viewer.serve_sqlite_browser(sqlite_path, port=0, open_browser=False)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    sqlite_path.unlink()  # the read-only pool cannot open it any more
+    try:
+        urlopen(f"http://127.0.0.1:{server.server_port}/api/options")
+    except HTTPError as exc:
+        failed = exc
+    else:  # pragma: no cover
+        raise AssertionError("a missing database should answer 500")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert failed.code == 500
+    assert failed.headers["Connection"] == "close"
+
+
+def test_sqlite_viewer_compresses_large_payloads():
+    import gzip
+
+    body = b'{"rows":[' + b'{"name":"x"},' * 200 + b"]}"
+    packed, coding = sqlite_viewer.encode_body(body, "gzip")
+
+    assert coding == "gzip"
+    assert len(packed) < len(body)
+    assert gzip.decompress(packed) == body
+
+
+def test_sqlite_viewer_streams_row_batches(sample_atlas_df, tmp_path):
+    import json
+
+    csv_path = tmp_path / "atlas.csv"
+    sqlite_path = tmp_path / "atlas.sqlite"
+    sample_atlas_df.to_csv(csv_path, index=False)
+    sqlite_sync.build_sqlite_from_csv(csv_path, sqlite_path)
+
+    batches = list(
+        sqlite_viewer.iter_row_batches(sqlite_path, batch_size=2, all_rows=True)
+    )
+    rows = [json.loads(line) for batch in batches for line in batch.splitlines()]
+
+    assert len(batches) == 2
+    assert [row["name"] for row in rows] == sorted(sample_atlas_df["name"])
+
+    try:
+        sqlite_viewer.iter_row_batches(sqlite_path, county="Travis", sort="bogus")
+    except ValueError as exc:
+        assert "bogus" in str(exc)
+    else:  # pragma: no cover
+        raise AssertionError("bad sort column should fail before streaming")
+
+
+def test_async_viewer_keeps_connections_alive_and_streams(sample_atlas_df, tmp_path):
+    import http.client
+    import json
+    import threading
+
+    from thc_toolkit import sqlite_viewer_async
+
+    csv_path = tmp_path / "atlas.csv"
+    sqlite_path = tmp_path / "atlas.sqlite"
+    sample_atlas_df.to_csv(csv_path, index=False)
+    sqlite_sync.build_sqlite_from_csv(csv_path, sqlite_path)
+
+    server = sqlite_viewer_async.serve_async_browser(
+        sqlite_path, port=0, open_browser=False, workers=2
+    )
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        conn = http.client.HTTPConnection("127.0.0.1", server.server_port, timeout=5)
+        conn.request("GET", "/api/options")
+        options = conn.getresponse()
+        options_body = json.loads(options.read())
+        sock = conn.sock
+
+        conn.request("GET", "/api/stream?county=Travis")
+        stream = conn.getresponse()
+        stream_body = stream.read()
+
+        conn.request("GET", "/api/options", headers={"If-None-Match": options.headers["ETag"]})
+        revalidated = conn.getresponse()
+        revalidated.read()
+
+        conn.request("POST", "/api/options", body=b"x")
+        refused = conn.getresponse()
+        refused.read()
+        reused = conn.sock is sock
+        conn.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+    thread.join(timeout=5)
+
+    assert options.status == 200
+    assert options_body["counties"] == ["Travis", "Williamson"]
+    assert stream.status == 200
+    assert stream.headers["Transfer-Encoding"] == "chunked"
+    assert stream.headers["Content-Type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in stream_body.splitlines()]
+    assert [row["addr:county"] for row in rows] == ["Travis", "Travis"]
+    assert revalidated.status == 304
+    assert revalidated.headers["Content-Length"] is None
+    assert refused.status == 405
+    assert reused
+    assert not thread.is_alive()
+
+
+def test_async_viewer_answers_a_failed_handler_with_500(sample_atlas_df, tmp_path):
+    import http.client
+    import sqlite3
+    import threading
+
+    from thc_toolkit import sqlite_viewer_async
+
+    csv_path = tmp_path / "atlas.csv"
+    sqlite_path = tmp_path / "atlas.sqlite"
+    sample_atlas_df.to_csv(csv_path, index=False)
+    sqlite_sync.build_sqlite_from_csv(csv_path, sqlite_path)
+
+    server = sqlite_viewer_async.serve_async_browser(
+        sqlite_path, port=0, open_browser=False, workers=1
+    )
+
+    def broken(target, headers):
+        raise sqlite3.OperationalError("database is locked")
+
+    server.app.handle = broken
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        conn = http.client.HTTPConnection("127.0.0.1", server.server_port, timeout=5)
+        conn.request("GET", "/api/options")
+        failed = conn.getresponse()
+        failed.read()
+        conn.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+    thread.join(timeout=5)
+
+    assert failed.status == 500
+    assert failed.headers["Connection"] == "close"
+
+
+def test_async_viewer_drops_a_stream_that_fails_midway(sample_atlas_df, tmp_path, capsys):
+    import http.client
+    import threading
+
+    from thc_toolkit import sqlite_viewer_async
+
+    csv_path = tmp_path / "atlas.csv"
+    sqlite_path = tmp_path / "atlas.sqlite"
+    sample_atlas_df.to_csv(csv_path, index=False)
+    sqlite_sync.build_sqlite_from_csv(csv_path, sqlite_path)
+
+    server = sqlite_viewer_async.serve_async_browser(
+        sqlite_path, port=0, open_browser=False, workers=1
+    )
+
+    def batches():
+        yield b'{"name": "first"}\n'
+        raise RuntimeError("cursor went away")
+
+    server.app.handle = lambda target, headers: sqlite_viewer.ViewerResponse(
+        200, [("Content-Type", "application/x-ndjson")], batches()
+    )
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        conn = http.client.HTTPConnection("127.0.0.1", server.server_port, timeout=5)
+        conn.request("GET", "/api/stream")
+        response = conn.getresponse()
+        try:
+            response.read()
+        except http.client.IncompleteRead as exc:
+            truncated = exc
+        else:  # pragma: no cover
+            raise AssertionError("a failed stream must not end like a complete one")
+        conn.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+    thread.join(timeout=5)
+
+    assert response.status == 200
+    assert truncated.partial == b'{"name": "first"}\n'
+    assert "cursor went away" in capsys.readouterr().err
+    assert not thread.is_alive()
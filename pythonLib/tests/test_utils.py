@@ -190,6 +190,18 @@ class TestUtils:
         # Should not raise even when refs/coords/tags contain missing values.
         json.dumps(nodes)
 
+    def test_create_nodes_json_text_is_stable(self, sample_atlas_df):
+        # Tag order and value types (int refs, str dates skipped when NA) are
+        # part of the nodes.json contract.
+        node = create_nodes(sample_atlas_df)[2]
+        assert json.dumps(node) == (
+            '{"lat": 30.3, "lon": -97.3, "tags": {"name": "Marker C", '
+            '"historic": "memorial", "memorial": "plaque", "material": "aluminium", '
+            '"operator": "Texas Historical Commission", "operator:wikidata": "Q2397965", '
+            '"ref:US-TX:thc": 1003, "ref:hmdb": null, "website": "", '
+            '"start_date": 1970, "addr:city": "Round Rock", "addr:county": "Williamson"}}'
+        )
+
     def test_create_nodes_invalid_coords_raise(self, sample_atlas_df):
         bad = sample_atlas_df.copy()
         bad["verified:Latitude"] = bad["verified:Latitude"].astype("object")
@@ -0,0 +1,150 @@
+"""Columnar sidecar cache for atlas_db.csv.
+
+Every subcommand used to re-parse the full atlas with ``pd.read_csv``: 17.5k
+rows by 33 columns, most of the cost in the long ``Marker Text`` inscriptions.
+The parsed, typed frame is now written once to a Parquet file beside the CSV
+and later runs read that instead -- memory-mapped, and only for the columns
+the caller asked for. Parsing itself lives in ``atlas_frame``; this module
+only stores and retrieves what it produced.
+
+The sidecar is keyed on the CSV's size, mtime and SHA-256, plus a digest of
+the schema it was parsed with:
+
+* Size differs -> stale, rebuild.
+* Size and mtime match -> fresh; the hash is not recomputed.
+* Size matches but mtime moved (``git checkout``, ``touch``, a copy) -> the
+  hash decides. Hashing the file is far cheaper than parsing it, so a
+  content-identical CSV keeps its cache.
+
+Parquet needs ``pyarrow`` (``pip install -e ".[cache]"``). Without it the cache
+is simply off and the loader parses the CSV every time. A cache that cannot be
+written (read-only checkout, full disk) is skipped the same way; it is an
+optimization, never a reason to fail a run.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - exercised only without the extra
+    pa = pq = None
+
+CACHE_SUFFIX = ".cache.parquet"
+METADATA_KEY = b"thc_atlas_fingerprint"
+_HASH_CHUNK = 1 << 20
+
+
+def available() -> bool:
+    """True when pyarrow is importable and the cache can be used."""
+    return pq is not None
+
+
+def schema_digest(schema) -> str:
+    """Short, stable digest of a loader's schema; part of the sidecar's name."""
+    text = json.dumps(schema, sort_keys=True, default=str)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:10]
+
+
+def sidecar_path(csv_path: str | os.PathLike, key: str) -> Path:
+    """``atlas_db.csv`` -> ``.atlas_db.csv.<key>.cache.parquet`` alongside it.
+
+    ``key`` is a :func:`schema_digest`, so two loaders that type the columns
+    differently each keep their own sidecar instead of overwriting one
+    another's.
+    """
+    p = Path(csv_path)
+    return p.with_name(f".{p.name}.{key}{CACHE_SUFFIX}")
+
+
+def file_sha256(path: str | os.PathLike) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(_HASH_CHUNK):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def fingerprint(csv_path: str | os.PathLike, with_hash: bool = True) -> dict:
+    st = os.stat(csv_path)
+    out = {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+    if with_hash:
+        out["sha256"] = file_sha256(csv_path)
+    return out
+
+
+def _stored_fingerprint(cache: Path) -> dict | None:
+    try:
+        meta = pq.read_schema(cache).metadata or {}
+    except (OSError, pa.ArrowException):
+        return None
+    raw = meta.get(METADATA_KEY)
+    return json.loads(raw) if raw else None
+
+
+def is_fresh(csv_path: str | os.PathLike, key: str) -> bool:
+    """Whether the sidecar for ``csv_path`` still describes the CSV on disk."""
+    if not available():
+        return False
+    cache = sidecar_path(csv_path, key)
+    if not cache.exists():
+        return False
+    stored = _stored_fingerprint(cache)
+    if not stored:
+        return False
+    current = fingerprint(csv_path, with_hash=False)
+    if current["size"] != stored.get("size"):
+        return False
+    if current["mtime_ns"] == stored.get("mtime_ns"):
+        return True
+    return file_sha256(csv_path) == stored.get("sha256")
+
+
+def load(
+    csv_path: str | os.PathLike,
+    key: str,
+    columns: list[str] | None = None,
+    rows=None,
+) -> pd.DataFrame | None:
+    """Return the cached frame, or None on a miss.
+
+    ``columns`` projects the read; ``rows`` is an optional boolean mask over
+    the full table, applied in Arrow before anything is converted to pandas.
+    """
+    if not is_fresh(csv_path, key):
+        return None
+    cache = sidecar_path(csv_path, key)
+    try:
+        if columns is not None:
+            present = set(pq.read_schema(cache).names)
+            columns = [c for c in columns if c in present]
+        table = pq.read_table(cache, columns=columns, memory_map=True)
+        if rows is not None:
+            table = table.filter(pa.array(rows, type=pa.bool_()))
+    except (OSError, pa.ArrowException):
+        return None
+    return table.to_pandas()
+
+
+def store(csv_path: str | os.PathLike, df: pd.DataFrame, key: str) -> Path | None:
+    """Write ``df`` as the sidecar for ``csv_path``; None if it could not be."""
+    if not available():
+        return None
+    cache = sidecar_path(csv_path, key)
+    tmp = cache.with_name(cache.name + ".tmp")
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        meta = dict(table.schema.metadata or {})
+        meta[METADATA_KEY] = json.dumps(fingerprint(csv_path)).encode("utf-8")
+        pq.write_table(table.replace_schema_metadata(meta), tmp)
+        os.replace(tmp, cache)
+    except (OSError, pa.ArrowException):
+        tmp.unlink(missing_ok=True)
+        return None
+    return cache
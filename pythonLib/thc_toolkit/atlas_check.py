@@ -30,6 +30,7 @@ from pathlib import Path
 
 import pandas as pd
 
+from .atlas_frame import read_atlas_raw
 from .hmdb_sync import IGNORE_FILE_NAME, load_ignored_marker_ids
 
 DEFAULT_ATLAS = "atlas_db.csv"
@@ -42,7 +43,7 @@ def _s(v) -> str:
 
 
 def _load(path: Path) -> pd.DataFrame:
-    return pd.read_csv(path, dtype=str, low_memory=False, keep_default_na=False)
+    return read_atlas_raw(path)
 
 
 def check_ignore_not_claimed_by_atlas(atlas: pd.DataFrame, ignored: set[str]) -> list[str]:
@@ -0,0 +1,197 @@
+"""The one loader for atlas_db.csv.
+
+Six modules used to read the atlas, each its own way: ``utils.read_atlas`` and
+``osm_cli.read_atlas`` with two slightly different dtype maps,
+``counties_cli``, ``route_cli`` and ``sqlite_sync`` with plain type inference,
+``atlas_check`` with everything as text, and ``hmdb_sync`` through
+``csv.DictReader``. All of them parsed every column, including the long
+``Marker Text`` inscriptions, whatever they went on to use.
+
+``AtlasFrame`` replaces them. The schema is declared once in ``ATLAS_SCHEMA``
+and coerced with the same strict parsers the rest of the toolkit validates
+with, so ``yes``/``no`` flags and ``1001.0`` IDs load everywhere and a bad
+value raises the same message everywhere. Callers say what they need:
+
+* ``columns=`` -- only these columns are parsed (or read from the cache).
+* ``where=`` -- a :class:`Where` predicate. Its columns are read first, the
+  mask is computed, and the main pass then skips every other record, so a
+  single-county map never builds ``Marker Text`` for the other 250 counties.
+
+``raw=True`` keeps every cell as the literal string in the file (blank is
+``""``), for the checks and rewrites that must see exactly what is on disk.
+
+Reads go through the Parquet sidecar in ``atlas_cache`` when pyarrow is
+installed; the first read after the CSV changes parses every column to
+rebuild it, later reads are projected and filtered straight from the cache.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterable
+
+import numpy as np
+import pandas as pd
+
+# Module imports rather than names: utils imports this module back for
+# ``read_atlas``, and either side may be loaded first.
+try:
+    from . import atlas_cache, utils
+except ImportError:  # pragma: no cover - compatibility for direct script execution
+    import atlas_cache  # type: ignore
+    import utils  # type: ignore
+
+# Columns that get a non-inferred type. Anything not listed (coordinates, free
+# text) is left to pandas: floats stay float, text stays text.
+ATLAS_SCHEMA = {
+    "ref:US-TX:thc": "Int32",
+    "ref:hmdb": "Int32",
+    "OsmNodeID": "Int64",
+    "start_date": "Int32",
+    "UTM Easting": "Int32",
+    "UTM Northing": "Int32",
+    "UTM Zone": "Int16",
+    "isActive": "boolean",
+    "isHMDB": "boolean",
+    "isOSM": "boolean",
+    "isMissing": "boolean",
+    "isPending": "boolean",
+    "isPrivate": "boolean",
+    "Private Property": "boolean",
+    "Recorded Texas Historic Landmark": "boolean",
+    "inGoogle": "boolean",
+}
+
+
+@dataclass(frozen=True)
+class Where:
+    """Row predicate applied while loading.
+
+    ``test`` receives a frame holding (at least) ``columns``, already typed by
+    the schema, and returns a boolean mask; NA counts as False.
+    """
+
+    columns: tuple[str, ...]
+    test: Callable[[pd.DataFrame], pd.Series]
+
+
+@dataclass
+class AtlasFrame:
+    schema: dict[str, str] = field(default_factory=lambda: dict(ATLAS_SCHEMA))
+    raw: bool = False
+
+    # ------------------------------------------------------------------ API
+
+    def read(
+        self,
+        path: str | Path,
+        columns: Iterable[str] | None = None,
+        where: Where | None = None,
+        require: Iterable[str] = (),
+        context: str = "atlas",
+        cache: bool = True,
+    ) -> pd.DataFrame:
+        """Load ``path`` projected to ``columns`` and filtered by ``where``.
+
+        ``require`` (plus the predicate's own columns) must be in the header,
+        otherwise the usual "missing required column(s)" ValueError is raised
+        before anything is parsed. Requested ``columns`` the file lacks are
+        ignored. The result has a fresh RangeIndex.
+        """
+        header = self.header(path)
+        needed = list(require) + list(where.columns if where else ())
+        utils.require_columns(pd.DataFrame(columns=header), needed, context=context)
+        if columns is not None:
+            columns = [c for c in columns if c in header]
+
+        if cache and atlas_cache.available():
+            return self._read_cached(path, columns, where, context)
+        return self._read_pushdown(path, columns, where, context)
+
+    def header(self, path: str | Path) -> list[str]:
+        return list(pd.read_csv(path, nrows=0).columns)
+
+    def cache_key(self) -> str:
+        return atlas_cache.schema_digest({"schema": self.schema, "raw": self.raw})
+
+    # ------------------------------------------------------------- parsing
+
+    def _parse(self, path, usecols=None, skiprows=None, context="atlas"):
+        if self.raw:
+            return pd.read_csv(
+                path,
+                usecols=usecols,
+                skiprows=skiprows,
+                dtype=str,
+                keep_default_na=False,
+                low_memory=False,
+            )
+        df = pd.read_csv(
+            path,
+            usecols=usecols,
+            skiprows=skiprows,
+            dtype={col: str for col in self.schema},
+            low_memory=False,
+        )
+        return self._coerce(df, context)
+
+    def _coerce(self, df: pd.DataFrame, context: str) -> pd.DataFrame:
+        for col, dtype in self.schema.items():
+            if col not in df.columns:
+                continue
+            if dtype == "boolean":
+                df[col] = utils.parse_bool_series(
+                    df[col], col, context=context, na_value=None
+                )
+            else:
+                df[col] = utils.coerce_nullable_int_series(
+                    df[col], col, context=context
+                ).astype(dtype)
+        return df
+
+    @staticmethod
+    def _mask(where: Where, df: pd.DataFrame) -> np.ndarray:
+        mask = pd.Series(where.test(df), index=df.index)
+        return mask.fillna(False).astype(bool).to_numpy()
+
+    def _read_pushdown(self, path, columns, where, context):
+        skiprows = None
+        if where is not None:
+            probe = self._parse(path, usecols=list(where.columns), context=context)
+            keep = set(np.flatnonzero(self._mask(where, probe)).tolist())
+            # Row 0 is the header; data row i is line-record i + 1.
+            skiprows = lambda i: i > 0 and (i - 1) not in keep  # noqa: E731
+        df = self._parse(path, usecols=columns, skiprows=skiprows, context=context)
+        if columns is not None:
+            df = df[columns]
+        return df
+
+    def _read_cached(self, path, columns, where, context):
+        key = self.cache_key()
+        if atlas_cache.is_fresh(path, key):
+            rows = None
+            if where is not None:
+                probe = atlas_cache.load(path, key, columns=list(where.columns))
+                rows = None if probe is None else self._mask(where, probe)
+            if where is None or rows is not None:
+                df = atlas_cache.load(path, key, columns=columns, rows=rows)
+                if df is not None:
+                    return df
+
+        full = self._parse(path, context=context)
+        atlas_cache.store(path, full, key)
+        if where is not None:
+            full = full.loc[self._mask(where, full)].reset_index(drop=True)
+        if columns is not None:
+            full = full[columns]
+        return full
+
+
+def read_atlas_frame(path, columns=None, where=None, **kwargs) -> pd.DataFrame:
+    """Typed atlas load; shorthand for ``AtlasFrame().read(...)``."""
+    return AtlasFrame().read(path, columns=columns, where=where, **kwargs)
+
+
+def read_atlas_raw(path, columns=None, where=None, **kwargs) -> pd.DataFrame:
+    """Atlas load with every cell kept as its literal string."""
+    return AtlasFrame(raw=True).read(path, columns=columns, where=where, **kwargs)
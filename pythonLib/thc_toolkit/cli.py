@@ -7,6 +7,7 @@ Commands:
     thc counties   → export county-based CSVs (supports --simple)
     thc route      → KML route + proximity mapping tools
     thc sqlite     → CSV / SQLite sync tools
+    thc search     → full-text search of the SQLite build
     thc hmdb       → reconcile / apply hmdb.org enrichments into atlas_db.csv
     thc docs       → show docs for subcommands
 
@@ -17,6 +18,7 @@ Examples:
     thc route --track ../scripts/test.kml --data ../atlas_db.csv --unmapped --openmap
     thc sqlite build --csv ../atlas_db.csv --sqlite atlas_db.sqlite
     thc sqlite browse --sqlite atlas_db.sqlite
+    thc search "fort davis" --sqlite atlas_db.sqlite
 """
 
 import argparse
@@ -31,6 +33,15 @@ from . import atlas_check
 from . import atlas_cli
 from .utils import convert_hmdb_csv
 
+
+def positive_int(value):
+    """argparse type for counts that start at 1 (``--page``, ``--limit``)."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be 1 or more, got {value}")
+    return number
+
+
 # ------------------- Subcommand Implementations ------------------- #
 
 
@@ -73,6 +84,7 @@ def run_route(args):
         geojson=args.geojson,
         kml=args.kml,
         openmap=args.openmap,
+        distance_mode=args.distance_mode,
     )
 
 
@@ -143,6 +155,7 @@ def run_sqlite_build(args):
         args.sqlite,
         table_name=args.table,
         strict_ids=args.strict_ids,
+        incremental=args.incremental,
     )
 
 
@@ -151,17 +164,11 @@ def run_sqlite_export(args):
 
 
 def run_sqlite_verify(args):
-    sqlite_sync.verify_sqlite_sync(args.csv, args.sqlite, table_name=args.table)
+    sqlite_sync.run_verify(args)
 
 
 def run_sqlite_browse(args):
-    server = sqlite_viewer.serve_sqlite_browser(
-        args.sqlite,
-        table_name=args.table,
-        host=args.host,
-        port=args.port,
-        open_browser=not args.no_open,
-    )
+    server = sqlite_viewer.serve_from_args(args)
     try:
         server.serve_forever()
     except KeyboardInterrupt:
@@ -170,6 +177,40 @@ def run_sqlite_browse(args):
         server.server_close()
 
 
+def run_search(args):
+    from rich.console import Console
+    from rich.text import Text
+
+    sqlite_path = sqlite_viewer.resolve_default_sqlite_path(args.sqlite)
+    offset = (args.page - 1) * args.limit
+    result = sqlite_sync.search_text(
+        sqlite_path,
+        args.query,
+        table_name=args.table,
+        limit=args.limit,
+        offset=offset,
+        raw=args.raw,
+        highlight=("\x02", "\x03"),
+    )
+    console = Console()
+    for n, row in enumerate(result["rows"], start=offset + 1):
+        where = ", ".join(str(v) for v in (row.get("addr:city"), row.get("addr:county")) if v)
+        console.print(
+            Text(f"{n:>4}. ", style="dim")
+            + Text(str(row.get("name") or ""), style="bold")
+            + Text(f"  THC {row.get('ref:US-TX:thc') or '?'}  {where}", style="dim")
+        )
+        snippet = Text("      ")
+        for i, part in enumerate(str(row["snippet"] or "").replace("\x03", "\x02").split("\x02")):
+            snippet.append(part, style="bold yellow" if i % 2 else None)
+        console.print(snippet)
+    shown = len(result["rows"])
+    if shown:
+        print(f"[INFO] {offset + 1}-{offset + shown} of {result['total']} match(es)")
+    else:
+        print(f"[INFO] No matches ({result['total']} total)")
+
+
 # ---------------------------- CLI Root ---------------------------- #
 
 
@@ -204,6 +245,12 @@ def main():
     r.add_argument("--track", required=True)
     r.add_argument("--data", required=True)
     r.add_argument("--radius", type=float, default=5)
+    r.add_argument(
+        "--distance-mode",
+        choices=route_cli.DISTANCE_MODES,
+        default=route_cli.DEFAULT_DISTANCE_MODE,
+        help="mercator (original), utm (per-marker zone) or geodesic",
+    )
     group = r.add_mutually_exclusive_group()
     group.add_argument(
         "--unmapped", action="store_true", help="show only unmapped markers"
@@ -246,6 +293,30 @@ def main():
     )
     v.set_defaults(func=run_viewcsv)
 
+    # -------- Full-text search --------
+    fts = sub.add_parser(
+        "search",
+        help="Full-text search of names, inscriptions, notes and addresses "
+        "in the SQLite build",
+    )
+    fts.add_argument("query", help='Words to find; "quoted words" match as a phrase')
+    fts.add_argument(
+        "--sqlite",
+        default=None,
+        help="SQLite file to search (defaults to atlas_db.sqlite if found)",
+    )
+    fts.add_argument(
+        "--table", default=sqlite_sync.DEFAULT_TABLE_NAME, help="SQLite table name"
+    )
+    fts.add_argument("--limit", type=positive_int, default=20, help="Results per page (default: 20)")
+    fts.add_argument("--page", type=positive_int, default=1, help="Page of results (default: 1)")
+    fts.add_argument(
+        "--raw",
+        action="store_true",
+        help="Pass the query to SQLite FTS5 as-is (column filters, OR, NEAR)",
+    )
+    fts.set_defaults(func=run_search)
+
     # -------- HMDB Converter --------
     h = sub.add_parser("convertHMDB", help="Convert HMDB CSV → THC format")
     h.add_argument("--input", "-i", required=True)
@@ -282,6 +353,11 @@ def main():
     sb.add_argument(
         "--strict-ids", action="store_true", help="Reject duplicate canonical ID values"
     )
+    sb.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Apply only rows changed since the last build",
+    )
     sb.set_defaults(func=run_sqlite_build)
 
     se = ss.add_parser("export", help="Export CSV from SQLite")
@@ -298,6 +374,7 @@ def main():
     sv.add_argument(
         "--table", default=sqlite_sync.DEFAULT_TABLE_NAME, help="SQLite table name"
     )
+    sqlite_sync.add_verify_arguments(sv)
     sv.set_defaults(func=run_sqlite_verify)
 
     sbrowse = ss.add_parser(
@@ -316,6 +393,7 @@ def main():
     sbrowse.add_argument(
         "--no-open", action="store_true", help="Do not auto-open the browser"
     )
+    sqlite_viewer.add_server_arguments(sbrowse)
     sbrowse.set_defaults(func=run_sqlite_browse)
 
     # -------- HMDB sync CLI --------
@@ -341,6 +419,22 @@ def main():
         action="store_true",
         help="Skip atlas backup before auto-applying exact-name matches",
     )
+    hsr.add_argument(
+        "--state",
+        default=None,
+        help="Reconcile state file (default: <out-dir>/reconcile_state.json)",
+    )
+    hsr.add_argument(
+        "--full",
+        action="store_true",
+        help="Reclassify every hmdb row instead of reusing stored verdicts",
+    )
+    hsr.add_argument(
+        "--delta",
+        action="store_true",
+        help="HMDB is a `thc hmdb fetch` delta CSV: merge it into the stored "
+        "state (needs the .delta.json beside it, taken against the state's export)",
+    )
     hsr.set_defaults(func=hmdb_sync.run_reconcile)
 
     hsa = hss.add_parser(
@@ -359,10 +453,26 @@ def main():
     hsa.add_argument(
         "--no-backup",
         action="store_true",
-        help="Skip writing atlas_db.csv.bak.<ts>",
+        help="Skip writing the atlas_db.csv.bak.<ts>.json reverse patch",
     )
     hsa.set_defaults(func=hmdb_sync.run_apply)
 
+    hsu = hss.add_parser(
+        "restore",
+        help="Undo an apply/reconcile atlas write from its .bak.<ts>.json backup",
+    )
+    hsu.add_argument("backup", help="atlas_db.csv.bak.<ts>.json reverse patch")
+    hsu.add_argument(
+        "--atlas", default="atlas_db.csv", help="Path to atlas_db.csv"
+    )
+    hsu.add_argument(
+        "--force",
+        action="store_true",
+        help="Restore even if atlas changed since the backup (rows are still "
+        "checked by THC#)",
+    )
+    hsu.set_defaults(func=hmdb_sync.run_restore)
+
     hsf = hss.add_parser(
         "fetch",
         help="Download a state-listing CSV from hmdb.org (no browser; "
@@ -386,6 +496,11 @@ def main():
         default=None,
         help=f"Session cookie file (default: {hmdb_fetch.DEFAULT_COOKIE_PATH})",
     )
+    hsf.add_argument(
+        "--force",
+        action="store_true",
+        help="Download even if the listing's marker IDs are unchanged",
+    )
     hsf.set_defaults(func=hmdb_fetch.run_fetch)
 
     # -------- Atlas encoding integrity --------
@@ -28,19 +28,19 @@ try:
         require_columns,
         normalize_match_key,
         normalize_match_series,
-        parse_bool_series,
         coerce_nullable_int_series,
         assert_no_duplicate_ids,
     )
+    from .atlas_frame import Where, read_atlas_frame
 except ImportError:  # pragma: no cover - compatibility for direct script execution
     from utils import (  # type: ignore
         require_columns,
         normalize_match_key,
         normalize_match_series,
-        parse_bool_series,
         coerce_nullable_int_series,
         assert_no_duplicate_ids,
     )
+    from atlas_frame import Where, read_atlas_frame  # type: ignore
 
 # Columns used when --simple is applied
 simple_fields = [
@@ -72,23 +72,24 @@ default_input_candidates = [
 # ====================== Core Load & Filtering ======================
 
 
-def load_filtered(input_file):
-    df = pd.read_csv(input_file, low_memory=False)
-    require_columns(
-        df, ["ref:hmdb", "isMissing", "isPrivate"], context="counties input"
+def _is_unmapped_public(df):
+    """No hmdb page yet, not reported missing, not on private property."""
+    return (
+        df["ref:hmdb"].isna()
+        & ~df["isMissing"].fillna(False)
+        & ~df["isPrivate"].fillna(False)
     )
 
-    # unmapped detection logic
-    hmdb = df["ref:hmdb"].astype(str).str.strip().str.casefold()
-    is_unmapped = hmdb.isin(["", "nan", "none", "null", "na"]) | df["ref:hmdb"].isna()
-    is_missing = parse_bool_series(
-        df["isMissing"], "isMissing", context="counties input", na_value=False
-    )
-    is_private = parse_bool_series(
-        df["isPrivate"], "isPrivate", context="counties input", na_value=False
-    )
-    base = df[is_unmapped & ~is_missing & ~is_private].copy()
 
+UNMAPPED_PUBLIC = Where(("ref:hmdb", "isMissing", "isPrivate"), _is_unmapped_public)
+
+
+def load_filtered(input_file):
+    # The filter runs inside the load, so rows that are mapped, missing or
+    # private are never parsed past the three columns it reads.
+    base = read_atlas_frame(
+        input_file, where=UNMAPPED_PUBLIC, context="counties input"
+    )
     assert_no_duplicate_ids(
         base, ["ref:US-TX:thc", "ref:hmdb"], context="counties filtered input"
     )
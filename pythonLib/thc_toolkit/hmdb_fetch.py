@@ -20,24 +20,45 @@ Cookie file format (default ~/.config/thc-toolkit/hmdb.session)::
     HistoricalMarkerDB=SessionID={GUID}&UserID=NNNN
 
 One line, the literal value of the ``Cookie`` header. Mode 0600 recommended.
+
+Delta fetches: each run records the listing's marker IDs and the CSV it
+wrote in ``.hmdb_fetch.<state>.json`` inside ``--out-dir``. When the next
+listing carries the same IDs, the download is skipped and the previous CSV
+stands (``--force`` downloads anyway; edits to existing entries do not
+show in the ID list). Otherwise the new CSV is compared with the previous
+one by MarkerID and two files are written beside it:
+
+    <name>.delta.csv   — the added and changed rows, in the export's own
+                         columns, for ``thc hmdb reconcile --delta``
+    <name>.delta.json  — the added, removed and changed MarkerIDs, and the
+                         SHA-256 of both exports
 """
 from __future__ import annotations
 
 import argparse
+import csv
+import hashlib
+import json
 import os
 import re
 import sys
-from datetime import date
+from datetime import date, datetime
 from pathlib import Path
 
 import requests
 
+try:
+    from .atlas_cache import file_sha256
+except ImportError:  # pragma: no cover - compatibility for direct script execution
+    from atlas_cache import file_sha256  # type: ignore
+
 BASE = "https://www.hmdb.org"
 DEFAULT_USER_AGENT = (
     "Mozilla/5.0 (X11; Linux x86_64; rv:120.0) Gecko/20100101 Firefox/120.0 "
     "(thc-toolkit/0.1; joelotz@gmail.com)"
 )
 DEFAULT_COOKIE_PATH = "~/.config/thc-toolkit/hmdb.session"
+DOWNLOAD_CHUNK = 1 << 16
 
 # Hidden inputs on the Results.asp page. HMDB's HTML uses single quotes
 # around values (and rarely whitespace around `=`), so we tolerate both.
@@ -137,24 +158,201 @@ def download_csv(
     out_dir: str | os.PathLike = ".",
     filename: str | None = None,
 ) -> Path:
-    """POST to ListsDownload.asp; write the response body verbatim."""
-    r = session.post(
+    """POST to ListsDownload.asp; stream the response body to disk verbatim.
+
+    The body goes to a ``.part`` file in chunks and is renamed into place
+    once complete, so a dropped connection never leaves a truncated CSV
+    under the real name.
+    """
+    with session.post(
         f"{BASE}/ListsDownload.asp",
         data={"markers": markers, "markercount": markercount, "title": title},
         timeout=120,
+        stream=True,
+    ) as r:
+        r.raise_for_status()
+        if filename is None:
+            cd = r.headers.get("Content-Disposition", "")
+            m = _FILENAME_RE.search(cd)
+            filename = m.group(1) if m else (
+                f"HMdb-Entries-{date.today().strftime('%Y%m%d')}.csv"
+            )
+        out_dir = Path(out_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        path = out_dir / filename
+        part = out_dir / f".{filename}.part"
+        try:
+            with part.open("wb") as f:
+                for chunk in r.iter_content(chunk_size=DOWNLOAD_CHUNK):
+                    f.write(chunk)
+            os.replace(part, path)
+        finally:
+            part.unlink(missing_ok=True)
+    return path
+
+
+# ------------------------------ deltas ---------------------------------------
+
+def parse_marker_ids(markers: str) -> list[str]:
+    """The hidden ``markers`` field as a list of IDs."""
+    return [m.strip() for m in markers.split(",") if m.strip()]
+
+
+def fetch_state_path(out_dir: str | os.PathLike, state: str) -> Path:
+    return Path(out_dir) / f".hmdb_fetch.{state.replace(' ', '_')}.json"
+
+
+def load_fetch_state(path: Path) -> dict | None:
+    """The previous fetch's record, or None if there is no usable one."""
+    if not path.exists():
+        return None
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or "markers" not in data or "csv" not in data:
+        return None
+    return data
+
+
+def save_fetch_state(path: Path, data: dict) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(data, indent=1) + "\n", encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _row_digests(path: Path) -> tuple[list[str], dict[str, str]]:
+    """The CSV's header, and a content digest per MarkerID."""
+    with path.open(newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        at = header.index("MarkerID") if "MarkerID" in header else None
+        digests = {}
+        for row in reader:
+            if at is None or at >= len(row) or not row[at].strip():
+                continue
+            text = "\x1f".join(row)
+            digests[row[at].strip()] = hashlib.blake2b(
+                text.encode("utf-8"), digest_size=16
+            ).hexdigest()
+    return header, digests
+
+
+def diff_exports(
+    previous: tuple[list[str], dict[str, str]], current: Path
+) -> dict[str, list[str]]:
+    """Added, removed and changed MarkerIDs between two exports.
+
+    ``previous`` is :func:`_row_digests` of the older export, taken before
+    the download in case the new file lands on the same name. A changed
+    header counts every common row as changed.
+    """
+    old_header, old = previous
+    new_header, new = _row_digests(current)
+    same_header = old_header == new_header
+    return {
+        "added": [i for i in new if i not in old],
+        "removed": [i for i in old if i not in new],
+        "changed": [
+            i for i in new if i in old and (not same_header or new[i] != old[i])
+        ],
+    }
+
+
+def write_delta(
+    current: Path, diff: dict[str, list[str]], previous_name: str, previous_sha256: str
+) -> tuple[Path, Path]:
+    """Write ``<name>.delta.csv`` and ``<name>.delta.json`` beside ``current``.
+
+    The summary names both exports and carries their SHA-256, which
+    ``thc hmdb reconcile --delta`` checks against the export its state was
+    built from; the file name alone usually repeats from one fetch to the next.
+    """
+    wanted = set(diff["added"]) | set(diff["changed"])
+    csv_path = current.with_name(f"{current.stem}.delta.csv")
+    json_path = current.with_name(f"{current.stem}.delta.json")
+    with current.open(newline="", encoding="utf-8-sig") as src, csv_path.open(
+        "w", newline="", encoding="utf-8"
+    ) as dst:
+        reader = csv.reader(src)
+        writer = csv.writer(dst, lineterminator="\n")
+        header = next(reader, [])
+        writer.writerow(header)
+        at = header.index("MarkerID") if "MarkerID" in header else None
+        for row in reader:
+            if at is not None and at < len(row) and row[at].strip() in wanted:
+                writer.writerow(row)
+    summary = {
+        "previous": previous_name,
+        "previous_sha256": previous_sha256,
+        "current": current.name,
+        "current_sha256": file_sha256(current),
+        "counts": {kind: len(ids) for kind, ids in diff.items()},
+        **diff,
+    }
+    json_path.write_text(json.dumps(summary, indent=1) + "\n", encoding="utf-8")
+    return csv_path, json_path
+
+
+def fetch_listing(
+    session: requests.Session,
+    state: str = "Texas",
+    out_dir: str | os.PathLike = ".",
+    filename: str | None = None,
+    force: bool = False,
+) -> dict:
+    """Fetch a state listing, skipping the download if its IDs are unchanged.
+
+    Returns ``path`` (the current full CSV), ``skipped``, ``count``, and,
+    when a previous export was available to compare against, ``diff`` and
+    the ``delta_csv`` / ``delta_json`` paths.
+    """
+    out_dir = Path(out_dir)
+    markers, count, title = fetch_state_listing(session, state=state)
+    ids = sorted(parse_marker_ids(markers))
+    state_path = fetch_state_path(out_dir, state)
+    last = load_fetch_state(state_path)
+    last_csv = out_dir / last["csv"] if last else None
+    if last_csv is not None and not last_csv.exists():
+        last, last_csv = None, None
+    result = {
+        "path": last_csv,
+        "skipped": False,
+        "count": count,
+        "diff": None,
+        "delta_csv": None,
+        "delta_json": None,
+    }
+
+    if last and not force and last["markers"] == ids:
+        result["skipped"] = True
+        return result
+
+    # Both read before the download, which may land on the same name.
+    previous = _row_digests(last_csv) if last_csv else None
+    previous_sha256 = file_sha256(last_csv) if last_csv else None
+    path = download_csv(
+        session, markers=markers, markercount=count, title=title,
+        out_dir=out_dir, filename=filename,
     )
-    r.raise_for_status()
-    if filename is None:
-        cd = r.headers.get("Content-Disposition", "")
-        m = _FILENAME_RE.search(cd)
-        filename = m.group(1) if m else (
-            f"HMdb-Entries-{date.today().strftime('%Y%m%d')}.csv"
+    result["path"] = path
+    if previous is not None:
+        diff = diff_exports(previous, path)
+        result["diff"] = diff
+        result["delta_csv"], result["delta_json"] = write_delta(
+            path, diff, last_csv.name, previous_sha256
         )
-    out_dir = Path(out_dir)
-    out_dir.mkdir(parents=True, exist_ok=True)
-    path = out_dir / filename
-    path.write_bytes(r.content)
-    return path
+    save_fetch_state(
+        state_path,
+        {
+            "state": state,
+            "fetched": datetime.now().isoformat(timespec="seconds"),
+            "csv": path.name,
+            "markercount": count,
+            "markers": ids,
+        },
+    )
+    return result
 
 
 def run_fetch(args) -> None:
@@ -162,20 +360,25 @@ def run_fetch(args) -> None:
     print(f"[INFO] verifying cookie")
     verify_session(session)
     print(f"[INFO] cookie OK; fetching state listing for {args.state}")
-    markers, count, title = fetch_state_listing(session, state=args.state)
-    print(f"[INFO] state listing returned {count} marker IDs "
-          f"({len(markers)} bytes of IDs)")
-    print(f"[INFO] requesting CSV download")
-    path = download_csv(
+    result = fetch_listing(
         session,
-        markers=markers,
-        markercount=count,
-        title=title,
+        state=args.state,
         out_dir=args.out_dir,
         filename=args.out_file,
+        force=getattr(args, "force", False),
     )
-    size_kb = path.stat().st_size / 1024
-    print(f"[OK] wrote {path} ({size_kb:.1f} KB)")
+    print(f"[INFO] state listing returned {result['count']} marker IDs")
+    if result["skipped"]:
+        print(f"[OK] marker IDs unchanged; keeping {result['path']} "
+              "(--force to download anyway)")
+        return
+    size_kb = result["path"].stat().st_size / 1024
+    print(f"[OK] wrote {result['path']} ({size_kb:.1f} KB)")
+    if result["diff"] is None:
+        print("[INFO] no previous export to compare against; no delta written")
+        return
+    counts = ", ".join(f"{len(ids)} {kind}" for kind, ids in result["diff"].items())
+    print(f"[OK] delta ({counts}) → {result['delta_csv']}, {result['delta_json']}")
 
 
 def main() -> None:
@@ -203,6 +406,11 @@ def main() -> None:
         default=None,
         help=f"Session cookie file (default: {DEFAULT_COOKIE_PATH})",
     )
+    ap.add_argument(
+        "--force",
+        action="store_true",
+        help="Download even if the listing's marker IDs are unchanged",
+    )
     args = ap.parse_args()
     run_fetch(args)
 
@@ -17,11 +17,16 @@ Phase 1 — ``thc hmdb reconcile`` (identification + auto-apply for exact matche
         review_name_mismatches.csv  — title/name fuzzy match failed
         review_hmdb_conflicts.csv   — atlas already has a different ref:hmdb
 
+    Verdicts are kept per MarkerID in ``reconcile_state.json``, so a rerun
+    reclassifies only new or changed rows; ``delta/`` repeats the four
+    files with just those rows.
+
 Phase 2 — ``thc hmdb apply`` (writes to atlas):
     Read the dispositioned review CSVs, look up each approved row in the
     original hmdb export, and strict-overwrite ten enrichment fields on
-    the matched atlas row. Writes a timestamped ``atlas_db.csv.bak.<ts>``
-    backup first unless ``--no-backup`` is set.
+    the matched atlas row. Writes a timestamped ``atlas_db.csv.bak.<ts>.json``
+    reverse patch of the changed rows first unless ``--no-backup`` is set;
+    ``thc hmdb restore`` applies it to undo the write.
 
 Approval rule: a review row counts as approved if its ``approve`` cell,
 uppercased and stripped, starts with ``YES``.
@@ -30,15 +35,22 @@ uppercased and stripped, starts with ``YES``.
 from __future__ import annotations
 
 import csv
+import hashlib
+import json
+import os
 import shutil
 import sys
-from collections import defaultdict
+from collections import Counter, defaultdict
 from datetime import datetime
 from difflib import SequenceMatcher
 from html import unescape
 from pathlib import Path
 import re
 
+from .atlas_cache import file_sha256
+from .atlas_frame import read_atlas_raw
+from .name_scoring import NameScorer
+
 # ----------------------------- reconcile ------------------------------------
 
 THC_CANONICAL_PHRASES = (
@@ -111,36 +123,98 @@ def normalize_name(s: str) -> str:
     return s
 
 
-def is_thc_erected_by(erected_by: str) -> bool:
-    norm = normalize_phrase(erected_by)
-    if not norm:
-        return False
-    if any(excl in norm for excl in THC_EXCLUSIONS):
-        return False
-    for canon in THC_CANONICAL_PHRASES:
-        if canon in norm:
-            return True
-    norm_words = norm.split()
-    for canon in THC_CANONICAL_PHRASES:
-        canon_words = canon.split()
-        if SequenceMatcher(None, canon, norm).ratio() >= THC_FUZZ_THRESHOLD:
+class ErectedByMatcher:
+    """Compiled ``Erected By`` filter: is this an official THC marker?
+
+    A string passes if, once normalized, it contains no exclusion and
+    either contains a canonical phrase or comes within ``threshold``
+    (``SequenceMatcher.ratio``) of one -- compared whole, and in every
+    window of as many words as the phrase has.
+
+    A Texas export repeats a few hundred sponsor strings across 20k+ rows,
+    so verdicts are memoized per raw string and per normalized string.
+    Exact phrase hits return before any fuzzy work. Each fuzzy comparison
+    is first bounded by length and then by shared characters -- the same
+    upper bounds ``real_quick_ratio`` and ``quick_ratio`` compute -- and
+    ``SequenceMatcher`` runs only when the bound reaches ``threshold``. The
+    bounds never undercut the real ratio, so verdicts are unchanged.
+    """
+
+    def __init__(
+        self,
+        phrases=THC_CANONICAL_PHRASES,
+        exclusions=THC_EXCLUSIONS,
+        threshold: float = THC_FUZZ_THRESHOLD,
+    ):
+        self.phrases = tuple(phrases)
+        self.exclusions = tuple(exclusions)
+        self.threshold = threshold
+        self._compiled = [
+            (canon, len(canon), Counter(canon), len(canon.split()))
+            for canon in self.phrases
+        ]
+        self._by_raw: dict[str, bool] = {}
+        self._by_norm: dict[str, bool] = {}
+
+    def __call__(self, erected_by: str) -> bool:
+        verdict = self._by_raw.get(erected_by)
+        if verdict is None:
+            norm = normalize_phrase(erected_by)
+            verdict = self._by_norm.get(norm)
+            if verdict is None:
+                verdict = self._by_norm[norm] = self._match(norm)
+            self._by_raw[erected_by] = verdict
+        return verdict
+
+    def _match(self, norm: str) -> bool:
+        if not norm:
+            return False
+        if any(excl in norm for excl in self.exclusions):
+            return False
+        if any(canon in norm for canon in self.phrases):
             return True
-        window_len = len(canon_words)
-        if len(norm_words) >= window_len:
+        norm_words = norm.split()
+        for compiled in self._compiled:
+            if self._close(compiled, norm):
+                return True
+            window_len = compiled[3]
             for i in range(len(norm_words) - window_len + 1):
-                window = " ".join(norm_words[i : i + window_len])
-                if SequenceMatcher(None, canon, window).ratio() >= THC_FUZZ_THRESHOLD:
+                if self._close(compiled, " ".join(norm_words[i : i + window_len])):
                     return True
-    return False
+        return False
+
+    def _close(self, compiled, text: str) -> bool:
+        canon, canon_len, canon_counts, _ = compiled
+        total = canon_len + len(text)
+        if 2.0 * min(canon_len, len(text)) / total < self.threshold:
+            return False
+        shared = sum(min(n, canon_counts[ch]) for ch, n in Counter(text).items())
+        if 2.0 * shared / total < self.threshold:
+            return False
+        return SequenceMatcher(None, canon, text).ratio() >= self.threshold
+
+
+_THC_MATCHER = ErectedByMatcher()
+
+
+def is_thc_erected_by(erected_by: str) -> bool:
+    return _THC_MATCHER(erected_by)
+
+
+def name_scorer(workers: int | None = None) -> NameScorer:
+    """A :class:`NameScorer` with this module's name rule.
+
+    Blank names score 0.0, names that normalize identically score 1.0, and
+    anything else is ``SequenceMatcher.ratio`` of the normalized forms.
+    """
+    return NameScorer(normalize_name, equal_is_one=True, workers=workers)
+
+
+_NAME_SCORER = name_scorer()
 
 
 def name_similarity(a: str, b: str) -> float:
-    na, nb = normalize_name(a), normalize_name(b)
-    if not na or not nb:
-        return 0.0
-    if na == nb:
-        return 1.0
-    return SequenceMatcher(None, na, nb).ratio()
+    return _NAME_SCORER.score(a, b)
 
 
 def _group_atlas_by_thc(rows: list[dict]) -> dict[str, list[dict]]:
@@ -159,9 +233,26 @@ def _group_atlas_by_thc(rows: list[dict]) -> dict[str, list[dict]]:
     return dict(by_thc)
 
 
+# What reconcile reads from an atlas row: the grouping key, the hmdb id it is
+# matched against, and the fields copied into the review CSVs.
+RECONCILE_ATLAS_COLUMNS = (
+    "ref:US-TX:thc",
+    "ref:hmdb",
+    "name",
+    "addr:city",
+    "addr:county",
+)
+
+
 def _load_atlas_by_thc(path: Path) -> dict[str, list[dict]]:
-    with path.open(newline="", encoding="utf-8") as f:
-        return _group_atlas_by_thc(list(csv.DictReader(f)))
+    atlas = read_atlas_raw(
+        path, columns=RECONCILE_ATLAS_COLUMNS, require=("ref:US-TX:thc",)
+    )
+    # Row dicts built from column lists; ``to_dict("records")`` boxes every
+    # cell through pandas and costs several times as much.
+    columns = list(atlas.columns)
+    rows = zip(*(atlas[column].tolist() for column in columns))
+    return _group_atlas_by_thc([dict(zip(columns, values)) for values in rows])
 
 
 def _resolve_atlas_row(
@@ -247,12 +338,174 @@ def _write_review(path: Path, rows: list[dict], extra_columns: tuple[str, ...] =
 NAME_AUTO_APPLY_THRESHOLD = 1.0
 
 
+# --------------------------- reconcile state --------------------------------
+
+STATE_FILE_NAME = "reconcile_state.json"
+STATE_FORMAT = "thc-hmdb-reconcile-state/3"
+DELTA_DIR_NAME = "delta"
+
+# The hmdb fields a verdict, review row or enrichment is built from. A row
+# whose values here are unchanged since the last run keeps its verdict.
+HMDB_STATE_FIELDS = (
+    "MarkerID",
+    "Marker No.",
+    "Title",
+    "Erected By",
+    "Missing",
+    "Link",
+    "Street Address",
+    "City or Town",
+    "County or Parish",
+    "Latitude (minus=S)",
+    "Longitude (minus=W)",
+)
+
+# Disposition -> stats key, and -> review file for those that get one.
+DISPOSITION_STATS = {
+    "ignored": "ignored",
+    "documented": "already_documented",
+    "auto_applied": "auto_applied",
+    "candidate": "candidates",
+    "name_mismatch": "name_mismatches",
+    "conflict": "conflicts",
+}
+REVIEW_FILES = {
+    "auto_applied": "auto_applied.csv",
+    "candidate": "review_candidates.csv",
+    "name_mismatch": "review_name_mismatches.csv",
+    "conflict": "review_hmdb_conflicts.csv",
+}
+
+
+def _digest(values) -> str:
+    text = "\x1f".join(values)
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _hmdb_row_hash(hmdb_row: dict) -> str:
+    return _digest([hmdb_row.get(field) or "" for field in HMDB_STATE_FIELDS])
+
+
+def _atlas_group_hash(atlas_rows: list[dict]) -> str:
+    return _digest(
+        str(row.get(column) or "") for row in atlas_rows for column in RECONCILE_ATLAS_COLUMNS
+    )
+
+
+def _rules_digest() -> str:
+    """Everything besides the data that a stored verdict depends on."""
+    rules = (
+        STATE_FORMAT,
+        THC_CANONICAL_PHRASES,
+        THC_EXCLUSIONS,
+        THC_FUZZ_THRESHOLD,
+        NAME_FUZZ_THRESHOLD,
+        NAME_AUTO_APPLY_THRESHOLD,
+        REVIEW_COLUMNS,
+        CONFLICT_EXTRA_COLUMN,
+    )
+    return _digest(json.dumps(rule) for rule in rules)
+
+
+def load_reconcile_state(path: Path | None) -> dict:
+    """Last reconcile's verdicts, or an empty state.
+
+    A missing or unreadable file, or one written under different rules
+    (phrase lists, thresholds, review columns), yields an empty state, so
+    the run reclassifies everything; the state is only ever a shortcut.
+    """
+    empty = {"format": STATE_FORMAT, "rules": _rules_digest(), "rows": {}, "groups": {}}
+    if path is None or not path.exists():
+        return empty
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return empty
+    if (
+        not isinstance(data, dict)
+        or data.get("format") != STATE_FORMAT
+        or data.get("rules") != empty["rules"]
+    ):
+        return empty
+    data.setdefault("rows", {})
+    data.setdefault("groups", {})
+    return data
+
+
+def save_reconcile_state(path: Path, state: dict) -> None:
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_text(
+        json.dumps(state, ensure_ascii=False, separators=(",", ":")), encoding="utf-8"
+    )
+    os.replace(tmp, path)
+
+
+def _merge_delta(
+    delta_rows: list[dict], stored_rows: dict[str, dict], removed: set[str]
+) -> list[dict]:
+    """The full export as of a ``thc hmdb fetch`` delta.
+
+    Stored rows come back, rebuilt from their ``HMDB_STATE_FIELDS``, in
+    stored order; a delta row replaces the stored row with its MarkerID,
+    ``removed`` MarkerIDs are dropped, and rows new to the state go last.
+    """
+    by_id: dict[str, dict] = {}
+    unkeyed: list[dict] = []
+    for row in delta_rows:
+        marker_id = (row.get("MarkerID") or "").strip()
+        if marker_id:
+            by_id[marker_id] = row
+        else:
+            unkeyed.append(row)
+    merged = []
+    for marker_id, entry in stored_rows.items():
+        if marker_id in removed:
+            continue
+        row = by_id.pop(marker_id, None)
+        if row is None:
+            row = dict(zip(HMDB_STATE_FIELDS, entry["fields"]))
+        merged.append(row)
+    return merged + list(by_id.values()) + unkeyed
+
+
+def _delta_summary(hmdb_path: Path, source: dict | None, state_path: Path) -> dict:
+    """The ``.delta.json`` beside a fetch delta, checked against the state.
+
+    The delta must have been taken against the export the state reflects
+    (same SHA-256). Otherwise an earlier delta was never merged, or this one
+    already was, and merging it would lose or replay changes.
+    """
+    summary_path = hmdb_path.with_suffix(".json")
+    if not summary_path.exists():
+        raise SystemExit(
+            f"ERROR: {summary_path} not found; --delta needs the summary "
+            "`thc hmdb fetch` writes beside the delta CSV"
+        )
+    try:
+        summary = json.loads(summary_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as e:
+        raise SystemExit(f"ERROR: could not read {summary_path}: {e}")
+    if not summary.get("previous_sha256") or not summary.get("current_sha256"):
+        raise SystemExit(f"ERROR: {summary_path} does not say which exports it compares")
+    if source is None or summary["previous_sha256"] != source.get("sha256"):
+        base = f"{source['name']} ({source['sha256'][:12]})" if source else "an unknown export"
+        raise SystemExit(
+            f"ERROR: {hmdb_path} was taken against {summary.get('previous')} "
+            f"({summary['previous_sha256'][:12]}), but {state_path} reflects {base}; "
+            f"reconcile the full export {summary.get('current')} instead"
+        )
+    return summary
+
+
 def reconcile(
     hmdb_path: Path,
     atlas_path: Path,
     out_dir: Path,
     make_backup: bool = True,
     ignore_path: Path | None = None,
+    state_path: Path | None = None,
+    full: bool = False,
+    delta: bool = False,
 ) -> dict:
     """Identify hmdb rows for atlas enrichment.
 
@@ -260,12 +513,47 @@ def reconcile(
     (``name_similarity == 1.0``, which includes "The X" vs "X") are
     written straight to atlas with a backup. Lower-confidence matches
     and conflicts go to review CSVs for human disposition.
+
+    Verdicts persist in ``state_path`` (default ``out_dir/reconcile_state.json``),
+    keyed by MarkerID: the row's ``HMDB_STATE_FIELDS`` and their hash, its
+    disposition and its review row. Rows are decided per THC#, so a rerun
+    reclassifies a THC# only when one of its hmdb rows is new or changed,
+    the set of rows under it changed, or its atlas rows changed; every
+    other row keeps its stored verdict. The review CSVs are always the
+    full, merged view. ``out_dir/delta/`` holds the same four files with
+    only the rows that are new or different since the last run. ``full``
+    reclassifies every row instead of reusing stored verdicts.
+
+    With ``delta``, ``hmdb_path`` is a ``thc hmdb fetch`` delta (added and
+    changed rows only) rather than a full export. It is merged into the
+    stored rows, which the state keeps for this purpose, and the MarkerIDs
+    its ``.delta.json`` summary lists as removed are dropped. A delta needs
+    a usable state built from the export the delta was taken against; the
+    state records that export's name and SHA-256 as ``source``.
     """
     hmdb_rows = _load_hmdb_rows(hmdb_path)
     atlas_by_thc = _load_atlas_by_thc(atlas_path)
     if ignore_path is None:
         ignore_path = atlas_path.parent / IGNORE_FILE_NAME
     ignored = load_ignored_marker_ids(ignore_path)
+    if state_path is None:
+        state_path = out_dir / STATE_FILE_NAME
+    # With ``full`` the stored verdicts are not reused, but the delta is
+    # still taken against them.
+    previous = load_reconcile_state(state_path)
+    stored_rows = previous["rows"]
+    if delta:
+        if not stored_rows:
+            raise SystemExit(
+                f"ERROR: {hmdb_path} is a delta, but {state_path} holds no usable "
+                "state; reconcile the full export first"
+            )
+        summary = _delta_summary(hmdb_path, previous.get("source"), state_path)
+        removed = {str(marker_id) for marker_id in summary.get("removed", [])}
+        hmdb_rows = _merge_delta(hmdb_rows, stored_rows, removed)
+        source = {"name": summary["current"], "sha256": summary["current_sha256"]}
+    else:
+        source = {"name": hmdb_path.name, "sha256": file_sha256(hmdb_path)}
 
     stats = {
         "hmdb_total": len(hmdb_rows),
@@ -277,44 +565,87 @@ def reconcile(
         "candidates": 0,
         "name_mismatches": 0,
         "conflicts": 0,
+        "reclassified": 0,
+        "removed": 0,
+        "delta": 0,
         "backup_path": None,
+        "state_path": str(state_path),
     }
 
-    auto_applied_rows: list[dict] = []
-    candidates: list[dict] = []
-    name_mismatches: list[dict] = []
-    conflicts: list[dict] = []
-    auto_hmdb_by_thc: dict[str, dict] = {}
-    claimed: set[int] = set()
-
-    for hmdb_row in hmdb_rows:
-        if not is_thc_erected_by(hmdb_row.get("Erected By") or ""):
-            continue
-        stats["thc_filter_pass"] += 1
-
+    ids = [(row.get("MarkerID") or "").strip() for row in hmdb_rows]
+    hashes = [_hmdb_row_hash(row) for row in hmdb_rows]
+    id_counts = Counter(ids)
+
+    def stored(i: int) -> dict | None:
+        """Row ``i``'s stored entry, if it still describes the row."""
+        if full or not ids[i] or id_counts[ids[i]] > 1:
+            return None
+        entry = stored_rows.get(ids[i])
+        return entry if entry and entry.get("hash") == hashes[i] else None
+
+    # (disposition, review row or None) per hmdb row, in file order.
+    results: list[tuple[str, dict | None] | None] = [None] * len(hmdb_rows)
+    members: dict[str, list[int]] = defaultdict(list)
+    for i, hmdb_row in enumerate(hmdb_rows):
+        entry = stored(i)
+        if entry:
+            is_thc = entry["disposition"] != "not_thc"
+        else:
+            is_thc = is_thc_erected_by(hmdb_row.get("Erected By") or "")
+        if not is_thc:
+            results[i] = ("not_thc", None)
         # A known duplicate page. Skipped before classification so it cannot
         # resurface as a conflict or candidate on every pull.
-        if (hmdb_row.get("MarkerID") or "").strip() in ignored:
-            stats["ignored"] += 1
-            continue
-
+        elif ids[i] in ignored:
+            results[i] = ("ignored", None)
+        elif (thc := (hmdb_row.get("Marker No.") or "").strip()) not in atlas_by_thc:
+            results[i] = ("not_in_atlas", None)
+        else:
+            members[thc].append(i)
+
+    # A THC#'s rows are decided together (they compete for its atlas rows),
+    # so the whole group is reused or the whole group is reclassified.
+    groups: dict[str, str] = {}
+    dirty: list[int] = []
+    for thc, rows in members.items():
+        groups[thc] = _digest(
+            [_atlas_group_hash(atlas_by_thc[thc])] + [f"{ids[i]}:{hashes[i]}" for i in rows]
+        )
+        entries = [stored(i) for i in rows]
+        if previous["groups"].get(thc) == groups[thc] and all(entries):
+            for i, entry in zip(rows, entries):
+                results[i] = (entry["disposition"], entry.get("review"))
+        else:
+            dirty.extend(rows)
+    dirty.sort()
+    stats["reclassified"] = len(dirty)
+
+    # Score every (Title, atlas name) pair the loop below can ask about in
+    # one batch; the loop then reads the scores from the scorer's cache.
+    scorer = name_scorer()
+    pairs = []
+    for i in dirty:
+        title = hmdb_rows[i].get("Title") or ""
+        thc = (hmdb_rows[i].get("Marker No.") or "").strip()
+        pairs.extend((title, row.get("name") or "") for row in atlas_by_thc[thc])
+    scorer.score_pairs(pairs)
+
+    auto_thcs: set[str] = set()
+    claimed: set[int] = set()
+    for i in dirty:
+        hmdb_row = hmdb_rows[i]
         thc = (hmdb_row.get("Marker No.") or "").strip()
-        if not thc or thc not in atlas_by_thc:
-            continue
-        stats["thc_in_atlas"] += 1
-
         atlas_rows = atlas_by_thc[thc]
-        hmdb_id = (hmdb_row.get("MarkerID") or "").strip()
-        atlas_row, disposition = _resolve_atlas_row(atlas_rows, hmdb_id, claimed)
-        score = name_similarity(hmdb_row.get("Title") or "", atlas_row.get("name") or "")
+        atlas_row, disposition = _resolve_atlas_row(atlas_rows, ids[i], claimed)
+        score = scorer.score(hmdb_row.get("Title") or "", atlas_row.get("name") or "")
 
         if disposition == "documented":
-            stats["already_documented"] += 1
+            results[i] = ("documented", None)
             continue
 
         # Every row under this THC# already points somewhere else, or the one
         # free row was taken by an earlier hmdb entry in this same pass.
-        if disposition == "conflict" or thc in auto_hmdb_by_thc:
+        if disposition == "conflict" or thc in auto_thcs:
             conflict = _review_row(hmdb_row, atlas_row, score)
             conflict[CONFLICT_EXTRA_COLUMN] = "; ".join(
                 sorted(
@@ -325,29 +656,57 @@ def reconcile(
                     }
                 )
             )
-            conflicts.append(conflict)
-            stats["conflicts"] += 1
+            results[i] = ("conflict", conflict)
             continue
 
         claimed.add(id(atlas_row))
         review = _review_row(hmdb_row, atlas_row, score)
         if score >= NAME_AUTO_APPLY_THRESHOLD:
             review["approve"] = "YES (auto)"
-            auto_applied_rows.append(review)
-            auto_hmdb_by_thc[thc] = hmdb_row
-            stats["auto_applied"] += 1
+            results[i] = ("auto_applied", review)
+            auto_thcs.add(thc)
         elif score >= NAME_FUZZ_THRESHOLD:
-            candidates.append(review)
-            stats["candidates"] += 1
+            results[i] = ("candidate", review)
         else:
-            name_mismatches.append(review)
-            stats["name_mismatches"] += 1
+            results[i] = ("name_mismatch", review)
 
-    out_dir.mkdir(parents=True, exist_ok=True)
-    _write_review(out_dir / "auto_applied.csv", auto_applied_rows)
-    _write_review(out_dir / "review_candidates.csv", candidates)
-    _write_review(out_dir / "review_name_mismatches.csv", name_mismatches)
-    _write_review(out_dir / "review_hmdb_conflicts.csv", conflicts, (CONFLICT_EXTRA_COLUMN,))
+    # Merge stored and fresh verdicts into the full view and the delta.
+    merged: dict[str, list[dict]] = {name: [] for name in REVIEW_FILES}
+    delta: dict[str, list[dict]] = {name: [] for name in REVIEW_FILES}
+    auto_hmdb_by_thc: dict[str, dict] = {}
+    state_rows: dict[str, dict] = {}
+    for i, (disposition, review) in enumerate(results):
+        if disposition in DISPOSITION_STATS:
+            stats[DISPOSITION_STATS[disposition]] += 1
+        if disposition != "not_thc":
+            stats["thc_filter_pass"] += 1
+        if disposition not in ("not_thc", "ignored", "not_in_atlas"):
+            stats["thc_in_atlas"] += 1
+        if disposition == "auto_applied":
+            auto_hmdb_by_thc[(hmdb_rows[i].get("Marker No.") or "").strip()] = hmdb_rows[i]
+        if ids[i]:
+            state_rows[ids[i]] = {
+                "hash": hashes[i],
+                "disposition": disposition,
+                "fields": [hmdb_rows[i].get(field) or "" for field in HMDB_STATE_FIELDS],
+            }
+            if review is not None:
+                state_rows[ids[i]]["review"] = review
+        if review is None:
+            continue
+        merged[disposition].append(review)
+        before = stored_rows.get(ids[i]) or {}
+        if before.get("disposition") != disposition or before.get("review") != review:
+            delta[disposition].append(review)
+            stats["delta"] += 1
+    stats["removed"] = len(stored_rows.keys() - state_rows.keys())
+
+    delta_dir = out_dir / DELTA_DIR_NAME
+    delta_dir.mkdir(parents=True, exist_ok=True)
+    for disposition, name in REVIEW_FILES.items():
+        extra = (CONFLICT_EXTRA_COLUMN,) if disposition == "conflict" else ()
+        _write_review(out_dir / name, merged[disposition], extra)
+        _write_review(delta_dir / name, delta[disposition], extra)
 
     if auto_hmdb_by_thc:
         write_result = _write_atlas_enrichment(
@@ -359,6 +718,17 @@ def reconcile(
             str(write_result["backup_path"]) if write_result["backup_path"] else None
         )
 
+    save_reconcile_state(
+        state_path,
+        {
+            "format": STATE_FORMAT,
+            "rules": previous["rules"],
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "source": source,
+            "rows": state_rows,
+            "groups": groups,
+        },
+    )
     return stats
 
 
@@ -448,6 +818,152 @@ def _hmdb_to_enrichment(hmdb_row: dict) -> dict[str, str]:
     }
 
 
+BACKUP_FORMAT = "thc-atlas-reverse-patch/1"
+
+
+def _read_atlas_keys(atlas_path: Path) -> tuple[list[str], list[dict]]:
+    """The header, and each data row's THC# and ``ref:hmdb`` in file order.
+
+    Only the two key cells are kept; ``_row`` is the row's position, the
+    key the patch map is built on. Blank lines are skipped, as
+    ``csv.DictReader`` skips them.
+    """
+    with atlas_path.open(newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        fieldnames = next(reader, [])
+        positions = {name: i for i, name in enumerate(fieldnames)}
+        thc_at = positions.get("ref:US-TX:thc")
+        hmdb_at = positions.get("ref:hmdb")
+        keys = []
+        for record in reader:
+            if not record:
+                continue
+            keys.append(
+                {
+                    "ref:US-TX:thc": _cell(record, thc_at),
+                    "ref:hmdb": _cell(record, hmdb_at),
+                    "_row": len(keys),
+                }
+            )
+    return fieldnames, keys
+
+
+def _cell(record: list[str], at: int | None) -> str:
+    return record[at] if at is not None and at < len(record) else ""
+
+
+class _RecordLines:
+    """Line source for ``csv.reader`` that keeps the current record's text.
+
+    ``csv.reader`` pulls exactly the lines one record spans (more than one
+    when a quoted ``Marker Text`` holds newlines), so after each record
+    ``take()`` returns its raw text.
+    """
+
+    def __init__(self, f):
+        self._f = f
+        self._lines: list[str] = []
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        line = next(self._f)
+        self._lines.append(line)
+        return line
+
+    def take(self) -> str:
+        raw = "".join(self._lines)
+        self._lines.clear()
+        return raw
+
+
+def _stream_patch(
+    atlas_path: Path,
+    patches: dict[int, dict[str, str]],
+    backup_path: Path | None = None,
+    expect_thc: dict[int, str] | None = None,
+) -> list[dict]:
+    """Rewrite atlas with ``patches`` (row position -> field values) applied.
+
+    Rows are streamed from the atlas to a temp file beside it, which then
+    replaces the atlas with an atomic rename; an interrupted run leaves
+    the atlas untouched. Rows without a patch are copied byte for byte;
+    only patched rows are re-encoded, with the header's line ending.
+
+    Returns the reverse patch: for every row that actually changed, the
+    fields' previous values. When ``backup_path`` is given and something
+    changed, the reverse patch is written there before the rename. If
+    nothing changed the atlas is not rewritten at all.
+    """
+    reverse: list[dict] = []
+    tmp = atlas_path.with_name(f".{atlas_path.name}.tmp")
+    try:
+        with atlas_path.open(newline="", encoding="utf-8") as src, tmp.open(
+            "w", newline="", encoding="utf-8"
+        ) as dst:
+            lines = _RecordLines(src)
+            reader = csv.reader(lines)
+            fieldnames = next(reader, [])
+            header = lines.take()
+            dst.write(header)
+            writer = csv.writer(
+                dst, lineterminator="\r\n" if header.endswith("\r\n") else "\n"
+            )
+            positions = {name: i for i, name in enumerate(fieldnames)}
+            thc_at = positions.get("ref:US-TX:thc")
+            row = 0
+            for record in reader:
+                raw = lines.take()
+                if not record:
+                    dst.write(raw)
+                    continue
+                patch = patches.get(row)
+                previous = {}
+                if patch:
+                    thc = _cell(record, thc_at)
+                    if expect_thc is not None and expect_thc.get(row) != thc:
+                        raise SystemExit(
+                            f"ERROR: atlas row {row} is THC {thc!r}, the backup "
+                            f"expects {expect_thc.get(row)!r}; not restoring"
+                        )
+                    if len(record) < len(fieldnames):
+                        record += [""] * (len(fieldnames) - len(record))
+                    for name, value in patch.items():
+                        at = positions[name]
+                        if record[at] != value:
+                            previous[name] = record[at]
+                            record[at] = value
+                if previous:
+                    reverse.append({"row": row, "ref:US-TX:thc": thc, "values": previous})
+                    writer.writerow(record)
+                else:
+                    dst.write(raw)
+                row += 1
+
+        if not reverse:
+            tmp.unlink()
+            return reverse
+        if backup_path is not None:
+            backup = {
+                "format": BACKUP_FORMAT,
+                "atlas": atlas_path.name,
+                "created": datetime.now().isoformat(timespec="seconds"),
+                # What the atlas looks like right after this write; restore
+                # refuses a file that has moved on since.
+                "sha256": file_sha256(tmp),
+                "rows": reverse,
+            }
+            backup_path.write_text(
+                json.dumps(backup, indent=1, ensure_ascii=False) + "\n", encoding="utf-8"
+            )
+        shutil.copymode(atlas_path, tmp)
+        os.replace(tmp, atlas_path)
+    finally:
+        tmp.unlink(missing_ok=True)
+    return reverse
+
+
 def _write_atlas_enrichment(
     atlas_path: Path,
     targets: list[tuple[str, dict]],
@@ -456,14 +972,16 @@ def _write_atlas_enrichment(
     """Strict-overwrite ENRICHMENT_FIELDS for each ``(thc, hmdb_row)`` target.
 
     Each target enriches exactly one atlas row — the one already carrying
-    that MarkerID, else a free row under the same THC#. Backs up atlas
-    before writing unless ``make_backup`` is False, then skips the rewrite
-    entirely if no rows were touched.
+    that MarkerID, else a free row under the same THC#. Targets are first
+    resolved against the atlas's key columns into a row -> patch map; the
+    atlas is then streamed once through :func:`_stream_patch`, which
+    leaves every other row's bytes alone. Unless
+    ``make_backup`` is False the backup is ``atlas_db.csv.bak.<ts>.json``,
+    a reverse patch holding only the changed rows' previous values
+    (``thc hmdb restore`` puts them back). Nothing is written if no row
+    changes.
     """
-    with atlas_path.open(newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        fieldnames = reader.fieldnames
-        rows = list(reader)
+    fieldnames, keys = _read_atlas_keys(atlas_path)
 
     missing_fields = [f for f in ENRICHMENT_FIELDS if f not in fieldnames]
     if missing_fields:
@@ -474,11 +992,12 @@ def _write_atlas_enrichment(
     # A THC# can cover several atlas rows (two physical markers sharing a
     # Marker No.). Enrich only the row this hmdb entry actually refers to,
     # never the whole group — that would overwrite the sibling's ref:hmdb.
-    rows_by_thc = _group_atlas_by_thc(rows)
+    rows_by_thc = _group_atlas_by_thc(keys)
 
     updated_ids: list[str] = []
     not_in_atlas: list[str] = []
     claimed: set[int] = set()
+    patches: dict[int, dict[str, str]] = {}
     for thc, hmdb_row in targets:
         group = rows_by_thc.get(thc)
         if not group:
@@ -488,21 +1007,20 @@ def _write_atlas_enrichment(
             group, (hmdb_row.get("MarkerID") or "").strip(), claimed
         )
         claimed.add(id(target))
-        for k, v in _hmdb_to_enrichment(hmdb_row).items():
-            target[k] = v
+        enrichment = _hmdb_to_enrichment(hmdb_row)
+        # Later targets must see this row's new ref:hmdb, as they would
+        # have when the rows were edited in place.
+        target.update(enrichment)
+        patches.setdefault(target["_row"], {}).update(enrichment)
         updated_ids.append(thc)
 
     backup_path: Path | None = None
-    if updated_ids and make_backup:
+    if patches and make_backup:
         ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_path = atlas_path.with_suffix(atlas_path.suffix + f".bak.{ts}")
-        shutil.copy2(atlas_path, backup_path)
-
-    if updated_ids:
-        with atlas_path.open("w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames, lineterminator="\n")
-            writer.writeheader()
-            writer.writerows(rows)
+        backup_path = atlas_path.with_suffix(atlas_path.suffix + f".bak.{ts}.json")
+    if patches:
+        if not _stream_patch(atlas_path, patches, backup_path):
+            backup_path = None
 
     return {
         "backup_path": backup_path,
@@ -511,6 +1029,30 @@ def _write_atlas_enrichment(
     }
 
 
+def restore_backup(atlas_path: Path, backup_path: Path, force: bool = False) -> dict:
+    """Undo an enrichment write from its reverse-patch backup.
+
+    The atlas must be exactly as that write left it (checked by SHA-256).
+    ``force`` skips that check; each patched row must then still hold the
+    THC# it held, or nothing is written.
+    """
+    backup = json.loads(backup_path.read_text(encoding="utf-8"))
+    if backup.get("format") != BACKUP_FORMAT:
+        raise SystemExit(f"ERROR: {backup_path} is not an atlas reverse patch")
+    if not force and file_sha256(atlas_path) != backup["sha256"]:
+        raise SystemExit(
+            f"ERROR: {atlas_path} has changed since {backup_path} was written; "
+            "use --force to restore the recorded rows anyway"
+        )
+    entries = backup["rows"]
+    _stream_patch(
+        atlas_path,
+        {entry["row"]: entry["values"] for entry in entries},
+        expect_thc={entry["row"]: entry["ref:US-TX:thc"] for entry in entries},
+    )
+    return {"restored": len(entries), "restored_ids": [e["ref:US-TX:thc"] for e in entries]}
+
+
 def apply_updates(
     atlas_path: Path,
     hmdb_path: Path,
@@ -556,6 +1098,9 @@ def run_reconcile(args) -> None:
         Path(args.atlas),
         Path(args.out_dir),
         make_backup=not getattr(args, "no_backup", False),
+        state_path=Path(args.state) if getattr(args, "state", None) else None,
+        full=getattr(args, "full", False),
+        delta=getattr(args, "delta", False),
     )
     print(f"hmdb rows read         : {stats['hmdb_total']}")
     print(f"  passed THC filter    : {stats['thc_filter_pass']}")
@@ -566,10 +1111,21 @@ def run_reconcile(args) -> None:
     print(f"    candidates         : {stats['candidates']}    → {args.out_dir}/review_candidates.csv")
     print(f"    name mismatches    : {stats['name_mismatches']}    → {args.out_dir}/review_name_mismatches.csv")
     print(f"    hmdb conflicts     : {stats['conflicts']}    → {args.out_dir}/review_hmdb_conflicts.csv")
+    print(f"  reclassified         : {stats['reclassified']}    (the rest from {stats['state_path']})")
+    print(f"  new or changed       : {stats['delta']}    → {args.out_dir}/{DELTA_DIR_NAME}/")
+    if stats["removed"]:
+        print(f"  gone from export     : {stats['removed']}")
     if stats["backup_path"]:
         print(f"Backup written         : {stats['backup_path']}")
 
 
+def run_restore(args) -> None:
+    result = restore_backup(Path(args.atlas), Path(args.backup), force=args.force)
+    print(f"Atlas rows restored     : {result['restored']}")
+    for t in result["restored_ids"]:
+        print(f"  {t}")
+
+
 def run_apply(args) -> None:
     result = apply_updates(
         atlas_path=Path(args.atlas),
@@ -23,6 +23,7 @@ import webbrowser
 import pandas as pd
 import folium
 
+from .atlas_frame import Where
 from .utils import (
     read_atlas,
     require_columns,
@@ -35,6 +36,22 @@ from .utils import (
 
 DEFAULT_TILES = "CartoDB positron"
 
+# Everything the map, popups and --simple export read. --csv and --geojson
+# write whole rows and so still load every column.
+MAP_COLUMNS = [
+    "ref:US-TX:thc",
+    "ref:hmdb",
+    "name",
+    "addr:city",
+    "addr:county",
+    "isOSM",
+    "isMissing",
+    "verified:Latitude",
+    "verified:Longitude",
+    "estimated:Latitude",
+    "estimated:Longitude",
+]
+
 
 def filter_markers(df, county=None, city=None, unmapped=False):
     required = [
@@ -80,6 +97,29 @@ def filter_markers(df, county=None, city=None, unmapped=False):
     return out
 
 
+def place_filter(county=None, city=None):
+    """Load-time county/city predicate, so other places' rows are never parsed.
+
+    ``filter_markers`` applies the same match again; this only narrows what
+    reaches it.
+    """
+    wanted = [
+        (col, normalize_match_key(value))
+        for col, value in (("addr:county", county), ("addr:city", city))
+        if value
+    ]
+    if not wanted:
+        return None
+
+    def test(df):
+        mask = pd.Series(True, index=df.index)
+        for col, key in wanted:
+            mask &= normalize_match_series(df[col]).eq(key)
+        return mask
+
+    return Where(tuple(col for col, _ in wanted), test)
+
+
 def build_tag(county=None, city=None, unmapped=False):
     parts = []
     if county:
@@ -128,7 +168,10 @@ def write_html_map(df, outfile, title=None):
 
 
 def run_with_args(args):
-    df = read_atlas(args.data)
+    columns = None if (args.csv or args.geojson) else MAP_COLUMNS
+    df = read_atlas(
+        args.data, columns=columns, where=place_filter(args.county, args.city)
+    )
 
     filtered = filter_markers(
         df,
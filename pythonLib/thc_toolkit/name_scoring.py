@@ -0,0 +1,121 @@
+"""Batched name similarity for reconcile and dedup.
+
+``hmdb_sync`` and ``osm_dedup`` both score names with
+``SequenceMatcher(None, a, b).ratio()`` on normalized forms, one pair at a
+time, re-normalizing the same atlas names on every call. A
+:class:`NameScorer` takes the pairs as a batch instead:
+
+* each distinct raw name is normalized once, and every distinct normalized
+  pair is scored once; both are cached on the scorer;
+* pairs sharing a second name reuse one ``SequenceMatcher`` whose index of
+  that name is built once (``set_seq2``), swapping only the first name in;
+* a batch with at least ``parallel_min`` unscored pairs is split across a
+  ``ProcessPoolExecutor`` when more than one worker is allowed.
+
+Every score is the very ``ratio()`` difflib returns for the same two
+normalized strings, computed the same way in whichever process, so the
+existing thresholds keep their meaning. The normalizer is the caller's:
+each module keeps its own notion of when two names are the same.
+"""
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from difflib import SequenceMatcher
+from itertools import groupby
+from typing import Callable, Iterable
+
+PARALLEL_MIN_PAIRS = 2000
+CACHE_MAX_ENTRIES = 200_000
+
+
+def _ratios(pairs: list[tuple[str, str]]) -> list[float]:
+    """``ratio()`` for each ``(a, b)``; ``pairs`` sorted by ``b`` is fastest."""
+    out = []
+    matcher = SequenceMatcher(None)
+    for b, group in groupby(pairs, key=lambda pair: pair[1]):
+        matcher.set_seq2(b)
+        for a, _ in group:
+            matcher.set_seq1(a)
+            out.append(matcher.ratio())
+    return out
+
+
+class NameScorer:
+    """Cached, batched ``SequenceMatcher`` ratios over normalized names.
+
+    ``normalize`` maps a raw name to the string that is compared; a blank
+    result scores 0.0. With ``equal_is_one`` identical normalized names
+    score 1.0 without consulting difflib (``hmdb_sync``'s rule).
+    ``workers`` caps the process pool (default: CPU count); 1 keeps every
+    batch in this process.
+    """
+
+    def __init__(
+        self,
+        normalize: Callable[[object], str],
+        equal_is_one: bool = False,
+        workers: int | None = None,
+        parallel_min: int = PARALLEL_MIN_PAIRS,
+    ):
+        self.normalize = normalize
+        self.equal_is_one = equal_is_one
+        self.workers = workers or os.cpu_count() or 1
+        self.parallel_min = parallel_min
+        self._norms: dict[str, str] = {}
+        self._scores: dict[tuple[str, str], float] = {}
+
+    # ------------------------------------------------------------------ API
+
+    def score(self, a, b) -> float:
+        """Similarity of one pair (through the same caches as a batch)."""
+        return self.score_pairs([(a, b)])[0]
+
+    def score_pairs(self, pairs: Iterable[tuple[object, object]]) -> list[float]:
+        """Similarity of every ``(a, b)`` in ``pairs``, in order."""
+        if len(self._scores) > CACHE_MAX_ENTRIES:
+            self.clear()
+        keys = [(self._norm(a), self._norm(b)) for a, b in pairs]
+        todo = sorted(
+            {key for key in keys if key not in self._scores and self._needs_ratio(key)},
+            key=lambda key: (key[1], key[0]),
+        )
+        if todo:
+            self._scores.update(zip(todo, self._compute(todo)))
+        return [self._lookup(key) for key in keys]
+
+    def clear(self) -> None:
+        self._norms.clear()
+        self._scores.clear()
+
+    # ------------------------------------------------------------- internal
+
+    def _norm(self, value) -> str:
+        # Only strings are cached: 1, 1.0 and True are one dict key but
+        # need not normalize alike.
+        if type(value) is not str:
+            return self.normalize(value)
+        norm = self._norms.get(value)
+        if norm is None:
+            norm = self._norms[value] = self.normalize(value)
+        return norm
+
+    def _needs_ratio(self, key: tuple[str, str]) -> bool:
+        na, nb = key
+        return bool(na and nb) and not (self.equal_is_one and na == nb)
+
+    def _lookup(self, key: tuple[str, str]) -> float:
+        if not self._needs_ratio(key):
+            na, nb = key
+            return 1.0 if na and nb else 0.0
+        return self._scores[key]
+
+    def _compute(self, todo: list[tuple[str, str]]) -> list[float]:
+        if self.workers <= 1 or len(todo) < self.parallel_min:
+            return _ratios(todo)
+        # Contiguous slices keep each worker's pairs grouped by second name.
+        n_chunks = self.workers * 4
+        size = -(-len(todo) // n_chunks)
+        chunks = [todo[i : i + size] for i in range(0, len(todo), size)]
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            return [score for part in pool.map(_ratios, chunks) for score in part]
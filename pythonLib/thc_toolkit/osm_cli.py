@@ -23,162 +23,95 @@ import requests
 import pandas as pd
 from datetime import datetime
 import json
-import time
 
 try:
     from .utils import (
         require_columns,
         assert_no_duplicate_ids,
-        coerce_nullable_int_series,
+        create_nodes,
         filter_hmdb_missing_osm,
+        read_atlas,
     )
     from . import osm_dedup, osm_sync, osm_refix, osm_refix_direct
+    from .overpass_cache import add_cache_arguments, cache_from_args
 except ImportError:  # pragma: no cover - compatibility for direct script execution
     from utils import (
         require_columns,
         assert_no_duplicate_ids,
-        coerce_nullable_int_series,
+        create_nodes,
         filter_hmdb_missing_osm,
+        read_atlas,
     )  # type: ignore
     import osm_dedup  # type: ignore
     import osm_sync  # type: ignore
     import osm_refix  # type: ignore
     import osm_refix_direct  # type: ignore
-
-
-def _normalize_scalar(value):
-    """Convert pandas/numpy scalar NA values into JSON-safe Python values."""
-    if pd.isna(value):
-        return None
-    return value
+    from overpass_cache import add_cache_arguments, cache_from_args  # type: ignore
 
 
 # ---------- Core Functions ---------- #
 
 
-def read_atlas(filename):
-    types = {
-        "ref:US-TX:thc": "Int32",
-        "ref:hmdb": "Int32",
-        "OsmNodeID": "Int64",
-        "start_date": "Int32",
-        "UTM Easting": "Int32",
-        "UTM Northing": "Int32",
-        "UTM Zone": "Int16",
-        "isActive": "boolean",
-        "isHMDB": "boolean",
-        "isOSM": "boolean",
-        "isMissing": "boolean",
-        "isPending": "boolean",
-        "Recorded Texas Historic Landmark": "boolean",
-        "Private Property": "boolean",
-        "inGoogle": "boolean",
-    }
-
-    return pd.read_csv(filename, dtype=types, low_memory=False)
-
-
-def create_nodes(df):
-    require_columns(
-        df,
-        [
-            "name",
-            "ref:US-TX:thc",
-            "ref:hmdb",
-            "website",
-            "verified:Latitude",
-            "verified:Longitude",
-        ],
-        context="create_nodes input",
-    )
-    assert_no_duplicate_ids(
-        df, ["ref:US-TX:thc", "ref:hmdb"], context="create_nodes input"
-    )
-    thc_ref = coerce_nullable_int_series(
-        df["ref:US-TX:thc"], "ref:US-TX:thc", context="create_nodes input"
-    )
-    hmdb_ref = coerce_nullable_int_series(
-        df["ref:hmdb"], "ref:hmdb", context="create_nodes input"
-    )
-    nodes = []
-    row_errors = []
-
-    for index, row in df.iterrows():
-        try:
-            lat = pd.to_numeric(
-                pd.Series([row["verified:Latitude"]]), errors="coerce"
-            ).iloc[0]
-            lon = pd.to_numeric(
-                pd.Series([row["verified:Longitude"]]), errors="coerce"
-            ).iloc[0]
-            if pd.isna(lat) or pd.isna(lon):
-                row_errors.append(f"row {index}: invalid verified:Latitude/verified:Longitude")
-                continue
-
-            row_thc = thc_ref.iloc[index]
-            row_hmdb = hmdb_ref.iloc[index]
-            tags = {
-                "name": _normalize_scalar(row["name"]),
-                "historic": "memorial",
-                "memorial": "plaque",
-                "material": "aluminium",
-                "operator": "Texas Historical Commission",
-                "operator:wikidata": "Q2397965",
-                "ref:US-TX:thc": int(row_thc) if pd.notna(row_thc) else None,
-                "ref:hmdb": int(row_hmdb) if pd.notna(row_hmdb) else None,
-                "website": _normalize_scalar(row["website"]),
-            }
-            if pd.notna(row_hmdb):
-                tags["memorial:website"] = (
-                    f"https://www.hmdb.org/m.asp?m={int(row_hmdb)}"
-                )
-            if "thc:designation" in df.columns and pd.notna(row.get("thc:designation")):
-                tags["thc:designation"] = _normalize_scalar(row["thc:designation"])
-            if "start_date" in df.columns and pd.notna(row.get("start_date")):
-                tags["start_date"] = _normalize_scalar(row["start_date"])
-            for col in ("addr:full", "addr:city", "addr:county"):
-                if col in df.columns and pd.notna(row.get(col)):
-                    tags[col] = _normalize_scalar(row[col])
-            for col in (
-                "wikimedia_commons",
-                "subject:wikimedia_commons",
-                "subject:wikipedia",
-                "subject:wikidata",
-            ):
-                if col in df.columns and pd.notna(row.get(col)):
-                    tags[col] = _normalize_scalar(row[col])
-
-            nodes.append({"lat": float(lat), "lon": float(lon), "tags": tags})
-
-        except Exception as e:
-            row_errors.append(f"row {index}: {e}")
-
-    if row_errors:
-        sample = "; ".join(row_errors[:5])
-        raise ValueError(f"create_nodes input has invalid rows: {sample}")
-
-    return nodes
-
-
 def _apply_dedup_check(
     nodes,
     radius_ft,
     name_threshold,
     rate_limit_sec,
     endpoint,
+    tile_deg=osm_dedup.DEFAULT_TILE_DEG,
+    session=None,
+    index=None,
+    cache=None,
 ):
     """Filter out nodes that match an existing OSM memorial=plaque nearby.
 
+    Overpass is asked once per tile of candidates (a padded bounding box)
+    rather than once per candidate; each candidate is then matched against a
+    local index through ``find_duplicate``'s ``nearby_nodes`` hook. Passing a
+    prebuilt ``index`` (an ``osm extract`` snapshot) skips the network.
+
     Returns ``(kept_nodes, skipped_records)``. ``skipped_records`` is a list
     of dicts pairing each skipped candidate with the matched OSM node for
     manual review.
     """
+    radius_m = radius_ft / osm_dedup.FEET_PER_METER
+    failed_tiles = set()
+    if index is None:
+        index, failed_tiles = osm_dedup.fetch_memorial_index(
+            [(node["lat"], node["lon"]) for node in nodes],
+            radius_m=radius_m,
+            tile_deg=tile_deg,
+            rate_limit_sec=rate_limit_sec,
+            endpoint=endpoint,
+            session=session,
+            cache=cache,
+        )
+
+    # Look up every candidate's neighbours first, then score all the
+    # (candidate, neighbour) names as one batch.
+    nearby = []
+    for node in nodes:
+        try:
+            if osm_dedup.tile_key(node["lat"], node["lon"], tile_deg) in failed_tiles:
+                raise RuntimeError("Overpass query for this area failed")
+            nearby.append(index.nearby(node["lat"], node["lon"], radius_m))
+        except Exception as e:
+            nearby.append(e)
+    scorer = osm_dedup.name_scorer()
+    scorer.score_pairs(
+        (node["tags"].get("name"), other.name)
+        for node, found in zip(nodes, nearby)
+        if not isinstance(found, Exception)
+        for other in found
+    )
+
     kept = []
     skipped = []
-    total = len(nodes)
-    for i, node in enumerate(nodes, start=1):
+    for node, found in zip(nodes, nearby):
         candidate_name = node["tags"].get("name")
         try:
+            if isinstance(found, Exception):
+                raise found
             match = osm_dedup.find_duplicate(
                 candidate_lat=node["lat"],
                 candidate_lon=node["lon"],
@@ -186,6 +119,8 @@ def _apply_dedup_check(
                 radius_ft=radius_ft,
                 name_threshold=name_threshold,
                 endpoint=endpoint,
+                nearby_nodes=found,
+                scorer=scorer,
             )
         except Exception as e:
             print(
@@ -210,14 +145,30 @@ def _apply_dedup_check(
                     }
                 )
                 print(
-                    f"[SKIP] {candidate_name!r} ~ OSM node {match['osm_id']} "
+                    f"[SKIP] {candidate_name!r} ~ OSM {match.get('osm_type', 'node')} {match['osm_id']} "
                     f"({match['distance_ft']} ft, similarity {match['name_similarity']})"
                 )
-        if rate_limit_sec and i < total:
-            time.sleep(rate_limit_sec)
     return kept, skipped
 
 
+def _load_dedup_snapshot(path):
+    """Load an ``osm extract`` file for offline dedup and say how old it is."""
+    index, info = osm_dedup.load_snapshot_index(path)
+    ts = info["timestamp"] or "unknown"
+    age = osm_dedup.snapshot_age_days(info["timestamp"])
+    age_note = f", {age} day(s) old" if age is not None else ""
+    print(
+        f"[INFO] Dedup snapshot {path}: {len(index)} feature(s) "
+        f"{info['by_type']}, timestamp_osm_base {ts}{age_note}"
+    )
+    if info["unlocated"]:
+        print(
+            f"[WARN] {info['unlocated']} snapshot element(s) have no coordinate "
+            "and were not indexed"
+        )
+    return index
+
+
 def push2josm(nodes):
     josm_url = "http://localhost:8111/add_node"
     added_refs = []
@@ -321,6 +272,42 @@ def apply_sync_results(atlas, ref_to_osm_id):
     return atlas, n_updated, missing_refs
 
 
+def _resolve_sync_refs(refs, args, cache=None):
+    """``(ref_to_osm_id, way_refs)`` for sync-from-osm, by the chosen plan."""
+    strategy = osm_sync.choose_strategy(args.strategy, len(refs), args.snapshot)
+    if strategy == "batched":
+        print(f"[INFO] Resolving {len(refs)} refs against OSM via Overpass…")
+        ref_to_osm_id = osm_sync.query_osm_nodes_by_thc_refs(
+            refs,
+            batch_size=args.batch_size,
+            endpoint=args.overpass_endpoint,
+            rate_limit_sec=args.rate_limit_sec,
+            cache=cache,
+            concurrency=args.concurrency,
+            max_retries=args.max_retries,
+            checkpoint=args.checkpoint,
+            target_latency=args.target_latency,
+        )
+        return ref_to_osm_id, {}
+
+    if args.snapshot:
+        payload = osm_sync.load_snapshot(args.snapshot)
+        stamp = payload.get("osm3s", {}).get("timestamp_osm_base")
+        age = osm_dedup.snapshot_age_days(stamp)
+        age_note = f", {age} day(s) old" if age is not None else ""
+        print(
+            f"[INFO] Resolving {len(refs)} refs against snapshot {args.snapshot} "
+            f"(OSM base {stamp or 'unknown'}{age_note})"
+        )
+    else:
+        print(
+            f"[INFO] Resolving {len(refs)} refs against OSM with one statewide "
+            "Overpass query…"
+        )
+        payload = osm_sync.fetch_thc_tagged(endpoint=args.overpass_endpoint, cache=cache)
+    return osm_sync.join_thc_refs(refs, payload)
+
+
 # ---------- CLI Entry ---------- #
 
 
@@ -345,8 +332,8 @@ def main():
         "--dedup-check",
         action="store_true",
         help=(
-            "Before emitting each node, query Overpass for nearby memorial=plaque "
-            "nodes and skip candidates that fuzzy-match an existing one"
+            "Before emitting nodes, fetch nearby memorial=plaque nodes from "
+            "Overpass and skip candidates that fuzzy-match an existing one"
         ),
     )
     create.add_argument(
@@ -370,13 +357,31 @@ def main():
         "--dedup-rate-limit-sec",
         type=float,
         default=1.0,
-        help="Seconds to sleep between Overpass queries (default: 1.0)",
+        help="Seconds to sleep between Overpass tile queries (default: 1.0)",
+    )
+    create.add_argument(
+        "--dedup-tile-deg",
+        type=float,
+        default=osm_dedup.DEFAULT_TILE_DEG,
+        help=(
+            "Group candidates into tiles this many degrees wide and fetch each "
+            "tile's OSM memorials in one bbox query (default: 2.0)"
+        ),
+    )
+    create.add_argument(
+        "--dedup-snapshot",
+        metavar="PATH",
+        help=(
+            "Dedup offline against an `osm extract` JSON file instead of "
+            "querying Overpass (implies --dedup-check)"
+        ),
     )
     create.add_argument(
         "--overpass-endpoint",
         default=osm_dedup.DEFAULT_OVERPASS_ENDPOINT,
         help="Overpass API endpoint URL",
     )
+    add_cache_arguments(create)
 
     # push to JOSM
     push = sub.add_parser("push-josm", help="Push nodes into JOSM remote control")
@@ -398,6 +403,7 @@ def main():
         "--nodes-only", action="store_true",
         help="Legacy node-only query; reintroduces the way blind spot",
     )
+    add_cache_arguments(ext)
 
     fm = sub.add_parser("find-missing", help="Compare atlas against OSM GeoJSON")
     fm.add_argument("--csv", required=True)
@@ -430,7 +436,54 @@ def main():
         "--rate-limit-sec",
         type=float,
         default=1.5,
-        help="Sleep between batched Overpass queries (default: 1.5)",
+        help="Minimum seconds between Overpass request starts (default: 1.5)",
+    )
+    sync.add_argument(
+        "--concurrency",
+        type=int,
+        default=2,
+        help="Overpass batches in flight at once (default: 2)",
+    )
+    sync.add_argument(
+        "--target-latency",
+        type=float,
+        default=osm_sync.TARGET_LATENCY_SEC,
+        help=(
+            "Seconds an Overpass batch should take; slower answers halve the "
+            f"batch size (default: {osm_sync.TARGET_LATENCY_SEC:g})"
+        ),
+    )
+    sync.add_argument(
+        "--max-retries",
+        type=int,
+        default=5,
+        help="Retries per batch after HTTP 429, honouring Retry-After (default: 5)",
+    )
+    sync.add_argument(
+        "--checkpoint",
+        default=None,
+        help=(
+            "JSON file recording finished batches; an interrupted run resumes "
+            "from it (removed on success)"
+        ),
+    )
+    sync.add_argument(
+        "--strategy",
+        choices=osm_sync.SYNC_STRATEGIES,
+        default="auto",
+        help=(
+            "bulk: one statewide query for every ref:US-TX:thc feature, joined "
+            "locally; batched: regex queries of --batch-size refs; auto: bulk "
+            f"from {osm_sync.BULK_MIN_REFS} refs or with --snapshot (default: auto)"
+        ),
+    )
+    sync.add_argument(
+        "--snapshot",
+        default=None,
+        help=(
+            "Join against this `osm extract` JSON instead of querying Overpass "
+            "(it must postdate the JOSM upload)"
+        ),
     )
     sync.add_argument(
         "--overpass-endpoint",
@@ -445,6 +498,7 @@ def main():
             "and any ambiguous duplicates"
         ),
     )
+    add_cache_arguments(sync)
 
     refix = sub.add_parser(
         "refix-osm-ids",
@@ -511,11 +565,18 @@ def main():
                               help="Print what would be pushed without calling OSM")
 
     args = parser.parse_args()
+    cache = None
+    if args.cmd == "extract" or (
+        args.cmd == "sync-from-osm" and not args.snapshot
+    ) or (
+        args.cmd == "create-nodes" and args.dedup_check and not args.dedup_snapshot
+    ):
+        cache = cache_from_args(args)
 
     # Commands
     if args.cmd == "extract":
         from . import osm_extract
-        osm_extract.run_extract(args)
+        osm_extract.run_extract(args, cache=cache)
 
     elif args.cmd == "load":
         atlas = read_atlas(args.file)
@@ -533,13 +594,19 @@ def main():
             )
         nodes = create_nodes(df)
 
-        if args.dedup_check:
+        if args.dedup_check or args.dedup_snapshot:
+            index = None
+            if args.dedup_snapshot:
+                index = _load_dedup_snapshot(args.dedup_snapshot)
             nodes, skipped = _apply_dedup_check(
                 nodes,
                 radius_ft=args.dedup_distance_ft,
                 name_threshold=args.dedup_name_similarity,
                 rate_limit_sec=args.dedup_rate_limit_sec,
                 endpoint=args.overpass_endpoint,
+                tile_deg=args.dedup_tile_deg,
+                index=index,
+                cache=cache,
             )
             with open(args.dedup_report, "w") as f:
                 json.dump(skipped, f, indent=2)
@@ -574,15 +641,9 @@ def main():
             nodes_payload = json.load(f)
         refs = [n["tags"].get("ref:US-TX:thc") for n in nodes_payload]
         refs = [r for r in refs if r is not None]
-        print(f"[INFO] Resolving {len(refs)} refs against OSM via Overpass…")
-        ref_to_osm_id = osm_sync.query_osm_nodes_by_thc_refs(
-            refs,
-            batch_size=args.batch_size,
-            endpoint=args.overpass_endpoint,
-            rate_limit_sec=args.rate_limit_sec,
-        )
+        ref_to_osm_id, way_refs = _resolve_sync_refs(refs, args, cache)
         updated, n_updated, missing_refs = apply_sync_results(atlas, ref_to_osm_id)
-        resolved_int = {int(k) for k in ref_to_osm_id.keys()}
+        resolved_int = {int(k) for k in [*ref_to_osm_id, *way_refs]}
         unresolved = sorted({int(r) for r in refs} - resolved_int)
         print(
             f"[OK] Matched {len(ref_to_osm_id)} of {len(refs)} refs in OSM; "
@@ -599,6 +660,7 @@ def main():
                 "matched": ref_to_osm_id,
                 "stamped_atlas_rows": n_updated,
                 "unresolved_refs": unresolved,
+                "tagged_on_way": way_refs,
                 "refs_not_found_in_atlas": missing_refs,
             }
             with open(args.report, "w") as f:
@@ -643,6 +705,10 @@ def main():
         print(f"\n[SUMMARY] {total_ok} ok, {total_fail} skipped across "
               f"{i} batch(es)")
 
+    if cache is not None:
+        print(cache.summary())
+        cache.close()
+
 
 if __name__ == "__main__":
     main()
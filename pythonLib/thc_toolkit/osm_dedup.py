@@ -9,15 +9,26 @@ manual review instead of silently creating a duplicate.
 
 from __future__ import annotations
 
+import json
 import math
 import re
+import time
 import unicodedata
 from dataclasses import dataclass, field
-from difflib import SequenceMatcher
+from datetime import datetime, timezone
 from typing import Iterable
 
 import requests
 
+try:
+    from .name_scoring import NameScorer
+    from .osm_extract import coord_of, summarize
+    from .overpass_cache import post_json, runtime_error
+except ImportError:  # pragma: no cover - compatibility for direct script execution
+    from name_scoring import NameScorer  # type: ignore
+    from osm_extract import coord_of, summarize  # type: ignore
+    from overpass_cache import post_json, runtime_error  # type: ignore
+
 
 DEFAULT_OVERPASS_ENDPOINT = "https://overpass-api.de/api/interpreter"
 DEFAULT_USER_AGENT = (
@@ -56,17 +67,21 @@ def normalize_name(value) -> str:
     return text
 
 
+def name_scorer(workers: int | None = None) -> NameScorer:
+    """A :class:`NameScorer` over :func:`normalize_name` forms."""
+    return NameScorer(normalize_name, workers=workers)
+
+
+_NAME_SCORER = name_scorer()
+
+
 def name_similarity(a, b) -> float:
     """Return a 0..1 similarity score between two free-text names.
 
     Uses :class:`difflib.SequenceMatcher` on normalized forms. Empty inputs
     score 0.0 so missing names never count as a match.
     """
-    na = normalize_name(a)
-    nb = normalize_name(b)
-    if not na or not nb:
-        return 0.0
-    return SequenceMatcher(None, na, nb).ratio()
+    return _NAME_SCORER.score(a, b)
 
 
 def haversine_m(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
@@ -93,12 +108,47 @@ class OverpassNode:
     lat: float
     lon: float
     tags: dict = field(default_factory=dict)
+    # "way" for a snapshot feature mapped as a way (lat/lon is its centre).
+    osm_type: str = "node"
 
     @property
     def name(self) -> str:
         return self.tags.get("name", "")
 
 
+def _parse_memorial_nodes(payload: dict) -> list[OverpassNode]:
+    nodes: list[OverpassNode] = []
+    for el in payload.get("elements", []):
+        if el.get("type") != "node":
+            continue
+        nodes.append(
+            OverpassNode(
+                osm_id=int(el["id"]),
+                lat=float(el["lat"]),
+                lon=float(el["lon"]),
+                tags=dict(el.get("tags", {}) or {}),
+            )
+        )
+    return nodes
+
+
+def _post_overpass(query, endpoint, timeout, session, user_agent, cache=None):
+    """POST ``query``; returns ``(payload, from_cache)``.
+
+    A timed-out or partial answer raises instead of reading as "no
+    memorials here".
+    """
+    http = session or requests
+    headers = {"User-Agent": user_agent}
+    payload, from_cache = post_json(
+        http, endpoint, query, timeout + 5, headers, cache=cache
+    )
+    remark = runtime_error(payload)
+    if remark:
+        raise RuntimeError(f"Overpass query failed: {remark}")
+    return payload, from_cache
+
+
 def query_overpass_memorials_near(
     lat: float,
     lon: float,
@@ -107,6 +157,7 @@ def query_overpass_memorials_near(
     timeout: float = 25.0,
     session: requests.Session | None = None,
     user_agent: str = DEFAULT_USER_AGENT,
+    cache=None,
 ) -> list[OverpassNode]:
     """Fetch ``memorial=plaque`` nodes within ``radius_m`` of (lat, lon)."""
     query = (
@@ -114,26 +165,216 @@ def query_overpass_memorials_near(
         f'node["memorial"="plaque"](around:{radius_m:.2f},{lat:.7f},{lon:.7f});'
         "out;"
     )
-    http = session or requests
-    headers = {"User-Agent": user_agent}
-    response = http.post(
-        endpoint, data={"data": query}, timeout=timeout + 5, headers=headers
+    payload, _ = _post_overpass(query, endpoint, timeout, session, user_agent, cache)
+    return _parse_memorial_nodes(payload)
+
+
+def query_overpass_memorials_bbox(
+    south: float,
+    west: float,
+    north: float,
+    east: float,
+    endpoint: str = DEFAULT_OVERPASS_ENDPOINT,
+    timeout: float = 60.0,
+    session: requests.Session | None = None,
+    user_agent: str = DEFAULT_USER_AGENT,
+    cache=None,
+) -> list[OverpassNode]:
+    """Fetch every ``memorial=plaque`` node inside a bounding box."""
+    return _bbox_nodes(
+        (south, west, north, east), endpoint, timeout, session, user_agent, cache
+    )[0]
+
+
+def _bbox_nodes(box, endpoint, timeout, session, user_agent, cache=None):
+    south, west, north, east = box
+    query = (
+        f"[out:json][timeout:{int(timeout)}];"
+        f'node["memorial"="plaque"]({south:.7f},{west:.7f},{north:.7f},{east:.7f});'
+        "out;"
     )
-    response.raise_for_status()
-    payload = response.json()
-    nodes: list[OverpassNode] = []
+    payload, from_cache = _post_overpass(
+        query, endpoint, timeout, session, user_agent, cache
+    )
+    return _parse_memorial_nodes(payload), from_cache
+
+
+# ----------------------------- batched lookup ------------------------------
+
+# Metres per degree of latitude; used only to size boxes and grid cells, which
+# are always padded, never to measure a match.
+_M_PER_DEG_LAT = 111_320.0
+DEFAULT_TILE_DEG = 2.0
+
+
+def _pad_deg(radius_m: float, lat: float) -> tuple[float, float]:
+    """Degrees of (lat, lon) that safely cover ``radius_m`` around ``lat``."""
+    dlat = radius_m / _M_PER_DEG_LAT * 1.01
+    coslat = max(math.cos(math.radians(min(abs(lat) + dlat, 89.0))), 1e-6)
+    return dlat, dlat / coslat
+
+
+def _overpass_order(node: OverpassNode):
+    # Overpass prints a union as nodes then ways, each by ascending id.
+    return (node.osm_type != "node", node.osm_id)
+
+
+class MemorialIndex:
+    """Grid index over OSM memorial nodes for radius lookups.
+
+    Nodes are bucketed by ``cell_deg`` cells (a fixed-precision geohash);
+    :meth:`nearby` reads only the cells a search circle can touch. Results are
+    ordered as Overpass prints them (nodes, then ways, by id), so
+    ``find_duplicate`` breaks ties exactly as it did on a live ``around:``
+    query.
+    """
+
+    def __init__(self, nodes: Iterable[OverpassNode] = (), cell_deg: float = 0.01):
+        self.cell_deg = cell_deg
+        self._cells: dict[tuple[int, int], list[OverpassNode]] = {}
+        self._ids: set[tuple[str, int]] = set()
+        self.add(nodes)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def _cell(self, lat: float, lon: float) -> tuple[int, int]:
+        return (math.floor(lat / self.cell_deg), math.floor(lon / self.cell_deg))
+
+    def add(self, nodes: Iterable[OverpassNode]) -> None:
+        for node in nodes:
+            key = (node.osm_type, node.osm_id)
+            if key in self._ids:
+                continue  # overlapping tiles return the same node twice
+            self._ids.add(key)
+            self._cells.setdefault(self._cell(node.lat, node.lon), []).append(node)
+
+    def nearby(self, lat: float, lon: float, radius_m: float) -> list[OverpassNode]:
+        """Nodes within ``radius_m`` (great-circle) of (lat, lon)."""
+        dlat, dlon = _pad_deg(radius_m, lat)
+        r0, c0 = self._cell(lat - dlat, lon - dlon)
+        r1, c1 = self._cell(lat + dlat, lon + dlon)
+        found = [
+            node
+            for r in range(r0, r1 + 1)
+            for c in range(c0, c1 + 1)
+            for node in self._cells.get((r, c), ())
+            if haversine_m(lat, lon, node.lat, node.lon) <= radius_m
+        ]
+        return sorted(found, key=_overpass_order)
+
+
+def plan_tiles(
+    points: Iterable[tuple[float, float]],
+    radius_m: float,
+    tile_deg: float = DEFAULT_TILE_DEG,
+) -> dict[tuple[int, int], tuple[float, float, float, float]]:
+    """Group (lat, lon) points into ``tile_deg`` tiles; one query box per tile.
+
+    Each box is the tight bounding box of the tile's points padded by
+    ``radius_m``, so sparse tiles ask Overpass for very little.
+    """
+    boxes: dict[tuple[int, int], list[float]] = {}
+    for lat, lon in points:
+        key = (math.floor(lat / tile_deg), math.floor(lon / tile_deg))
+        box = boxes.setdefault(key, [lat, lon, lat, lon])
+        box[0] = min(box[0], lat)
+        box[1] = min(box[1], lon)
+        box[2] = max(box[2], lat)
+        box[3] = max(box[3], lon)
+
+    out = {}
+    for key, (south, west, north, east) in boxes.items():
+        dlat, dlon = _pad_deg(radius_m, max(abs(south), abs(north)))
+        out[key] = (south - dlat, west - dlon, north + dlat, east + dlon)
+    return out
+
+
+def tile_key(lat: float, lon: float, tile_deg: float = DEFAULT_TILE_DEG):
+    return (math.floor(lat / tile_deg), math.floor(lon / tile_deg))
+
+
+def fetch_memorial_index(
+    points: Iterable[tuple[float, float]],
+    radius_m: float,
+    tile_deg: float = DEFAULT_TILE_DEG,
+    rate_limit_sec: float = 1.0,
+    endpoint: str = DEFAULT_OVERPASS_ENDPOINT,
+    session: requests.Session | None = None,
+    user_agent: str = DEFAULT_USER_AGENT,
+    log=print,
+    sleep=time.sleep,
+    cache=None,
+) -> tuple[MemorialIndex, set]:
+    """Fetch every memorial near ``points`` with one bbox query per tile.
+
+    Returns ``(index, failed_tiles)``. A tile whose query fails is left out of
+    the index and reported, so the caller can treat its candidates as
+    unchecked rather than as having no duplicate.
+    """
+    tiles = plan_tiles(points, radius_m, tile_deg)
+    index = MemorialIndex()
+    failed = set()
+    for i, (key, box) in enumerate(sorted(tiles.items()), start=1):
+        from_cache = False
+        try:
+            nodes, from_cache = _bbox_nodes(
+                box, endpoint, 60.0, session, user_agent, cache
+            )
+            index.add(nodes)
+        except Exception as e:
+            log(f"[WARN] Overpass bbox query failed for tile {box} ({e})")
+            failed.add(key)
+        if rate_limit_sec and i < len(tiles) and not from_cache:
+            sleep(rate_limit_sec)
+    log(
+        f"[INFO] Dedup: {len(index)} OSM memorial node(s) from "
+        f"{len(tiles) - len(failed)}/{len(tiles)} tile quer{'y' if len(tiles) == 1 else 'ies'}"
+    )
+    return index, failed
+
+
+def load_snapshot_index(path) -> tuple[MemorialIndex, dict]:
+    """Index an ``osm extract`` JSON file for offline dedup.
+
+    Nodes are indexed at their position and ways at their ``out center``
+    centroid. Returns ``(index, info)`` where ``info`` is
+    :func:`osm_extract.summarize` plus ``unlocated``, the number of elements
+    that carried no usable coordinate.
+    """
+    with open(path, encoding="utf-8") as f:
+        payload = json.load(f)
+    nodes = []
+    unlocated = 0
     for el in payload.get("elements", []):
-        if el.get("type") != "node":
+        pos = coord_of(el)
+        if pos is None:
+            unlocated += 1
             continue
         nodes.append(
             OverpassNode(
                 osm_id=int(el["id"]),
-                lat=float(el["lat"]),
-                lon=float(el["lon"]),
+                lat=pos[0],
+                lon=pos[1],
                 tags=dict(el.get("tags", {}) or {}),
+                osm_type=el.get("type", "node"),
             )
         )
-    return nodes
+    info = summarize(payload)
+    info["unlocated"] = unlocated
+    return MemorialIndex(nodes), info
+
+
+def snapshot_age_days(timestamp: str | None, now: datetime | None = None):
+    """Whole days since an Overpass ``timestamp_osm_base``; None if unknown."""
+    if not timestamp:
+        return None
+    try:
+        base = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    now = now or datetime.now(timezone.utc)
+    return (now - base).days
 
 
 def find_duplicate(
@@ -147,12 +388,16 @@ def find_duplicate(
     session: requests.Session | None = None,
     nearby_nodes: Iterable[OverpassNode] | None = None,
     user_agent: str = DEFAULT_USER_AGENT,
+    cache=None,
+    scorer: NameScorer | None = None,
 ) -> dict | None:
     """Return a match descriptor when a near-duplicate OSM node exists.
 
     ``nearby_nodes`` lets callers inject pre-fetched results (used by tests
-    and by callers that want to batch Overpass requests). When not provided,
-    Overpass is queried for ``memorial=plaque`` nodes around the candidate.
+    and by ``osm_cli`` via :class:`MemorialIndex`, which batches the Overpass
+    requests). When not provided, Overpass is queried for ``memorial=plaque``
+    nodes around the candidate. ``scorer`` is a :func:`name_scorer` the
+    caller has already fed its pairs in bulk.
     """
     radius_m = radius_ft / FEET_PER_METER
     if nearby_nodes is None:
@@ -164,6 +409,7 @@ def find_duplicate(
             timeout=timeout,
             session=session,
             user_agent=user_agent,
+            cache=cache,
         )
 
     best: dict | None = None
@@ -178,7 +424,7 @@ def find_duplicate(
         if distance_ft > radius_ft:
             continue
 
-        similarity = name_similarity(candidate_name, node.name)
+        similarity = (scorer or _NAME_SCORER).score(candidate_name, node.name)
 
         # Two plaques do not occupy the same few feet. Inside PROXIMITY_ONLY_FT
         # the position alone is enough to demand human review, whatever the
@@ -196,6 +442,7 @@ def find_duplicate(
                 "name": node.name,
                 "lat": node.lat,
                 "lon": node.lon,
+                "osm_type": node.osm_type,
                 "distance_ft": round(distance_ft, 2),
                 "name_similarity": round(similarity, 4),
                 "matched_on": "name" if similarity >= name_threshold else "proximity",
@@ -28,6 +28,11 @@ from pathlib import Path
 
 import requests
 
+try:
+    from .overpass_cache import post_json
+except ImportError:  # pragma: no cover - compatibility for direct script execution
+    from overpass_cache import post_json  # type: ignore
+
 DEFAULT_ENDPOINT = "https://overpass-api.de/api/interpreter"
 DEFAULT_USER_AGENT = (
     "thc-toolkit/0.1 (joelotz@gmail.com) TX historical marker reconciliation")
@@ -54,13 +59,12 @@ def fetch(bbox: tuple[float, float, float, float] = TX_BBOX,
           user_agent: str = DEFAULT_USER_AGENT,
           include_ways: bool = True,
           timeout: int = 300,
-          session: requests.Session | None = None) -> dict:
+          session: requests.Session | None = None,
+          cache=None) -> dict:
     http = session or requests
-    r = http.post(endpoint,
-                  data={"data": build_query(bbox, timeout, include_ways)},
-                  timeout=timeout + 60, headers={"User-Agent": user_agent})
-    r.raise_for_status()
-    return r.json()
+    payload, _ = post_json(http, endpoint, build_query(bbox, timeout, include_ways),
+                           timeout + 60, {"User-Agent": user_agent}, cache=cache)
+    return payload
 
 
 def coord_of(element: dict) -> tuple[float, float] | None:
@@ -88,8 +92,8 @@ def summarize(payload: dict) -> dict:
     }
 
 
-def run_extract(args) -> None:
-    payload = fetch(include_ways=not args.nodes_only)
+def run_extract(args, cache=None) -> None:
+    payload = fetch(include_ways=not args.nodes_only, cache=cache)
     out = Path(args.out)
     out.parent.mkdir(parents=True, exist_ok=True)
     out.write_text(json.dumps(payload))
@@ -5,16 +5,55 @@ After a JOSM upload pushes new ``memorial=plaque`` nodes to OpenStreetMap,
 each node receives a real OSM ID. This module queries Overpass by
 ``ref:US-TX:thc`` in batches and returns ``{ref: osm_id}`` so the atlas can
 be stamped with ``isOSM=True`` and ``OsmNodeID=<id>``.
+
+Batches run a few at a time, back off on HTTP 429, size themselves to
+Overpass response latency (halving outright when it times out), and can be
+checkpointed so a long sync resumes where it stopped.
+
+Each batch is a regex alternation (``"^(94|219|...)$"``) that Overpass tests
+against every tagged node, so a sync of thousands of refs is hundreds of
+expensive queries. For large ref sets the bulk plan replaces them: one bbox
+query pulls every Texas node and way carrying a ``ref:US-TX:thc`` (or an
+``osm extract`` snapshot is reused) and :func:`join_thc_refs` matches the
+requested refs locally through a dict.
 """
 
 from __future__ import annotations
 
+import json
+import os
+import threading
 import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from pathlib import Path
 from typing import Iterable
 
 import requests
 
 from .osm_dedup import DEFAULT_OVERPASS_ENDPOINT, DEFAULT_USER_AGENT
+from .osm_extract import TX_BBOX
+from .overpass_cache import post_json, runtime_error
+
+# Overpass answers these when a query is too heavy for it right now; the batch
+# is retried in halves. 429 is different: same batch, after Retry-After.
+SPLIT_STATUS = {502, 503, 504}
+BACKOFF_BASE_SEC = 2.0
+BACKOFF_CAP_SEC = 120.0
+# Consecutive fast batches (under half the latency target) before a shrunken
+# batch size doubles again.
+GROW_AFTER = 4
+# A batch answered slower than this halves the batch size for the next ones.
+# Well under the query's own server-side timeout, so the size backs off before
+# Overpass starts giving up on batches.
+TARGET_LATENCY_SEC = 10.0
+# ``strategy="auto"`` switches from batched regex queries to the bulk plan at
+# this many refs. Below it the statewide pull (~12k tagged features) costs the
+# server more than a handful of small batches.
+BULK_MIN_REFS = 500
+SYNC_STRATEGIES = ("auto", "bulk", "batched")
 
 
 def _normalize_refs(refs: Iterable) -> list[str]:
@@ -42,6 +81,116 @@ def _build_query(refs_batch: list[str], timeout: int) -> str:
     )
 
 
+class _Pacer:
+    """Space request starts at least ``interval`` seconds apart across threads."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+class _BatchTooLarge(Exception):
+    """Overpass timed out or gave up on a batch; retry it in smaller pieces."""
+
+
+def _retry_after_seconds(response, attempt: int) -> float:
+    """``Retry-After`` (seconds or HTTP date) if sent, else exponential backoff."""
+    header = (response.headers or {}).get("Retry-After") if response is not None else None
+    if header:
+        try:
+            return max(0.0, float(header))
+        except ValueError:
+            try:
+                when = parsedate_to_datetime(header)
+                return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+            except (TypeError, ValueError):
+                pass
+    return min(BACKOFF_CAP_SEC, BACKOFF_BASE_SEC * 2**attempt)
+
+
+def _batch_elements(payload: dict) -> list[tuple[str, int]]:
+    """``(ref, osm_id)`` for each node in a response, in response order."""
+    out = []
+    for el in payload.get("elements", []):
+        if el.get("type") != "node":
+            continue
+        tags = el.get("tags") or {}
+        ref = tags.get("ref:US-TX:thc")
+        if ref is None:
+            continue
+        out.append((str(ref).strip(), int(el["id"])))
+    return out
+
+
+def _fetch_batch(batch, http, endpoint, timeout, headers, cache, pacer, max_retries):
+    """``(elements, seconds)`` for a batch; retries 429s, raises _BatchTooLarge on timeouts.
+
+    ``seconds`` is how long the answered request took, without pacing or
+    Retry-After waits; ``None`` when the batch came from the cache.
+    """
+    query = _build_query(batch, timeout=int(timeout))
+    if cache is not None:
+        payload = cache.get(endpoint, query)
+        if payload is not None:
+            return _batch_elements(payload), None
+
+    attempt = 0
+    while True:
+        pacer.wait()
+        started = time.perf_counter()
+        try:
+            payload, _ = post_json(http, endpoint, query, timeout + 5, headers)
+        except requests.HTTPError as e:
+            status = getattr(e.response, "status_code", None)
+            if status == 429 and attempt < max_retries:
+                time.sleep(_retry_after_seconds(e.response, attempt))
+                attempt += 1
+                continue
+            if status in SPLIT_STATUS:
+                raise _BatchTooLarge(f"HTTP {status}") from e
+            raise
+        except requests.Timeout as e:
+            raise _BatchTooLarge("request timed out") from e
+
+        elapsed = time.perf_counter() - started
+
+        remark = runtime_error(payload)
+        if remark is not None:
+            # Overpass answers 200 with a partial result when a query times out
+            # server-side; never keep or cache that.
+            raise _BatchTooLarge(remark)
+        if cache is not None:
+            cache.put(endpoint, query, payload)
+        return _batch_elements(payload), elapsed
+
+
+def load_checkpoint(path) -> list[dict]:
+    """Completed batches from a sync checkpoint file (``[]`` when absent)."""
+    p = Path(path)
+    if not p.exists():
+        return []
+    with open(p) as f:
+        return json.load(f).get("batches", [])
+
+
+def save_checkpoint(path, batches: list[dict]) -> None:
+    tmp = Path(f"{path}.tmp")
+    with open(tmp, "w") as f:
+        json.dump({"batches": batches}, f)
+    os.replace(tmp, path)
+
+
 def query_osm_nodes_by_thc_refs(
     refs: Iterable,
     batch_size: int = 50,
@@ -51,6 +200,11 @@ def query_osm_nodes_by_thc_refs(
     user_agent: str = DEFAULT_USER_AGENT,
     session: requests.Session | None = None,
     log=print,
+    cache=None,
+    concurrency: int = 1,
+    max_retries: int = 5,
+    checkpoint: str | os.PathLike | None = None,
+    target_latency: float = TARGET_LATENCY_SEC,
 ) -> dict[str, int]:
     """Look up ``{ref:US-TX:thc -> osm_node_id}`` for the given refs via Overpass.
 
@@ -58,48 +212,134 @@ def query_osm_nodes_by_thc_refs(
     contains multiple nodes for the same ``ref:US-TX:thc``, the first one
     seen wins and a warning is logged — the atlas can't safely commit to
     a single ID until the duplication is resolved upstream.
+
+    Up to ``concurrency`` batches are in flight at once, with request starts
+    still spaced ``rate_limit_sec`` apart. A 429 is retried after its
+    ``Retry-After``. The batch size (at most ``batch_size``) follows response
+    latency: a batch answered slower than ``target_latency`` seconds halves
+    it, and it doubles back after a run of batches answered in under half
+    that. A batch Overpass times out on is split in half and retried. With
+    ``checkpoint``,
+    each finished batch is saved as it lands and skipped on the next run; the
+    file is removed once every batch is done. Batches are replayed in ref
+    order afterwards, so the mapping and warnings match a sequential run.
     """
-    normalized = _normalize_refs(refs)
+    normalized = list(dict.fromkeys(_normalize_refs(refs)))
     if not normalized:
         return {}
 
     http = session or requests
     headers = {"User-Agent": user_agent}
+    position = {ref: i for i, ref in enumerate(normalized)}
+
+    done: list[dict] = []
+    if checkpoint:
+        done = [
+            b for b in load_checkpoint(checkpoint)
+            if b["refs"] and all(r in position for r in b["refs"])
+        ]
+        if done and log:
+            log(f"[INFO] sync checkpoint: {sum(len(b['refs']) for b in done)} refs already done")
+    covered = {r for b in done for r in b["refs"]}
+    todo = [r for r in normalized if r not in covered]
+
+    pacer = _Pacer(rate_limit_sec)
+    size = max(1, batch_size)
+    retry: deque[list[str]] = deque()
+    cursor = 0
+    streak = 0
+    failure: BaseException | None = None
+    matched: set[str] = {ref for b in done for ref, _ in b["elements"]}
+
+    def next_batch():
+        nonlocal cursor
+        if retry:
+            return retry.popleft()
+        if cursor >= len(todo):
+            return None
+        batch = todo[cursor : cursor + size]
+        cursor += len(batch)
+        return batch
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        running = {}
+
+        def fill():
+            while failure is None and len(running) < max(1, concurrency):
+                batch = next_batch()
+                if batch is None:
+                    return
+                fut = pool.submit(
+                    _fetch_batch, batch, http, endpoint, timeout, headers,
+                    cache, pacer, max_retries,
+                )
+                running[fut] = batch
+
+        fill()
+        while running:
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                batch = running.pop(fut)
+                try:
+                    elements, elapsed = fut.result()
+                except _BatchTooLarge as e:
+                    if len(batch) == 1:
+                        failure = failure or RuntimeError(
+                            f"Overpass failed on ref:US-TX:thc={batch[0]} ({e})"
+                        )
+                        continue
+                    half = len(batch) // 2
+                    retry.appendleft(batch[half:])
+                    retry.appendleft(batch[:half])
+                    size = max(1, min(size, half))
+                    streak = 0
+                    if log:
+                        log(f"[WARN] sync batch of {len(batch)} refs failed ({e}); "
+                            f"retrying as {half} + {len(batch) - half}")
+                    continue
+                except BaseException as e:  # noqa: BLE001 - re-raised below
+                    failure = failure or e
+                    continue
+
+                done.append({"refs": batch, "elements": [list(x) for x in elements]})
+                matched.update(ref for ref, _ in elements)
+                if elapsed is not None and elapsed > target_latency:
+                    if len(batch) > 1 and size > len(batch) // 2:
+                        size = max(1, len(batch) // 2)
+                        if log:
+                            log(f"[INFO] sync batch of {len(batch)} refs took "
+                                f"{elapsed:.1f}s (target {target_latency:g}s); "
+                                f"batch size now {size}")
+                    streak = 0
+                elif elapsed is None or elapsed <= target_latency / 2:
+                    streak += 1
+                    if streak >= GROW_AFTER and size < batch_size:
+                        size, streak = min(batch_size, size * 2), 0
+                if checkpoint:
+                    save_checkpoint(checkpoint, done)
+                if log:
+                    n_done = sum(len(b["refs"]) for b in done)
+                    log(
+                        f"[INFO] sync batch {len(done)}: queried {len(batch)} refs "
+                        f"({n_done}/{len(normalized)} done), "
+                        f"matched {len(matched)} so far"
+                    )
+            fill()
+
+    if failure is not None:
+        if checkpoint and log:
+            log(f"[INFO] sync checkpoint saved to {checkpoint}; rerun to resume")
+        raise failure
+
     result: dict[str, int] = {}
     duplicates: dict[str, list[int]] = {}
-
-    batches = [
-        normalized[i : i + batch_size] for i in range(0, len(normalized), batch_size)
-    ]
-    for i, batch in enumerate(batches, start=1):
-        query = _build_query(batch, timeout=int(timeout))
-        response = http.post(
-            endpoint, data={"data": query}, timeout=timeout + 5, headers=headers
-        )
-        response.raise_for_status()
-        payload = response.json()
-        for el in payload.get("elements", []):
-            if el.get("type") != "node":
-                continue
-            tags = el.get("tags") or {}
-            ref = tags.get("ref:US-TX:thc")
-            if ref is None:
-                continue
-            ref_s = str(ref).strip()
-            osm_id = int(el["id"])
+    for batch in sorted(done, key=lambda b: position[b["refs"][0]]):
+        for ref_s, osm_id in batch["elements"]:
             if ref_s in result and result[ref_s] != osm_id:
                 duplicates.setdefault(ref_s, [result[ref_s]]).append(osm_id)
             else:
                 result[ref_s] = osm_id
 
-        if log:
-            log(
-                f"[INFO] sync batch {i}/{len(batches)}: queried {len(batch)} refs, "
-                f"matched {sum(1 for r in batch if r in result)} so far"
-            )
-        if rate_limit_sec and i < len(batches):
-            time.sleep(rate_limit_sec)
-
     if duplicates and log:
         for ref_s, ids in duplicates.items():
             log(
@@ -107,4 +347,121 @@ def query_osm_nodes_by_thc_refs(
                 f"({ids}); kept first ({result[ref_s]})"
             )
 
+    if checkpoint and Path(checkpoint).exists():
+        os.remove(checkpoint)
     return result
+
+
+# ---------------------------------------------------------------- bulk plan
+
+
+def build_bulk_query(
+    bbox: tuple[float, float, float, float] = TX_BBOX,
+    timeout: int = 180,
+    include_ways: bool = True,
+) -> str:
+    """Overpass QL for every feature in ``bbox`` carrying a ``ref:US-TX:thc``."""
+    s, w, n, e = bbox
+    box = f"{s},{w},{n},{e}"
+    parts = [f'node["ref:US-TX:thc"]({box});']
+    if include_ways:
+        parts.append(f'way["ref:US-TX:thc"]({box});')
+    return f"[out:json][timeout:{timeout}];(" + "".join(parts) + ");out tags;"
+
+
+def fetch_thc_tagged(
+    bbox: tuple[float, float, float, float] = TX_BBOX,
+    endpoint: str = DEFAULT_OVERPASS_ENDPOINT,
+    timeout: float = 180.0,
+    user_agent: str = DEFAULT_USER_AGENT,
+    session: requests.Session | None = None,
+    cache=None,
+    include_ways: bool = True,
+) -> dict:
+    """One Overpass payload holding every THC-tagged node (and way) in ``bbox``."""
+    http = session or requests
+    query = build_bulk_query(bbox, timeout=int(timeout), include_ways=include_ways)
+    if cache is not None:
+        payload = cache.get(endpoint, query)
+        if payload is not None:
+            return payload
+    payload, _ = post_json(http, endpoint, query, timeout + 60, {"User-Agent": user_agent})
+    remark = runtime_error(payload)
+    if remark is not None:
+        # Checked before caching, as in _fetch_batch: a failed query must go
+        # back to Overpass on the next run, not replay from the cache.
+        raise RuntimeError(f"Overpass bulk query failed: {remark}")
+    if cache is not None:
+        cache.put(endpoint, query, payload)
+    return payload
+
+
+def index_thc_elements(payload: dict) -> dict[str, dict[str, list[int]]]:
+    """``{ref: {"node": [ids], "way": [ids]}}`` in payload order.
+
+    Works on a :func:`fetch_thc_tagged` payload and on an ``osm extract``
+    snapshot alike; elements without a ``ref:US-TX:thc`` are ignored.
+    """
+    index: dict[str, dict[str, list[int]]] = {}
+    for el in payload.get("elements", []):
+        kind = el.get("type")
+        if kind not in ("node", "way"):
+            continue
+        ref = (el.get("tags") or {}).get("ref:US-TX:thc")
+        if ref is None:
+            continue
+        slot = index.setdefault(str(ref).strip(), {"node": [], "way": []})
+        slot[kind].append(int(el["id"]))
+    return index
+
+
+def join_thc_refs(
+    refs: Iterable, payload: dict, log=print
+) -> tuple[dict[str, int], dict[str, int]]:
+    """Match refs against a bulk payload; returns ``(nodes, ways)``.
+
+    ``nodes`` is the same ``{ref: osm_node_id}`` mapping
+    :func:`query_osm_nodes_by_thc_refs` returns, first node winning with a
+    warning on duplicates. ``ways`` holds refs found *only* on a way --
+    present in OSM, but a way ID cannot go into ``OsmNodeID``.
+    """
+    index = index_thc_elements(payload)
+    nodes: dict[str, int] = {}
+    ways: dict[str, int] = {}
+    for ref_s in dict.fromkeys(_normalize_refs(refs)):
+        hit = index.get(ref_s)
+        if hit is None:
+            continue
+        if hit["node"]:
+            ids = list(dict.fromkeys(hit["node"]))
+            nodes[ref_s] = ids[0]
+            if len(ids) > 1 and log:
+                log(
+                    f"[WARN] ref:US-TX:thc={ref_s} has multiple OSM nodes "
+                    f"({ids}); kept first ({ids[0]})"
+                )
+        elif hit["way"]:
+            ways[ref_s] = hit["way"][0]
+    if ways and log:
+        log(
+            f"[WARN] {len(ways)} ref(s) are tagged on a way, not a node "
+            f"(e.g. ref:US-TX:thc={next(iter(ways))}); left out of OsmNodeID"
+        )
+    return nodes, ways
+
+
+def load_snapshot(path) -> dict:
+    """An ``osm extract`` JSON file, for :func:`join_thc_refs`."""
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def choose_strategy(strategy: str, n_refs: int, snapshot=None) -> str:
+    """Resolve ``"auto"`` to ``"bulk"`` or ``"batched"``."""
+    if strategy not in SYNC_STRATEGIES:
+        raise ValueError(
+            f"unknown sync strategy {strategy!r}; expected one of {SYNC_STRATEGIES}"
+        )
+    if strategy != "auto":
+        return strategy
+    return "bulk" if snapshot or n_refs >= BULK_MIN_REFS else "batched"
@@ -0,0 +1,234 @@
+"""On-disk cache of Overpass responses.
+
+Dedup, sync-from-osm and the statewide extract all POST to the public Overpass
+server. Rerunning one of them after a failure -- a timeout on batch 30 of 40,
+a typo in ``--out`` -- used to re-download everything and spend the server's
+patience on answers we already had.
+
+Responses are stored in a small SQLite file keyed by a hash of the endpoint
+and the *normalized* query: whitespace collapsed and the ``[timeout:N]``
+setting dropped, since neither changes the answer. Each entry expires after
+``ttl_sec``; OSM moves, so the default is an hour, long enough to cover a
+retry and short enough that a sync run after a JOSM upload sees the new
+nodes. Bodies are zlib-compressed, and once the file holds more than
+``max_bytes`` of them the least recently used entries are evicted.
+
+Callers thread an :class:`OverpassCache` through the ``cache=`` argument of
+the Overpass helpers (``osm_dedup``, ``osm_sync``, ``osm_extract``); ``None``
+means no caching, exactly as before.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+
+DEFAULT_TTL_SEC = 3600.0
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+CACHE_FILE_NAME = "overpass_cache.sqlite"
+
+_TIMEOUT_SETTING_RE = re.compile(r"\[timeout:\d+\]")
+_WS_RE = re.compile(r"\s+")
+_PUNCT_WS_RE = re.compile(r"\s*([;(),\[\]])\s*")
+
+
+def default_cache_dir() -> Path:
+    """``$XDG_CACHE_HOME/thc-toolkit``, else ``~/.cache/thc-toolkit``."""
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "thc-toolkit"
+
+
+def normalize_query(query: str) -> str:
+    """Overpass QL with the parts that do not change the answer removed."""
+    text = _TIMEOUT_SETTING_RE.sub("", query)
+    text = _WS_RE.sub(" ", text).strip()
+    return _PUNCT_WS_RE.sub(r"\1", text)
+
+
+def query_key(endpoint: str, query: str) -> str:
+    raw = f"{endpoint.rstrip('/')}\n{normalize_query(query)}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class OverpassCache:
+    """SQLite-backed Overpass response cache with TTL and LRU eviction."""
+
+    def __init__(
+        self,
+        cache_dir: str | os.PathLike | None = None,
+        ttl_sec: float = DEFAULT_TTL_SEC,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        clock=time.time,
+    ):
+        self.path = Path(cache_dir or default_cache_dir()).expanduser() / CACHE_FILE_NAME
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_sec = ttl_sec
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                endpoint TEXT NOT NULL,
+                query TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS responses_accessed ON responses(accessed_at)"
+        )
+        self._conn.commit()
+
+    # ------------------------------------------------------------------ API
+
+    def get(self, endpoint: str, query: str) -> dict | None:
+        """Cached payload for this query, or None (counted as a miss)."""
+        key = query_key(endpoint, query)
+        now = self._clock()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, stored_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl_sec:
+                if row is not None:
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self._conn.commit()
+                self.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+            self.hits += 1
+        return json.loads(zlib.decompress(row[0]))
+
+    def put(self, endpoint: str, query: str, payload: dict) -> None:
+        body = zlib.compress(json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+        now = self._clock()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    query_key(endpoint, query),
+                    endpoint,
+                    normalize_query(query),
+                    body,
+                    len(body),
+                    now,
+                    now,
+                ),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def size_bytes(self) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()[0]
+
+    def summary(self) -> str:
+        return (
+            f"[INFO] Overpass cache: {self.hits} hit(s), {self.misses} miss(es) "
+            f"({self.path})"
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # ------------------------------------------------------------- internal
+
+    def _evict(self) -> None:
+        """Drop expired entries, then least recently used ones over the cap."""
+        self._conn.execute(
+            "DELETE FROM responses WHERE stored_at < ?", (self._clock() - self.ttl_sec,)
+        )
+        total = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        doomed = []
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY accessed_at ASC"
+        ):
+            if total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", doomed)
+
+
+def runtime_error(payload: dict) -> str | None:
+    """The ``remark`` of a timed-out or partial Overpass answer, else None.
+
+    Overpass answers HTTP 200 with whatever it gathered when a query runs
+    out of time or memory server-side, flagged only by this remark.
+    """
+    remark = str(payload.get("remark") or "")
+    return remark if "runtime error" in remark else None
+
+
+def post_json(http, endpoint, query, timeout, headers, cache=None) -> tuple[dict, bool]:
+    """POST an Overpass query, going through ``cache`` when one is given.
+
+    Returns ``(payload, from_cache)`` so callers can skip their rate-limit
+    sleep after a hit. A payload flagged by :func:`runtime_error` is
+    returned but never cached; the caller decides whether it is a failure.
+    """
+    if cache is not None:
+        payload = cache.get(endpoint, query)
+        if payload is not None:
+            return payload, True
+    response = http.post(endpoint, data={"data": query}, timeout=timeout, headers=headers)
+    response.raise_for_status()
+    payload = response.json()
+    if cache is not None and runtime_error(payload) is None:
+        cache.put(endpoint, query, payload)
+    return payload, False
+
+
+def add_cache_arguments(parser) -> None:
+    """``--cache-dir`` / ``--no-cache`` / ``--cache-ttl`` for an Overpass command."""
+    parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help=f"Overpass response cache directory (default: {default_cache_dir()})",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always query Overpass; neither read nor write the response cache",
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=DEFAULT_TTL_SEC,
+        help=f"Seconds a cached Overpass response stays valid (default: {DEFAULT_TTL_SEC:g})",
+    )
+
+
+def cache_from_args(args) -> OverpassCache | None:
+    if getattr(args, "no_cache", False):
+        return None
+    return OverpassCache(getattr(args, "cache_dir", None), ttl_sec=args.cache_ttl)
@@ -18,34 +18,39 @@ Outputs:
 """
 
 import argparse
+import math
+import numpy as np
 import pandas as pd
 import pyproj
+import shapely
 import html
 import webbrowser
 import geopandas as gpd
 import folium
 from folium.plugins import MarkerCluster
 from folium import LayerControl
-from shapely.geometry import Point, LineString, MultiLineString
-from shapely.ops import transform
+from shapely.geometry import LineString, MultiLineString
 import xml.etree.ElementTree as ET
 
 DEFAULT_TILES = "CartoDB positron"
+METERS_PER_MILE = 1609.34
+# Segments per quarter circle in the prefilter buffer; see near_route_mask.
+BUFFER_QUAD_SEGS = 8
 
 try:
     from .utils import (
-        require_columns,
         coerce_nullable_int_series,
         assert_no_duplicate_ids,
         resolve_coords,
     )
+    from .atlas_frame import read_atlas_frame
 except ImportError:  # pragma: no cover - compatibility for direct script execution
     from utils import (  # type: ignore
-        require_columns,
         coerce_nullable_int_series,
         assert_no_duplicate_ids,
         resolve_coords,
     )
+    from atlas_frame import read_atlas_frame  # type: ignore
 
 
 # ----------------------------------------------------------
@@ -73,6 +78,172 @@ def load_kml_route(path):
     return segments[0] if len(segments) == 1 else MultiLineString(segments)
 
 
+# ----------------------------------------------------------
+# Proximity
+# ----------------------------------------------------------
+# How distance to the route is measured:
+#   mercator -- planar EPSG:3857 metres. The original behaviour; Web Mercator
+#               stretches lengths by 1/cos(latitude), 15-25% across Texas,
+#               so the effective radius is too small.
+#   utm      -- planar metres in each marker's UTM zone (the atlas "UTM Zone"
+#               column, else derived from longitude). Scale error <0.1%.
+#   geodesic -- the route is cut into short pieces and each is measured in an
+#               azimuthal equidistant projection centred on it; within a piece
+#               plus the radius this matches ellipsoidal distance to ~1e-4.
+DISTANCE_MODES = ("mercator", "utm", "geodesic")
+DEFAULT_DISTANCE_MODE = "mercator"
+# Longest route piece measured in one local projection (geodesic mode).
+GEODESIC_PIECE_M = 50_000
+_WGS84 = "EPSG:4326"
+_GEOD = pyproj.Geod(ellps="WGS84")
+
+
+def _transformer(crs):
+    return pyproj.Transformer.from_crs(_WGS84, crs, always_xy=True)
+
+
+def _project_line(line, transformer):
+    return shapely.transform(line, transformer.transform, interleaved=False)
+
+
+def _planar_distances(points, line, limit_m):
+    """Distance (m) from each projected point to ``line``; inf past ``limit_m``.
+
+    The line is buffered once and an STRtree over the points keeps only those
+    inside the buffer; the exact distance runs on that short list. Buffer
+    arcs are polygons whose edges cut inside the true circle, so the buffer
+    radius is widened by ``1 / cos(pi / (4 * quad_segs))`` to make the
+    polygon contain every point within ``limit_m``.
+    """
+    dist = np.full(len(points), np.inf)
+    if not len(points):
+        return dist
+    slack = 1.0 / math.cos(math.pi / (4 * BUFFER_QUAD_SEGS))
+    zone = line.buffer(limit_m * slack * 1.000001, quad_segs=BUFFER_QUAD_SEGS)
+    candidates = shapely.STRtree(points).query(zone, predicate="intersects")
+    dist[candidates] = shapely.distance(line, points[candidates])
+    return dist
+
+
+def _utm_zones(lon, zones=None):
+    derived = np.floor((lon + 180.0) / 6.0).astype(int) + 1
+    if zones is None:
+        return derived
+    given = pd.to_numeric(pd.Series(zones), errors="coerce").to_numpy(dtype=float)
+    valid = np.isfinite(given) & (given >= 1) & (given <= 60)
+    return np.where(valid, given, derived).astype(int)
+
+
+def _route_pieces(route, max_len_m=GEODESIC_PIECE_M):
+    """Split ``route`` into LineStrings no longer than ``max_len_m`` (geodesic).
+
+    A single segment longer than the limit is densified with geodesic
+    intermediate points first, so every piece stays short.
+    """
+    lines = [route] if isinstance(route, LineString) else list(route.geoms)
+    pieces = []
+    for line in lines:
+        coords = []
+        for (x0, y0), (x1, y1) in zip(line.coords[:-1], line.coords[1:]):
+            coords.append((x0, y0))
+            n = int(_GEOD.inv(x0, y0, x1, y1)[2] // max_len_m)
+            if n:
+                coords.extend(_GEOD.npts(x0, y0, x1, y1, n))
+        coords.append(line.coords[-1])
+
+        xs, ys = np.array(coords).T
+        seg = _GEOD.inv(xs[:-1], ys[:-1], xs[1:], ys[1:])[2]
+        start, run = 0, 0.0
+        for k, length in enumerate(seg, start=1):
+            run += length
+            if run >= max_len_m or k == len(seg):
+                pieces.append(LineString(coords[start : k + 1]))
+                start, run = k, 0.0
+    return pieces
+
+
+def _mercator_miles(lon, lat, route, radius):
+    merc = _transformer("EPSG:3857")
+    x, y = merc.transform(lon, lat)
+    return _planar_distances(
+        shapely.points(x, y), _project_line(route, merc), radius * METERS_PER_MILE
+    ) / METERS_PER_MILE
+
+
+def _utm_miles(lon, lat, route, radius, zones=None):
+    dist = np.full(len(lon), np.inf)
+    zone_of = _utm_zones(lon, zones)
+    for zone in np.unique(zone_of):
+        idx = np.flatnonzero(zone_of == zone)
+        utm = _transformer(f"EPSG:{32600 + zone}")
+        x, y = utm.transform(lon[idx], lat[idx])
+        dist[idx] = _planar_distances(
+            shapely.points(x, y), _project_line(route, utm), radius * METERS_PER_MILE
+        )
+    return dist / METERS_PER_MILE
+
+
+def _geodesic_miles(lon, lat, route, radius):
+    limit_m = radius * METERS_PER_MILE
+    # Prefilter in Web Mercator, which only ever overstates length: a point
+    # within limit_m on the ground is within limit_m * sec(lat) on the map.
+    merc = _transformer("EPSG:3857")
+    x, y = merc.transform(lon, lat)
+    points = shapely.points(x, y)
+    _, miny, _, maxy = route.bounds
+    lat_max = min(max(abs(miny), abs(maxy)) + limit_m / 110_000.0, 85.0)
+    merc_limit = limit_m / math.cos(math.radians(lat_max)) * 1.02
+    tree = shapely.STRtree(points)
+
+    dist = np.full(len(lon), np.inf)
+    slack = 1.0 / math.cos(math.pi / (4 * BUFFER_QUAD_SEGS))
+    for piece in _route_pieces(route):
+        zone = _project_line(piece, merc).buffer(
+            merc_limit * slack, quad_segs=BUFFER_QUAD_SEGS
+        )
+        idx = tree.query(zone, predicate="intersects")
+        if not len(idx):
+            continue
+        c = piece.interpolate(0.5, normalized=True)
+        aeqd = _transformer(
+            f"+proj=aeqd +lat_0={c.y} +lon_0={c.x} +datum=WGS84 +units=m"
+        )
+        px, py = aeqd.transform(lon[idx], lat[idx])
+        d = shapely.distance(_project_line(piece, aeqd), shapely.points(px, py))
+        dist[idx] = np.minimum(dist[idx], d)
+    dist[dist > limit_m] = np.inf
+    return dist / METERS_PER_MILE
+
+
+def route_distance_miles(
+    lon, lat, route, radius, mode=DEFAULT_DISTANCE_MODE, zones=None
+):
+    """Distance in miles from each point to ``route``; inf beyond ``radius``.
+
+    Points farther than ``radius`` are pruned by the spatial prefilter and
+    never measured exactly. ``zones`` (UTM zone per point) is only read in
+    ``utm`` mode.
+    """
+    if mode not in DISTANCE_MODES:
+        raise ValueError(
+            f"unknown distance mode {mode!r}; expected one of {', '.join(DISTANCE_MODES)}"
+        )
+    lon = np.asarray(lon, dtype=float)
+    lat = np.asarray(lat, dtype=float)
+    if not len(lon):
+        return np.zeros(0)
+    if mode == "utm":
+        return _utm_miles(lon, lat, route, radius, zones)
+    if mode == "geodesic":
+        return _geodesic_miles(lon, lat, route, radius)
+    return _mercator_miles(lon, lat, route, radius)
+
+
+def near_route_mask(lon, lat, route, radius, mode=DEFAULT_DISTANCE_MODE, zones=None):
+    """Boolean mask of the points within ``radius`` miles of ``route``."""
+    return route_distance_miles(lon, lat, route, radius, mode, zones) <= radius
+
+
 # ----------------------------------------------------------
 # Main Processing
 # ----------------------------------------------------------
@@ -98,6 +269,7 @@ def run_with_args(
     geojson=False,
     kml=False,
     openmap=False,
+    distance_mode=DEFAULT_DISTANCE_MODE,
 ):
 
     tag = "unmapped" if unmapped else "all"
@@ -106,11 +278,10 @@ def run_with_args(
     route = load_kml_route(track)
 
     print(f"📄 Loading dataset → {data}")
-    df = pd.read_csv(data, low_memory=False)
     # Coordinates are not required by name here: resolve_coords accepts either
     # pair and raises if neither is present, so a file carrying only verified
     # coordinates still works.
-    require_columns(df, ["ref:hmdb"], context="route input")
+    df = read_atlas_frame(data, require=["ref:hmdb"], context="route input")
     assert_no_duplicate_ids(df, ["ref:US-TX:thc", "ref:hmdb"], context="route input")
 
     # ---------- Filter Markers ----------
@@ -139,20 +310,18 @@ def run_with_args(
     if dropped:
         print(f"⚠ Dropping {dropped} rows with invalid or missing coordinates")
     markers = markers.dropna(subset=[LAT, LON]).copy()
-    markers["geometry"] = markers.apply(lambda r: Point(r[LON], r[LAT]), axis=1)
-
-    proj = pyproj.Transformer.from_crs(
-        "EPSG:4326", "EPSG:3857", always_xy=True
-    ).transform
-    rp = transform(proj, route)
+    markers["geometry"] = shapely.points(markers[LON], markers[LAT])
 
+    zones = markers["UTM Zone"] if "UTM Zone" in markers.columns else None
     near = markers[
-        markers["geometry"].apply(
-            lambda p: rp.distance(transform(proj, p)) / 1609.34 <= radius
+        near_route_mask(
+            markers[LON], markers[LAT], route, radius, mode=distance_mode, zones=zones
         )
     ].copy(deep=True)  # 👈 REQUIRED to kill SettingWithCopyWarning
 
-    print(f"✓ {len(near)} markers found within {radius} miles ({tag})\n")
+    print(
+        f"✓ {len(near)} markers found within {radius} miles ({tag}, {distance_mode})\n"
+    )
 
     # ----------------------------------------------------------
     # Map Generation
@@ -280,6 +449,12 @@ def main():
     p.add_argument("--track", required=True, help="Input KML file")
     p.add_argument("--data", required=True, help="CSV dataset of markers")
     p.add_argument("--radius", type=float, default=5, help="Search distance in miles")
+    p.add_argument(
+        "--distance-mode",
+        choices=DISTANCE_MODES,
+        default=DEFAULT_DISTANCE_MODE,
+        help="How distance to the route is measured (default: mercator)",
+    )
 
     # ---- Filtering flags (mutually exclusive) ----
     group = p.add_mutually_exclusive_group()
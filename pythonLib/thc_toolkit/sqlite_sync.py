@@ -5,23 +5,42 @@ THC CSV / SQLite sync helpers.
 CSV remains the source of truth. SQLite is a generated working copy that is
 useful for fast filtering, sorting, and browser-backed views.
 
+Columns are stored with real types: INTEGER IDs and counts, REAL coordinates,
+and BOOLEAN (0/1) flags, so coordinates can be range-queried and indexed.
+Text keeps ``""`` for blanks; typed columns use NULL. Export and verify read
+the declared types back, so the CSV round-trips unchanged.
+
 Commands:
-    thc sqlite build   -> rebuild SQLite from CSV
+    thc sqlite build   -> rebuild SQLite from CSV (--incremental: changed rows only)
     thc sqlite export  -> export CSV back out of SQLite
     thc sqlite verify  -> compare row counts and key columns
+    thc search         -> ranked full-text search (FTS5) of the build
 """
 
 from __future__ import annotations
 
 import argparse
+import csv
+import hashlib
+import json
+import math
 import re
 import sqlite3
 from pathlib import Path
 from typing import Iterable
 
+import numpy as np
 import pandas as pd
 
+from .atlas_frame import read_atlas_frame
 from .utils import (
+    _FALSEY,
+    _NULL_TOKENS,
+    _TRUTHY,
+    ESTIMATED_LAT,
+    ESTIMATED_LON,
+    VERIFIED_LAT,
+    VERIFIED_LON,
     assert_no_duplicate_ids,
     coerce_nullable_int_series,
     parse_bool_series,
@@ -41,6 +60,37 @@ DEFAULT_INDEX_COLUMNS = (
     "isMissing",
     "isPrivate",
 )
+# Expression indexes over the viewer's case-folded filter and sort keys, named
+# by what they lead with. Every index entry ends in the rowid, which is the
+# viewer's tiebreaker, so the default order is read straight off the index.
+VIEWER_KEY_INDEXES = {
+    "county_city_name_key": ("addr:county", "addr:city", "name"),
+    "city_county_name_key": ("addr:city", "addr:county", "name"),
+}
+# A row's identity for incremental builds. ref:US-TX:thc alone is not enough:
+# HMDB-only rows have none, and a few THC numbers are shared by two markers.
+ROW_KEY_COLUMNS = ("ref:US-TX:thc", "ref:hmdb")
+# Full builds number rows 1, 1 + ROWID_GAP, 1 + 2 * ROWID_GAP, ... so the rowid
+# is the row's place in the CSV with room to spare: an incremental build gives
+# a marker inserted mid-file a rowid between its neighbours', and export,
+# verify and the viewer, which all read in rowid order, see it in file order.
+ROWID_GAP = 1024
+META_TABLE_NAME = "_thc_sync_meta"
+ROW_HASH_TABLE_NAME = "_thc_sync_row_hashes"
+SPATIAL_TABLE_SUFFIX = "_rtree"
+TEXT_TABLE_SUFFIX = "_fts"
+# Indexed for full-text search, with their bm25 weights: a hit in the name
+# outranks one buried in a 300-word inscription.
+TEXT_INDEX_COLUMNS = {
+    "name": 10.0,
+    "Marker Text": 1.0,
+    "Marker Notes": 1.0,
+    "addr:full": 2.0,
+    "addr:city": 2.0,
+}
+SEARCH_RESULT_COLUMNS = ("ref:US-TX:thc", "ref:hmdb", "name", "addr:city", "addr:county")
+EARTH_RADIUS_MI = 3958.7613
+MILES_PER_DEGREE_LAT = 69.0
 
 
 def _quote_identifier(name: str) -> str:
@@ -52,32 +102,79 @@ def _safe_index_name(table_name: str, column_name: str) -> str:
     return f"idx_{slug.strip('_')}"
 
 
+def normalized_key_sql(column_name: str) -> str:
+    """Case-folded, NULL-as-blank key for ``column_name``.
+
+    The viewer must filter and sort with exactly this expression; SQLite
+    only uses an expression index for an identical expression.
+    """
+    return f"LOWER(COALESCE({_quote_identifier(column_name)}, ''))"
+
+
+def _create_viewer_indexes(conn: sqlite3.Connection, table_name: str, columns) -> None:
+    present = set(columns)
+    for suffix, key_columns in VIEWER_KEY_INDEXES.items():
+        if not present.issuperset(key_columns):
+            continue
+        parts = [normalized_key_sql(c) for c in key_columns]
+        index_name = _safe_index_name(table_name, suffix)
+        conn.execute(
+            f"CREATE INDEX IF NOT EXISTS {_quote_identifier(index_name)} "
+            f"ON {_quote_identifier(table_name)} ({', '.join(parts)})"
+        )
+
+
 def _ensure_parent_dir(path: str | Path) -> None:
     Path(path).expanduser().resolve().parent.mkdir(parents=True, exist_ok=True)
 
 
 def _load_csv_frame(csv_path: str | Path) -> pd.DataFrame:
-    df = pd.read_csv(csv_path, low_memory=False)
-    require_columns(df, list(DEFAULT_KEY_COLUMNS), context="sqlite sync source CSV")
+    # The shared loader already coerces the key and flag columns (and the
+    # other typed atlas columns) with the strict parsers.
+    return read_atlas_frame(
+        csv_path, require=DEFAULT_KEY_COLUMNS, context="sqlite sync source CSV"
+    )
 
-    for col in DEFAULT_KEY_COLUMNS:
-        df[col] = coerce_nullable_int_series(
-            df[col], col, context="sqlite sync source CSV"
-        )
 
-    for col in DEFAULT_BOOL_COLUMNS:
-        if col in df.columns:
-            df[col] = parse_bool_series(
-                df[col], col, context="sqlite sync source CSV", na_value=None
-            )
+def _sqlite_decl_types(conn: sqlite3.Connection, table_name: str) -> dict[str, str]:
+    rows = conn.execute(f"PRAGMA table_info({_quote_identifier(table_name)})")
+    return {row[1]: (row[2] or "").upper() for row in rows}
 
-    return df
+
+def _restore_sqlite_types(
+    df: pd.DataFrame, decl_types: dict[str, str], context: str
+) -> pd.DataFrame:
+    """Undo the storage types: INTEGER -> Int64, BOOLEAN 0/1 -> boolean.
+
+    Integer columns with NULLs come back from SQLite as floats, which would
+    otherwise be written out as ``1950.0``. Tables from older builds stored
+    everything as TEXT; their key and flag columns are parsed as before.
+    """
+    out = df.copy()
+    for col in out.columns:
+        decl = decl_types.get(col, "")
+        if decl == "BOOLEAN":
+            ints = coerce_nullable_int_series(out[col], col, context=context)
+            if ints.dropna().isin([0, 1]).all():
+                out[col] = ints.astype("boolean")
+            else:
+                out[col] = parse_bool_series(ints, col, context=context, na_value=None)
+        elif decl == "INTEGER" or col in DEFAULT_KEY_COLUMNS:
+            out[col] = coerce_nullable_int_series(out[col], col, context=context)
+        elif col in DEFAULT_BOOL_COLUMNS:
+            out[col] = parse_bool_series(out[col], col, context=context, na_value=None)
+    return out
 
 
-def _load_sqlite_frame(sqlite_path: str | Path, table_name: str) -> pd.DataFrame:
+def _load_sqlite_frame(
+    sqlite_path: str | Path, table_name: str, context: str = "sqlite sync SQLite"
+) -> pd.DataFrame:
     with sqlite3.connect(sqlite_path) as conn:
         query = f"SELECT * FROM {_quote_identifier(table_name)} ORDER BY rowid"
-        return pd.read_sql_query(query, conn)
+        df = pd.read_sql_query(query, conn)
+        decl_types = _sqlite_decl_types(conn, table_name)
+    require_columns(df, list(DEFAULT_KEY_COLUMNS), context=context)
+    return _restore_sqlite_types(df, decl_types, context)
 
 
 def _normalize_key_frame(
@@ -93,55 +190,400 @@ def _normalize_key_frame(
 
 
 def _prepare_sqlite_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Frame as it will be stored: typed ID/flag/number columns, text elsewhere."""
     out = df.copy()
-    for col in DEFAULT_KEY_COLUMNS:
-        out[col] = coerce_nullable_int_series(
-            out[col], col, context="sqlite sync build"
-        ).astype("string")
-    for col in DEFAULT_BOOL_COLUMNS:
-        if col in out.columns:
-            out[col] = (
-                parse_bool_series(
-                    out[col], col, context="sqlite sync build", na_value=None
-                )
-                .astype("string")
-                .fillna("")
-            )
     for col in out.columns:
-        if col in DEFAULT_KEY_COLUMNS or col in DEFAULT_BOOL_COLUMNS:
-            continue
-        out[col] = out[col].astype("string").fillna("")
-    return out
-
-
-def _normalize_frame_for_compare(df: pd.DataFrame) -> pd.DataFrame:
-    normalized = df.copy()
-    for col in normalized.columns:
+        series = out[col]
         if col in DEFAULT_KEY_COLUMNS:
-            normalized[col] = (
-                coerce_nullable_int_series(
-                    normalized[col], col, context="sqlite sync compare"
-                )
-                .astype("string")
-                .fillna("")
+            out[col] = coerce_nullable_int_series(
+                series, col, context="sqlite sync build"
             )
-        elif col in DEFAULT_BOOL_COLUMNS:
-            normalized[col] = (
-                parse_bool_series(
-                    normalized[col], col, context="sqlite sync compare", na_value=None
-                )
-                .astype("string")
-                .fillna("")
+        elif col in DEFAULT_BOOL_COLUMNS or pd.api.types.is_bool_dtype(series.dtype):
+            out[col] = parse_bool_series(
+                series, col, context="sqlite sync build", na_value=None
             )
+        elif pd.api.types.is_integer_dtype(series.dtype):
+            out[col] = series.astype("Int64")
+        elif pd.api.types.is_float_dtype(series.dtype):
+            out[col] = series.astype("float64")
         else:
-            normalized[col] = (
-                normalized[col]
-                .astype("string")
-                .fillna("")
-                .str.strip()
-                .str.replace(r"\.0+$", "", regex=True)
-            )
-    return normalized
+            out[col] = series.astype("string").fillna("")
+    return out
+
+
+def _column_affinities(df: pd.DataFrame) -> list[tuple[str, str]]:
+    """``(column, declared type)`` for a :func:`_prepare_sqlite_frame` frame."""
+    out = []
+    for col in df.columns:
+        dtype = df[col].dtype
+        if pd.api.types.is_bool_dtype(dtype):
+            decl = "BOOLEAN"
+        elif pd.api.types.is_integer_dtype(dtype):
+            decl = "INTEGER"
+        elif pd.api.types.is_float_dtype(dtype):
+            decl = "REAL"
+        else:
+            decl = "TEXT"
+        out.append((col, decl))
+    return out
+
+
+def _row_keys(df: pd.DataFrame) -> list[str]:
+    parts = [df[col].astype("string").fillna("") for col in ROW_KEY_COLUMNS]
+    return (parts[0] + "|" + parts[1]).tolist()
+
+
+def _row_hashes(df: pd.DataFrame) -> list[str]:
+    """Content digest per prepared row; NULL and "" hash differently."""
+    cols = [df[col].astype("string").fillna("\x00").tolist() for col in df.columns]
+    return [
+        hashlib.blake2b("\x1f".join(values).encode("utf-8"), digest_size=16).hexdigest()
+        for values in zip(*cols)
+    ]
+
+
+def _sql_rows(df: pd.DataFrame) -> list[tuple]:
+    """Rows as plain tuples for executemany: Python scalars, NA as NULL."""
+    columns = []
+    for col in df.columns:
+        series = df[col]
+        if pd.api.types.is_bool_dtype(series.dtype):
+            values = series.astype("Int8").astype(object)
+        else:
+            values = series.astype(object)
+        columns.append(values.where(series.notna(), None).tolist())
+    return list(zip(*columns))
+
+
+def _spaced_rowids(n: int) -> range:
+    """The rowids a full build gives its ``n`` rows."""
+    return range(1, 1 + n * ROWID_GAP, ROWID_GAP)
+
+
+def _bulk_load(
+    conn: sqlite3.Connection,
+    table_name: str,
+    df: pd.DataFrame,
+    affinities: list[tuple[str, str]],
+) -> None:
+    """Recreate ``table_name`` from a prepared frame.
+
+    WAL with ``synchronous=OFF`` for the load itself: a build that dies
+    halfway is simply rerun from the CSV. Indexes are created after the rows
+    are in, then ANALYZE gives the planner row counts. The journal is set
+    back to DELETE afterwards so the database stays a single file that
+    read-only viewers can open.
+    """
+    table_sql = _quote_identifier(table_name)
+    conn.commit()
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = OFF")
+    conn.execute("PRAGMA temp_store = MEMORY")
+
+    conn.execute("BEGIN")
+    conn.execute(f"DROP TABLE IF EXISTS {table_sql}")
+    column_sql = ", ".join(f"{_quote_identifier(c)} {decl}" for c, decl in affinities)
+    conn.execute(f"CREATE TABLE {table_sql} ({column_sql})")
+    col_sql = ", ".join(["rowid"] + [_quote_identifier(c) for c, _ in affinities])
+    marks = ", ".join("?" for _ in range(len(affinities) + 1))
+    conn.executemany(
+        f"INSERT INTO {table_sql} ({col_sql}) VALUES ({marks})",
+        ((row_id, *row) for row_id, row in zip(_spaced_rowids(len(df)), _sql_rows(df))),
+    )
+    present = set(df.columns)
+    for column in DEFAULT_INDEX_COLUMNS:
+        if column not in present:
+            continue
+        index_name = _safe_index_name(table_name, column)
+        conn.execute(
+            f"CREATE INDEX IF NOT EXISTS {_quote_identifier(index_name)} "
+            f"ON {table_sql} ({_quote_identifier(column)})"
+        )
+    _create_viewer_indexes(conn, table_name, present)
+    _create_spatial_index(conn, table_name, affinities)
+    _create_text_index(conn, table_name, affinities)
+    conn.execute(f"ANALYZE {table_sql}")
+
+
+def spatial_table_name(table_name: str = DEFAULT_TABLE_NAME) -> str:
+    return f"{table_name}{SPATIAL_TABLE_SUFFIX}"
+
+
+def _resolved_coord_sql(decl_types: dict[str, str]) -> tuple[str, str] | None:
+    """SQL for the resolved (lat, lon): verified, else estimated.
+
+    None unless at least one coordinate pair is stored as REAL; a pair that
+    fell back to TEXT (a stray non-number in the CSV) cannot be indexed.
+    """
+    exprs = []
+    for lat_col, lon_col in ((VERIFIED_LAT, VERIFIED_LON), (ESTIMATED_LAT, ESTIMATED_LON)):
+        if decl_types.get(lat_col) == "REAL" and decl_types.get(lon_col) == "REAL":
+            exprs.append((_quote_identifier(lat_col), _quote_identifier(lon_col)))
+    if not exprs:
+        return None
+    if len(exprs) == 1:
+        return exprs[0]
+    return (
+        f"COALESCE({exprs[0][0]}, {exprs[1][0]})",
+        f"COALESCE({exprs[0][1]}, {exprs[1][1]})",
+    )
+
+
+def _fill_spatial_index(conn, table_name, coords, rowids=None) -> None:
+    """Index the resolved position of ``rowids`` (every row when None)."""
+    lat_sql, lon_sql = coords
+    where = f"{lat_sql} IS NOT NULL AND {lon_sql} IS NOT NULL"
+    params: list = []
+    if rowids is not None:
+        if not rowids:
+            return
+        where += f" AND rowid IN ({', '.join('?' for _ in rowids)})"
+        params = list(rowids)
+    conn.execute(
+        f"INSERT INTO {_quote_identifier(spatial_table_name(table_name))} "
+        f"SELECT rowid, {lat_sql}, {lat_sql}, {lon_sql}, {lon_sql} "
+        f"FROM {_quote_identifier(table_name)} WHERE {where}",
+        params,
+    )
+
+
+def _create_spatial_index(conn, table_name, affinities) -> None:
+    rtree_sql = _quote_identifier(spatial_table_name(table_name))
+    conn.execute(f"DROP TABLE IF EXISTS {rtree_sql}")
+    coords = _resolved_coord_sql(dict(affinities))
+    if coords is None:
+        return
+    conn.execute(
+        f"CREATE VIRTUAL TABLE {rtree_sql} "
+        "USING rtree(id, min_lat, max_lat, min_lon, max_lon)"
+    )
+    _fill_spatial_index(conn, table_name, coords)
+
+
+def _update_spatial_index(conn, table_name, affinities, stale, fresh) -> None:
+    """Drop ``stale`` rowids from the R*Tree and index ``fresh`` ones again."""
+    coords = _resolved_coord_sql(dict(affinities))
+    if coords is None:
+        return
+    rtree_sql = _quote_identifier(spatial_table_name(table_name))
+    conn.executemany(f"DELETE FROM {rtree_sql} WHERE id = ?", [(r,) for r in stale])
+    for start in range(0, len(fresh), 500):
+        _fill_spatial_index(conn, table_name, coords, fresh[start : start + 500])
+
+
+def text_table_name(table_name: str = DEFAULT_TABLE_NAME) -> str:
+    return f"{table_name}{TEXT_TABLE_SUFFIX}"
+
+
+def _text_columns(affinities) -> list[str]:
+    present = {col for col, decl in affinities if decl == "TEXT"}
+    return [col for col in TEXT_INDEX_COLUMNS if col in present]
+
+
+def _create_text_index(conn, table_name, affinities) -> None:
+    """FTS5 index over the text columns, reading its content from the table.
+
+    ``content=`` keeps only the index in the FTS table, not a second copy of
+    every inscription; ``remove_diacritics`` lets "Ysleta" find "Ysléta".
+    """
+    fts_sql = _quote_identifier(text_table_name(table_name))
+    conn.execute(f"DROP TABLE IF EXISTS {fts_sql}")
+    columns = _text_columns(affinities)
+    if not columns:
+        return
+    column_sql = ", ".join(_quote_identifier(c) for c in columns)
+    conn.execute(
+        f"CREATE VIRTUAL TABLE {fts_sql} USING fts5({column_sql}, "
+        f"content={_quote_identifier(table_name)}, content_rowid='rowid', "
+        "tokenize='unicode61 remove_diacritics 2')"
+    )
+    conn.execute(f"INSERT INTO {fts_sql}({fts_sql}) VALUES ('rebuild')")
+
+
+def _update_text_index(conn, table_name, affinities, rowids, delete=False) -> None:
+    """Add ``rowids`` to the FTS index, or remove them with ``delete=True``.
+
+    An external-content index removes a row by being handed the values it
+    indexed, so deletes must run while the table still holds the old row.
+    """
+    columns = _text_columns(affinities)
+    if not columns or not rowids:
+        return
+    fts = text_table_name(table_name)
+    fts_sql = _quote_identifier(fts)
+    column_sql = ", ".join(_quote_identifier(c) for c in columns)
+    if delete:
+        target = f"{fts_sql}({fts_sql}, rowid, {column_sql})"
+        select = f"SELECT 'delete', rowid, {column_sql}"
+    else:
+        target = f"{fts_sql}(rowid, {column_sql})"
+        select = f"SELECT rowid, {column_sql}"
+    rowids = list(rowids)
+    for start in range(0, len(rowids), 500):
+        chunk = rowids[start : start + 500]
+        conn.execute(
+            f"INSERT INTO {target} {select} FROM {_quote_identifier(table_name)} "
+            f"WHERE rowid IN ({', '.join('?' for _ in chunk)})",
+            chunk,
+        )
+
+
+def _ensure_meta_tables(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        f"CREATE TABLE IF NOT EXISTS {META_TABLE_NAME} ("
+        "table_name TEXT NOT NULL, key TEXT NOT NULL, value TEXT, "
+        "PRIMARY KEY (table_name, key))"
+    )
+    conn.execute(
+        f"CREATE TABLE IF NOT EXISTS {ROW_HASH_TABLE_NAME} ("
+        "table_name TEXT NOT NULL, row_key TEXT NOT NULL, "
+        "row_hash TEXT NOT NULL, row_id INTEGER NOT NULL, "
+        "PRIMARY KEY (table_name, row_key))"
+    )
+
+
+def _store_row_hashes(
+    conn: sqlite3.Connection,
+    table_name: str,
+    columns: list[tuple[str, str]],
+    entries: Iterable[tuple[str, str, int]] | None,
+) -> None:
+    """Replace the stored hashes for ``table_name``; None disables incremental."""
+    _ensure_meta_tables(conn)
+    conn.execute(f"DELETE FROM {ROW_HASH_TABLE_NAME} WHERE table_name = ?", (table_name,))
+    conn.execute(
+        f"INSERT OR REPLACE INTO {META_TABLE_NAME} VALUES (?, 'columns', ?)",
+        (table_name, json.dumps(columns) if entries is not None else None),
+    )
+    if entries is not None:
+        conn.executemany(
+            f"INSERT INTO {ROW_HASH_TABLE_NAME} VALUES (?, ?, ?, ?)",
+            ((table_name, key, digest, row_id) for key, digest, row_id in entries),
+        )
+
+
+def _stored_row_hashes(
+    conn: sqlite3.Connection, table_name: str, columns: list[tuple[str, str]]
+) -> dict[str, tuple[str, int]] | None:
+    """``{row_key: (row_hash, rowid)}`` from the last build, or None if unusable."""
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name IN (?, ?)",
+        (table_name, META_TABLE_NAME),
+    ).fetchall()
+    if len(exists) < 2:
+        return None
+    row = conn.execute(
+        f"SELECT value FROM {META_TABLE_NAME} WHERE table_name = ? AND key = 'columns'",
+        (table_name,),
+    ).fetchone()
+    if row is None or row[0] is None or json.loads(row[0]) != [list(c) for c in columns]:
+        return None
+    return {
+        key: (digest, row_id)
+        for key, digest, row_id in conn.execute(
+            f"SELECT row_key, row_hash, row_id FROM {ROW_HASH_TABLE_NAME} "
+            "WHERE table_name = ?",
+            (table_name,),
+        )
+    }
+
+
+def _incremental_plan(keys, hashes, stored):
+    """Split rows into inserts, updates and deletes, or None to rebuild.
+
+    Export and verify read the table in rowid order, so kept rows must keep
+    their relative order; rows that moved fall back to a full rebuild. New
+    rows get rowids that put them in file order: between their kept
+    neighbours' rowids, or ``ROWID_GAP`` apart before the first kept row and
+    after the last. More new rows than a gap has room for also rebuilds,
+    which spaces the rowids out again. Inserts are ``(position, rowid)``.
+    """
+    inserts, updates, pending = [], [], []
+    lower = None
+
+    def place(upper) -> bool:
+        """Give the ``pending`` rows rowids between ``lower`` and ``upper``."""
+        if lower is None and upper is None:
+            return False
+        if lower is None:
+            row_ids = [upper - ROWID_GAP * (len(pending) - i) for i in range(len(pending))]
+        elif upper is None:
+            row_ids = [lower + ROWID_GAP * (i + 1) for i in range(len(pending))]
+        else:
+            step = (upper - lower) // (len(pending) + 1)
+            if step < 1:
+                return False
+            row_ids = [lower + step * (i + 1) for i in range(len(pending))]
+        inserts.extend(zip(pending, row_ids))
+        pending.clear()
+        return True
+
+    for pos, (key, digest) in enumerate(zip(keys, hashes)):
+        old = stored.get(key)
+        if old is None:
+            pending.append(pos)
+            continue
+        if lower is not None and old[1] < lower:
+            return None
+        if pending and not place(old[1]):
+            return None
+        lower = old[1]
+        if old[0] != digest:
+            updates.append((pos, old[1]))
+    if pending and not place(None):
+        return None
+    live = set(keys)
+    deletes = [row_id for key, (_, row_id) in stored.items() if key not in live]
+    return inserts, updates, deletes
+
+
+def _apply_incremental(conn, table_name, df, keys, hashes, plan):
+    inserts, updates, deletes = plan
+    table_sql = _quote_identifier(table_name)
+    cols = list(df.columns)
+    touched = [pos for pos, _ in updates] + [pos for pos, _ in inserts]
+    rows = dict(zip(touched, _sql_rows(df.iloc[touched])))
+    affinities = _column_affinities(df)
+    _update_text_index(
+        conn, table_name, affinities, deletes + [r for _, r in updates], delete=True
+    )
+    if deletes:
+        conn.executemany(
+            f"DELETE FROM {table_sql} WHERE rowid = ?", [(r,) for r in deletes]
+        )
+    if updates:
+        assignments = ", ".join(f"{_quote_identifier(c)} = ?" for c in cols)
+        conn.executemany(
+            f"UPDATE {table_sql} SET {assignments} WHERE rowid = ?",
+            [rows[pos] + (row_id,) for pos, row_id in updates],
+        )
+    if inserts:
+        col_sql = ", ".join(["rowid"] + [_quote_identifier(c) for c in cols])
+        marks = ", ".join("?" for _ in range(len(cols) + 1))
+        conn.executemany(
+            f"INSERT INTO {table_sql} ({col_sql}) VALUES ({marks})",
+            [(row_id, *rows[pos]) for pos, row_id in inserts],
+        )
+
+    fresh = [row_id for _, row_id in updates + inserts]
+    _update_spatial_index(
+        conn,
+        table_name,
+        affinities,
+        stale=deletes + [row_id for _, row_id in updates],
+        fresh=fresh,
+    )
+    _update_text_index(conn, table_name, affinities, fresh)
+
+    conn.executemany(
+        f"DELETE FROM {ROW_HASH_TABLE_NAME} WHERE table_name = ? AND row_id = ?",
+        [(table_name, r) for r in deletes],
+    )
+    conn.executemany(
+        f"INSERT OR REPLACE INTO {ROW_HASH_TABLE_NAME} VALUES (?, ?, ?, ?)",
+        [(table_name, keys[pos], hashes[pos], row_id) for pos, row_id in updates]
+        + [(table_name, keys[pos], hashes[pos], row_id) for pos, row_id in inserts],
+    )
 
 
 def build_sqlite_from_csv(
@@ -149,12 +591,20 @@ def build_sqlite_from_csv(
     sqlite_path: str | Path,
     table_name: str = DEFAULT_TABLE_NAME,
     strict_ids: bool = False,
+    incremental: bool = False,
 ) -> dict[str, object]:
     """
     Rebuild a SQLite database from CSV.
 
     The SQLite table is replaced in place. Indexes are added for the common
     THC sync and filtering columns when they are present.
+
+    Every build records a content hash per row, keyed on ``ref:US-TX:thc`` +
+    ``ref:hmdb``. With ``incremental=True`` only rows whose hash changed are
+    updated, new rows inserted and vanished rows deleted, all in one
+    transaction. The build falls back to a full rebuild when there is nothing
+    to diff against, the columns changed, the keys are not unique, or rows
+    moved.
     """
     df = _load_csv_frame(csv_path)
     if strict_ids:
@@ -162,32 +612,65 @@ def build_sqlite_from_csv(
             df, list(DEFAULT_KEY_COLUMNS), context="sqlite sync source CSV"
         )
     df = _prepare_sqlite_frame(df)
+    columns = list(df.columns)
+    affinities = _column_affinities(df)
+    keys = _row_keys(df)
+    hashes = _row_hashes(df)
+    unique_keys = len(set(keys)) == len(keys)
 
     _ensure_parent_dir(sqlite_path)
+    counts = None
     with sqlite3.connect(sqlite_path) as conn:
-        df.to_sql(table_name, conn, if_exists="replace", index=False)
-        present = set(df.columns)
-        for column in DEFAULT_INDEX_COLUMNS:
-            if column not in present:
-                continue
-            index_name = _safe_index_name(table_name, column)
-            conn.execute(
-                f"CREATE INDEX IF NOT EXISTS {_quote_identifier(index_name)} "
-                f"ON {_quote_identifier(table_name)} ({_quote_identifier(column)})"
-            )
+        plan = None
+        if incremental:
+            stored = _stored_row_hashes(conn, table_name, affinities)
+            if stored is None:
+                reason = "no previous build metadata"
+            elif not unique_keys:
+                reason = "row keys (ref:US-TX:thc + ref:hmdb) are not unique"
+            else:
+                plan = _incremental_plan(keys, hashes, stored)
+                reason = "rows were reordered, or too many inserted in one place"
+            if plan is None:
+                print(f"[INFO] Incremental build not possible ({reason}); rebuilding")
+
+        if plan is not None:
+            _apply_incremental(conn, table_name, df, keys, hashes, plan)
+            # Databases built before these indexes existed gain them here.
+            _create_viewer_indexes(conn, table_name, columns)
+            counts = {
+                "inserted": len(plan[0]),
+                "updated": len(plan[1]),
+                "deleted": len(plan[2]),
+            }
+        else:
+            _bulk_load(conn, table_name, df, affinities)
+            entries = zip(keys, hashes, _spaced_rowids(len(df))) if unique_keys else None
+            _store_row_hashes(conn, table_name, affinities, entries)
         conn.commit()
+        if plan is None:
+            conn.execute("PRAGMA journal_mode = DELETE")
 
     report = {
         "csv_path": str(csv_path),
         "sqlite_path": str(sqlite_path),
         "table_name": table_name,
         "rows": len(df),
-        "columns": list(df.columns),
+        "columns": columns,
+        "mode": "incremental" if counts is not None else "full",
     }
-    print(
-        f"✔ Rebuilt SQLite table '{table_name}' at {sqlite_path} "
-        f"from {csv_path} ({len(df)} rows)"
-    )
+    if counts is not None:
+        report.update(counts)
+        print(
+            f"✔ Updated SQLite table '{table_name}' at {sqlite_path} from {csv_path} "
+            f"({counts['inserted']} inserted, {counts['updated']} updated, "
+            f"{counts['deleted']} deleted; {len(df)} rows)"
+        )
+    else:
+        print(
+            f"✔ Rebuilt SQLite table '{table_name}' at {sqlite_path} "
+            f"from {csv_path} ({len(df)} rows)"
+        )
     return report
 
 
@@ -202,19 +685,9 @@ def export_csv_from_sqlite(
     The export preserves column order from the SQLite table and normalizes the
     canonical THC ID / boolean columns back into CSV-friendly values.
     """
-    df = _load_sqlite_frame(sqlite_path, table_name)
-    require_columns(df, list(DEFAULT_KEY_COLUMNS), context="sqlite sync export SQLite")
-
-    normalized = df.copy()
-    for col in DEFAULT_KEY_COLUMNS:
-        normalized[col] = coerce_nullable_int_series(
-            normalized[col], col, context="sqlite sync export"
-        )
-    for col in DEFAULT_BOOL_COLUMNS:
-        if col in normalized.columns:
-            normalized[col] = parse_bool_series(
-                normalized[col], col, context="sqlite sync export", na_value=None
-            )
+    normalized = _load_sqlite_frame(
+        sqlite_path, table_name, context="sqlite sync export SQLite"
+    )
 
     _ensure_parent_dir(csv_path)
     normalized.to_csv(csv_path, index=False)
@@ -225,51 +698,626 @@ def export_csv_from_sqlite(
     return normalized
 
 
-def verify_sqlite_sync(
-    csv_path: str | Path,
+def _connect_read_only(
+    sqlite_path: str | Path, immutable: bool = False, check_same_thread: bool = True
+) -> sqlite3.Connection:
+    """Open ``sqlite_path`` read-only.
+
+    ``immutable`` also promises SQLite the file will not change while open,
+    which skips file locking entirely; only safe for a file nothing writes.
+    """
+    uri = Path(sqlite_path).expanduser().resolve().as_uri() + "?mode=ro"
+    if immutable:
+        uri += "&immutable=1"
+    return sqlite3.connect(uri, uri=True, check_same_thread=check_same_thread)
+
+
+def query_bbox(
     sqlite_path: str | Path,
+    south: float,
+    west: float,
+    north: float,
+    east: float,
     table_name: str = DEFAULT_TABLE_NAME,
-    key_columns: Iterable[str] = DEFAULT_KEY_COLUMNS,
-) -> dict[str, object]:
-    """
-    Compare row counts and key columns between the CSV and SQLite table.
+    columns: Iterable[str] | None = None,
+    limit: int | None = None,
+) -> pd.DataFrame:
+    """Markers whose resolved position lies inside the box, via the R*Tree.
+
+    The R*Tree stores 32-bit floats, so its hits are checked again against
+    the stored coordinates. ``columns`` projects the result (default: all);
+    rows come back in table order with the same types ``export`` produces.
     """
-    csv_df = _load_csv_frame(csv_path)
-    sqlite_df = _load_sqlite_frame(sqlite_path, table_name)
+    conn = _connect_read_only(sqlite_path)
+    try:
+        df, _, _ = _bbox_frame(conn, table_name, (south, west, north, east), columns, limit)
+    finally:
+        conn.close()
+    return df
+
 
-    if list(csv_df.columns) != list(sqlite_df.columns):
+def _bbox_frame(conn, table_name, box, columns=None, limit=None):
+    """``(frame, lats, lons)`` for the box; the arrays are resolved positions."""
+    decl_types = _sqlite_decl_types(conn, table_name)
+    coords = _resolved_coord_sql(decl_types)
+    rtree = spatial_table_name(table_name)
+    has_rtree = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE name = ?", (rtree,)
+    ).fetchone()
+    if coords is None or not has_rtree:
         raise ValueError(
-            "column order mismatch between CSV and SQLite: "
-            f"CSV={list(csv_df.columns)} SQLite={list(sqlite_df.columns)}"
+            f"SQLite table '{table_name}' has no spatial index; rebuild it with "
+            "`thc sqlite build`"
         )
+    columns = list(decl_types) if columns is None else list(columns)
+    require_columns(pd.DataFrame(columns=list(decl_types)), columns, context="query_bbox")
+    south, west, north, east = box
+    lat_sql, lon_sql = coords
+    select = ", ".join(
+        [f"t.{_quote_identifier(c)}" for c in columns]
+        + [f"{lat_sql} AS _lat", f"{lon_sql} AS _lon"]
+    )
+    sql = (
+        f"SELECT {select} FROM {_quote_identifier(rtree)} AS r "
+        f"JOIN {_quote_identifier(table_name)} AS t ON t.rowid = r.id "
+        "WHERE r.min_lat <= ? AND r.max_lat >= ? AND r.min_lon <= ? AND r.max_lon >= ? "
+        f"AND {lat_sql} BETWEEN ? AND ? AND {lon_sql} BETWEEN ? AND ? "
+        "ORDER BY t.rowid"
+    )
+    params = [north, south, east, west, south, north, west, east]
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(int(limit))
+    df = pd.read_sql_query(sql, conn, params=params)
+    restored = _restore_sqlite_types(df[columns], decl_types, "query_bbox")
+    return restored, df["_lat"].to_numpy(float), df["_lon"].to_numpy(float)
 
-    if len(csv_df) != len(sqlite_df):
-        raise ValueError(
-            f"row count mismatch: CSV has {len(csv_df)} rows, SQLite has {len(sqlite_df)} rows"
+
+def query_radius(
+    sqlite_path: str | Path,
+    lat: float,
+    lon: float,
+    radius_miles: float,
+    table_name: str = DEFAULT_TABLE_NAME,
+    columns: Iterable[str] | None = None,
+) -> pd.DataFrame:
+    """Markers within ``radius_miles`` (great circle) of a point, nearest first.
+
+    A bounding box around the circle goes through :func:`query_bbox`'s
+    R*Tree path; the exact distance is then computed for those candidates
+    only and returned in a ``distance_mi`` column.
+    """
+    dlat = radius_miles / MILES_PER_DEGREE_LAT
+    cos_lat = max(math.cos(math.radians(lat)), 1e-6)
+    dlon = min(180.0, dlat / cos_lat)
+    box = (lat - dlat, lon - dlon, lat + dlat, lon + dlon)
+    conn = _connect_read_only(sqlite_path)
+    try:
+        df, lats, lons = _bbox_frame(conn, table_name, box, columns)
+    finally:
+        conn.close()
+    phi1, phi2 = math.radians(lat), np.radians(lats)
+    dphi = phi2 - phi1
+    dlmb = np.radians(lons - lon)
+    a = np.sin(dphi / 2) ** 2 + math.cos(phi1) * np.cos(phi2) * np.sin(dlmb / 2) ** 2
+    distance = 2 * EARTH_RADIUS_MI * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+    keep = distance <= radius_miles
+    out = df.loc[keep].copy()
+    out["distance_mi"] = distance[keep]
+    return out.sort_values("distance_mi", kind="stable").reset_index(drop=True)
+
+
+_SEARCH_TERM_RE = re.compile(r'"([^"]*)"|(\S+)')
+
+
+def fts_match_expression(text: str) -> str:
+    """Plain search text as an FTS5 query.
+
+    Words must all appear (in any column, any order); ``"quoted words"`` must
+    appear as a phrase; the last bare word also matches as a prefix, so
+    ``"fort dav"`` finds Fort Davis. Everything is quoted, so punctuation in
+    names ("Y'Barbo", "St.") can never be read as query syntax.
+    """
+    terms = []
+    for phrase, word in _SEARCH_TERM_RE.findall(text):
+        body = (phrase or word.strip('"')).replace('"', '""').strip()
+        if body:
+            terms.append((f'"{body}"', bool(word)))
+    if not terms:
+        raise ValueError("search query is empty")
+    parts = [quoted for quoted, _ in terms]
+    if terms[-1][1]:
+        parts[-1] += "*"
+    return " ".join(parts)
+
+
+def search_text(
+    sqlite_path: str | Path,
+    query: str,
+    table_name: str = DEFAULT_TABLE_NAME,
+    limit: int = 20,
+    offset: int = 0,
+    raw: bool = False,
+    highlight: tuple[str, str] = ("[", "]"),
+    columns: Iterable[str] | None = None,
+) -> dict[str, object]:
+    """Ranked full-text search over names, inscriptions, notes and addresses.
+
+    Returns ``{"query", "match", "total", "rows"}``; each row carries the
+    ``columns`` (default :data:`SEARCH_RESULT_COLUMNS`), a bm25 ``score``
+    (lower is better) and a ``snippet`` of the best-matching column with the
+    hits wrapped in ``highlight``. ``raw=True`` passes ``query`` to FTS5
+    unchanged, for column filters (``name: fort``), ``OR`` and ``NEAR``.
+    """
+    conn = _connect_read_only(sqlite_path)
+    try:
+        return _search_text(
+            conn, table_name, query, limit, offset, raw, highlight, columns
+        )
+    finally:
+        conn.close()
+
+
+def _search_text(
+    conn, table_name, query, limit=20, offset=0, raw=False, highlight=("[", "]"),
+    columns=None,
+):
+    match = query if raw else fts_match_expression(query)
+    try:
+        return _run_text_search(
+            conn, table_name, query, match, limit, offset, highlight, columns
         )
+    except sqlite3.OperationalError as exc:
+        if "fts5" in str(exc) or "syntax" in str(exc):
+            raise ValueError(f"invalid search query {query!r}: {exc}") from exc
+        raise
 
-    csv_norm = _normalize_frame_for_compare(csv_df)
-    sqlite_norm = _normalize_frame_for_compare(sqlite_df)
 
-    if not csv_norm.equals(sqlite_norm):
-        mismatch_mask = csv_norm.ne(sqlite_norm).any(axis=1)
-        first_bad = mismatch_mask[mismatch_mask].index[0] if mismatch_mask.any() else 0
+def _run_text_search(conn, table_name, query, match, limit, offset, highlight, columns):
+    fts = text_table_name(table_name)
+    indexed = [
+        row[1]
+        for row in conn.execute(f"PRAGMA table_info({_quote_identifier(fts)})")
+    ]
+    if not indexed:
         raise ValueError(
-            "row mismatch detected at row "
-            f"{first_bad}: CSV={csv_norm.iloc[first_bad].to_dict()} "
-            f"SQLite={sqlite_norm.iloc[first_bad].to_dict()}"
+            f"SQLite table '{table_name}' has no full-text index; rebuild it with "
+            "`thc sqlite build`"
+        )
+    present = list(_sqlite_decl_types(conn, table_name))
+    if columns is None:
+        columns = [c for c in SEARCH_RESULT_COLUMNS if c in present]
+    else:
+        columns = list(columns)
+        require_columns(pd.DataFrame(columns=present), columns, context="search_text")
+
+    fts_sql = _quote_identifier(fts)
+    weights = ", ".join(str(TEXT_INDEX_COLUMNS[c]) for c in indexed)
+    select = ", ".join(f"t.{_quote_identifier(c)}" for c in columns)
+    total = conn.execute(
+        f"SELECT COUNT(*) FROM {fts_sql} WHERE {fts_sql} MATCH ?", (match,)
+    ).fetchone()[0]
+    rows = conn.execute(
+        f"SELECT {select}, bm25({fts_sql}, {weights}) AS score, "
+        f"snippet({fts_sql}, -1, ?, ?, '…', 16) AS snippet "
+        f"FROM {fts_sql} JOIN {_quote_identifier(table_name)} AS t "
+        f"ON t.rowid = {fts_sql}.rowid "
+        f"WHERE {fts_sql} MATCH ? ORDER BY score, t.rowid LIMIT ? OFFSET ?",
+        (*highlight, match, int(limit), int(offset)),
+    ).fetchall()
+    keys = columns + ["score", "snippet"]
+    return {
+        "query": query,
+        "match": match,
+        "total": total,
+        "rows": [dict(zip(keys, row)) for row in rows],
+    }
+
+
+_DOT_ZERO = re.compile(r"\.0+$")
+
+
+def _canon_int(value) -> str:
+    if value.__class__ is str and value.isdigit() and value[0] != "0":
+        return value
+    if value is None:
+        return ""
+    if isinstance(value, float):
+        if value != value:
+            return ""
+        return str(int(value)) if value.is_integer() else repr(value)
+    if isinstance(value, int):
+        return str(value)
+    text = str(value).strip()
+    if text.casefold() in _NULL_TOKENS:
+        return ""
+    digits = _DOT_ZERO.sub("", text)
+    return str(int(digits)) if digits.isdigit() else text
+
+
+_BOOL_SPELLING = {None: "", "": "", 1: "True", 0: "False", "True": "True", "False": "False"}
+
+
+def _canon_bool(value) -> str:
+    spelled = _BOOL_SPELLING.get(value)
+    if spelled is not None:
+        return spelled
+    if isinstance(value, (int, float)):
+        return "" if value != value else str(bool(value))
+    text = _DOT_ZERO.sub("", str(value).strip()).casefold()
+    if text in _TRUTHY:
+        return "True"
+    if text in _FALSEY:
+        return "False"
+    return "" if text in _NULL_TOKENS else str(value)
+
+
+def _canon_real(value) -> str:
+    if value is None or value == "":
+        return ""
+    if isinstance(value, (int, float)):
+        return "" if value != value else repr(float(value))
+    text = str(value).strip()
+    try:
+        number = float(text)
+    except ValueError:
+        return text
+    return "" if number != number else repr(number)
+
+
+def _canon_text(value) -> str:
+    if value is None:
+        return ""
+    text = value if value.__class__ is str else str(value)
+    if text and (text[0].isspace() or text[-1].isspace()):
+        text = text.strip()
+    # Pre-typing builds stored numbers as text; "1950.0" == "1950".
+    return _DOT_ZERO.sub("", text) if text.endswith("0") else text
+
+
+def _canonicalizers(columns: list[str], decl_types: dict[str, str]) -> list:
+    """Per-column functions that spell a cell the same from either side.
+
+    CSV cells are raw text and SQLite cells whatever the driver returned
+    (int, float, str, None). Both land on one spelling: IDs as plain
+    integers, flags as True/False, numbers as Python's float repr, text
+    stripped, blank as "". A value that does not parse is kept as text, so
+    it shows up as a difference rather than an error.
+    """
+    out = []
+    for col in columns:
+        decl = decl_types.get(col, "")
+        if decl == "INTEGER" or col in DEFAULT_KEY_COLUMNS:
+            out.append(_canon_int)
+        elif decl == "BOOLEAN" or col in DEFAULT_BOOL_COLUMNS:
+            out.append(_canon_bool)
+        elif decl == "REAL":
+            out.append(_canon_real)
+        else:
+            out.append(_canon_text)
+    return out
+
+
+def _in_sample(key: str, fraction: float | None) -> bool:
+    """Deterministic key-hash sample, so both sides pick the same rows."""
+    if fraction is None or fraction >= 1:
+        return True
+    head = hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(head, "big") < fraction * 2**64
+
+
+def _iter_csv_rows(csv_path, columns, positions=None):
+    """``(position, cells)`` per data row, cells in ``columns`` order."""
+    with open(csv_path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        idx = [header.index(c) for c in columns]
+        position = 0
+        for row in reader:
+            if not row:
+                continue  # pandas skips blank lines too
+            if positions is None or position in positions:
+                yield position, [row[i] if i < len(row) else "" for i in idx]
+            position += 1
+
+
+def _iter_sqlite_rows(conn, table_name, columns, chunk_size, rowids=None):
+    """``(rowid, cells)`` in rowid order, optionally only ``rowids``."""
+    table_sql = _quote_identifier(table_name)
+    select = ", ".join(["rowid"] + [_quote_identifier(c) for c in columns])
+    if rowids is None:
+        cursor = conn.execute(f"SELECT {select} FROM {table_sql} ORDER BY rowid")
+        while rows := cursor.fetchmany(chunk_size):
+            for row in rows:
+                yield row[0], row[1:]
+        return
+    wanted = sorted(rowids)
+    for start in range(0, len(wanted), 500):
+        part = wanted[start : start + 500]
+        marks = ", ".join("?" for _ in part)
+        for row in conn.execute(
+            f"SELECT {select} FROM {table_sql} WHERE rowid IN ({marks}) ORDER BY rowid",
+            part,
+        ):
+            yield row[0], row[1:]
+
+
+class _RowKeys:
+    """Row key from the canonical key cells; repeats get ``#2``, ``#3``..."""
+
+    def __init__(self):
+        self.seen: dict[str, int] = {}
+
+    def __call__(self, thc: str, hmdb: str) -> str:
+        key = f"{thc}|{hmdb}"
+        n = self.seen.get(key, 0) + 1
+        self.seen[key] = n
+        return key if n == 1 else f"{key}#{n}"
+
+
+def _digest_rows(rows, canon, key_idx, fraction):
+    """``{key: (digest, locator)}`` for every (sampled) row of one side.
+
+    Only the key cells are canonicalized for rows the sample skips.
+    """
+    row_key = _RowKeys()
+    (ti, hi), (tf, hf) = key_idx, (canon[key_idx[0]], canon[key_idx[1]])
+    digests: dict[str, tuple[str, int]] = {}
+    for locator, cells in rows:
+        key = row_key(tf(cells[ti]), hf(cells[hi]))
+        if not _in_sample(key, fraction):
+            continue
+        text = "\x1f".join([f(v) for f, v in zip(canon, cells)])
+        digest = hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+        digests[key] = (digest, locator)
+    return digests
+
+
+def _sampled_rowids(conn, table_name, canon, key_idx, fraction, chunk_size):
+    """Rowids the sample keeps, from a pass over the key columns only."""
+    row_key = _RowKeys()
+    key_cols = [ROW_KEY_COLUMNS[0], ROW_KEY_COLUMNS[1]]
+    tf, hf = canon[key_idx[0]], canon[key_idx[1]]
+    return {
+        rowid: key
+        for rowid, (thc, hmdb) in _iter_sqlite_rows(conn, table_name, key_cols, chunk_size)
+        if _in_sample(key := row_key(tf(thc), hf(hmdb)), fraction)
+    }
+
+
+def _changed_cells(csv_path, conn, table_name, columns, canon, changed, chunk_size):
+    """``{key: {column: {"csv": v, "sqlite": v}}}`` for rows whose digests differ."""
+    by_position = {pos: key for key, (pos, _) in changed.items()}
+    by_rowid = {rowid: key for key, (_, rowid) in changed.items()}
+    csv_cells = {
+        by_position[pos]: [f(v) for f, v in zip(canon, cells)]
+        for pos, cells in _iter_csv_rows(csv_path, columns, set(by_position))
+    }
+    out: dict[str, dict] = {}
+    for rowid, cells in _iter_sqlite_rows(
+        conn, table_name, columns, chunk_size, rowids=list(by_rowid)
+    ):
+        key = by_rowid[rowid]
+        right = [f(v) for f, v in zip(canon, cells)]
+        out[key] = {
+            col: {"csv": a, "sqlite": b}
+            for col, a, b in zip(columns, csv_cells[key], right)
+            if a != b
+        }
+    return out
+
+
+def _split_key(key: str) -> dict[str, str]:
+    base = key.split("#", 1)[0]
+    thc, hmdb = base.split("|", 1)
+    return {ROW_KEY_COLUMNS[0]: thc, ROW_KEY_COLUMNS[1]: hmdb}
+
+
+def write_verify_report(report: dict, path: str | Path) -> None:
+    """Write a verify report: JSON as-is, or ``.csv`` with one line per difference."""
+    _ensure_parent_dir(path)
+    if str(path).lower().endswith(".csv"):
+        lines = []
+        for entry in report["changed"]:
+            for col, pair in entry["columns"].items():
+                lines.append(
+                    {**entry["key"], "kind": "changed", "column": col,
+                     "csv_value": pair["csv"], "sqlite_value": pair["sqlite"]}
+                )
+        for kind in ("missing_in_sqlite", "missing_in_csv"):
+            for key in report[kind]:
+                lines.append(
+                    {**key, "kind": kind, "column": "", "csv_value": "", "sqlite_value": ""}
+                )
+        columns = [*ROW_KEY_COLUMNS, "kind", "column", "csv_value", "sqlite_value"]
+        pd.DataFrame(lines, columns=columns).to_csv(path, index=False)
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+def verify_sqlite_sync(
+    csv_path: str | Path,
+    sqlite_path: str | Path,
+    table_name: str = DEFAULT_TABLE_NAME,
+    sample: int | None = None,
+    chunk_size: int = 2000,
+    raise_on_mismatch: bool = True,
+) -> dict[str, object]:
+    """
+    Compare the CSV and SQLite table row by row, keyed on ``ref:US-TX:thc`` +
+    ``ref:hmdb``.
+
+    Both sides are streamed (the CSV with :mod:`csv`, SQLite ``chunk_size``
+    rows at a time) and reduced to one digest per row; only rows whose
+    digests differ are read again for a per-column diff. The report lists
+    every changed row and column and every row missing from either side.
+    ``sample=N`` checks about N rows, picked by key hash so both sides
+    choose the same ones.
+
+    A mismatch raises ValueError with a summary unless
+    ``raise_on_mismatch=False``, in which case the report (``match`` False)
+    is returned for :func:`write_verify_report`.
+    """
+    with sqlite3.connect(sqlite_path) as conn:
+        decl_types = _sqlite_decl_types(conn, table_name)
+        sqlite_columns = list(decl_types)
+        csv_columns = list(pd.read_csv(csv_path, nrows=0).columns)
+        require_columns(
+            pd.DataFrame(columns=csv_columns), list(DEFAULT_KEY_COLUMNS),
+            context="sqlite sync source CSV",
+        )
+        require_columns(
+            pd.DataFrame(columns=sqlite_columns), list(DEFAULT_KEY_COLUMNS),
+            context="sqlite sync SQLite",
+        )
+        columns = [c for c in csv_columns if c in decl_types]
+        canon = _canonicalizers(columns, decl_types)
+        key_idx = (columns.index(ROW_KEY_COLUMNS[0]), columns.index(ROW_KEY_COLUMNS[1]))
+        sqlite_rows = conn.execute(
+            f"SELECT COUNT(*) FROM {_quote_identifier(table_name)}"
+        ).fetchone()[0]
+        fraction = None
+        if sample is not None and sqlite_rows:
+            fraction = min(1.0, sample / sqlite_rows)
+
+        csv_rows = 0
+
+        def counted(rows):
+            nonlocal csv_rows
+            for item in rows:
+                csv_rows += 1
+                yield item
+
+        csv_digests = _digest_rows(
+            counted(_iter_csv_rows(csv_path, columns)), canon, key_idx, fraction
+        )
+        if fraction is None:
+            sqlite_digests = _digest_rows(
+                _iter_sqlite_rows(conn, table_name, columns, chunk_size),
+                canon, key_idx, None,
+            )
+        else:
+            # Fetch full rows for the sample only; keys come from the key pass
+            # so repeated keys are numbered over the whole table.
+            keys = _sampled_rowids(conn, table_name, canon, key_idx, fraction, chunk_size)
+            sqlite_digests = {}
+            for rowid, cells in _iter_sqlite_rows(
+                conn, table_name, columns, chunk_size, rowids=list(keys)
+            ):
+                text = "\x1f".join([f(v) for f, v in zip(canon, cells)])
+                digest = hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+                sqlite_digests[keys[rowid]] = (digest, rowid)
+
+        changed = {
+            key: (pos, sqlite_digests[key][1])
+            for key, (digest, pos) in csv_digests.items()
+            if key in sqlite_digests and sqlite_digests[key][0] != digest
+        }
+        cells = _changed_cells(
+            csv_path, conn, table_name, columns, canon, changed, chunk_size
         )
 
+    missing_in_sqlite = [k for k in csv_digests if k not in sqlite_digests]
+    missing_in_csv = [k for k in sqlite_digests if k not in csv_digests]
+    column_order_matches = csv_columns == sqlite_columns
+    match = (
+        column_order_matches
+        and csv_rows == sqlite_rows
+        and not changed
+        and not missing_in_sqlite
+        and not missing_in_csv
+    )
     report = {
-        "match": True,
-        "rows": len(csv_norm),
+        "match": match,
+        "rows": csv_rows,
+        "sqlite_rows": sqlite_rows,
+        "compared_rows": len(csv_digests),
+        "sample": sample,
         "table_name": table_name,
-        "key_columns": list(key_columns),
+        "column_order_matches": column_order_matches,
+        "columns_only_in_csv": [c for c in csv_columns if c not in decl_types],
+        "columns_only_in_sqlite": [c for c in sqlite_columns if c not in csv_columns],
+        "changed": [
+            {
+                "key": _split_key(key),
+                "csv_row": changed[key][0],
+                "sqlite_rowid": changed[key][1],
+                "columns": cells[key],
+            }
+            for key in changed
+        ],
+        "missing_in_sqlite": [_split_key(k) for k in missing_in_sqlite],
+        "missing_in_csv": [_split_key(k) for k in missing_in_csv],
     }
-    print(
-        f"✔ CSV and SQLite are in sync for table '{table_name}' "
-        f"({len(csv_norm)} rows, keys: {', '.join(key_columns)})"
+
+    scope = f"{len(csv_digests)} sampled rows" if fraction is not None else f"{csv_rows} rows"
+    if match:
+        print(
+            f"✔ CSV and SQLite are in sync for table '{table_name}' "
+            f"({scope})"
+        )
+        return report
+
+    summary = _mismatch_summary(report)
+    if raise_on_mismatch:
+        raise ValueError(f"row mismatch detected: {summary}")
+    print(f"[WARN] CSV and SQLite differ for table '{table_name}' ({scope}): {summary}")
+    return report
+
+
+def _mismatch_summary(report: dict) -> str:
+    parts = []
+    if not report["column_order_matches"]:
+        parts.append(
+            "column mismatch (only in CSV: "
+            f"{report['columns_only_in_csv']}, only in SQLite: "
+            f"{report['columns_only_in_sqlite']}, or a different order)"
+        )
+    if report["rows"] != report["sqlite_rows"]:
+        parts.append(
+            f"row count CSV={report['rows']} SQLite={report['sqlite_rows']}"
+        )
+    if report["changed"]:
+        first = report["changed"][0]
+        parts.append(
+            f"{len(report['changed'])} changed row(s), first {first['key']} "
+            f"in {sorted(first['columns'])}"
+        )
+    for kind in ("missing_in_sqlite", "missing_in_csv"):
+        if report[kind]:
+            parts.append(f"{len(report[kind])} {kind.replace('_', ' ')}")
+    return "; ".join(parts)
+
+
+def add_verify_arguments(parser) -> None:
+    parser.add_argument(
+        "--sample",
+        type=int,
+        default=None,
+        help="Check about N rows chosen by key hash instead of every row",
+    )
+    parser.add_argument(
+        "--report",
+        default=None,
+        help="Write the diff report here (.json, or .csv for one line per difference)",
     )
+
+
+def run_verify(args) -> dict[str, object]:
+    """``verify`` entry point: write the report if asked, exit 1 on mismatch."""
+    report = verify_sqlite_sync(
+        args.csv,
+        args.sqlite,
+        table_name=args.table,
+        sample=args.sample,
+        raise_on_mismatch=False,
+    )
+    if args.report:
+        write_verify_report(report, args.report)
+        print(f"[OK] Wrote verify report → {args.report}")
+    if not report["match"]:
+        raise SystemExit(1)
     return report
 
 
@@ -283,6 +1331,11 @@ def main(argv: list[str] | None = None) -> None:
     build.add_argument("--csv", required=True, help="Source CSV file")
     build.add_argument("--sqlite", required=True, help="Destination SQLite file")
     build.add_argument("--table", default=DEFAULT_TABLE_NAME, help="SQLite table name")
+    build.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Apply only rows changed since the last build",
+    )
 
     export = sub.add_parser("export", help="Export CSV from SQLite")
     export.add_argument("--sqlite", required=True, help="Source SQLite file")
@@ -293,15 +1346,18 @@ def main(argv: list[str] | None = None) -> None:
     verify.add_argument("--csv", required=True, help="Source CSV file")
     verify.add_argument("--sqlite", required=True, help="SQLite file to check")
     verify.add_argument("--table", default=DEFAULT_TABLE_NAME, help="SQLite table name")
+    add_verify_arguments(verify)
 
     args = parser.parse_args(argv)
 
     if args.command == "build":
-        build_sqlite_from_csv(args.csv, args.sqlite, table_name=args.table)
+        build_sqlite_from_csv(
+            args.csv, args.sqlite, table_name=args.table, incremental=args.incremental
+        )
     elif args.command == "export":
         export_csv_from_sqlite(args.sqlite, args.csv, table_name=args.table)
     elif args.command == "verify":
-        verify_sqlite_sync(args.csv, args.sqlite, table_name=args.table)
+        run_verify(args)
 
 
 if __name__ == "__main__":  # pragma: no cover
@@ -3,23 +3,46 @@
 Local browser viewer for THC SQLite databases.
 
 The page starts blank and only loads rows after you filter by county and/or
-city. Data is queried directly from SQLite so you can browse without loading
-the whole table into the browser up front.
+city, or search the text of the markers. Data is queried directly from SQLite
+so you can browse without loading the whole table into the browser up front.
 """
 
 from __future__ import annotations
 
 import argparse
+import base64
+import gzip
+import hashlib
 import html
 import json
+import math
+import os
+import queue
 import sqlite3
 import threading
+import time
 import webbrowser
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
+from typing import Iterator
 from urllib.parse import parse_qs, urlparse
 
-from .sqlite_sync import DEFAULT_TABLE_NAME, _quote_identifier
+try:
+    import brotli
+except ImportError:  # pragma: no cover - exercised only without the extra
+    brotli = None
+
+from .sqlite_sync import (
+    DEFAULT_TABLE_NAME,
+    _bbox_frame,
+    _connect_read_only,
+    _quote_identifier,
+    _search_text,
+    normalized_key_sql,
+)
 
 DEFAULT_HOST = "127.0.0.1"
 DEFAULT_PORT = 8765
@@ -43,6 +66,16 @@ DISPLAY_COLUMNS = (
     "estimated:Latitude",
     "estimated:Longitude",
 )
+# Snippet highlight delimiters: control characters cannot occur in the
+# escaped text, so they are swapped for <mark> after html.escape.
+_MARK_OPEN = "\x02"
+_MARK_CLOSE = "\x03"
+POOL_MAX_IDLE = 8
+# Rows per /api/search window; the page asks for the next one on scroll.
+MAX_WINDOW_ROWS = 1000
+# Bodies smaller than this go out uncompressed; the headers would eat the gain.
+MIN_COMPRESS_BYTES = 1024
+STATS_WINDOW = 1000
 
 
 def _resolve_sqlite_path(sqlite_path: str | Path) -> str:
@@ -64,19 +97,142 @@ def resolve_default_sqlite_path(sqlite_path: str | Path | None = None) -> str:
     )
 
 
-def _sqlite_columns(sqlite_path: str | Path, table_name: str) -> list[str]:
-    with sqlite3.connect(sqlite_path) as conn:
-        rows = conn.execute(
-            f"PRAGMA table_info({_quote_identifier(table_name)})"
-        ).fetchall()
-    return [row[1] for row in rows]
+class ReadOnlyPool:
+    """Read-only connections to one SQLite file, shared by request threads.
 
+    ``ThreadingHTTPServer`` runs every request on a new thread, so a
+    connection per thread would still be one per request. Instead a request
+    checks a connection out, runs its queries, and hands it back; up to
+    ``max_idle`` stay open between requests, keeping their page cache and
+    prepared statements warm.
 
-def _available_display_columns(sqlite_path: str | Path, table_name: str) -> list[str]:
-    present = set(_sqlite_columns(sqlite_path, table_name))
+    ``immutable`` (default: when the file is not writable by us) also skips
+    SQLite's file locking. A writable file is opened plain ``mode=ro``, so a
+    ``thc sqlite build`` while the viewer runs is picked up.
+    """
+
+    def __init__(
+        self,
+        sqlite_path: str | Path,
+        immutable: bool | None = None,
+        max_idle: int = POOL_MAX_IDLE,
+    ):
+        self.sqlite_path = _resolve_sqlite_path(sqlite_path)
+        if immutable is None:
+            immutable = not os.access(self.sqlite_path, os.W_OK)
+        self.immutable = immutable
+        self.max_idle = max_idle
+        self.opened = 0
+        self._idle: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._schema_version = None
+        self._columns: dict[str, dict[str, str]] = {}
+        self._watch: sqlite3.Connection | None = None
+        self._data_version = None
+        self._generation = 0
+
+    @contextmanager
+    def connection(self):
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = _connect_read_only(
+                self.sqlite_path, immutable=self.immutable, check_same_thread=False
+            )
+            with self._lock:
+                self.opened += 1
+        try:
+            yield conn
+        finally:
+            # An idle connection must not hold a read lock, or it would block
+            # the next ``thc sqlite build`` of this file.
+            if conn.in_transaction:
+                conn.rollback()
+            if self._idle.qsize() < self.max_idle:
+                self._idle.put(conn)
+            else:
+                conn.close()
+
+    def columns(self, conn: sqlite3.Connection, table_name: str) -> list[str]:
+        """Column names of ``table_name``, cached until the schema changes."""
+        return list(self.decl_types(conn, table_name))
+
+    def decl_types(self, conn: sqlite3.Connection, table_name: str) -> dict[str, str]:
+        """``{column: declared type}`` for ``table_name``, cached the same way."""
+        version = conn.execute("PRAGMA schema_version").fetchone()[0]
+        with self._lock:
+            if version != self._schema_version:
+                self._schema_version = version
+                self._columns.clear()
+            cached = self._columns.get(table_name)
+        if cached is None:
+            rows = conn.execute(
+                f"PRAGMA table_info({_quote_identifier(table_name)})"
+            ).fetchall()
+            cached = {row[1]: (row[2] or "").upper() for row in rows}
+            with self._lock:
+                self._columns[table_name] = cached
+        return cached
+
+    def version(self) -> str:
+        """Token that changes whenever the database content may have.
+
+        The file's mtime and size catch a rebuild; ``PRAGMA data_version`` on
+        a connection kept aside for the purpose catches a commit that left
+        both alone. Neither reads a page of the table, so a client holding a
+        current ETag is answered without touching the data.
+        """
+        st = os.stat(self.sqlite_path)
+        with self._lock:
+            if not self.immutable:
+                if self._watch is None:
+                    self._watch = _connect_read_only(
+                        self.sqlite_path, check_same_thread=False
+                    )
+                current = self._watch.execute("PRAGMA data_version").fetchone()[0]
+                if current != self._data_version:
+                    self._data_version = current
+                    self._generation += 1
+            generation = self._generation
+        return f"{st.st_mtime_ns:x}-{st.st_size:x}-{generation}"
+
+    def close(self) -> None:
+        with self._lock:
+            if self._watch is not None:
+                self._watch.close()
+                self._watch = None
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+_POOLS: dict[str, ReadOnlyPool] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def connection_pool(sqlite_path: str | Path) -> ReadOnlyPool:
+    """The shared :class:`ReadOnlyPool` for ``sqlite_path``."""
+    key = _resolve_sqlite_path(sqlite_path)
+    with _POOLS_LOCK:
+        pool = _POOLS.get(key)
+        if pool is None:
+            pool = _POOLS[key] = ReadOnlyPool(key)
+        return pool
+
+
+def _display_columns(pool: ReadOnlyPool, conn, table_name: str) -> list[str]:
+    present = set(pool.columns(conn, table_name))
     return [col for col in DISPLAY_COLUMNS if col in present]
 
 
+def _available_display_columns(sqlite_path: str | Path, table_name: str) -> list[str]:
+    pool = connection_pool(sqlite_path)
+    with pool.connection() as conn:
+        return _display_columns(pool, conn, table_name)
+
+
 def _split_values(values: list[str] | str | None) -> list[str]:
     if values is None:
         return []
@@ -106,7 +262,7 @@ def _distinct_values(
         f"WHERE COALESCE(TRIM({column_sql}), '') <> '' "
         f"ORDER BY LOWER({column_sql}), {column_sql}"
     )
-    with sqlite3.connect(sqlite_path) as conn:
+    with connection_pool(sqlite_path).connection() as conn:
         rows = conn.execute(query).fetchall()
     return [str(row[0]) for row in rows]
 
@@ -114,33 +270,117 @@ def _distinct_values(
 def _build_where_clause(
     county_values: list[str] | str | None,
     city_values: list[str] | str | None,
+    filters: dict[str, str] | None = None,
+    blank: list[str] | tuple[str, ...] = (),
 ) -> tuple[str, list[object]]:
+    """WHERE for the county/city selection plus the per-column filters.
+
+    ``filters`` maps a column to text it must contain, case-insensitively;
+    ``blank`` lists columns that must be empty. Both mirror the filter row
+    of the page.
+    """
     clauses: list[str] = []
     params: list[object] = []
 
     county_list = _split_values(county_values)
     city_list = _split_values(city_values)
 
-    if county_list:
-        clauses.append(
-            "("
-            + " OR ".join(['LOWER(COALESCE("addr:county", "")) = ?'] * len(county_list))
-            + ")"
-        )
-        params.extend([value.strip().lower() for value in county_list])
-    if city_list:
-        clauses.append(
-            "("
-            + " OR ".join(['LOWER(COALESCE("addr:city", "")) = ?'] * len(city_list))
-            + ")"
-        )
-        params.extend([value.strip().lower() for value in city_list])
+    for column, values in (("addr:county", county_list), ("addr:city", city_list)):
+        if values:
+            key_sql = normalized_key_sql(column)
+            clauses.append("(" + " OR ".join([f"{key_sql} = ?"] * len(values)) + ")")
+            params.extend([value.strip().lower() for value in values])
+
+    for column in blank:
+        clauses.append(f"{normalized_key_sql(column)} = ''")
+    for column, text in (filters or {}).items():
+        needle = str(text).strip().lower()
+        if not needle:
+            continue
+        escaped = needle.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        clauses.append(f"{normalized_key_sql(column)} LIKE ? ESCAPE '\\'")
+        params.append(f"%{escaped}%")
 
     if not clauses:
         return "", params
     return "WHERE " + " AND ".join(clauses), params
 
 
+def _sort_keys(sort: str | None, decl_types: dict[str, str]) -> list[str]:
+    """ORDER BY expressions for a page, before the final ``rowid`` tiebreak.
+
+    The default order is the key index's, so it needs no sort step. Text
+    sorts case-folded; numbers sort numerically with blanks last. Every key
+    is non-NULL, which keyset comparison needs.
+    """
+    if sort is None:
+        return [normalized_key_sql(c) for c in ("addr:county", "addr:city", "name")]
+    if decl_types.get(sort) in ("INTEGER", "REAL", "BOOLEAN"):
+        return [f"IFNULL({_quote_identifier(sort)}, '')"]
+    return [normalized_key_sql(sort)]
+
+
+def encode_cursor(values: list[object]) -> str:
+    """Opaque ``after=`` token: the sort keys and rowid of a page's last row."""
+    raw = json.dumps(values, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str, n_keys: int) -> list[object]:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError) as exc:
+        raise ValueError(f"invalid page cursor {token!r}") from exc
+    if not isinstance(values, list) or len(values) != n_keys + 1:
+        raise ValueError("page cursor does not match the sort order; reload the page")
+    return values
+
+
+def _rows_sql(
+    table_name: str,
+    columns: list[str],
+    county=None,
+    city=None,
+    filters: dict[str, str] | None = None,
+    blank: list[str] | tuple[str, ...] = (),
+    keys: list[str] | None = None,
+    descending: bool = False,
+    cursor: list[object] | None = None,
+    with_total: bool = True,
+) -> tuple[str, list[object]]:
+    """The viewer's page query, ending ``LIMIT ? OFFSET ?``, and its params.
+
+    Each row is the display ``columns``, then the sort ``keys`` and rowid
+    (the next page's cursor), then, ``with_total``, the total match count.
+    ``cursor`` seeks past the previous page by row-value comparison instead
+    of counting off rows, so a page deep into the table costs the same as
+    the first. The total is an uncorrelated subquery, evaluated once; a
+    ``COUNT(*) OVER ()`` window would materialize every match before LIMIT.
+    """
+    table_sql = _quote_identifier(table_name)
+    keys = list(keys) if keys is not None else _sort_keys(None, {})
+    where_sql, where_params = _build_where_clause(county, city, filters, blank)
+    seek_sql, seek_params = where_sql, list(where_params)
+    if cursor is not None:
+        op = "<" if descending else ">"
+        seek = f"({', '.join(keys)}, rowid) {op} ({', '.join('?' for _ in cursor)})"
+        seek_sql = f"{where_sql} AND {seek}" if where_sql else f"WHERE {seek}"
+        seek_params += list(cursor)
+    direction = " DESC" if descending else ""
+    order_sql = "ORDER BY " + ", ".join(f"{k}{direction}" for k in [*keys, "rowid"])
+    select = [_quote_identifier(col) for col in columns] + keys + ["rowid"]
+    params: list[object] = []
+    if with_total:
+        select.append(f"(SELECT COUNT(*) FROM {table_sql} {where_sql})")
+        params += where_params
+    sql = (
+        f"SELECT {', '.join(select)} FROM {table_sql} {seek_sql} {order_sql} "
+        "LIMIT ? OFFSET ?"
+    )
+    return sql, params + seek_params
+
+
 def query_rows(
     sqlite_path: str | Path,
     county: list[str] | str | None = None,
@@ -148,48 +388,161 @@ def query_rows(
     table_name: str = DEFAULT_TABLE_NAME,
     limit: int = 200,
     offset: int = 0,
+    sort: str | None = None,
+    descending: bool = False,
+    filters: dict[str, str] | None = None,
+    blank: list[str] | tuple[str, ...] = (),
+    after: str | None = None,
+    all_rows: bool = False,
 ) -> dict[str, object]:
     """
     Query rows for the browser viewer.
 
     Blank county and city values intentionally return no rows so the page
-    starts empty until the user requests data.
-    """
-    if not county and not city:
-        return {
-            "rows": [],
-            "total": 0,
-            "columns": _available_display_columns(sqlite_path, table_name),
-        }
-
-    table_sql = _quote_identifier(table_name)
-    where_sql, params = _build_where_clause(county, city)
-    columns = _available_display_columns(sqlite_path, table_name)
-    if not columns:
-        raise ValueError(f"No display columns found in SQLite table '{table_name}'")
-
-    order_sql = """
-        ORDER BY
-            COALESCE(LOWER("addr:county"), ''),
-            COALESCE(LOWER("addr:city"), ''),
-            COALESCE(LOWER("name"), ''),
-            COALESCE("ref:US-TX:thc", '')
+    starts empty until the user requests data; ``all_rows=True`` asks for
+    the whole table instead.
+
+    Pages are windows of ``limit`` rows. The response's ``next`` is the
+    ``after`` token for the following window (None after the last one).
+    ``total`` is counted on the first window only; later windows return
+    None. ``sort``/``descending``, ``filters`` and ``blank`` must stay the
+    same across the windows of one listing.
     """
-    select_cols = ", ".join(_quote_identifier(col) for col in columns)
-
-    with sqlite3.connect(sqlite_path) as conn:
-        conn.row_factory = sqlite3.Row
-        count_sql = f"SELECT COUNT(*) FROM {table_sql} {where_sql}"
-        total = conn.execute(count_sql, params).fetchone()[0]
-
-        query_sql = (
-            f"SELECT {select_cols} FROM {table_sql} "
-            f"{where_sql} {order_sql} LIMIT ? OFFSET ?"
+    pool = connection_pool(sqlite_path)
+    with pool.connection() as conn:
+        decl_types = pool.decl_types(conn, table_name)
+        columns = [col for col in DISPLAY_COLUMNS if col in decl_types]
+        if not county and not city and not all_rows:
+            return {"rows": [], "total": 0, "columns": columns, "next": None}
+        if not columns:
+            raise ValueError(f"No display columns found in SQLite table '{table_name}'")
+        for column in [sort, *(filters or {}), *blank]:
+            if column is not None and column not in columns:
+                raise ValueError(f"cannot sort or filter on column {column!r}")
+
+        keys = _sort_keys(sort, decl_types)
+        cursor = decode_cursor(after, len(keys)) if after else None
+        with_total = cursor is None
+        query_sql, params = _rows_sql(
+            table_name,
+            columns,
+            county,
+            city,
+            filters=filters,
+            blank=blank,
+            keys=keys,
+            descending=descending,
+            cursor=cursor,
+            with_total=with_total,
         )
         rows = conn.execute(query_sql, [*params, limit, offset]).fetchall()
+        total = None
+        if with_total:
+            if rows:
+                total = rows[0][-1]
+            elif offset:
+                where_sql, where_params = _build_where_clause(county, city, filters, blank)
+                count_sql = f"SELECT COUNT(*) FROM {_quote_identifier(table_name)} {where_sql}"
+                total = conn.execute(count_sql, where_params).fetchone()[0]
+            else:
+                total = 0
+
+    n = len(columns)
+    payload_rows = [dict(zip(columns, row[:n])) for row in rows]
+    next_after = None
+    if rows and len(rows) == limit:
+        next_after = encode_cursor(list(rows[-1][n : n + len(keys) + 1]))
+    return {"rows": payload_rows, "total": total, "columns": columns, "next": next_after}
+
+
+def query_bbox_rows(
+    sqlite_path: str | Path,
+    south: float,
+    west: float,
+    north: float,
+    east: float,
+    table_name: str = DEFAULT_TABLE_NAME,
+    limit: int = 2000,
+) -> dict[str, object]:
+    """Display columns for the markers inside a map view, via the R*Tree."""
+    pool = connection_pool(sqlite_path)
+    with pool.connection() as conn:
+        columns = _display_columns(pool, conn, table_name)
+        df, _, _ = _bbox_frame(
+            conn, table_name, (south, west, north, east), columns, limit
+        )
+    rows = df.astype(object).where(df.notna(), None).to_dict("records")
+    return {"rows": rows, "total": len(rows), "columns": columns}
 
-    payload_rows = [{col: row[col] for col in columns} for row in rows]
-    return {"rows": payload_rows, "total": total, "columns": columns}
+
+def query_text_rows(
+    sqlite_path: str | Path,
+    query: str,
+    table_name: str = DEFAULT_TABLE_NAME,
+    limit: int = 20,
+    offset: int = 0,
+    raw: bool = False,
+) -> dict[str, object]:
+    """Ranked full-text hits, with each snippet as HTML-safe ``<mark>`` markup."""
+    with connection_pool(sqlite_path).connection() as conn:
+        payload = _search_text(
+            conn,
+            table_name,
+            query,
+            limit=limit,
+            offset=offset,
+            raw=raw,
+            highlight=(_MARK_OPEN, _MARK_CLOSE),
+        )
+    for row in payload["rows"]:
+        row["snippet"] = (
+            html.escape(row["snippet"] or "")
+            .replace(_MARK_OPEN, "<mark>")
+            .replace(_MARK_CLOSE, "</mark>")
+        )
+    payload.update(limit=limit, offset=offset)
+    return payload
+
+
+class RequestStats:
+    """Latency of the last ``window`` requests per path, for ``/api/stats``."""
+
+    def __init__(self, window: int = STATS_WINDOW):
+        self.window = window
+        self._lock = threading.Lock()
+        self._samples: dict[str, deque] = {}
+        self._counts: dict[str, int] = {}
+
+    def record(self, path: str, seconds: float) -> None:
+        with self._lock:
+            samples = self._samples.get(path)
+            if samples is None:
+                samples = self._samples[path] = deque(maxlen=self.window)
+            samples.append(seconds)
+            self._counts[path] = self._counts.get(path, 0) + 1
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """``{path: {count, p50_ms, p90_ms, p99_ms, max_ms}}``.
+
+        Percentiles are nearest-rank over the retained window; ``count`` is
+        every request since the server started.
+        """
+        with self._lock:
+            snapshot = {path: sorted(s) for path, s in self._samples.items()}
+            counts = dict(self._counts)
+        out = {}
+        for path, samples in sorted(snapshot.items()):
+            def pct(q):
+                return round(samples[max(0, math.ceil(q * len(samples)) - 1)] * 1000, 3)
+
+            out[path] = {
+                "count": counts[path],
+                "p50_ms": pct(0.50),
+                "p90_ms": pct(0.90),
+                "p99_ms": pct(0.99),
+                "max_ms": round(samples[-1] * 1000, 3),
+            }
+        return out
 
 
 def _page_html(sqlite_name: str, table_name: str) -> str:
@@ -282,6 +635,7 @@ def _page_html(sqlite_name: str, table_name: str) -> str:
     }}
     .table-wrap {{
       overflow: auto;
+      max-height: 72vh;
       border: 1px solid var(--line);
       border-radius: 14px;
       background: var(--panel);
@@ -388,6 +742,27 @@ def _page_html(sqlite_name: str, table_name: str) -> str:
       font-size: 11px;
       margin-left: 4px;
     }}
+    .fts-results {{
+      list-style: none;
+      margin: 0 0 12px;
+      padding: 0;
+    }}
+    .fts-results li {{
+      padding: 10px 12px;
+      border: 1px solid var(--line);
+      border-radius: 10px;
+      background: var(--panel);
+      margin-bottom: 8px;
+      font-size: 13px;
+    }}
+    .fts-results .where {{
+      color: var(--muted);
+      font-size: 12px;
+    }}
+    mark {{
+      background: #fff1a8;
+      padding: 0 1px;
+    }}
   </style>
 </head>
 <body>
@@ -407,18 +782,30 @@ def _page_html(sqlite_name: str, table_name: str) -> str:
         <select id="city" name="city" multiple size="8"></select>
         <div class="select-note">Hold Ctrl/Cmd to select multiple cities.</div>
       </label>
-      <label>
-        Limit
-        <input id="limit" name="limit" type="number" min="1" max="5000" value="2000">
+      <label class="blank-toggle" style="align-self:center">
+        <input id="allRows" name="all" type="checkbox">
+        <span>Whole table</span>
       </label>
       <div style="display:flex;gap:10px;align-items:end">
         <button type="submit">Load</button>
         <button type="button" id="clearBtn" class="secondary">Clear</button>
       </div>
     </form>
+    <form class="toolbar" id="textForm">
+      <label>
+        Search text
+        <input id="textQuery" name="q" type="search" placeholder="Name, inscription, notes, address">
+      </label>
+      <div style="display:flex;gap:10px;align-items:end">
+        <button type="submit">Search</button>
+        <button type="button" id="textPrev" class="secondary hidden">Previous</button>
+        <button type="button" id="textNext" class="secondary hidden">Next</button>
+      </div>
+    </form>
+    <ol class="fts-results hidden" id="textResults"></ol>
     <div class="meta">
       <span class="pill" id="resultPill">No results loaded</span>
-      <span class="hint">Start with county and/or city, then load rows from SQLite.</span>
+      <span class="hint">Start with county and/or city, then load rows from SQLite. More rows load as you scroll.</span>
     </div>
     <div id="status" class="status">The page starts blank on purpose.</div>
     <div class="table-wrap hidden" id="tableWrap">
@@ -429,94 +816,72 @@ def _page_html(sqlite_name: str, table_name: str) -> str:
         </thead>
         <tbody id="bodyRow"></tbody>
       </table>
+      <div id="moreRows" class="status" style="padding:8px 12px"></div>
     </div>
   </main>
   <script>
     const form = document.getElementById('searchForm');
     const county = document.getElementById('county');
     const city = document.getElementById('city');
-    const limit = document.getElementById('limit');
+    const allRows = document.getElementById('allRows');
     const clearBtn = document.getElementById('clearBtn');
     const statusEl = document.getElementById('status');
     const tableWrap = document.getElementById('tableWrap');
     const headerRow = document.getElementById('headerRow');
     const filterRow = document.getElementById('filterRow');
     const bodyRow = document.getElementById('bodyRow');
+    const moreRows = document.getElementById('moreRows');
     const resultPill = document.getElementById('resultPill');
+    const windowSize = 200;
     let currentColumns = [];
-    let currentRows = [];
     let sortState = {{ column: null, asc: true }};
+    // One listing = one selection + sort + filters; windows are fetched with
+    // the cursor the previous window returned. `generation` drops responses
+    // for a listing that has since been replaced.
+    let listing = null;
+    let generation = 0;
+    let filterTimer = null;
+    const textForm = document.getElementById('textForm');
+    const textQuery = document.getElementById('textQuery');
+    const textResults = document.getElementById('textResults');
+    const textPrev = document.getElementById('textPrev');
+    const textNext = document.getElementById('textNext');
+    const textPageSize = 20;
+    let textOffset = 0;
 
     function setStatus(message, isError=false) {{
       statusEl.textContent = message;
       statusEl.classList.toggle('error', Boolean(isError));
     }}
 
-    function normalize(value) {{
-      return String(value ?? '').toLowerCase().trim();
-    }}
-
-    function isBlankLike(value) {{
-      return ['','nan','none','null','na','<na>'].includes(normalize(value));
-    }}
-
-    function sortRows(rows, column) {{
-      const asc = sortState.column === column ? !sortState.asc : true;
-      sortState = {{ column, asc }};
-      const sorted = [...rows].sort((a, b) => {{
-        const left = String(a[column] ?? '').trim();
-        const right = String(b[column] ?? '').trim();
-        const leftNum = Number(left.replace(/,/g, ''));
-        const rightNum = Number(right.replace(/,/g, ''));
-        let cmp;
-        if (!Number.isNaN(leftNum) && !Number.isNaN(rightNum) && left !== '' && right !== '') {{
-          cmp = leftNum - rightNum;
-        }} else {{
-          cmp = left.localeCompare(right, undefined, {{ numeric: true, sensitivity: 'base' }});
-        }}
-        return asc ? cmp : -cmp;
-      }});
-      return sorted;
+    function selectionParams() {{
+      const params = new URLSearchParams();
+      for (const value of selectedValues(county)) params.append('county', value);
+      for (const value of selectedValues(city)) params.append('city', value);
+      if (allRows.checked) params.set('all', '1');
+      return params;
     }}
 
-    function applyFilters() {{
-      const controls = [...filterRow.querySelectorAll('[data-column]')];
-      const activeFilters = new Map();
-      for (const control of controls) {{
+    function listingParams() {{
+      const params = selectionParams();
+      if (sortState.column) {{
+        params.set('sort', sortState.column);
+        params.set('dir', sortState.asc ? 'asc' : 'desc');
+      }}
+      for (const control of filterRow.querySelectorAll('[data-column]')) {{
         const column = control.dataset.column;
-        const mode = control.dataset.mode;
-        const entry = activeFilters.get(column) || {{ text: '', blankOnly: false }};
-        if (mode === 'text') {{
-          entry.text = normalize(control.value);
-        }} else if (mode === 'blank') {{
-          entry.blankOnly = Boolean(control.checked);
+        if (control.dataset.mode === 'text' && control.value.trim()) {{
+          params.set(`f.${{column}}`, control.value.trim());
+        }} else if (control.dataset.mode === 'blank' && control.checked) {{
+          params.append('blank', column);
         }}
-        activeFilters.set(column, entry);
       }}
-      let filtered = currentRows.filter(row => {{
-        for (const [column, filter] of activeFilters.entries()) {{
-          if (filter.blankOnly) {{
-            if (!isBlankLike(row[column])) return false;
-            continue;
-          }}
-          if (filter.text && !normalize(row[column]).includes(filter.text)) return false;
-        }}
-        return true;
-      }});
-
-      if (sortState.column) {{
-        filtered = sortRows(filtered, sortState.column);
-      }}
-
-      renderBody(filtered);
-      resultPill.textContent = `${{filtered.length}} visible row(s) / ${{currentRows.length}} loaded`;
-      setStatus(filtered.length < currentRows.length
-        ? `Showing ${{filtered.length}} of ${{currentRows.length}} loaded rows.`
-        : `Loaded ${{currentRows.length}} row(s).`);
+      params.set('limit', windowSize);
+      return params;
     }}
 
-    function renderBody(rows) {{
-      bodyRow.innerHTML = '';
+    function renderRows(rows) {{
+      const fragment = document.createDocumentFragment();
       for (const row of rows) {{
         const tr = document.createElement('tr');
         for (const col of currentColumns) {{
@@ -524,16 +889,20 @@ def _page_html(sqlite_name: str, table_name: str) -> str:
           td.textContent = row[col] ?? '';
           tr.appendChild(td);
         }}
-        bodyRow.appendChild(tr);
+        fragment.appendChild(tr);
       }}
+      bodyRow.appendChild(fragment);
+    }}
+
+    function scheduleReload() {{
+      clearTimeout(filterTimer);
+      filterTimer = setTimeout(() => startListing().catch(error => setStatus(error.message, true)), 250);
     }}
 
-    function renderTable(columns, rows) {{
+    function renderHeader(columns) {{
       currentColumns = columns;
-      currentRows = rows;
       headerRow.innerHTML = '';
       filterRow.innerHTML = '';
-      bodyRow.innerHTML = '';
       for (const col of columns) {{
         const th = document.createElement('th');
         th.textContent = col;
@@ -543,10 +912,10 @@ def _page_html(sqlite_name: str, table_name: str) -> str:
         indicator.textContent = '';
         th.appendChild(indicator);
         th.addEventListener('click', () => {{
-          const sorted = sortRows(currentRows, col);
-          currentRows = sorted;
-          applyFilters();
-          updateSortIndicators(col);
+          const asc = sortState.column === col ? !sortState.asc : true;
+          sortState = {{ column: col, asc }};
+          updateSortIndicators();
+          startListing().catch(error => setStatus(error.message, true));
         }});
         headerRow.appendChild(th);
 
@@ -559,7 +928,7 @@ def _page_html(sqlite_name: str, table_name: str) -> str:
         blank.type = 'checkbox';
         blank.dataset.column = col;
         blank.dataset.mode = 'blank';
-        blank.addEventListener('change', applyFilters);
+        blank.addEventListener('change', scheduleReload);
         const blankText = document.createElement('span');
         blankText.textContent = 'Blank only';
         blankLabel.appendChild(blank);
@@ -570,34 +939,89 @@ def _page_html(sqlite_name: str, table_name: str) -> str:
         input.placeholder = `Filter ${{col}}`;
         input.dataset.column = col;
         input.dataset.mode = 'text';
-        input.addEventListener('input', applyFilters);
+        input.addEventListener('input', scheduleReload);
         controls.appendChild(input);
         filterTh.appendChild(controls);
         filterRow.appendChild(filterTh);
       }}
-      sortState = {{ column: null, asc: true }};
-      renderBody(rows);
-      updateSortIndicators(null);
-      applyFilters();
+      updateSortIndicators();
     }}
 
-    function updateSortIndicators(activeColumn) {{
+    function updateSortIndicators() {{
       [...headerRow.children].forEach((th, index) => {{
         const indicator = th.querySelector('.sort-indicator');
         if (!indicator) return;
         const col = currentColumns[index];
-        if (col !== activeColumn && sortState.column !== col) {{
-          indicator.textContent = '';
-          return;
+        indicator.textContent = sortState.column === col ? (sortState.asc ? '▲' : '▼') : '';
+      }});
+    }}
+
+    function updateCounts() {{
+      const shown = bodyRow.children.length;
+      resultPill.textContent = `${{listing.total}} matching row(s)`;
+      moreRows.textContent = listing.next ? 'Scroll for more…' : '';
+      setStatus(shown < listing.total
+        ? `Showing ${{shown}} of ${{listing.total}} matches; more load as you scroll.`
+        : `Loaded ${{listing.total}} match(es).`);
+    }}
+
+    async function fetchWindow() {{
+      if (!listing || listing.loading || (listing.started && !listing.next)) return;
+      const mine = generation;
+      listing.loading = true;
+      const params = new URLSearchParams(listing.params);
+      if (listing.next) params.set('after', listing.next);
+      try {{
+        const response = await fetch(`/api/search?${{params.toString()}}`);
+        const data = await response.json();
+        if (mine !== generation) return;
+        if (!response.ok) {{
+          throw new Error(data.error || 'Failed to load rows');
         }}
-        if (sortState.column === col) {{
-          indicator.textContent = sortState.asc ? '▲' : '▼';
-        }} else {{
-          indicator.textContent = '';
+        if (!listing.started) {{
+          if (JSON.stringify(currentColumns) !== JSON.stringify(data.columns)) {{
+            renderHeader(data.columns);
+          }}
+          bodyRow.innerHTML = '';
+          tableWrap.scrollTop = 0;
+          listing.total = data.total;
+          listing.started = true;
         }}
-      }});
+        listing.next = data.next;
+        renderRows(data.rows);
+        updateCounts();
+      }} finally {{
+        if (mine === generation) listing.loading = false;
+      }}
+      // A short first window may not fill the view, so nothing would scroll.
+      if (mine === generation && listing.next && tableWrap.scrollHeight <= tableWrap.clientHeight) {{
+        await fetchWindow();
+      }}
     }}
 
+    async function startListing() {{
+      const selection = selectionParams();
+      if (!selection.has('county') && !selection.has('city') && !selection.has('all')) {{
+        generation += 1;
+        listing = null;
+        tableWrap.classList.add('hidden');
+        resultPill.textContent = 'No results loaded';
+        setStatus('Enter county and/or city, then click Load.');
+        return;
+      }}
+      generation += 1;
+      listing = {{ params: listingParams().toString(), next: null, total: 0, started: false, loading: false }};
+      setStatus('Loading rows from SQLite...');
+      tableWrap.classList.remove('hidden');
+      await fetchWindow();
+    }}
+
+    new IntersectionObserver(entries => {{
+      if (entries.some(entry => entry.isIntersecting)) {{
+        fetchWindow().catch(error => setStatus(error.message, true));
+      }}
+    }}, {{ root: tableWrap, rootMargin: '400px' }}).observe(moreRows);
+
     function selectedValues(selectEl) {{
       return [...selectEl.selectedOptions].map(option => option.value).filter(Boolean);
     }}
@@ -613,7 +1037,7 @@ def _page_html(sqlite_name: str, table_name: str) -> str:
         [county, data.counties],
         [city, data.cities],
       ];
-        for (const [selectEl, values] of fills) {{
+      for (const [selectEl, values] of fills) {{
         selectEl.innerHTML = '';
         const placeholder = document.createElement('option');
         placeholder.value = '';
@@ -630,46 +1054,63 @@ def _page_html(sqlite_name: str, table_name: str) -> str:
       }}
     }}
 
-    async function loadRows() {{
-      const params = new URLSearchParams();
-      for (const value of selectedValues(county)) params.append('county', value);
-      for (const value of selectedValues(city)) params.append('city', value);
-      params.set('limit', limit.value || '2000');
-
-      if (!params.has('county') && !params.has('city')) {{
-        tableWrap.classList.add('hidden');
-        resultPill.textContent = 'No results loaded';
-        setStatus('Enter county and/or city, then click Load.');
-        return;
+    form.addEventListener('submit', async (event) => {{
+      event.preventDefault();
+      try {{
+        await startListing();
+      }} catch (error) {{
+        setStatus(error.message, true);
       }}
+    }});
 
-      setStatus('Loading rows from SQLite...');
-      const response = await fetch(`/api/search?${{params.toString()}}`);
+    async function loadText(offset) {{
+      const params = new URLSearchParams({{ q: textQuery.value, limit: textPageSize, offset }});
+      const response = await fetch(`/api/fts?${{params.toString()}}`);
       const data = await response.json();
       if (!response.ok) {{
-        throw new Error(data.error || 'Failed to load rows');
+        throw new Error(data.error || 'Search failed');
       }}
-      renderTable(data.columns, data.rows);
-      tableWrap.classList.remove('hidden');
-      resultPill.textContent = `${{data.total}} matching row(s)`;
-      setStatus(data.rows.length < data.total
-        ? `Showing ${{data.rows.length}} of ${{data.total}} matches. Increase the limit if you want more.`
-        : `Loaded ${{data.total}} match(es).`);
+      textOffset = offset;
+      textResults.innerHTML = '';
+      textResults.start = offset + 1;
+      for (const row of data.rows) {{
+        const li = document.createElement('li');
+        const title = document.createElement('strong');
+        title.textContent = `${{row.name ?? ''}} (THC ${{row['ref:US-TX:thc'] ?? '?'}})`;
+        const where = document.createElement('div');
+        where.className = 'where';
+        where.textContent = [row['addr:city'], row['addr:county']].filter(Boolean).join(', ');
+        const snippet = document.createElement('div');
+        snippet.innerHTML = row.snippet;  // escaped server-side; only <mark> is markup
+        li.append(title, where, snippet);
+        textResults.appendChild(li);
+      }}
+      textResults.classList.toggle('hidden', data.rows.length === 0);
+      textPrev.classList.toggle('hidden', offset === 0);
+      textNext.classList.toggle('hidden', offset + data.rows.length >= data.total);
+      resultPill.textContent = `${{data.total}} text match(es)`;
+      setStatus(data.total
+        ? `Showing ${{offset + 1}}-${{offset + data.rows.length}} of ${{data.total}} text matches, best first.`
+        : 'No markers match that text.');
     }}
 
-    form.addEventListener('submit', async (event) => {{
+    function runText(offset) {{
+      loadText(offset).catch(error => setStatus(error.message, true));
+    }}
+
+    textForm.addEventListener('submit', (event) => {{
       event.preventDefault();
-      try {{
-        await loadRows();
-      }} catch (error) {{
-        setStatus(error.message, true);
-      }}
+      runText(0);
     }});
+    textPrev.addEventListener('click', () => runText(Math.max(0, textOffset - textPageSize)));
+    textNext.addEventListener('click', () => runText(textOffset + textPageSize));
 
     clearBtn.addEventListener('click', () => {{
       for (const option of county.options) option.selected = false;
       for (const option of city.options) option.selected = false;
-      limit.value = '2000';
+      allRows.checked = false;
+      generation += 1;
+      listing = null;
       tableWrap.classList.add('hidden');
       resultPill.textContent = 'No results loaded';
       setStatus('Cleared. Enter county and/or city, then click Load.');
@@ -684,65 +1125,310 @@ def _page_html(sqlite_name: str, table_name: str) -> str:
 """
 
 
-def _make_handler(sqlite_path: str, table_name: str):
-    class ViewerHandler(BaseHTTPRequestHandler):
-        def _send_json(self, payload: dict[str, object], status: int = 200) -> None:
-            body = json.dumps(payload, indent=2, default=str).encode("utf-8")
-            self.send_response(status)
-            self.send_header("Content-Type", "application/json; charset=utf-8")
-            self.send_header("Content-Length", str(len(body)))
-            self.end_headers()
-            self.wfile.write(body)
-
-        def _send_html(self, body: str) -> None:
-            data = body.encode("utf-8")
-            self.send_response(200)
-            self.send_header("Content-Type", "text/html; charset=utf-8")
-            self.send_header("Content-Length", str(len(data)))
-            self.end_headers()
-            self.wfile.write(data)
+ROUTES = (
+    "/",
+    "/api/search",
+    "/api/stream",
+    "/api/bbox",
+    "/api/fts",
+    "/api/options",
+    "/api/stats",
+)
 
-        def do_GET(self) -> None:  # noqa: N802
-            parsed = urlparse(self.path)
-            if parsed.path == "/":
-                self._send_html(_page_html(Path(sqlite_path).name, table_name))
-                return
 
-            if parsed.path == "/api/search":
-                params = parse_qs(parsed.query)
-                county = params.get("county", [])
-                city = params.get("city", [])
-                limit_raw = params.get("limit", ["200"])[0]
-                try:
-                    limit = max(1, min(5000, int(limit_raw)))
-                except ValueError:
-                    self._send_json({"error": "limit must be an integer"}, status=400)
-                    return
-                try:
-                    payload = query_rows(
-                        sqlite_path,
-                        county=county,
-                        city=city,
-                        table_name=table_name,
-                        limit=limit,
-                    )
-                except Exception as exc:  # pragma: no cover - surfaced to browser
-                    self._send_json({"error": str(exc)}, status=400)
-                    return
-                self._send_json(payload)
-                return
+def negotiate_encoding(accept_encoding: str | None) -> str | None:
+    """``br``, ``gzip`` or None for an ``Accept-Encoding`` header.
 
-            if parsed.path == "/api/options":
-                try:
-                    counties = _distinct_values(sqlite_path, "addr:county", table_name)
-                    cities = _distinct_values(sqlite_path, "addr:city", table_name)
-                except Exception as exc:  # pragma: no cover - surfaced to browser
-                    self._send_json({"error": str(exc)}, status=400)
-                    return
-                self._send_json({"counties": counties, "cities": cities})
+    Brotli needs the optional ``brotli`` package; without it gzip is used.
+    Codings the client refuses with ``q=0`` are skipped.
+    """
+    offered = {}
+    for item in (accept_encoding or "").split(","):
+        name, _, params = item.strip().partition(";")
+        q = 1.0
+        if params.strip().startswith("q="):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        offered[name.strip().lower()] = q
+    wildcard = offered.get("*", 0.0)
+    for coding in ("br", "gzip") if brotli is not None else ("gzip",):
+        if offered.get(coding, wildcard) > 0:
+            return coding
+    return None
+
+
+def encode_body(body: bytes, coding: str | None) -> tuple[bytes, str | None]:
+    """``(body, Content-Encoding)``; small bodies are sent as they are."""
+    if coding is None or len(body) < MIN_COMPRESS_BYTES:
+        return body, None
+    if coding == "br":
+        return brotli.compress(body, quality=5), "br"
+    return gzip.compress(body, compresslevel=6, mtime=0), "gzip"
+
+
+def _etag(version: str, parsed) -> str:
+    digest = hashlib.sha1(f"{parsed.path}?{parsed.query}".encode("utf-8")).hexdigest()
+    return f'W/"{version}-{digest[:16]}"'
+
+
+def _etag_matches(header: str | None, etag: str) -> bool:
+    if not header:
+        return False
+    tags = [tag.strip() for tag in header.split(",")]
+    # Weak comparison: W/"x" and "x" name the same representation.
+    bare = etag.removeprefix("W/")
+    return "*" in tags or any(tag.removeprefix("W/") == bare for tag in tags)
+
+
+def _dumps(payload) -> bytes:
+    return json.dumps(
+        payload, separators=(",", ":"), ensure_ascii=False, default=str
+    ).encode("utf-8")
+
+
+def _listing_args(params: dict[str, list[str]]) -> dict[str, object]:
+    """``query_rows`` keyword arguments from /api/search or /api/stream params."""
+    return {
+        "county": params.get("county", []),
+        "city": params.get("city", []),
+        "sort": params.get("sort", [None])[0] or None,
+        "descending": params.get("dir", ["asc"])[0] == "desc",
+        "filters": {
+            key[len("f.") :]: values[0]
+            for key, values in params.items()
+            if key.startswith("f.")
+        },
+        "blank": params.get("blank", []),
+        "all_rows": params.get("all", ["0"])[0] == "1",
+    }
+
+
+def iter_row_batches(
+    sqlite_path: str | Path,
+    table_name: str = DEFAULT_TABLE_NAME,
+    batch_size: int = MAX_WINDOW_ROWS,
+    **listing,
+):
+    """Every row of a listing as NDJSON, one ``bytes`` chunk per batch.
+
+    Each line is one row object. The batches are consecutive keyset windows
+    of :func:`query_rows`, so memory stays at one window however large the
+    result. The first window is queried before this returns, so a bad sort
+    or filter raises here rather than halfway through a response.
+    """
+    first = query_rows(sqlite_path, table_name=table_name, limit=batch_size, **listing)
+
+    def batches():
+        payload = first
+        while True:
+            if payload["rows"]:
+                yield b"".join(_dumps(row) + b"\n" for row in payload["rows"])
+            if payload["next"] is None:
                 return
+            payload = query_rows(
+                sqlite_path,
+                table_name=table_name,
+                limit=batch_size,
+                after=payload["next"],
+                **listing,
+            )
+
+    return batches()
+
+
+@dataclass
+class ViewerResponse:
+    """Status, headers and body of one viewer response.
+
+    ``body`` is either the whole payload or, for streamed responses, an
+    iterator of chunks; the server decides how to frame the latter.
+    """
+
+    status: int
+    headers: list[tuple[str, str]] = field(default_factory=list)
+    body: bytes | Iterator[bytes] = b""
+
+    @property
+    def streamed(self) -> bool:
+        return not isinstance(self.body, bytes)
 
-            self.send_error(404, "Not Found")
+
+def _plain(status: int, text: str) -> ViewerResponse:
+    return ViewerResponse(
+        status, [("Content-Type", "text/plain; charset=utf-8")], text.encode("utf-8")
+    )
+
+
+class ViewerApp:
+    """Routing and payloads for the viewer, independent of the HTTP server.
+
+    Both the threaded server below and the asyncio one in
+    ``sqlite_viewer_async`` call :meth:`handle` with the request target and
+    headers and write out the :class:`ViewerResponse` it returns.
+    """
+
+    def __init__(self, sqlite_path: str, table_name: str = DEFAULT_TABLE_NAME):
+        self.sqlite_path = sqlite_path
+        self.table_name = table_name
+        self.stats = RequestStats()
+        self._options_lock = threading.Lock()
+        self._options: tuple[str | None, dict | None] = (None, None)
+
+    def record(self, path: str, seconds: float) -> None:
+        self.stats.record(path if path in ROUTES else "(other)", seconds)
+
+    def handle(self, target: str, headers) -> ViewerResponse:
+        """Answer a GET for ``target`` (path and query string).
+
+        ``headers`` needs only a case-insensitive ``get``, as
+        ``email.message.Message`` provides.
+        """
+        parsed = urlparse(target)
+        if parsed.path == "/":
+            body = _page_html(Path(self.sqlite_path).name, self.table_name).encode("utf-8")
+            return ViewerResponse(
+                200, [("Content-Type", "text/html; charset=utf-8")], body
+            )
+        if parsed.path == "/api/stats":
+            pool = connection_pool(self.sqlite_path)
+            return self._json(
+                headers,
+                {
+                    "requests": self.stats.summary(),
+                    "connections_opened": pool.opened,
+                    "immutable": pool.immutable,
+                },
+            )
+        route = {
+            "/api/search": self._search,
+            "/api/stream": self._stream,
+            "/api/bbox": self._bbox,
+            "/api/fts": self._fts,
+            "/api/options": self._options_payload,
+        }.get(parsed.path)
+        if route is None:
+            return self._json(headers, {"error": "Not Found"}, status=404)
+
+        # The ETag names the database version plus the exact URL, so a
+        # repeated request from a client that already has the answer costs
+        # a stat and a pragma, not a query.
+        version = connection_pool(self.sqlite_path).version()
+        etag = _etag(version, parsed)
+        cache_headers = [("ETag", etag), ("Cache-Control", "no-cache")]
+        if _etag_matches(headers.get("If-None-Match"), etag):
+            return ViewerResponse(304, [*cache_headers, ("Vary", "Accept-Encoding")])
+        try:
+            result = route(parse_qs(parsed.query), version)
+        except Exception as exc:  # surfaced to the browser
+            return self._json(headers, {"error": str(exc)}, status=400)
+        if isinstance(result, dict):
+            return self._json(headers, result, extra=cache_headers)
+        return ViewerResponse(
+            200,
+            [("Content-Type", "application/x-ndjson; charset=utf-8"), *cache_headers],
+            result,
+        )
+
+    # ------------------------------------------------------------- routes
+
+    def _search(self, params, version):
+        limit_raw = params.get("limit", ["200"])[0]
+        try:
+            limit = max(1, min(MAX_WINDOW_ROWS, int(limit_raw)))
+        except ValueError:
+            raise ValueError("limit must be an integer") from None
+        return query_rows(
+            self.sqlite_path,
+            table_name=self.table_name,
+            limit=limit,
+            after=params.get("after", [None])[0] or None,
+            **_listing_args(params),
+        )
+
+    def _stream(self, params, version):
+        return iter_row_batches(
+            self.sqlite_path, table_name=self.table_name, **_listing_args(params)
+        )
+
+    def _bbox(self, params, version):
+        try:
+            box = [float(params[k][0]) for k in ("south", "west", "north", "east")]
+            limit = max(1, min(5000, int(params.get("limit", ["2000"])[0])))
+        except (KeyError, ValueError):
+            raise ValueError("south, west, north and east must be numbers") from None
+        return query_bbox_rows(self.sqlite_path, *box, table_name=self.table_name, limit=limit)
+
+    def _fts(self, params, version):
+        try:
+            limit = max(1, min(200, int(params.get("limit", ["20"])[0])))
+            offset = max(0, int(params.get("offset", ["0"])[0]))
+        except ValueError:
+            raise ValueError("limit and offset must be integers") from None
+        return query_text_rows(
+            self.sqlite_path,
+            params.get("q", [""])[0],
+            table_name=self.table_name,
+            limit=limit,
+            offset=offset,
+            raw=params.get("raw", ["0"])[0] == "1",
+        )
+
+    def _options_payload(self, params, version):
+        with self._options_lock:
+            cached_version, payload = self._options
+        if cached_version != version:
+            payload = {
+                "counties": _distinct_values(self.sqlite_path, "addr:county", self.table_name),
+                "cities": _distinct_values(self.sqlite_path, "addr:city", self.table_name),
+            }
+            with self._options_lock:
+                self._options = (version, payload)
+        return payload
+
+    # ------------------------------------------------------------ helpers
+
+    def _json(self, headers, payload, status=200, extra=()) -> ViewerResponse:
+        body, coding = encode_body(
+            _dumps(payload), negotiate_encoding(headers.get("Accept-Encoding"))
+        )
+        out = [
+            ("Content-Type", "application/json; charset=utf-8"),
+            ("Vary", "Accept-Encoding"),
+        ]
+        if coding:
+            out.append(("Content-Encoding", coding))
+        return ViewerResponse(status, [*out, *extra], body)
+
+
+def _make_handler(app: ViewerApp):
+    class ViewerHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802
+            started = time.perf_counter()
+            try:
+                try:
+                    response = app.handle(self.path, self.headers)
+                except Exception:
+                    # e.g. sqlite3.OperationalError on a locked or missing database
+                    response = _plain(500, "Internal Server Error")
+                    response.headers.append(("Connection", "close"))
+                    self.close_connection = True
+                self.send_response(response.status)
+                for name, value in response.headers:
+                    self.send_header(name, value)
+                if response.streamed:
+                    # HTTP/1.0: the end of the body is the end of the connection.
+                    self.end_headers()
+                    for chunk in response.body:
+                        self.wfile.write(chunk)
+                else:
+                    if response.status != 304:
+                        self.send_header("Content-Length", str(len(response.body)))
+                    self.end_headers()
+                    self.wfile.write(response.body)
+            finally:
+                app.record(urlparse(self.path).path, time.perf_counter() - started)
 
         def log_message(self, format: str, *args) -> None:  # noqa: A003
             return
@@ -750,6 +1436,44 @@ def _make_handler(sqlite_path: str, table_name: str):
     return ViewerHandler
 
 
+def add_server_arguments(parser) -> None:
+    """``--async`` / ``--workers`` for a command that serves the viewer."""
+    parser.add_argument(
+        "--async",
+        dest="use_async",
+        action="store_true",
+        help="Serve with the asyncio backend (keep-alive, streamed /api/stream)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=POOL_MAX_IDLE,
+        help=f"SQLite reader threads for --async (default: {POOL_MAX_IDLE})",
+    )
+
+
+def serve_from_args(args):
+    """The threaded or asyncio server, as the parsed arguments ask."""
+    options = dict(
+        table_name=args.table,
+        host=args.host,
+        port=args.port,
+        open_browser=not args.no_open,
+    )
+    if getattr(args, "use_async", False):
+        from .sqlite_viewer_async import serve_async_browser
+
+        return serve_async_browser(args.sqlite, workers=args.workers, **options)
+    return serve_sqlite_browser(args.sqlite, **options)
+
+
+def _announce(sqlite_path: str, url: str, open_browser: bool) -> None:
+    print(f"✔ Serving SQLite browser for {sqlite_path}")
+    print(f"✔ Open {url}")
+    if open_browser:
+        threading.Timer(0.2, lambda: webbrowser.open(url)).start()
+
+
 def serve_sqlite_browser(
     sqlite_path: str | Path | None = None,
     table_name: str = DEFAULT_TABLE_NAME,
@@ -758,13 +1482,10 @@ def serve_sqlite_browser(
     open_browser: bool = True,
 ) -> ThreadingHTTPServer:
     sqlite_path = resolve_default_sqlite_path(sqlite_path)
-    handler = _make_handler(sqlite_path, table_name)
-    server = ThreadingHTTPServer((host, port), handler)
-    url = f"http://{host}:{server.server_port}/"
-    print(f"✔ Serving SQLite browser for {sqlite_path}")
-    print(f"✔ Open {url}")
-    if open_browser:
-        threading.Timer(0.2, lambda: webbrowser.open(url)).start()
+    server = ThreadingHTTPServer(
+        (host, port), _make_handler(ViewerApp(sqlite_path, table_name))
+    )
+    _announce(sqlite_path, f"http://{host}:{server.server_port}/", open_browser)
     return server
 
 
@@ -784,15 +1505,10 @@ def main(argv: list[str] | None = None) -> None:
     parser.add_argument(
         "--no-open", action="store_true", help="Do not auto-open the browser"
     )
+    add_server_arguments(parser)
     args = parser.parse_args(argv)
 
-    server = serve_sqlite_browser(
-        args.sqlite,
-        table_name=args.table,
-        host=args.host,
-        port=args.port,
-        open_browser=not args.no_open,
-    )
+    server = serve_from_args(args)
 
     try:
         server.serve_forever()
@@ -0,0 +1,247 @@
+"""asyncio backend for the SQLite browser (``thc sqlite browse --async``).
+
+``ThreadingHTTPServer`` starts a thread per connection, closes the
+connection after every response and buffers each body whole. This server
+is stdlib ``asyncio`` instead:
+
+* One event loop accepts connections and parses requests. Connections stay
+  open between requests (HTTP/1.1 keep-alive) until the client closes them
+  or stays idle for ``keepalive_sec``.
+* SQLite reads run on a fixed pool of ``workers`` threads, so a burst of
+  clients queues for a reader instead of opening one connection each.
+  Keep it at or under ``POOL_MAX_IDLE`` and every worker reuses a pooled
+  connection.
+* Streamed bodies (``/api/stream``) go out with chunked transfer encoding,
+  one chunk per keyset window. Each window is fetched on the pool and
+  written before the next is read, and ``drain()`` holds the next query
+  back until a slow client has taken the last one.
+
+Routing, ETags and compression are the shared :class:`ViewerApp`'s; this
+module only speaks HTTP. The returned server has the same
+``serve_forever`` / ``shutdown`` / ``server_close`` / ``server_port``
+surface as the threaded one.
+"""
+from __future__ import annotations
+
+import asyncio
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.message import Message
+from http import HTTPStatus
+from pathlib import Path
+
+from .sqlite_sync import DEFAULT_TABLE_NAME
+from .sqlite_viewer import (
+    DEFAULT_HOST,
+    DEFAULT_PORT,
+    POOL_MAX_IDLE,
+    ViewerApp,
+    ViewerResponse,
+    _announce,
+    _plain,
+    resolve_default_sqlite_path,
+)
+
+KEEPALIVE_SEC = 15.0
+MAX_HEADERS = 100
+_STREAM_END = object()
+
+
+class _BadRequest(Exception):
+    pass
+
+
+class AsyncViewerServer:
+    """Keep-alive HTTP/1.1 server for a :class:`ViewerApp`."""
+
+    def __init__(
+        self,
+        app: ViewerApp,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        workers: int = POOL_MAX_IDLE,
+        keepalive_sec: float = KEEPALIVE_SEC,
+    ):
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.app = app
+        self.keepalive_sec = keepalive_sec
+        self.executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="thc-viewer"
+        )
+        self.loop = asyncio.new_event_loop()
+        # Bind now, like socketserver, so server_port is known before serving.
+        self._server = self.loop.run_until_complete(
+            asyncio.start_server(self._client, host, port)
+        )
+        self.server_port = self._server.sockets[0].getsockname()[1]
+        self._stop: asyncio.Event | None = None
+        self._clients: dict[asyncio.Task, asyncio.StreamWriter] = {}
+        self._stopped = threading.Event()
+        self._stopped.set()
+
+    # ------------------------------------------------------------------ API
+
+    def serve_forever(self) -> None:
+        self._stopped.clear()
+        try:
+            self.loop.run_until_complete(self._serve())
+        finally:
+            self._stopped.set()
+
+    def shutdown(self) -> None:
+        """Stop ``serve_forever`` (from another thread) and wait for it."""
+        if self._stop is not None:
+            self.loop.call_soon_threadsafe(self._stop.set)
+        self._stopped.wait()
+
+    def server_close(self) -> None:
+        self._server.close()
+        self.loop.run_until_complete(self._server.wait_closed())
+        self.executor.shutdown(wait=True)
+        self.loop.close()
+
+    # ------------------------------------------------------------- internal
+
+    async def _serve(self) -> None:
+        self._stop = asyncio.Event()
+        await self._stop.wait()
+        self._server.close()
+        # Idle keep-alive connections would otherwise outlive the loop;
+        # closing them ends each client's read with EOF.
+        for writer in list(self._clients.values()):
+            writer.close()
+        await asyncio.gather(*self._clients, return_exceptions=True)
+
+    async def _client(self, reader, writer) -> None:
+        task = asyncio.current_task()
+        self._clients[task] = writer
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(
+                        _read_request(reader), self.keepalive_sec
+                    )
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+                    return
+                except (_BadRequest, ValueError, asyncio.LimitOverrunError):
+                    await _write(writer, _plain(400, "Bad Request"), keep_alive=False)
+                    return
+                if request is None:
+                    return
+                method, target, keep_alive, headers = request
+                if method != "GET":
+                    response = _plain(405, "Method Not Allowed")
+                    response.headers.append(("Allow", "GET"))
+                    await _write(writer, response, keep_alive)
+                else:
+                    started = time.perf_counter()
+                    try:
+                        try:
+                            response = await self.loop.run_in_executor(
+                                self.executor, self.app.handle, target, headers
+                            )
+                        except Exception:
+                            response = _plain(500, "Internal Server Error")
+                            keep_alive = False
+                        keep_alive = await self._send(writer, response, keep_alive)
+                    finally:
+                        path = target.split("?", 1)[0]
+                        self.app.record(path, time.perf_counter() - started)
+                if not keep_alive:
+                    return
+        except ConnectionError:
+            return
+        finally:
+            self._clients.pop(task, None)
+            writer.close()
+
+    async def _send(self, writer, response: ViewerResponse, keep_alive: bool) -> bool:
+        """Write ``response``; False when the connection can't take another request."""
+        if not response.streamed:
+            await _write(writer, response, keep_alive)
+            return keep_alive
+        writer.write(_head(response, keep_alive, [("Transfer-Encoding", "chunked")]))
+        chunks = iter(response.body)
+        while True:
+            try:
+                chunk = await self.loop.run_in_executor(
+                    self.executor, next, chunks, _STREAM_END
+                )
+            except Exception as e:
+                # Headers are out, so no 500 is possible; dropping the connection
+                # without the closing chunk tells the client the body is cut short.
+                print(f"[WARN] viewer stream failed mid-response: {e!r}", file=sys.stderr)
+                writer.transport.abort()
+                return False
+            if chunk is _STREAM_END:
+                break
+            writer.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+            await writer.drain()
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+        return keep_alive
+
+
+async def _read_request(reader):
+    """``(method, target, keep_alive, headers)``, or None at a clean EOF."""
+    line = await reader.readline()
+    if not line:
+        return None
+    parts = line.decode("latin-1").split()
+    if len(parts) != 3 or not parts[2].startswith("HTTP/1."):
+        raise _BadRequest(line)
+    method, target, version = parts
+    headers = Message()
+    for _ in range(MAX_HEADERS + 1):
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, sep, value = line.decode("latin-1").partition(":")
+        if not sep:
+            raise _BadRequest(line)
+        headers[name.strip()] = value.strip()
+    else:
+        raise _BadRequest("too many headers")
+    length = int(headers.get("Content-Length") or 0)
+    if length:
+        await reader.readexactly(length)
+    connection = (headers.get("Connection") or "").lower()
+    if version == "HTTP/1.0":
+        keep_alive = connection == "keep-alive"
+    else:
+        keep_alive = connection != "close"
+    return method, target, keep_alive, headers
+
+
+def _head(response: ViewerResponse, keep_alive: bool, extra=()) -> bytes:
+    lines = [f"HTTP/1.1 {response.status} {HTTPStatus(response.status).phrase}"]
+    lines += [f"{name}: {value}" for name, value in [*response.headers, *extra]]
+    lines.append(f"Connection: {'keep-alive' if keep_alive else 'close'}")
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+
+async def _write(writer, response: ViewerResponse, keep_alive: bool) -> None:
+    # A 304 has no body, and its Content-Length would describe the cached one.
+    length = [("Content-Length", str(len(response.body)))]
+    writer.write(_head(response, keep_alive, [] if response.status == 304 else length))
+    writer.write(response.body)
+    await writer.drain()
+
+
+def serve_async_browser(
+    sqlite_path: str | Path | None = None,
+    table_name: str = DEFAULT_TABLE_NAME,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    open_browser: bool = True,
+    workers: int = POOL_MAX_IDLE,
+) -> AsyncViewerServer:
+    sqlite_path = resolve_default_sqlite_path(sqlite_path)
+    server = AsyncViewerServer(
+        ViewerApp(sqlite_path, table_name), host=host, port=port, workers=workers
+    )
+    _announce(sqlite_path, f"http://{host}:{server.server_port}/", open_browser)
+    return server
@@ -1,4 +1,5 @@
 # thc/utils.py
+import numpy as np
 import pandas as pd
 import json
 import requests
@@ -10,6 +11,11 @@ import unicodedata
 from rich.console import Console
 from rich.table import Table
 
+try:
+    from . import atlas_frame
+except ImportError:  # pragma: no cover - compatibility for direct script execution
+    import atlas_frame  # type: ignore
+
 
 def require_columns(df, required_columns, context="dataframe"):
     """Raise a clear error when required columns are missing."""
@@ -18,13 +24,6 @@ def require_columns(df, required_columns, context="dataframe"):
         raise ValueError(f"{context} missing required column(s): {', '.join(missing)}")
 
 
-def _normalize_scalar(value):
-    """Convert pandas/numpy scalar NA values into JSON-safe Python values."""
-    if pd.isna(value):
-        return None
-    return value
-
-
 _TRUTHY = {"true", "1", "yes", "y", "t"}
 _FALSEY = {"false", "0", "no", "n", "f"}
 _NULL_TOKENS = {"", "nan", "none", "null", "na", "<na>"}
@@ -74,13 +73,20 @@ def parse_bool_series(series, column, context="dataframe", na_value=False):
 
 def coerce_nullable_int_series(series, column, context="dataframe"):
     """Strictly coerce nullable integer series; raise on invalid non-empty values."""
+    if pd.api.types.is_integer_dtype(series.dtype):
+        return series.astype("Int64")
+    if pd.api.types.is_float_dtype(series.dtype):
+        # SQLite hands back INTEGER columns with NULLs as floats.
+        finite = series.dropna().to_numpy(dtype=float)
+        if np.isfinite(finite).all() and (finite == np.floor(finite)).all():
+            return series.astype("Int64")
     values = series.astype("string").str.strip()
     lowered = values.str.casefold()
     is_blank = series.isna() | lowered.isin(_NULL_TOKENS)
     normalized = values.str.replace(r"\.0+$", "", regex=True)
     invalid = ~is_blank & ~normalized.map(
         lambda v: bool(_INT_PATTERN.fullmatch(str(v)))
-    )
+    ).fillna(False).astype(bool)
     if invalid.any():
         bad = sorted(values[invalid].unique().tolist())
         sample = ", ".join(repr(v) for v in bad[:5])
@@ -264,24 +270,15 @@ def convert_hmdb_csv(input_file, output_file):
 
 
 # -------------- Additional Utility Functions -------------- #
-def read_atlas(filename):
-    types = {
-        "ref:US-TX:thc": "Int32",
-        "ref:hmdb": "Int32",
-        "start_date": "Int32",
-        "UTM Easting": "Int32",
-        "UTM Northing": "Int32",
-        "UTM Zone": "Int16",
-        "isActive": "boolean",
-        "isHMDB": "boolean",
-        "isOSM": "boolean",
-        "isMissing": "boolean",
-        "isPending": "boolean",
-        "isPrivate": "boolean",
-        "Recorded Texas Historic Landmark": "boolean",
-        "inGoogle": "boolean",
-    }
-    return pd.read_csv(filename, dtype=types, low_memory=False)
+def read_atlas(filename, columns=None, where=None, cache=True):
+    """Load the atlas with typed ID/flag columns.
+
+    Thin wrapper over ``atlas_frame.AtlasFrame``, the shared loader: the
+    schema is declared there, ``columns`` limits what is parsed, ``where``
+    (an ``atlas_frame.Where``) filters rows during the load, and the Parquet
+    sidecar cache is used when pyarrow is installed.
+    """
+    return atlas_frame.AtlasFrame().read(filename, columns=columns, where=where, cache=cache)
 
 
 def filter_hmdb_missing_osm(df):
@@ -295,7 +292,43 @@ def filter_hmdb_missing_osm(df):
     return df.loc[mask].reset_index(drop=True)
 
 
+# Tags copied from the atlas only when the cell is set, in the order they
+# appear in nodes.json.
+OPTIONAL_NODE_TAG_COLUMNS = (
+    "thc:designation",
+    "start_date",
+    "addr:full",
+    "addr:city",
+    "addr:county",
+    "wikimedia_commons",
+    "subject:wikimedia_commons",
+    "subject:wikipedia",
+    "subject:wikidata",
+)
+
+
+def _json_values(series):
+    """Column as a list of Python values, NA as None.
+
+    ``astype(object)`` yields the same per-cell objects ``iterrows`` used to
+    (``int`` for Int32, ``float`` for float64, ``str`` for text), so the JSON
+    written from them is unchanged.
+    """
+    values = series.astype(object).to_numpy()
+    return np.where(series.notna().to_numpy(), values, None).tolist()
+
+
+def _int_values(series):
+    return [None if pd.isna(v) else int(v) for v in series.astype(object)]
+
+
 def create_nodes(df):
+    """Build one OSM node dict per atlas row.
+
+    Columnar: coordinates and IDs are coerced once for the whole frame and
+    each tag dict is assembled from pre-computed column lists, rather than
+    going through ``iterrows``.
+    """
     require_columns(
         df,
         [
@@ -317,62 +350,49 @@ def create_nodes(df):
     hmdb_ref = coerce_nullable_int_series(
         df["ref:hmdb"], "ref:hmdb", context="create_nodes input"
     )
-    nodes = []
-    row_errors = []
-    for index, row in df.iterrows():
-        try:
-            lat = pd.to_numeric(
-                pd.Series([row["verified:Latitude"]]), errors="coerce"
-            ).iloc[0]
-            lon = pd.to_numeric(
-                pd.Series([row["verified:Longitude"]]), errors="coerce"
-            ).iloc[0]
-            if pd.isna(lat) or pd.isna(lon):
-                row_errors.append(f"row {index}: invalid verified:Latitude/verified:Longitude")
-                continue
-
-            row_thc = thc_ref.iloc[index]
-            row_hmdb = hmdb_ref.iloc[index]
-            tags = {
-                "name": _normalize_scalar(row["name"]),
-                "historic": "memorial",
-                "memorial": "plaque",
-                "material": "aluminium",
-                "operator": "Texas Historical Commission",
-                "operator:wikidata": "Q2397965",
-                "ref:US-TX:thc": int(row_thc) if pd.notna(row_thc) else None,
-                "ref:hmdb": int(row_hmdb) if pd.notna(row_hmdb) else None,
-                "website": _normalize_scalar(row["website"]),
-            }
-            if pd.notna(row_hmdb):
-                tags["memorial:website"] = (
-                    f"https://www.hmdb.org/m.asp?m={int(row_hmdb)}"
-                )
-            if "thc:designation" in df.columns and pd.notna(row.get("thc:designation")):
-                tags["thc:designation"] = _normalize_scalar(row["thc:designation"])
-            if "start_date" in df.columns and pd.notna(row.get("start_date")):
-                tags["start_date"] = _normalize_scalar(row["start_date"])
-            for col in ("addr:full", "addr:city", "addr:county"):
-                if col in df.columns and pd.notna(row.get(col)):
-                    tags[col] = _normalize_scalar(row[col])
-            for col in (
-                "wikimedia_commons",
-                "subject:wikimedia_commons",
-                "subject:wikipedia",
-                "subject:wikidata",
-            ):
-                if col in df.columns and pd.notna(row.get(col)):
-                    tags[col] = _normalize_scalar(row[col])
-
-            nodes.append({"lat": float(lat), "lon": float(lon), "tags": tags})
-
-        except Exception as e:
-            row_errors.append(f"row {index}: {e}")
-
-    if row_errors:
-        sample = "; ".join(row_errors[:5])
+    lat = pd.to_numeric(df["verified:Latitude"], errors="coerce")
+    lon = pd.to_numeric(df["verified:Longitude"], errors="coerce")
+
+    bad = (lat.isna() | lon.isna()).to_numpy()
+    if bad.any():
+        sample = "; ".join(
+            f"row {index}: invalid verified:Latitude/verified:Longitude"
+            for index in df.index[bad][:5]
+        )
         raise ValueError(f"create_nodes input has invalid rows: {sample}")
 
+    lats = lat.astype(float).tolist()
+    lons = lon.astype(float).tolist()
+    thc = _int_values(thc_ref)
+    hmdb = _int_values(hmdb_ref)
+    names = _json_values(df["name"])
+    websites = _json_values(df["website"])
+    optional = [
+        (col, _json_values(df[col]), df[col].notna().tolist())
+        for col in OPTIONAL_NODE_TAG_COLUMNS
+        if col in df.columns
+    ]
+
+    nodes = []
+    for i in range(len(df)):
+        tags = {
+            "name": names[i],
+            "historic": "memorial",
+            "memorial": "plaque",
+            "material": "aluminium",
+            "operator": "Texas Historical Commission",
+            "operator:wikidata": "Q2397965",
+            "ref:US-TX:thc": thc[i],
+            "ref:hmdb": hmdb[i],
+            "website": websites[i],
+        }
+        if hmdb[i] is not None:
+            tags["memorial:website"] = f"https://www.hmdb.org/m.asp?m={hmdb[i]}"
+        for col, values, present in optional:
+            if present[i]:
+                tags[col] = values[i]
+        nodes.append({"lat": lats[i], "lon": lons[i], "tags": tags})
+
     return nodes
 
 